@@ -34,6 +34,12 @@ typedef struct {
 	uint32_t	payloadLength;
 } RDSReadingHeader;
 
+/**
+ * Sent by the storage service once all the readings of a block have been
+ * received, with RDS_ACK_MAGIC when they have all been committed and
+ * RDS_NACK_MAGIC when they have not. A block of up to RDS_BLOCK readings
+ * is inserted in a single transaction.
+ */
 typedef struct {
 	uint32_t	magic;
 	uint32_t	block;
@@ -27,6 +27,7 @@
 using HttpClient = SimpleWeb::Client<SimpleWeb::HTTP>;
 
 #define STREAM_BLK_SIZE 	100	// Readings to send per write call to a stream
+#define STREAM_ACK_TIMEOUT	30	// Seconds to wait for a block of readings to be acknowledged
 #define STREAM_THRESHOLD	25	// Switch to streamed mode above this number of readings per second
 
 // Backup values for repeated storage client exception messages
@@ -1444,6 +1444,10 @@ bool StorageClient::openStream()
 				Logger::getLogger()->warn("Failed to write connection header: %s", strerror(errno));
 				return false;
 			}
+			struct timeval timeout;
+			timeout.tv_sec = STREAM_ACK_TIMEOUT;
+			timeout.tv_usec = 0;
+			setsockopt(m_stream, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
 			m_streaming = true;
 			m_logger->info("Storage stream succesfully created");
 			return true;
@@ -1655,6 +1659,26 @@ string				lastAsset;
 			Logger::getLogger()->fatal("Long write %d < %d", length, n);
 		}
 	}
+
+	/*
+	 * Wait for the storage service to acknowledge the block. A block that
+	 * is not acknowledged has not been committed and should be sent again.
+	 */
+	RDSAcknowledge ack;
+	if ((n = recv(m_stream, &ack, sizeof(ack), MSG_WAITALL)) != sizeof(ack))
+	{
+		Logger::getLogger()->error("No acknowledge received for block %d, closing stream: %s",
+					m_readingBlock - 1, n < 0 ? strerror(errno) : "short read");
+		close(m_stream);
+		m_streaming = false;
+		return false;
+	}
+	if (ack.magic != RDS_ACK_MAGIC || ack.block != m_readingBlock - 1)
+	{
+		Logger::getLogger()->error("Block %d of readings has not been committed by the storage service",
+					m_readingBlock - 1);
+		return false;
+	}
 	Logger::getLogger()->info("Written block of %d readings via streaming connection", readings.size());
 	return true;
 }
@@ -2368,6 +2368,7 @@ bool Connection::jsonAggregates(const Value& payload,
 	else if (aggregates.IsArray())
 	{
 		int index = 0;
+		SQLBuffer anyConstraint;	// Properties of which a reading must have one
 		for (Value::ConstValueIterator itr = aggregates.Begin(); itr != aggregates.End(); ++itr)
 		{
 			if (!itr->IsObject())
@@ -2430,11 +2431,11 @@ bool Connection::jsonAggregates(const Value& payload,
 					return false;
 				}
 				const Value& jsonFields = json["properties"];
-				if (! jsonConstraint.isEmpty())
+				if (! anyConstraint.isEmpty())
 				{
-					jsonConstraint.append(" AND ");
+					anyConstraint.append(" OR ");
 				}
-				jsonConstraint.append(json["column"].GetString());
+				anyConstraint.append(json["column"].GetString());
 				if (jsonFields.IsArray())
 				{
 					string prev;
@@ -2442,18 +2443,18 @@ bool Connection::jsonAggregates(const Value& payload,
 					{
 						if (prev.length() > 0)
 						{
-							jsonConstraint.append("->>'");
-							jsonConstraint.append(prev);
-							jsonConstraint.append("'");
+							anyConstraint.append("->>'");
+							anyConstraint.append(prev);
+							anyConstraint.append("'");
 						}
 						prev = itr->GetString();
 						sql.append("->>'");
 						sql.append(itr->GetString());
 						sql.append('\'');
 					}
-					jsonConstraint.append(" ? '");
-					jsonConstraint.append(prev);
-					jsonConstraint.append("'");
+					anyConstraint.append(" ? '");
+					anyConstraint.append(prev);
+					anyConstraint.append("'");
 				}
 				else
 				{
@@ -2468,9 +2469,9 @@ bool Connection::jsonAggregates(const Value& payload,
 					sql.append("->>'");
 					sql.append(jsonFields.GetString());
 					sql.append('\'');
-					jsonConstraint.append(" ? '");
-					jsonConstraint.append(jsonFields.GetString());
-					jsonConstraint.append("'");
+					anyConstraint.append(" ? '");
+					anyConstraint.append(jsonFields.GetString());
+					anyConstraint.append("'");
 
 					sql.append(")::float");
 
@@ -2489,6 +2490,20 @@ bool Connection::jsonAggregates(const Value& payload,
 			}
 			sql.append("\"");
 		}
+		if (! anyConstraint.isEmpty())
+		{
+			// The aggregates ignore the NULL values of the readings lacking some of the
+			// properties, a reading is only left out when it has none of them
+			if (! jsonConstraint.isEmpty())
+			{
+				jsonConstraint.append(" AND ");
+			}
+			jsonConstraint.append('(');
+			const char *anyBuf = anyConstraint.coalesce();
+			jsonConstraint.append(anyBuf);
+			delete[] anyBuf;
+			jsonConstraint.append(')');
+		}
 	}
 	if (payload.HasMember("group"))
 	{
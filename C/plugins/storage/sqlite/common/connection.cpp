@@ -2218,6 +2218,7 @@ bool Connection::jsonAggregates(const Value& payload,
 	else if (aggregates.IsArray())
 	{
 		int index = 0;
+		SQLBuffer anyConstraint;	// Properties of which a reading must have one
 		for (Value::ConstValueIterator itr = aggregates.Begin(); itr != aggregates.End(); ++itr)
 		{
 			if (!itr->IsObject())
@@ -2276,9 +2277,9 @@ bool Connection::jsonAggregates(const Value& payload,
 					return false;
 				}
 				const Value& jsonFields = json["properties"];
-				if (! jsonConstraint.isEmpty())
+				if (! anyConstraint.isEmpty())
 				{
-					jsonConstraint.append(" AND ");
+					anyConstraint.append(" OR ");
 				}
 				// Use json_extract(field, '$.key1.key2') AS value
 				sql.append("json_extract(");
@@ -2289,9 +2290,9 @@ bool Connection::jsonAggregates(const Value& payload,
 				// JSON1 SQLite3 extension 'json_type' object check:
 				// json_type(field, '$.key1.key2') IS NOT NULL
 				// Build the Json keys NULL check
-				jsonConstraint.append("json_type(");
-				jsonConstraint.append(json["column"].GetString());
-				jsonConstraint.append(", '$.");
+				anyConstraint.append("json_type(");
+				anyConstraint.append(json["column"].GetString());
+				anyConstraint.append(", '$.");
 
 				if (jsonFields.IsArray())
 				{
@@ -2300,8 +2301,8 @@ bool Connection::jsonAggregates(const Value& payload,
 					{
 						if (prev.length() > 0)
 						{
-							jsonConstraint.append(prev);
-							jsonConstraint.append('.');
+							anyConstraint.append(prev);
+							anyConstraint.append('.');
 							sql.append('.');
 						}
 						// Append Json field for query
@@ -2309,10 +2310,10 @@ bool Connection::jsonAggregates(const Value& payload,
 						prev = itr->GetString();
 					}
 					// Add last Json key
-					jsonConstraint.append(prev);
+					anyConstraint.append(prev);
 
 					// Add condition for json key not null
-					jsonConstraint.append("') IS NOT NULL");
+					anyConstraint.append("') IS NOT NULL");
 				}
 				else
 				{
@@ -2322,10 +2323,10 @@ bool Connection::jsonAggregates(const Value& payload,
 					// JSON1 SQLite3 extension 'json_type' object check:
 					// json_type(field, '$.key1.key2') IS NOT NULL
 					// Build the Json key NULL check
-					jsonConstraint.append(jsonFields.GetString());
+					anyConstraint.append(jsonFields.GetString());
 
 					// Add condition for json key not null
-					jsonConstraint.append("') IS NOT NULL");
+					anyConstraint.append("') IS NOT NULL");
 				}
 				sql.append("')");
 			}
@@ -2350,6 +2351,20 @@ bool Connection::jsonAggregates(const Value& payload,
 			}
 			sql.append("\"");
 		}
+		if (! anyConstraint.isEmpty())
+		{
+			// The aggregates ignore the NULL values of the readings lacking some of the
+			// properties, a reading is only left out when it has none of them
+			if (! jsonConstraint.isEmpty())
+			{
+				jsonConstraint.append(" AND ");
+			}
+			jsonConstraint.append('(');
+			const char *anyBuf = anyConstraint.coalesce();
+			jsonConstraint.append(anyBuf);
+			delete[] anyBuf;
+			jsonConstraint.append(')');
+		}
 	}
 	if (payload.HasMember("group"))
 	{
@@ -18,7 +18,9 @@
 #include <reading_stream.h>
 
 #define MAX_EVENTS	  40	// Number of epoll events in one epoll_wait call
+#ifndef RDS_BLOCK
 #define RDS_BLOCK	 10000	// Number of readings to insert in each call to the storage plugin
+#endif
 #define BLOCK_POOL_SIZES 512	// Increments of block sizes in a block pool
 
 class StorageApi;
@@ -64,6 +66,7 @@ class StreamHandler {
 					void		setNonBlocking(int fd);
 					unsigned int	available(int fd);
 					void		queueInsert(StorageApi *api, unsigned int nReadings, bool commit);
+					void		acknowledge();
 					void		dump(int n);
 					enum { Closed, Listen, AwaitingToken, Connected }
 				       			m_status;
@@ -71,6 +74,8 @@ class StreamHandler {
 					uint16_t	m_port;
 					uint32_t	m_token;
 					uint32_t	m_blockNo;
+					uint32_t	m_currentBlock;
+					bool		m_blockCommitted;
 					enum { BlkHdr, RdHdr, RdBody }
 				       			m_protocolState;
 					uint32_t	m_readingNo;
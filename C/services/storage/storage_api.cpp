@@ -1272,12 +1272,17 @@ string	responsePayload;
  *
  * @param readings	A Null terminated array of points to ReadingStream structures
  * @param commit	A flag to commit the readings block
+ * @return		True if all the readings have been inserted
  */
 bool StorageApi::readingStream(ReadingStream **readings, bool commit)
 {
 	if ((readingPlugin ? readingPlugin : plugin)->hasStreamSupport())
 	{
-		return (readingPlugin ? readingPlugin : plugin)->readingStream(readings, commit);
+		int nReadings = 0;
+		while (readings[nReadings])
+			nReadings++;
+		// The plugin returns the number of readings inserted, -1 on failure
+		return (readingPlugin ? readingPlugin : plugin)->readingStream(readings, commit) == nReadings;
 	}
 	else
 	{
@@ -1305,9 +1310,8 @@ bool StorageApi::readingStream(ReadingStream **readings, bool commit)
 		}
 		convert << "]}";
 		Logger::getLogger()->debug("Fallback created payload: %s", convert.str().c_str());
-		(readingPlugin ? readingPlugin : plugin)->readingsAppend(convert.str());
+		return (readingPlugin ? readingPlugin : plugin)->readingsAppend(convert.str()) >= 0;
 	}	
-	return false;
 }
 
 /**
@@ -16,6 +16,7 @@
 #include <fcntl.h>
 #include <sys/epoll.h>
 #include <sys/ioctl.h>
+#include <sys/socket.h>
 #include <chrono>
 #include <unistd.h>
 #include <errno.h>
@@ -224,7 +225,7 @@ void StreamHandler::Stream::setNonBlocking(int fd)
  * reading the block header the individual reading headers and the
  * readings themselves. 
  *
- * TODO Improve memory handling, use seperate threads for inserts, send acknowledgements
+ * TODO Improve memory handling, use seperate threads for inserts
  *
  * @param epollfd	The epoll file descriptor
  */
@@ -318,7 +319,9 @@ ssize_t n;
 				close(m_socket);
 			}
 		}
-		else if (m_status == Connected)
+		// The first block may have arrived with the token, the socket is edge
+		// triggered so process it now rather than wait for another event
+		if (m_status == Connected)
 		{
 			/*
 			 * We are connected so loop on the available data reading block headers,
@@ -362,10 +365,17 @@ ssize_t n;
 						// Somehow we lost a block
 					}
 					m_blockNo++;
+					m_currentBlock = blkHdr.blockNumber;
+					m_blockCommitted = true;
 					m_blockSize = blkHdr.count;
 					m_protocolState = RdHdr;
 					m_readingNo = 0;
 					Logger::getLogger()->info("New block %d of %d readings", blkHdr.blockNumber, blkHdr.count);
+					if (m_blockSize == 0)
+					{
+						acknowledge();
+						m_protocolState = BlkHdr;
+					}
 				}
 				else if (m_protocolState == RdHdr)
 				{
@@ -462,21 +472,26 @@ ssize_t n;
 					}
 					m_readingNo++;
 					m_protocolState = RdHdr;
-					if ((m_readingNo % RDS_BLOCK) == 0)
+					if (m_readingNo == m_blockSize)
 					{
-						queueInsert(api, RDS_BLOCK, false);
-						for (int i = 0; i < RDS_BLOCK; i++)
+						// We have completed the block, insert the readings not
+						// inserted yet, a multiple of RDS_BLOCK readings leaving
+						// a full array of them, and wait for a block header
+						uint32_t nReadings = m_readingNo % RDS_BLOCK;
+						if (nReadings == 0)
+							nReadings = RDS_BLOCK;
+						queueInsert(api, nReadings, true);
+						for (uint32_t i = 0; i < nReadings; i++)
 							m_blockPool->release(m_readings[i]);
+						acknowledge();
+						m_protocolState = BlkHdr;
+						Logger::getLogger()->warn("Waiting for the next block header");
 					}
-					else if (m_readingNo == m_blockSize)
+					else if ((m_readingNo % RDS_BLOCK) == 0)
 					{
-						// We have completed the block, insert readings and wait
-						// for a block header
-						queueInsert(api, m_readingNo % RDS_BLOCK, true);
-						for (uint32_t i = 0; i < m_readingNo % RDS_BLOCK; i++)
+						queueInsert(api, RDS_BLOCK, false);
+						for (int i = 0; i < RDS_BLOCK; i++)
 							m_blockPool->release(m_readings[i]);
-						m_protocolState = BlkHdr;
-						Logger::getLogger()->warn("Waiting for the next block header");
 					}
 					else if (m_readingNo > m_blockSize)
 					{
@@ -498,7 +513,29 @@ ssize_t n;
 void StreamHandler::Stream::queueInsert(StorageApi *api, unsigned int nReadings, bool commit)
 {
 	m_readings[nReadings] = NULL;
-	api->readingStream(m_readings, commit);
+	if (!api->readingStream(m_readings, commit))
+	{
+		m_blockCommitted = false;
+	}
+}
+
+/**
+ * Acknowledge the block that has been received, so that the client knows
+ * whether it has to send its readings again by other means. The acknowledge
+ * is not sent if the socket buffer is full, the client then treats the block
+ * as not committed.
+ */
+void StreamHandler::Stream::acknowledge()
+{
+	RDSAcknowledge ack;
+	ack.magic = m_blockCommitted ? RDS_ACK_MAGIC : RDS_NACK_MAGIC;
+	ack.block = m_currentBlock;
+	ssize_t n = send(m_socket, &ack, sizeof(ack), MSG_DONTWAIT | MSG_NOSIGNAL);
+	if (n != (ssize_t)sizeof(ack))
+	{
+		Logger::getLogger()->warn("Failed to acknowledge block %d: %s", m_currentBlock,
+				n < 0 ? strerror(errno) : "short write");
+	}
 }
 
 /**
@@ -284,6 +284,24 @@ class ACLManager(ACLManagerSingleton):
             err_response = ex.error
             raise ValueError(err_response)
 
+    async def get_acls_for_entities(self, entity_names, entity_type):
+        """Get the acl attached to each of the entities, with a single query. "" for an entity without acl."""
+        acls = {name: "" for name in entity_names}
+        try:
+            q_payload = PayloadBuilder().SELECT("entity_name", "name"). \
+                WHERE(["entity_type", "=", entity_type]). \
+                AND_WHERE(["entity_name", "in", list(entity_names)]).payload()
+            results = await self._storage_client.query_tbl_with_payload('acl_usage', q_payload)
+            for row in results['rows']:
+                if acls.get(row['entity_name']) == "":
+                    acls[row['entity_name']] = row['name']
+        except KeyError:
+            raise ValueError(results['message'])
+        except StorageServerError as ex:
+            err_response = ex.error
+            raise ValueError(err_response)
+        return acls
+
     async def resolve_pending_notification_for_acl_change(self, svc_name):
         """Methods that handles the pending notification about acl change to the service."""
         _logger.debug("svc name {} and pending notifications {}".format(svc_name,
@@ -292,6 +310,20 @@ class ACLManager(ACLManagerSingleton):
             return
 
         new_acl = await self.get_acl_for_an_entity(svc_name, "service")
+        await self._resolve_pending_notification(svc_name, new_acl)
+
+    async def resolve_pending_notifications_for_acl_change(self, svc_names):
+        """Same as resolve_pending_notification_for_acl_change for several services, reading their acl at once.
+        Storage is not queried when none of the services has a pending notification."""
+        pending = [name for name in svc_names if name in self._pending_notifications]
+        if not pending:
+            return
+        _logger.debug("svc names {} and pending notifications {}".format(pending, self._pending_notifications))
+        new_acls = await self.get_acls_for_entities(pending, "service")
+        for svc_name in pending:
+            await self._resolve_pending_notification(svc_name, new_acls[svc_name])
+
+    async def _resolve_pending_notification(self, svc_name, new_acl):
         old_acl = self._pending_notifications[svc_name]
 
         _logger.debug("New acl is {} Old acl is {}".format(new_acl, old_acl))
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Service side cache of asset tracker events with asynchronous delivery of new events to the core """
+
+import asyncio
+from typing import Dict, List, Tuple
+
+from fledge.common import logger
+from fledge.common.microservice_management_client.microservice_management_client import \
+    MicroserviceManagementClient, MicroserviceManagementClientAsync
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_LOGGER = logger.setup(__name__)
+
+_RETRY_WAIT_SECONDS = 5
+"""Seconds to wait before delivering again events that the core failed to record"""
+
+
+class AssetTrackerCache(object):
+    """ Set of the asset tracker events known to a service
+
+    :meth:`track` is called on the hot path for every reading: it is a single hash lookup of the
+    (asset, event, service, plugin) tuple. Events that are not in the set are queued and delivered to the core by a
+    background task, so a slow or unavailable core never blocks ingest or egress.
+
+    The background task delivers the events with its own asynchronous management client, connected to the same
+    management API as the given client. Events that fail to be delivered are retried after a short wait.
+    """
+
+    def __init__(self, management_client: MicroserviceManagementClient, retry_wait: float = _RETRY_WAIT_SECONDS):
+        self._management_client = management_client
+        self._delivery_client = None  # type: MicroserviceManagementClientAsync
+        self._retry_wait = retry_wait
+        self._events = set()
+        self._pending = []  # type: List[Tuple[str, str, str, str]]
+        self._pending_event = None  # type: asyncio.Event
+        self._delivery_task = None  # type: asyncio.Task
+        self._stopping = False
+        self._delivered = 0
+        self._failed = 0
+
+    @staticmethod
+    def _key(record: Dict) -> Tuple[str, str, str, str]:
+        return record['asset'], record['event'], record['service'], record['plugin']
+
+    def load(self, records: List[Dict]):
+        """ Seed the cache with the asset tracker records already held by the core
+
+        :param records: list of records as returned by get_asset_tracker_events()['track']
+        """
+        for record in records:
+            try:
+                self._events.add(self._key(record))
+            except (KeyError, TypeError):
+                _LOGGER.warning("Ignoring invalid asset tracker record %s", record)
+
+    def __contains__(self, key: Tuple[str, str, str, str]) -> bool:
+        return key in self._events
+
+    def __len__(self):
+        return len(self._events)
+
+    @property
+    def pending(self) -> int:
+        """ Number of events waiting to be delivered to the core """
+        return len(self._pending)
+
+    def track(self, asset: str, event: str, service: str, plugin: str) -> bool:
+        """ Record an asset tracker event
+
+        Returns:
+            True - The event is new and has been queued for delivery to the core
+            False - The event is already known
+        """
+        key = (asset, event, service, plugin)
+        if key in self._events:
+            return False
+        self._events.add(key)
+        self._pending.append(key)
+        if self._pending_event is not None:
+            self._pending_event.set()
+        return True
+
+    def start(self):
+        """ Start the background delivery task """
+        if self._delivery_task is not None:
+            return
+        self._stopping = False
+        self._pending_event = asyncio.Event()
+        if self._pending:
+            self._pending_event.set()
+        self._delivery_task = asyncio.ensure_future(self._deliver_forever())
+
+    async def stop(self):
+        """ Stop the background delivery task after a last attempt to deliver the pending events """
+        if self._delivery_task is None:
+            return
+        self._stopping = True
+        self._pending_event.set()
+        await self._delivery_task
+        self._delivery_task = None
+        self._pending_event = None
+        await self.flush()
+        if self._pending:
+            _LOGGER.warning("%d asset tracker events could not be delivered to the core", len(self._pending))
+        if self._delivery_client is not None:
+            await self._delivery_client.close()
+            self._delivery_client = None
+
+    async def flush(self) -> int:
+        """ Deliver the pending events to the core
+
+        Returns the number of events the core failed to record; these remain pending.
+        """
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, []
+        failed = await self._deliver(batch)
+        if failed:
+            # Retry the failed events ahead of those tracked while the batch was being delivered
+            self._pending = failed + self._pending
+        return len(failed)
+
+    async def _deliver(self, batch: List[Tuple[str, str, str, str]]) -> List[Tuple[str, str, str, str]]:
+        """ Post a batch of events to the core and return those that the core failed to record """
+        if self._delivery_client is None:
+            self._delivery_client = MicroserviceManagementClientAsync(self._management_client.hostname,
+                                                                      self._management_client.port)
+        failed = []
+        for index, (asset, event, service, plugin) in enumerate(batch):
+            try:
+                await self._delivery_client.create_asset_tracker_event(
+                    {"asset": asset, "event": event, "service": service, "plugin": plugin})
+                self._delivered += 1
+            except Exception as ex:
+                _LOGGER.error("Failed to record asset tracker event %s for asset %s, %s", event, asset, str(ex))
+                self._failed += 1
+                # The core is likely to fail the rest of the batch as well, retry all of them later
+                failed = batch[index:]
+                break
+        return failed
+
+    async def _deliver_forever(self):
+        retry = False
+        while not self._stopping:
+            if retry:
+                try:
+                    await asyncio.wait_for(self._pending_event.wait(), self._retry_wait)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await self._pending_event.wait()
+            self._pending_event.clear()
+            if self._stopping:
+                break
+            retry = await self.flush() > 0
+
+    def metrics(self) -> Dict:
+        """ Counters of the cache and of the delivery to the core """
+        return {"events": len(self._events), "pending": len(self._pending), "delivered": self._delivered,
+                "failed": self._failed}
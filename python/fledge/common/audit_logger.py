@@ -4,6 +4,10 @@
 # See: http://fledge-iot.readthedocs.io/
 # FLEDGE_END
 
+import asyncio
+import collections
+import json
+
 from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.common.storage_client.storage_client import StorageClientAsync
@@ -16,6 +20,16 @@ __version__ = "${VERSION}"
 
 _logger = FLCoreLogger().get_logger(__name__)
 
+_DEFAULT_FLUSH_INTERVAL = 1
+""" Seconds between two writes of the buffered audit trail entries """
+
+_DEFAULT_BUFFER_SIZE = 1000
+""" Maximum number of audit trail entries waiting to be written """
+
+OVERFLOW_POLICIES = ['discard_oldest', 'discard_newest', 'flush']
+""" What to do with a new entry when the buffer is full: discard the oldest entry of the buffer, discard the new
+entry, or have the caller write the buffer before adding the new entry """
+
 
 class AuditLoggerSingleton(object):
     """ AuditLoggerSingleton
@@ -32,6 +46,11 @@ class AuditLogger(AuditLoggerSingleton):
     """ Audit Logger
 
         Singleton interface to an audit logging class
+
+        By default every entry is written to storage before the log method returns. Once start_write_behind has
+        been called the entries are buffered instead, and written with a single multi-row insert every
+        flush_interval seconds, or sooner when the buffer is half full. The ts column of an entry is then the time it
+        is written, at most flush_interval seconds after it has been logged.
     """
 
     _success = 0
@@ -43,6 +62,9 @@ class AuditLogger(AuditLoggerSingleton):
     _storage = None
     """ The storage client we should use to talk to the storage service """
 
+    _buffer = None
+    """ Audit trail entries waiting to be written, None when entries are written immediately """
+
     def __init__(self, storage=None):
         AuditLoggerSingleton.__init__(self)
         if self._storage is None:
@@ -50,7 +72,106 @@ class AuditLogger(AuditLoggerSingleton):
                 raise TypeError('Must be a valid Storage object')
             self._storage = storage
 
+    def start_write_behind(self, flush_interval=_DEFAULT_FLUSH_INTERVAL, buffer_size=_DEFAULT_BUFFER_SIZE,
+                           overflow='discard_oldest'):
+        """ Buffers the audit trail entries and writes them in the background
+
+        Args:
+            flush_interval: seconds between two writes of the buffered entries
+            buffer_size: maximum number of buffered entries
+            overflow: one of OVERFLOW_POLICIES
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('overflow must be one of {}'.format(OVERFLOW_POLICIES))
+        if buffer_size < 1:
+            raise ValueError('buffer_size must be a positive integer')
+        if self._buffer is not None:
+            return
+        self._buffer = collections.deque()
+        self._buffer_size = buffer_size
+        self._overflow = overflow
+        self._flush_interval = flush_interval
+        self._flush_lock = asyncio.Lock()
+        self._flush_wakeup = asyncio.Event()
+        self._write_behind_stats = {"written": 0, "discarded": 0, "failures": 0}
+        self._flush_task = asyncio.ensure_future(self._flush_forever())
+
+    async def stop_write_behind(self):
+        """ Writes the buffered entries and goes back to writing entries immediately """
+        if self._buffer is None:
+            return
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        await self.flush()
+        if self._buffer:
+            _logger.warning("Discarded %s audit trail entries that could not be written.", len(self._buffer))
+        self._buffer = None
+        self._flush_task = None
+
+    async def flush(self):
+        """ Writes the buffered entries with a single insert
+
+        Returns:
+            False when storage failed, the entries are then kept for the next write
+        """
+        if not self._buffer:
+            return True
+        async with self._flush_lock:
+            self._flush_wakeup.clear()
+            entries = list(self._buffer)
+            self._buffer.clear()
+            try:
+                await self._storage.insert_into_tbl("log", json.dumps({"inserts": entries}))
+            except (StorageServerError, Exception) as ex:
+                _logger.error(ex, "Failed to write {} audit trail entries.".format(len(entries)))
+                self._buffer.extendleft(reversed(entries))
+                while len(self._buffer) > self._buffer_size:
+                    self._buffer.popleft()
+                    self._write_behind_stats["discarded"] += 1
+                self._write_behind_stats["failures"] += 1
+                return False
+            self._write_behind_stats["written"] += len(entries)
+            return True
+
+    def metrics(self):
+        """ Counters of the write-behind buffer, None when entries are written immediately """
+        if self._buffer is None:
+            return None
+        return dict(self._write_behind_stats, pending=len(self._buffer))
+
+    async def _flush_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def _buffer_entry(self, entry):
+        if len(self._buffer) >= self._buffer_size:
+            if self._overflow == 'flush':
+                await self.flush()
+            if self._overflow == 'discard_newest':
+                self._write_behind_stats["discarded"] += 1
+                return
+            if len(self._buffer) >= self._buffer_size:
+                self._buffer.popleft()
+                self._write_behind_stats["discarded"] += 1
+        self._buffer.append(entry)
+        if len(self._buffer) * 2 >= self._buffer_size:
+            self._flush_wakeup.set()
+
     async def _log(self, level, code, log):
+        if self._buffer is not None:
+            entry = {"code": code, "level": level}
+            if log is not None:
+                entry["log"] = log
+            await self._buffer_entry(entry)
+            return
+
         try:
             if log is None:
                 payload = PayloadBuilder().INSERT(code=code, level=level).payload()
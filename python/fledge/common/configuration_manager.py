@@ -43,69 +43,109 @@ RESERVED_CATG = ['South', 'North', 'General', 'Advanced', 'Utilities', 'rest_api
 
 
 class ConfigurationCache(object):
-    """Configuration Cache Manager"""
+    """Configuration Cache Manager
 
-    MAX_CACHE_SIZE = 10
+    Holds the most recently used categories. The least recently used categories are evicted when there are more than
+    max_cache_size categories or when their values take more than max_cache_bytes bytes, a value being measured by the
+    length of its JSON.
+    """
 
-    def __init__(self):
+    MAX_CACHE_SIZE = 1000
+    MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, max_cache_size=None, max_cache_bytes=None):
         """
-        cache: value stored in dictionary as per category_name
-        max_cache_size: Hold the 10 recently requested categories in the cache
+        cache: value stored in dictionary as per category_name, the least recently used first
+        max_cache_size: maximum number of categories held in the cache
+        max_cache_bytes: maximum number of bytes of the values held in the cache
         hit: number of times an item is read from the cache
         miss: number of times an item was not found in the cache and a read of the storage layer was required
+        evictions: number of categories removed to honour the limits
         """
-        self.cache = {}
-        self.max_cache_size = self.MAX_CACHE_SIZE
+        self._cache = collections.OrderedDict()
+        self._sizes = {}
+        self.max_cache_size = self.MAX_CACHE_SIZE if max_cache_size is None else max_cache_size
+        self.max_cache_bytes = self.MAX_CACHE_BYTES if max_cache_bytes is None else max_cache_bytes
+        self.bytes = 0
         self.hit = 0
         self.miss = 0
+        self.evictions = 0
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, categories):
+        self._cache = collections.OrderedDict(categories)
+        self._sizes = {name: self._size_of(entry) for name, entry in self._cache.items()}
+        self.bytes = sum(self._sizes.values())
 
     def __contains__(self, category_name):
         """Returns True or False depending on whether or not the key is in the cache
-        and update the hit and data_accessed"""
-        if category_name in self.cache:
-            try:
-                current_hit = self.cache[category_name]['hit']
-            except KeyError:
-                current_hit = 0
-
+        and marks the category as the most recently used"""
+        if category_name in self._cache:
             self.hit += 1
-            self.cache[category_name].update({'date_accessed': datetime.datetime.now(), 'hit': current_hit + 1})
+            self._cache.move_to_end(category_name)
             return True
         self.miss += 1
         return False
 
     def update(self, category_name, category_description, category_val, display_name=None):
-        """Update the cache dictionary and remove the oldest item"""
-        if category_name not in self.cache and len(self.cache) >= self.max_cache_size:
-            self.remove_oldest()
+        """Update the cache dictionary and remove the least recently used items beyond the limits"""
         display_name = category_name if display_name is None else display_name
-        self.cache[category_name] = {'date_accessed': datetime.datetime.now(), 'description': category_description,
-                                     'value': category_val, 'displayName': display_name}
-        _logger.debug("Updated Configuration Cache %s", self.cache)
+        self._cache[category_name] = {'date_accessed': datetime.datetime.now(), 'description': category_description,
+                                      'value': category_val, 'displayName': display_name}
+        self._cache.move_to_end(category_name)
+        self.resize(category_name)
+        _logger.debug("Updated Configuration Cache %s", category_name)
+
+    def resize(self, category_name):
+        """Account for the size of a category changed in place, and remove the least recently used items beyond
+        the limits"""
+        if category_name not in self._cache:
+            return
+        size = self._size_of(self._cache[category_name])
+        self.bytes += size - self._sizes.get(category_name, 0)
+        self._sizes[category_name] = size
+        while len(self._cache) > self.max_cache_size or (self.bytes > self.max_cache_bytes and len(self._cache) > 1):
+            self.remove_oldest()
+            self.evictions += 1
+
+    def set_limits(self, max_cache_size=None, max_cache_bytes=None):
+        """Change the limits of the cache, and remove the least recently used items beyond them"""
+        self.max_cache_size = self.MAX_CACHE_SIZE if max_cache_size is None else max_cache_size
+        self.max_cache_bytes = self.MAX_CACHE_BYTES if max_cache_bytes is None else max_cache_bytes
+        while len(self._cache) > self.max_cache_size or (self.bytes > self.max_cache_bytes and len(self._cache) > 1):
+            self.remove_oldest()
+            self.evictions += 1
 
     def remove_oldest(self):
-        """Remove the entry that has the oldest accessed date"""
-        oldest_entry = None
-        for category_name in self.cache:
-            if oldest_entry is None:
-                oldest_entry = category_name
-            elif self.cache[category_name].get('date_accessed') and self.cache[oldest_entry].get('date_accessed') \
-                    and self.cache[category_name]['date_accessed'] < self.cache[oldest_entry]['date_accessed']:
-                oldest_entry = category_name
-        if oldest_entry:
-            self.cache.pop(oldest_entry)
+        """Remove the least recently used entry"""
+        if self._cache:
+            category_name, _ = self._cache.popitem(last=False)
+            self.bytes -= self._sizes.pop(category_name, 0)
 
     def remove(self, key):
         """Remove the entry with given key name"""
-        for category_name in self.cache:
-            if key == category_name:
-                self.cache.pop(key)
-                break
+        if self._cache.pop(key, None) is not None:
+            self.bytes -= self._sizes.pop(key, 0)
+
+    def metrics(self):
+        """Return the counters and the occupancy of the cache"""
+        lookups = self.hit + self.miss
+        return {"size": len(self._cache), "maxSize": self.max_cache_size, "bytes": self.bytes,
+                "maxBytes": self.max_cache_bytes, "hit": self.hit, "miss": self.miss, "evictions": self.evictions,
+                "hitRatio": round(self.hit / lookups, 3) if lookups else 0.0}
 
     @property
     def size(self):
         """Return the size of the cache"""
-        return len(self.cache)
+        return len(self._cache)
+
+    @staticmethod
+    def _size_of(entry):
+        return len(json.dumps(entry.get('value'), default=str))
 
 
 class ConfigurationManagerSingleton(object):
@@ -195,6 +235,9 @@ class ConfigurationManager(ConfigurationManagerSingleton):
                 logging_level = self._cacheManager.cache[category_name]['value']['logLevel']['value']
                 server.Server._log_level = logging_level
                 FLCoreLogger().set_level(logging_level)
+            elif category_name == "CONFIGURATION_CACHE":
+                from fledge.services.core import server
+                server.Server.set_configuration_cache_limits(self._cacheManager.cache[category_name]['value'])
 
     async def _run_callbacks_child(self, parent_category_name, child_category, operation):
         callbacks = self._registered_interests_child.get(parent_category_name)
@@ -450,6 +493,24 @@ class ConfigurationManager(ConfigurationManagerSingleton):
         # If nothing found then return False
         return False, None, None, None
 
+    def set_cache_limits(self, max_cache_size=None, max_cache_bytes=None):
+        """Change the maximum number of categories and of bytes of their values held in the cache, None for the
+        default limit"""
+        self._cacheManager.set_limits(max_cache_size, max_cache_bytes)
+
+    async def preload_cache(self):
+        """Read the categories into the cache, in a single query, as many as the cache limits allow
+
+        Return Values:
+        the number of categories held in the cache
+        """
+        payload = PayloadBuilder().SELECT("key", "description", "value", "display_name").payload()
+        results = await self._storage.query_tbl_with_payload('configuration', payload)
+        for row in results['rows'][:self._cacheManager.max_cache_size]:
+            category_value = self._handle_script_type(row['key'], row['value'])
+            self._cacheManager.update(row['key'], row['description'], category_value, row['display_name'])
+        return self._cacheManager.size
+
     async def _read_all_category_names(self):
         # SELECT configuration.key, configuration.description, configuration.value, configuration.display_name, configuration.ts FROM configuration
         payload = PayloadBuilder().SELECT("key", "description", "value", "display_name", "ts") \
@@ -665,8 +726,9 @@ class ConfigurationManager(ConfigurationManagerSingleton):
                         self._cacheManager.cache[category_name]['value'][item_name]['value'] = cat_value[item_name][
                             'value']
                     else:
-                        self._cacheManager.cache[category_name]['value'].update(
-                            {item_name: cat_value[item_name]['value']})
+                        # Cached category is missing the item, read it again on next use
+                        self._cacheManager.remove(category_name)
+            self._cacheManager.resize(category_name)
 
             # Configuration Change audit entry
             audit = AuditLogger(self._storage)
@@ -718,14 +780,7 @@ class ConfigurationManager(ConfigurationManagerSingleton):
             response = result['response']
             # Re-read category from DB
             new_category_val_db = await self._read_category_val(category_name)
-            if category_name in self._cacheManager.cache:
-                self._cacheManager.cache[category_name]['description'] = category_description
-                self._cacheManager.cache[category_name]['value'] = new_category_val_db
-                self._cacheManager.cache[category_name]['displayName'] = display_name
-            else:
-                self._cacheManager.cache.update({category_name: {"description": category_description,
-                                                                 "value": new_category_val_db,
-                                                                 "displayName": display_name}})
+            self._cacheManager.update(category_name, category_description, new_category_val_db, display_name)
         except KeyError:
             raise ValueError(result['message'])
         except StorageServerError as ex:
@@ -766,6 +821,9 @@ class ConfigurationManager(ConfigurationManagerSingleton):
         """
         try:
             if category_name in self._cacheManager:
+                cached = self._cacheManager.cache[category_name]
+                if not any(item.get('type') == 'script' for item in cached['value'].values()):
+                    return cached['value']
                 # Interim solution; to ensure script type config item file content handling
                 category_value = self._handle_script_type(category_name,
                                                           self._cacheManager.cache[category_name]['value'])
@@ -919,8 +977,10 @@ class ConfigurationManager(ConfigurationManagerSingleton):
                     self._cacheManager.cache[category_name]['value'][item_name]['value'] = cat_item['value']
                     if storage_value_entry['type'] == 'script':
                         self._cacheManager.cache[category_name]['value'][item_name]["file"] = script_file_path
+                    self._cacheManager.resize(category_name)
                 else:
-                    self._cacheManager.cache[category_name]['value'].update({item_name: cat_item['value']})
+                    # Cached category is missing the item, read it again on next use
+                    self._cacheManager.remove(category_name)
         except:
             _logger.exception(
                 'Unable to set item value entry based on category_name %s and item_name %s and value_item_entry %s',
@@ -1016,8 +1076,10 @@ class ConfigurationManager(ConfigurationManagerSingleton):
                 if item_name in self._cacheManager.cache[category_name]['value']:
                     self._cacheManager.cache[category_name]['value'][item_name][optional_entry_name] = cat_item[
                         optional_entry_name]
+                    self._cacheManager.resize(category_name)
                 else:
-                    self._cacheManager.cache[category_name]['value'].update({item_name: cat_item[optional_entry_name]})
+                    # Cached category is missing the item, read it again on next use
+                    self._cacheManager.remove(category_name)
         except:
             _logger.exception(
                 'Unable to set optional %s entry based on category_name %s and item_name %s and value_item_entry %s',
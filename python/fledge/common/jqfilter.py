@@ -7,6 +7,10 @@
 """ A simple implementation using the jq product to apply a transformation to the JSON document
 """
 
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pyjq
 
 from fledge.common.logger import FLCoreLogger
@@ -16,16 +20,63 @@ __copyright__ = "Copyright (c) 2017 OSI Soft, LLC"
 __license__ = "Apache 2.0"
 __version__ = "${VERSION}"
 
+_MAX_WORKER_PROGRAMS = 16
+""" Number of compiled programs kept by a worker process """
+
+_worker_programs = {}
+""" Programs compiled by a worker process, by filter string """
+
+
+def _transform_in_worker(filter_string, reading_block):
+    """ Applies a filter in a worker process, compiling it on first use
+
+    Returns: (result, compile seconds, transform seconds)
+    """
+    start = time.perf_counter()
+    program = _worker_programs.get(filter_string)
+    if program is None:
+        if len(_worker_programs) >= _MAX_WORKER_PROGRAMS:
+            _worker_programs.clear()
+        program = _worker_programs[filter_string] = pyjq.compile(filter_string)
+    compiled = time.perf_counter()
+    result = program.all(reading_block)
+    return result, compiled - start, time.perf_counter() - compiled
+
 
 class JQFilter:
     """JQFilter class to use the jq product.
     jq is a lightweight and flexible JSON processor.
     This class uses pyjq (https://pypi.python.org/pypi/jq) which contains Python bindings for jq
+
+    The filter is compiled on first use and kept until a different filter is applied. The durations of the compile,
+    of the transform and of the whole last call are available in timings.
     """
 
     def __init__(self):
         """Initialise the JQFilter"""
         self._logger = FLCoreLogger().get_logger("JQFilter")
+        self._filter_string = None
+        self._program = None
+        self.timings = {"compile": 0.0, "transform": 0.0, "total": 0.0}
+        """ Seconds spent by the last transform """
+
+    def compile(self, filter_string):
+        """ Compiles a filter, unless it is the filter already compiled
+
+        Args:
+            filter_string: filter in JQ format
+        Returns: the compiled program
+        Raises:
+            ValueError: If filter is not a proper JQ filter
+        """
+        if self._program is None or filter_string != self._filter_string:
+            try:
+                self._program = pyjq.compile(filter_string)
+            except ValueError as ex:
+                self._logger.error(ex, "Failed to transform, please check the transformation rule.")
+                raise
+            self._filter_string = filter_string
+        return self._program
 
     def transform(self, reading_block, filter_string):
         """
@@ -42,11 +93,52 @@ class JQFilter:
                 and usage with plugins using defined configurations.
 
         """
+        start = time.perf_counter()
+        program = self.compile(filter_string)
+        compiled = time.perf_counter()
+        try:
+            result = program.all(reading_block)
+        except TypeError as ex:
+            self._logger.error(ex, "Invalid JSON passed during jq transform.")
+            raise
+        except ValueError as ex:
+            self._logger.error(ex, "Failed to transform, please check the transformation rule.")
+            raise
+        end = time.perf_counter()
+        self.timings = {"compile": compiled - start, "transform": end - compiled, "total": end - start}
+        return result
+
+    async def transform_async(self, reading_block, filter_string, executor=None):
+        """ Same as transform, run in an executor so that a heavy filter does not block the event loop
+
+        Args:
+            reading_block: Formatted JSON on which filter needs to be applied.
+            filter_string: filter to apply. Filter should be in JQ format.
+            executor: None to transform in the calling thread, a thread pool executor having a single worker, or a
+                      process pool executor. A process compiles each filter once and keeps it.
+        Returns: transformed JSON
+        Raises:
+            TypeError: If reading_block is not a valid JSON
+            ValueError: If filter is not a proper JQ filter
+        """
+        if executor is None:
+            return self.transform(reading_block, filter_string)
+
+        loop = asyncio.get_event_loop()
+        start = time.perf_counter()
+        if not isinstance(executor, ProcessPoolExecutor):
+            result = await loop.run_in_executor(executor, self.transform, reading_block, filter_string)
+            self.timings["total"] = time.perf_counter() - start
+            return result
+
         try:
-            return pyjq.all(filter_string, reading_block)
+            result, compile_time, transform_time = await loop.run_in_executor(executor, _transform_in_worker,
+                                                                              filter_string, reading_block)
         except TypeError as ex:
             self._logger.error(ex, "Invalid JSON passed during jq transform.")
             raise
         except ValueError as ex:
             self._logger.error(ex, "Failed to transform, please check the transformation rule.")
             raise
+        self.timings = {"compile": compile_time, "transform": transform_time, "total": time.perf_counter() - start}
+        return result
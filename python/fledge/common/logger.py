@@ -5,12 +5,15 @@
 # FLEDGE_END
 
 """ Fledge Logger """
+import atexit
 import os
-import subprocess
+import queue
+import sys
 import logging
+import threading
 import traceback
-from logging.handlers import SysLogHandler
-from functools import wraps
+from logging.handlers import QueueHandler, QueueListener, SysLogHandler
+from functools import lru_cache, wraps
 
 
 __author__ = "Praveen Garg, Ashish Jabble"
@@ -47,14 +50,92 @@ if (FLEDGE_LOGS_DESTINATION in os.environ) and \
     set_default_destination(int(os.environ[FLEDGE_LOGS_DESTINATION]))
 
 
+_FORMAT = '{}[%(process)d] %(levelname)s: %(module)s: %(name)s: %(message)s'
+""" Format of the records, given the name of the process """
+
+_process_args = None
+""" Arguments naming the process instead of its command line, set in a process forked to run a task """
+
+
+@lru_cache(maxsize=1)
 def get_process_name() -> str:
-    # Example: ps -eaf | grep 5175 | grep -v grep | awk -F '--name=' '{print $2}'
-    pid = os.getpid()
-    cmd = "ps -eaf | grep {} | grep -v grep | awk -F '--name=' '{{print $2}}'| tr -d '\n'".format(pid)
-    read_process_name = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE).stdout.readlines()
-    binary_to_string = [b.decode() for b in read_process_name]
-    pname = 'Fledge ' + binary_to_string[0] if binary_to_string else 'Fledge'
-    return pname
+    """ Name of the process in the syslog, 'Fledge' followed by the --name argument of the process if any
+
+    It is read from the command line of the process, that of the C service when Python is embedded in one, and
+    resolved once for all the loggers of the process.
+    """
+    if _process_args is not None:
+        args = _process_args
+    else:
+        try:
+            with open('/proc/self/cmdline', 'rb') as f:
+                args = [a.decode('utf-8', 'replace') for a in f.read().split(b'\0')]
+        except OSError:
+            args = sys.argv
+    names = [a[len('--name='):] for a in args if a.startswith('--name=')]
+    return 'Fledge ' + names[0] if names else 'Fledge'
+
+
+def set_process_args(args: list) -> None:
+    """ Names the process from args rather than from its command line, in a process forked to run a task
+
+    The handlers of the loggers already set up are given the new name.
+    """
+    global _process_args
+    old_fmt = _FORMAT.format(get_process_name())
+    _process_args = list(args)
+    get_process_name.cache_clear()
+    FLCoreLogger._instance = None
+    formatter = FLCoreLogger().formatter
+    loggers = [logging.getLogger()] + [log for log in logging.Logger.manager.loggerDict.values()
+                                       if isinstance(log, logging.Logger)]
+    for log in loggers:
+        for handler in log.handlers:
+            if handler.formatter is not None and handler.formatter._fmt == old_fmt:
+                handler.setFormatter(formatter)
+
+
+_syslog_lock = threading.Lock()
+_syslog_listener = None
+""" Listener writing the records queued by the syslog handlers of the process to syslog, in its own thread """
+_syslog_listener_pid = None
+
+
+def _get_syslog_queue() -> queue.Queue:
+    """ Queue of the records to send to syslog, the listener is started by the first call in a process """
+    global _syslog_listener, _syslog_listener_pid
+    if _syslog_listener_pid == os.getpid():
+        return _syslog_listener.queue
+    with _syslog_lock:
+        if _syslog_listener is None or _syslog_listener_pid != os.getpid():
+            # A forked process does not inherit the thread of the listener, it starts its own
+            _syslog_listener = QueueListener(queue.Queue(-1), SysLogHandler(address='/dev/log'))
+            _syslog_listener.start()
+            _syslog_listener_pid = os.getpid()
+        return _syslog_listener.queue
+
+
+def stop_syslog_listener() -> None:
+    """ Sends the records still queued to syslog, on exit or before a forked process calls os._exit """
+    with _syslog_lock:
+        if _syslog_listener is not None and _syslog_listener_pid == os.getpid():
+            _syslog_listener.stop()
+
+
+atexit.register(stop_syslog_listener)
+
+
+class SyslogQueueHandler(QueueHandler):
+    """ Syslog handler that does not block the callers
+
+    Records are formatted by the caller and queued, a single listener thread of the process writes them to syslog.
+    """
+
+    def __init__(self):
+        super().__init__(_get_syslog_queue())
+
+    def enqueue(self, record):
+        _get_syslog_queue().put_nowait(record)
 
 
 def setup(logger_name: str = None,
@@ -102,15 +183,14 @@ def setup(logger_name: str = None,
         destination = default_destination
 
     if destination == SYSLOG:
-        handler = SysLogHandler(address='/dev/log')
+        handler = SyslogQueueHandler()
     elif destination == CONSOLE:
         handler = logging.StreamHandler()  # stderr
     else:
         raise ValueError("Invalid destination {}".format(destination))
 
     # TODO: Consider using %r with message when using syslog .. \n looks better than #
-    fmt = '{}[%(process)d] %(levelname)s: %(module)s: %(name)s: %(message)s'.format(get_process_name())
-    formatter = logging.Formatter(fmt=fmt)
+    formatter = logging.Formatter(fmt=_FORMAT.format(get_process_name()))
     handler.setFormatter(formatter)
     if level is not None:
         logger.setLevel(level)
@@ -177,9 +257,7 @@ class FLCoreLogger:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            process_name = get_process_name()
-            fmt = '{}[%(process)d] %(levelname)s: %(module)s: %(name)s: %(message)s'.format(process_name)
-            cls.formatter = logging.Formatter(fmt=fmt)
+            cls.formatter = logging.Formatter(fmt=_FORMAT.format(get_process_name()))
         return cls._instance
 
     def get_syslog_handler(self):
@@ -188,7 +266,7 @@ class FLCoreLogger:
         Returns:
              logging handler object : the syslog handler
         """
-        syslog_handler = SysLogHandler(address='/dev/log')
+        syslog_handler = SyslogQueueHandler()
         syslog_handler.setFormatter(self.formatter)
         syslog_handler.name = "syslogHandler"
         return syslog_handler
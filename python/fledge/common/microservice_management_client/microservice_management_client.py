@@ -4,11 +4,14 @@
 # See: http://fledge-iot.readthedocs.io/
 # FLEDGE_END
 
+import asyncio
 import http.client
 import json
 import urllib.parse
 import logging
 
+import aiohttp
+
 from fledge.common import logger
 from fledge.common.microservice_management_client import exceptions as client_exceptions
 
@@ -19,6 +22,24 @@ __version__ = "${VERSION}"
 
 _logger = logger.setup(__name__, level=logging.INFO)
 
+_DEFAULT_CONNECTION_LIMIT = 10
+""" Maximum number of pooled connections held open to a management API by a single async client """
+
+_DEFAULT_KEEPALIVE_TIMEOUT = 60
+""" Seconds an idle pooled connection is kept alive before it is closed """
+
+_DEFAULT_REQUEST_TIMEOUT = 30
+""" Default total timeout, in seconds, for a single management request """
+
+_DEFAULT_RETRIES = 2
+""" Number of times a failed request is retried when it is safe to do so """
+
+_DEFAULT_RETRY_BACKOFF = 0.5
+""" Seconds to wait before the first retry, doubled for every further retry """
+
+_IDEMPOTENT_METHODS = frozenset(['GET', 'PUT', 'DELETE'])
+_RETRY_STATUS = frozenset([502, 503, 504])
+
 
 class MicroserviceManagementClient(object):
     _management_client_conn = None
@@ -390,3 +411,262 @@ class MicroserviceManagementClient(object):
         self._management_client_conn.close()
         response = json.loads(res)
         return response
+
+
+class MicroserviceManagementClientAsync(object):
+    """ Asynchronous counterpart of :class:`MicroserviceManagementClient`
+
+    All requests share one aiohttp session with a bounded, keep-alive connection pool; the session is created on first
+    use and must be released with :meth:`close`. Each method accepts an optional ``timeout`` (in seconds) that overrides
+    the client default.
+
+    Requests that fail to connect are retried. Idempotent requests (GET, PUT and DELETE) are also retried on timeouts,
+    dropped connections and 502, 503 and 504 responses. Identical GET requests made while one is already in flight
+    share its response.
+    """
+
+    def __init__(self, microservice_management_host, microservice_management_port,
+                 connection_limit=_DEFAULT_CONNECTION_LIMIT, keepalive_timeout=_DEFAULT_KEEPALIVE_TIMEOUT,
+                 timeout=_DEFAULT_REQUEST_TIMEOUT, retries=_DEFAULT_RETRIES, retry_backoff=_DEFAULT_RETRY_BACKOFF):
+        """
+        :param connection_limit: maximum number of simultaneous connections to the management API
+        :param keepalive_timeout: seconds an idle connection is kept in the pool
+        :param timeout: default total timeout in seconds for a request, None for no timeout
+        :param retries: number of retries of a failed request
+        :param retry_backoff: seconds to wait before the first retry
+        """
+        self.hostname = microservice_management_host
+        self.port = microservice_management_port
+        self._base_url = 'http://{}:{}'.format(microservice_management_host, microservice_management_port)
+        self._session = None
+        self._connection_limit = connection_limit
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._retries = retries
+        self._retry_backoff = retry_backoff
+        self._in_flight = {}
+        self._counters = {"requests": 0, "retries": 0, "coalesced": 0}
+
+    def _get_session(self):
+        """ Return the shared client session, creating it and its connection pool on first use """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._connection_limit, keepalive_timeout=self._keepalive_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout)
+        return self._session
+
+    def _request_timeout(self, timeout):
+        """ Per call timeout; falls back to the client default when not given """
+        return self._timeout if timeout is None else aiohttp.ClientTimeout(total=timeout)
+
+    @property
+    def stats(self):
+        """ Number of requests sent, retries and GET requests served by a request already in flight """
+        return dict(self._counters)
+
+    async def close(self):
+        """ Close the shared session and every pooled connection """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(self, method, url, data=None, timeout=None):
+        """ Send a request, retrying it when safe, and return the body of the response
+
+        :raises MicroserviceManagementClientError: the response status is 4xx or 5xx
+        """
+        attempt = 0
+        while True:
+            try:
+                self._counters["requests"] += 1
+                async with self._get_session().request(method, self._base_url + url, data=data,
+                                                       timeout=self._request_timeout(timeout)) as resp:
+                    status = resp.status
+                    reason = resp.reason
+                    res = await resp.text()
+                if status not in _RETRY_STATUS or method not in _IDEMPOTENT_METHODS or attempt >= self._retries:
+                    break
+                _logger.warning("%s %s, server error code: %d, Reason: %s, retrying", method, url, status, reason)
+            except aiohttp.ClientConnectorError as ex:
+                # Nothing was sent, any request can be retried
+                if attempt >= self._retries:
+                    raise
+                _logger.warning("%s %s, %s, retrying", method, url, str(ex))
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as ex:
+                if method not in _IDEMPOTENT_METHODS or attempt >= self._retries:
+                    raise
+                _logger.warning("%s %s, %s, retrying", method, url, str(ex) or type(ex).__name__)
+            await asyncio.sleep(self._retry_backoff * (2 ** attempt))
+            attempt += 1
+            self._counters["retries"] += 1
+
+        if status in range(400, 500):
+            _logger.error("Client error code: %d, Reason: %s", status, reason)
+            raise client_exceptions.MicroserviceManagementClientError(status=status, reason=reason)
+        if status in range(500, 600):
+            _logger.error("Server error code: %d, Reason: %s", status, reason)
+            raise client_exceptions.MicroserviceManagementClientError(status=status, reason=reason)
+        return res
+
+    async def _get(self, url, timeout=None):
+        """ GET url, sharing the response of an identical request already in flight """
+        task = self._in_flight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._request('GET', url, timeout=timeout))
+            self._in_flight[url] = task
+            task.add_done_callback(lambda t: self._get_done(url, t))
+        else:
+            self._counters["coalesced"] += 1
+        # Every caller decodes its own copy, so that a caller can not alter the response of another
+        return json.loads(await asyncio.shield(task))
+
+    def _get_done(self, url, task):
+        if self._in_flight.get(url) is task:
+            del self._in_flight[url]
+        if not task.cancelled():
+            # Mark the exception as retrieved, the callers that are still waiting get it
+            task.exception()
+
+    @staticmethod
+    def _check_response(response, key, message):
+        try:
+            response[key]
+        except (KeyError, Exception) as ex:
+            _logger.exception(ex, message)
+            raise
+
+    async def register_service(self, service_registration_payload, timeout=None):
+        """ Registers a newly created microservice with the core service
+
+        :param service_registration_payload: A dict object describing the microservice and giving details of the
+        management interface for that microservice
+        :return: a JSON object containing the UUID of the newly registered service
+        """
+        response = json.loads(await self._request('POST', '/fledge/service',
+                                                  data=json.dumps(service_registration_payload), timeout=timeout))
+        self._check_response(response, "id", "Could not register the microservice, From request {}".format(
+            json.dumps(service_registration_payload)))
+        return response
+
+    async def unregister_service(self, microservice_id, timeout=None):
+        """ Removes the registration record for a microservice
+
+        :param microservice_id: string UUID of microservice
+        :return: a JSON object containing the UUID of the unregistered service
+        """
+        response = json.loads(await self._request('DELETE', '/fledge/service/{}'.format(microservice_id),
+                                                  timeout=timeout))
+        self._check_response(response, "id",
+                             "Could not unregister the microservice having UUID {}".format(microservice_id))
+        return response
+
+    async def register_interest(self, category, microservice_id, timeout=None):
+        """ Register an interest of microservice in a configuration category
+
+        :param category: configuration category
+        :param microservice_id: microservice's UUID string
+        :return: A JSON object containing a registration ID for this registration
+        """
+        payload = json.dumps({"category": category, "service": microservice_id}, sort_keys=True)
+        response = json.loads(await self._request('POST', '/fledge/interest', data=payload, timeout=timeout))
+        self._check_response(response, "id", "Could not register interest, for request payload {}".format(payload))
+        return response
+
+    async def unregister_interest(self, registered_interest_id, timeout=None):
+        """ Remove a previously registered interest in a configuration category
+
+        :param registered_interest_id: registered interest id for a configuration category
+        :return: A JSON object containing the unregistered interest id
+        """
+        response = json.loads(await self._request('DELETE', '/fledge/interest/{}'.format(registered_interest_id),
+                                                  timeout=timeout))
+        self._check_response(response, "id", "Could not unregister interest for {}".format(registered_interest_id))
+        return response
+
+    async def get_services(self, service_name=None, service_type=None, timeout=None):
+        """ Retrieve the details of one or more services that are registered
+
+        :param service_name: filter the returned services by name
+        :param service_type: filter the returned services by type
+        :return: list of registered microservices, all or based on filter(s) applied
+        """
+        url = '/fledge/service'
+        delimeter = '?'
+        if service_name:
+            url = '{}{}name={}'.format(url, delimeter, urllib.parse.quote(service_name))
+            delimeter = '&'
+        if service_type:
+            url = '{}{}type={}'.format(url, delimeter, service_type)
+
+        response = await self._get(url, timeout=timeout)
+        self._check_response(response, "services", "Could not find the microservice for requested url {}".format(url))
+        return response
+
+    async def get_configuration_category(self, category_name=None, timeout=None):
+        url = '/fledge/service/category'
+        if category_name:
+            url = "{}/{}".format(url, urllib.parse.quote(category_name))
+        return await self._get(url, timeout=timeout)
+
+    async def get_configuration_item(self, category_name, config_item, timeout=None):
+        url = "/fledge/service/category/{}/{}".format(urllib.parse.quote(category_name),
+                                                      urllib.parse.quote(config_item))
+        return await self._get(url, timeout=timeout)
+
+    async def create_configuration_category(self, category_data, timeout=None):
+        """
+
+        :param category_data: e.g. '{"key": "TEST", "description": "description", "value": {"info": {"description": "Test", "type": "boolean", "default": "true"}}}'
+        :return:
+        """
+        data = json.loads(category_data)
+        if 'keep_original_items' in data:
+            keep_original_item = 'true' if data['keep_original_items'] is True else 'false'
+            url = '/fledge/service/category?keep_original_items={}'.format(keep_original_item)
+            del data['keep_original_items']
+        else:
+            url = '/fledge/service/category'
+        return json.loads(await self._request('POST', url, data=json.dumps(data), timeout=timeout))
+
+    async def create_child_category(self, parent, children, timeout=None):
+        url = '/fledge/service/category/{}/children'.format(urllib.parse.quote(parent))
+        return json.loads(await self._request('POST', url, data=json.dumps({"children": children}), timeout=timeout))
+
+    async def update_configuration_item(self, category_name, config_item, category_data, timeout=None):
+        """
+
+        :param category_data: e.g. '{"value": "true"}'
+        """
+        url = "/fledge/service/category/{}/{}".format(urllib.parse.quote(category_name),
+                                                      urllib.parse.quote(config_item))
+        return json.loads(await self._request('PUT', url, data=category_data, timeout=timeout))
+
+    async def delete_configuration_item(self, category_name, config_item, timeout=None):
+        url = "/fledge/service/category/{}/{}/value".format(urllib.parse.quote(category_name),
+                                                            urllib.parse.quote(config_item))
+        return json.loads(await self._request('DELETE', url, timeout=timeout))
+
+    async def ping_service(self, timeout=None):
+        return await self._get('/fledge/service/ping', timeout=timeout)
+
+    async def update_service_for_acl_change_security(self, acl, reason, timeout=None):
+        assert reason in ["attachACL", "detachACL", "reloadACL", "updateACL"]
+        payload = {
+            "reason": reason,
+            "argument": acl
+        }
+        response = json.loads(await self._request('PUT', '/fledge/security', data=json.dumps(payload),
+                                                  timeout=timeout))
+        _logger.debug("The response is {}".format(response))
+        return response
+
+    async def get_asset_tracker_events(self, timeout=None):
+        return await self._get('/fledge/track', timeout=timeout)
+
+    async def create_asset_tracker_event(self, asset_event, timeout=None):
+        """
+
+        :param asset_event
+               e.g. {"asset": "AirIntake", "event": "Ingest", "service": "PT100_In1", "plugin": "PT100"}
+        :return:
+        """
+        return json.loads(await self._request('POST', '/fledge/track', data=json.dumps(asset_event), timeout=timeout))
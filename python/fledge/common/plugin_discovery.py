@@ -6,7 +6,14 @@
 
 """Common Plugin Discovery Class"""
 
+import copy
+import hashlib
+import json
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from fledge.common.logger import FLCoreLogger
 from fledge.plugins.common import utils as common_utils
 from fledge.services.core.api import utils
@@ -20,13 +27,52 @@ __version__ = "${VERSION}"
 
 _logger = FLCoreLogger().get_logger(__name__)
 
+PLUGIN_TYPES = (('north', 'north'), ('south', 'south'), ('filter', 'filter'), ('notify', 'notificationDelivery'),
+                ('rule', 'notificationRule'))
+""" Plugin types and the name of their installation directory, in the order plugins are listed """
+
+_MAX_WORKERS = 8
+""" Maximum number of plugins whose information is loaded at once """
+
+_INDEX_VERSION = 1
+""" Version of the layout of the discovery index file """
+
 
 class PluginDiscovery(object):
     def __init__(self):
         pass
 
+    _cache = None
+    """ PluginDiscoveryCache of the core, None when the plugins are discovered on each call """
+
+    @classmethod
+    def enable_cache(cls, index_file=None):
+        """ Caches the plugins discovered from now on, loading the index saved by a previous run if any """
+        cache = PluginDiscoveryCache(cls, index_file)
+        cache.load()
+        cls._cache = cache
+
+    @classmethod
+    def disable_cache(cls):
+        if cls._cache is not None:
+            cls._cache.save()
+            cls._cache = None
+
+    @classmethod
+    def refresh(cls, plugin_type=None, is_config=False):
+        """ Discovers the installed plugins again, regardless of the cache, and returns them """
+        if cls._cache is not None:
+            cls._cache.clear(plugin_type)
+        return cls.get_plugins_installed(plugin_type, is_config)
+
+    @classmethod
+    def cache_metrics(cls):
+        return cls._cache.metrics() if cls._cache is not None else None
+
     @classmethod
     def get_plugins_installed(cls, plugin_type=None, is_config=False):
+        if cls._cache is not None:
+            return cls._cache.get_plugins_installed(plugin_type, is_config)
         if plugin_type is None:
             plugins_list = []
             plugins_list_north = cls.fetch_plugins_installed(plugin_type="north", installed_dir_name="north",
@@ -129,45 +175,52 @@ class PluginDiscovery(object):
         libs = utils.find_c_plugin_libs(installed_dir_name)
         configs = []
         for name, _type in libs:
-            try:
-                if _type == 'binary':
-                    jdoc = utils.get_plugin_info(name, dir=installed_dir_name)
-                    if jdoc:
-                        if 'flag' in jdoc:
-                            if common_utils.bit_at_given_position_set_or_unset(jdoc['flag'],
-                                                                               common_utils.DEPRECATED_BIT_POSITION):
-                                raise DeprecationWarning
-
-                        pkg_name = ''
-                        # Only OMF is an inbuilt plugin
-                        if name.lower() != 'omf':
-                            pkg_name = 'fledge-{}-{}'.format(plugin_type, name.lower().replace("_", "-"))
-
-                        plugin_config = {'name': name,
-                                         'type': plugin_type,
-                                         'description': jdoc['config']['plugin']['description'],
-                                         'version': jdoc['version'],
-                                         'installedDirectory': '{}/{}'.format(installed_dir_name, name),
-                                         'packageName': get_package_name(
-                                             "fledge-{}-".format(plugin_type),
-                                             "{}/plugins/{}/{}/.Package".format(utils._FLEDGE_ROOT, installed_dir_name, name),
-                                             pkg_name)
-                                         }
-                        if is_config:
-                            plugin_config.update({'config': jdoc['config']})
-                        configs.append(plugin_config)
-                else:
-                    # for c-hybrid plugin
-                    hybrid_plugin_config = common.load_and_fetch_c_hybrid_plugin_info(name, is_config)
-                    if hybrid_plugin_config:
-                        configs.append(hybrid_plugin_config)
-            except DeprecationWarning:
-                _logger.warning('"{}" plugin is deprecated'.format(name))
-            except Exception as ex:
-                _logger.exception(ex)
-
+            plugin_config = cls.get_c_plugin_config(name, _type, plugin_type, installed_dir_name, is_config)
+            if plugin_config is not None:
+                configs.append(plugin_config)
         return configs
 
+    @classmethod
+    def get_c_plugin_config(cls, name, _type, plugin_type, installed_dir_name, is_config):
+        plugin_config = None
+        try:
+            if _type == 'binary':
+                jdoc = utils.get_plugin_info(name, dir=installed_dir_name)
+                if jdoc:
+                    if 'flag' in jdoc:
+                        if common_utils.bit_at_given_position_set_or_unset(jdoc['flag'],
+                                                                           common_utils.DEPRECATED_BIT_POSITION):
+                            raise DeprecationWarning
+
+                    pkg_name = ''
+                    # Only OMF is an inbuilt plugin
+                    if name.lower() != 'omf':
+                        pkg_name = 'fledge-{}-{}'.format(plugin_type, name.lower().replace("_", "-"))
+
+                    plugin_config = {'name': name,
+                                     'type': plugin_type,
+                                     'description': jdoc['config']['plugin']['description'],
+                                     'version': jdoc['version'],
+                                     'installedDirectory': '{}/{}'.format(installed_dir_name, name),
+                                     'packageName': get_package_name(
+                                         "fledge-{}-".format(plugin_type),
+                                         "{}/plugins/{}/{}/.Package".format(utils._FLEDGE_ROOT, installed_dir_name, name),
+                                         pkg_name)
+                                     }
+                    if is_config:
+                        plugin_config.update({'config': jdoc['config']})
+            else:
+                # for c-hybrid plugin
+                hybrid_plugin_config = common.load_and_fetch_c_hybrid_plugin_info(name, is_config)
+                if hybrid_plugin_config:
+                    plugin_config = hybrid_plugin_config
+        except DeprecationWarning:
+            _logger.warning('"{}" plugin is deprecated'.format(name))
+        except Exception as ex:
+            _logger.exception(ex)
+
+        return plugin_config
+
     @classmethod
     def get_plugin_config(cls, plugin_dir, plugin_type, installed_dir_name, is_config):
         plugin_module_path = plugin_dir
@@ -229,3 +282,154 @@ def get_package_name(prefix: str, filepath: str, internal_name: str) -> str:
     else:
         # if Package file content is empty then return internal package name Else Package file content
         return internal_name if prefix not in line else line
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _fingerprint(directory):
+    """ Hash of the names, sizes and modification times of the files of a plugin directory, None when it is gone """
+    digest = hashlib.sha1()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_file():
+                    stat = entry.stat()
+                    digest.update('{}:{}:{};'.format(entry.name, stat.st_size, stat.st_mtime_ns).encode())
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class PluginDiscoveryCache(object):
+    """ Installed plugins discovered by PluginDiscovery, validated against the plugin files instead of loading them
+
+    The plugins of a type are listed again only when the modification time of a plugin directory has changed, or
+    when a plugin directory has been added or removed. The information of a plugin is loaded again only when the
+    fingerprint of the files of its directory has changed. Plugins are loaded in a pool of threads, as the
+    information of a C plugin is read by running a process. The information of the plugins is saved to an index file
+    so that the core does not load all the plugins again when it restarts.
+    """
+
+    def __init__(self, discovery, index_file=None, max_workers=_MAX_WORKERS):
+        """
+        Args:
+            discovery: PluginDiscovery class used to load the plugins
+            index_file: path of the file the information of the plugins is saved to, None for no persistence
+            max_workers: maximum number of plugins whose information is loaded at once
+        """
+        self._discovery = discovery
+        self._index_file = index_file
+        self._max_workers = max_workers
+        self._lock = threading.Lock()
+        self._plugins = {}
+        """ List of the fingerprint of the plugin files and the plugin information with its configuration, by key """
+        self._listings = {}
+        """ Tuple of the modification times of the plugin directories and the plugins listed, by plugin type """
+        self._stats = {"hits": 0, "misses": 0, "loads": 0}
+
+    def get_plugins_installed(self, plugin_type=None, is_config=False):
+        """ Same as PluginDiscovery.get_plugins_installed """
+        plugin_types = [_type for _type, _ in PLUGIN_TYPES] if plugin_type is None else [plugin_type]
+        plugins = []
+        for _type in plugin_types:
+            plugins.extend(self._listing(_type))
+        if is_config:
+            return copy.deepcopy(plugins)
+        return [{k: v for k, v in plugin.items() if k != 'config'} for plugin in plugins]
+
+    def clear(self, plugin_type=None):
+        """ Forgets the plugins of a type, or all the plugins when None, so that they are loaded again """
+        with self._lock:
+            if plugin_type is None:
+                self._plugins.clear()
+                self._listings.clear()
+                return
+            prefixes = tuple('{}:{}:'.format(kind, dict(PLUGIN_TYPES).get(plugin_type, plugin_type))
+                             for kind in ('python', 'c'))
+            self._plugins = {key: value for key, value in self._plugins.items() if not key.startswith(prefixes)}
+            self._listings.pop(plugin_type, None)
+
+    def load(self):
+        """ Loads the information of the plugins saved by a previous run, if any """
+        if self._index_file is None:
+            return
+        try:
+            with open(self._index_file) as f:
+                index = json.load(f)
+            if index['version'] != _INDEX_VERSION:
+                raise ValueError("index version {} is not supported".format(index['version']))
+            plugins = index['plugins']
+        except (OSError, ValueError, KeyError) as ex:
+            _logger.debug("No plugin discovery index loaded. %s", str(ex))
+            return
+        with self._lock:
+            self._plugins = {key: list(value) for key, value in plugins.items()}
+
+    def save(self):
+        """ Saves the information of the plugins to the index file """
+        if self._index_file is None:
+            return
+        with self._lock:
+            index = {"version": _INDEX_VERSION,
+                     "plugins": {key: value for key, value in self._plugins.items() if value[0] is not None}}
+            try:
+                os.makedirs(os.path.dirname(self._index_file), exist_ok=True)
+                with open(self._index_file + '.tmp', 'w') as f:
+                    json.dump(index, f)
+                os.replace(self._index_file + '.tmp', self._index_file)
+            except (OSError, TypeError, ValueError) as ex:
+                _logger.warning("Failed to save the plugin discovery index. %s", str(ex))
+
+    def metrics(self):
+        with self._lock:
+            return dict(self._stats, plugins=len(self._plugins), types=len(self._listings))
+
+    def _listing(self, plugin_type):
+        installed_dir_name = dict(PLUGIN_TYPES).get(plugin_type, plugin_type)
+        # Tuples of the key, the directory and the name and library type of C plugins
+        units = [('python:{}:{}'.format(installed_dir_name, d), d, None)
+                 for d in self._discovery.get_plugin_folders(installed_dir_name) or []]
+        units.extend(('c:{}:{}:{}/{}'.format(installed_dir_name, _type, path, name), path, (name, _type))
+                     for name, _type, path in utils.find_c_plugin_files(installed_dir_name))
+        signature = [(directory, _mtime(directory)) for _, directory, _ in units]
+        with self._lock:
+            listing = self._listings.get(plugin_type)
+            if listing is not None and listing[0] == signature:
+                self._stats["hits"] += 1
+                return listing[1]
+            self._stats["misses"] += 1
+            fingerprints = {key: _fingerprint(directory) for key, directory, _ in units}
+            stale = [unit for unit in units if fingerprints[unit[0]] is None or
+                     self._plugins.get(unit[0], [None])[0] != fingerprints[unit[0]]]
+
+        loaded = []
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(self._max_workers, len(stale))) as executor:
+                loaded = list(executor.map(lambda unit: self._load(plugin_type, installed_dir_name, unit), stale))
+
+        with self._lock:
+            for (key, _, _), plugin in zip(stale, loaded):
+                self._plugins[key] = [fingerprints[key], plugin]
+            self._stats["loads"] += len(stale)
+            plugins = [self._plugins[key][1] for key, _, _ in units
+                       if key in self._plugins and self._plugins[key][1] is not None]
+            if all(fingerprints.values()):
+                self._listings[plugin_type] = (signature, plugins)
+        if stale:
+            self.save()
+        return plugins
+
+    def _load(self, plugin_type, installed_dir_name, unit):
+        _, directory, c_plugin = unit
+        if c_plugin is None:
+            # The plugin files have changed, or a refresh was asked for, hence the module is imported again
+            name = directory.split('/')[-1]
+            sys.modules.pop("fledge.plugins.{}.{}.{}".format(installed_dir_name, name, name), None)
+            return self._discovery.get_plugin_config(directory, plugin_type, installed_dir_name, True)
+        name, _type = c_plugin
+        return self._discovery.get_c_plugin_config(name, _type, plugin_type, installed_dir_name, True)
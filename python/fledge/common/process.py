@@ -110,6 +110,12 @@ class FledgeProcess(ABC):
                                                                   self._core_management_port)
         self._storage_async = StorageClientAsync(self._core_management_host, self._core_management_port)
 
+    async def close_storage_clients(self):
+        """ Release the pooled connections held by the storage clients of this process """
+        for client in (self._readings_storage_async, self._storage_async):
+            if client is not None:
+                await client.close()
+
     # pure virtual method run() to be implemented by child class
     @abstractmethod
     def run(self):
@@ -4,6 +4,7 @@
 # See: http://fledge-iot.readthedocs.io/
 # FLEDGE_END
 
+import asyncio
 import json
 from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.payload_builder import PayloadBuilder
@@ -18,12 +19,35 @@ __version__ = "${VERSION}"
 _logger = FLCoreLogger().get_logger(__name__)
 
 
+_DEFAULT_FLUSH_INTERVAL = 5
+""" Seconds between two flushes of the statistics accumulator """
+
+_DEFAULT_FLUSH_THRESHOLD = 1000
+""" Number of pending increments that triggers a flush of the statistics accumulator before the interval """
+
+_accumulator = None
+""" Statistics accumulator shared by the components of the process """
+
+
 async def create_statistics(storage=None):
     stat = Statistics(storage)
     await stat._init()
     return stat
 
 
+async def create_statistics_accumulator(storage=None, flush_interval=_DEFAULT_FLUSH_INTERVAL,
+                                        flush_threshold=_DEFAULT_FLUSH_THRESHOLD):
+    """ Returns the statistics accumulator of the process, creating it on first call
+
+    The flush_interval and flush_threshold only apply to the call that creates the accumulator.
+    """
+    global _accumulator
+    if _accumulator is None:
+        stat = await create_statistics(storage)
+        _accumulator = StatisticsAccumulator(stat, flush_interval, flush_threshold)
+    return _accumulator
+
+
 class Statistics(object):
     """ Statistics interface of the API to gather the available statistics counters,
         calculate the deltas from the previous run of the process and write the deltas
@@ -146,6 +170,34 @@ class Statistics(object):
                 _logger.exception(ex, 'Unable to create new statistic {} key.'.format(key))
                 raise
 
+    async def register_bulk(self, descriptions):
+        """ Registers the keys that are not in the statistics table yet with a single insert
+
+        Args:
+            descriptions: dict of statistics keys and their descriptions
+
+        Returns:
+            None
+        """
+        if not self._registered_keys:
+            await self._load_keys()
+        new_keys = {k: v for k, v in descriptions.items() if k not in self._registered_keys}
+        if not new_keys:
+            return
+        try:
+            payload = {"inserts": [json.loads(PayloadBuilder().INSERT(key=k, description=v, value=0,
+                                                                      previous_value=0).payload())
+                                   for k, v in new_keys.items()]}
+            await self._storage.insert_into_tbl("statistics", json.dumps(payload, sort_keys=False))
+            self._registered_keys.extend(new_keys)
+        except Exception as ex:
+            """ The error may be because some keys have been created in another process, reload keys """
+            await self._load_keys()
+            missing = [k for k in new_keys if k not in self._registered_keys]
+            if missing:
+                _logger.exception(ex, 'Unable to create new statistics keys {}.'.format(missing))
+                raise
+
     async def _load_keys(self):
         self._registered_keys = []
         try:
@@ -155,3 +207,107 @@ class Statistics(object):
                 self._registered_keys.append(row['key'])
         except Exception as ex:
             _logger.exception(ex, 'Failed to retrieve statistics keys')
+
+
+class StatisticsAccumulator(object):
+    """ Counts statistics increments in memory and writes them to storage in bulk
+
+    Increments are added up per key and written with a single update of the statistics table every flush_interval
+    seconds, or as soon as flush_threshold increments are pending. The keys that are not in the statistics table yet
+    are registered with a single insert before the update. When storage fails the counts are kept and written by the
+    next flush, so that no count is lost.
+    """
+
+    def __init__(self, stats, flush_interval=_DEFAULT_FLUSH_INTERVAL, flush_threshold=_DEFAULT_FLUSH_THRESHOLD):
+        self._stats = stats
+        self._flush_interval = flush_interval
+        self._flush_threshold = flush_threshold
+        self._counts = {}
+        """ Value increments not written yet, by key """
+        self._descriptions = {}
+        """ Descriptions of the keys to register before the next update """
+        self._increments = 0
+        """ Number of increments since the last flush """
+        self._flushes = 0
+        self._failures = 0
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    @property
+    def pending(self):
+        """ Number of keys having counts not written yet """
+        return len(self._counts)
+
+    def increment(self, key, value_increment=1, description=None):
+        """ Adds value_increment to the count of key
+
+        Args:
+            key: statistics key
+            value_increment: amount to increment the value by
+            description: description used to register the key when it is not in the statistics table yet
+        """
+        if value_increment == 0:
+            return
+        self._counts[key] = self._counts.get(key, 0) + value_increment
+        if description is not None and key not in self._descriptions:
+            self._descriptions[key] = description
+        self._increments += 1
+        if self._increments >= self._flush_threshold:
+            self._wakeup.set()
+
+    def start(self):
+        """ Starts to flush the counts in the background """
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._flush_forever())
+
+    async def stop(self):
+        """ Stops the background flush and writes the pending counts """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self):
+        """ Registers the new keys and writes the pending counts
+
+        Returns:
+            True when the pending counts have been written, False when they are kept for the next flush
+        """
+        async with self._lock:
+            self._wakeup.clear()
+            self._increments = 0
+            if not self._counts:
+                return True
+            counts, self._counts = self._counts, {}
+            descriptions, self._descriptions = self._descriptions, {}
+            try:
+                if descriptions:
+                    await self._stats.register_bulk(descriptions)
+                await self._stats.update_bulk(counts)
+            except Exception as ex:
+                for key, value in counts.items():
+                    self._counts[key] = self._counts.get(key, 0) + value
+                for key, description in descriptions.items():
+                    self._descriptions.setdefault(key, description)
+                self._failures += 1
+                _logger.warning('Unable to write statistics, %s keys kept for the next flush. %s',
+                                len(self._counts), str(ex))
+                return False
+            self._flushes += 1
+            return True
+
+    def metrics(self):
+        return {"pending": len(self._counts), "flushes": self._flushes, "failures": self._failures}
+
+    async def _flush_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
@@ -19,7 +19,8 @@ __license__ = "Apache 2.0"
 __version__ = "${VERSION}"
 
 __all__ = ('BadRequest', 'StorageServiceUnavailable', 'InvalidServiceInstance', 'InvalidReadingsPurgeFlagParameters',
-           'PurgeOneOfAgeAssetAndSize', 'PurgeOnlyOneOfAgeAndSize', 'PurgeOneOfAgeAndAsset', 'PurgeOneOfSizeAndAsset', 'StorageServerError')
+           'PurgeOneOfAgeAssetAndSize', 'PurgeOnlyOneOfAgeAndSize', 'PurgeOneOfAgeAndAsset', 'PurgeOneOfSizeAndAsset',
+           'StorageServerError', 'ReadingStreamUnavailable')
 
 
 class StorageClientException(Exception):
@@ -61,6 +62,15 @@ class InvalidServiceInstance(StorageClientException):
         self.message = "Storage client needs a valid *Fledge storage* micro-service instance"
 
 
+class ReadingStreamUnavailable(StorageClientException):
+    """ 503 - Readings stream could not be opened or was closed by the storage service
+    """
+
+    def __init__(self):
+        self.code = 503
+        self.message = "Readings stream to the storage service is unavailable"
+
+
 class InvalidReadingsPurgeFlagParameters(BadRequest):
     """ 400 - Invalid params for Purge request
     """
@@ -74,7 +74,7 @@ class PayloadBuilder(object):
         if isinstance(arg, list):
             if len(arg) == 1 and arg[0] == "all":
                 retval = True
-            elif len(arg) == 2:
+            elif len(arg) == 2 or (len(arg) == 3 and isinstance(arg[2], str)):
                 if arg[0] in ['min', 'max', 'avg', 'sum', 'count']:
                     retval = True
         return retval
@@ -600,8 +600,10 @@ class PayloadBuilder(object):
         """
         Forms a json to return a dict (for a single col) or a list of dicts required in an aggregate clause.
 
-        :param args: Can be a single list or a tuple of lists. The list is given in structure [opr, col].
-                     col can be a str or another list for json col. For json col, the structure is [col, properties].
+        :param args: Can be a single list or a tuple of lists. The list is given in structure [opr, col] or
+                     [opr, col, alias]. col can be a str or another list for json col. For json col, the structure is
+                     [col, properties]. Giving the alias in the list allows several properties of the same json col to
+                     be aggregated with the same operation in a single payload, which ALIAS can not tell apart.
         :return:
         :example:
         PayloadBuilder().AGGREGATE((["min", "values"], ["max", "values"], ["avg", "values"])).ALIAS('aggregate',
@@ -612,6 +614,11 @@ class PayloadBuilder(object):
                            {"operation": "max", "column": "values", "alias": "max_values"},
                            {"operation": "avg", "column": "values", "alias": "avg_values"}]}
 
+        PayloadBuilder().AGGREGATE((["min", ["reading", "x"], "min_x"], ["min", ["reading", "y"], "min_y"])).payload()
+        returns
+            {"aggregate": [{"operation": "min", "json": {"column": "reading", "properties": "x"}, "alias": "min_x"},
+                           {"operation": "min", "json": {"column": "reading", "properties": "y"}, "alias": "min_y"}]}
+
         PayloadBuilder().AGGREGATE(["all"])
         """
 
@@ -628,6 +635,8 @@ class PayloadBuilder(object):
                         aggregate["column"] = arg[1]
                     else:
                         continue
+                if len(arg) == 3:
+                    aggregate["alias"] = arg[2]
                 if 'aggregate' in cls.query_payload:
                     if not isinstance(cls.query_payload['aggregate'], list):
                         cls.query_payload['aggregate'] = [cls.query_payload.get('aggregate')]
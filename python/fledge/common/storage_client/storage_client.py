@@ -13,8 +13,11 @@ __license__ = "Apache 2.0"
 __version__ = "${VERSION}"
 
 import aiohttp
+import asyncio
+import datetime
 import http.client
 import json
+import struct
 import time
 from abc import ABC, abstractmethod
 
@@ -25,6 +28,31 @@ from fledge.common.storage_client.utils import Utils
 
 _LOGGER = logger.setup(__name__)
 
+_DEFAULT_CONNECTION_LIMIT = 20
+""" Maximum number of pooled connections held open to the storage service by a single client """
+
+_DEFAULT_KEEPALIVE_TIMEOUT = 60
+""" Seconds an idle pooled connection is kept alive before it is closed """
+
+_DEFAULT_REQUEST_TIMEOUT = 300
+""" Default total timeout, in seconds, for a single storage request """
+
+_STREAM_ACK_TIMEOUT = 30
+""" Seconds to wait for the storage service to acknowledge a block of readings sent over the readings stream """
+
+# Readings stream protocol, see C/common/include/reading_stream.h
+RDS_CONNECTION_MAGIC = 0x344f4e4e
+RDS_BLOCK_MAGIC = 0x5244424b
+RDS_READING_MAGIC = 0x52444947
+RDS_ACK_MAGIC = 0x4241434b
+RDS_NACK_MAGIC = 0x4e41434b
+
+_RDS_CONNECT_HEADER = struct.Struct('=II')
+_RDS_BLOCK_HEADER = struct.Struct('=III')
+_RDS_READING_HEADER = struct.Struct('=IIII')
+_RDS_TIMEVAL = struct.Struct('@ll')
+_RDS_ACKNOWLEDGE = struct.Struct('=II')
+
 
 class AbstractStorage(ABC):
     """ abstract class for storage client """
@@ -40,6 +68,66 @@ class AbstractStorage(ABC):
     def disconnect(self):
         pass
 
+    def _get_session(self):
+        """ Return the shared client session, creating it and its connection pool on first use """
+        if self._session is None or self._session.closed:
+            if self._socket_path:
+                connector = aiohttp.UnixConnector(path=self._socket_path, limit=self._connection_limit,
+                                                  keepalive_timeout=self._keepalive_timeout)
+            else:
+                connector = aiohttp.TCPConnector(limit=self._connection_limit,
+                                                 keepalive_timeout=self._keepalive_timeout)
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(self._on_request_start)
+            trace_config.on_connection_create_end.append(self._on_connection_create_end)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+            trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+            trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self._timeout,
+                                                  trace_configs=[trace_config])
+        return self._session
+
+    def _request_timeout(self, timeout):
+        """ Per call timeout; falls back to the client default when not given """
+        return self._timeout if timeout is None else aiohttp.ClientTimeout(total=timeout)
+
+    async def _on_request_start(self, session, ctx, params):
+        self._pool_counters["requests"] += 1
+
+    async def _on_connection_create_end(self, session, ctx, params):
+        self._pool_counters["created"] += 1
+
+    async def _on_connection_reuseconn(self, session, ctx, params):
+        self._pool_counters["reused"] += 1
+
+    async def _on_connection_queued_start(self, session, ctx, params):
+        self._pool_counters["waiting"] += 1
+
+    async def _on_connection_queued_end(self, session, ctx, params):
+        self._pool_counters["waiting"] -= 1
+
+    @property
+    def pool_stats(self):
+        """ Connection pool statistics
+
+        :return: dict with the pool limit, connections currently open and in use, requests waiting for a free
+            connection, and the total number of requests, connections created and connections reused
+        """
+        in_use = idle = 0
+        if self._session is not None and not self._session.closed:
+            connector = self._session.connector
+            in_use = len(getattr(connector, '_acquired', ()))
+            idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+        stats = {"limit": self._connection_limit, "open": in_use + idle, "in_use": in_use}
+        stats.update(self._pool_counters)
+        return stats
+
+    async def close(self):
+        """ Close the shared session and every pooled connection """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
     # Allow with context
     def __enter__(self):
         return self.connect()
@@ -49,7 +137,28 @@ class AbstractStorage(ABC):
 
 
 class StorageClientAsync(AbstractStorage):
-    def __init__(self, core_management_host, core_management_port, svc=None):
+    """ Storage service client
+
+    All requests made by a client instance share one aiohttp session with a bounded, keep-alive connection pool.
+    The session is created on first use and must be released with :meth:`close` on shutdown.
+    Each request method accepts an optional ``timeout`` (in seconds) that overrides the client default.
+    """
+
+    def __init__(self, core_management_host, core_management_port, svc=None,
+                 connection_limit=_DEFAULT_CONNECTION_LIMIT, keepalive_timeout=_DEFAULT_KEEPALIVE_TIMEOUT,
+                 timeout=_DEFAULT_REQUEST_TIMEOUT, socket_path=None):
+        """
+        :param connection_limit: maximum number of simultaneous connections to the storage service
+        :param keepalive_timeout: seconds an idle connection is kept in the pool
+        :param timeout: default total timeout in seconds for a request, None for no timeout
+        :param socket_path: optional Unix domain socket path of the storage service; TCP is used when None
+        """
+        self._session = None
+        self._connection_limit = connection_limit
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._socket_path = socket_path
+        self._pool_counters = {"created": 0, "reused": 0, "waiting": 0, "requests": 0}
         try:
             if svc:
                 self.service = svc
@@ -122,7 +231,7 @@ class StorageClientAsync(AbstractStorage):
 
     # FIXME: As per JIRA-615 strict=false at python side (interim solution)
     # fix is required at storage layer (error message with escape sequence using a single quote)
-    async def insert_into_tbl(self, tbl_name, data):
+    async def insert_into_tbl(self, tbl_name, data, timeout=None):
         """ insert json payload into given table
 
         :param tbl_name:
@@ -150,18 +259,18 @@ class StorageClientAsync(AbstractStorage):
 
         post_url = '/storage/table/{tbl_name}'.format(tbl_name=tbl_name)
         url = 'http://' + self.base_url + post_url
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=data) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("POST %s, with payload: %s", post_url, data)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.post(url, data=data, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("POST %s, with payload: %s", post_url, data)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
-    async def update_tbl(self, tbl_name, data):
+    async def update_tbl(self, tbl_name, data, timeout=None):
         """ update json payload for specified condition into given table
 
         :param tbl_name:
@@ -194,18 +303,18 @@ class StorageClientAsync(AbstractStorage):
         put_url = '/storage/table/{tbl_name}'.format(tbl_name=tbl_name)
 
         url = 'http://' + self.base_url + put_url
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, data=data) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("PUT %s, with payload: %s", put_url, data)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.put(url, data=data, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("PUT %s, with payload: %s", put_url, data)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
-    async def delete_from_tbl(self, tbl_name, condition=None):
+    async def delete_from_tbl(self, tbl_name, condition=None, timeout=None):
         """ Delete for specified condition from given table
 
         :param tbl_name:
@@ -231,18 +340,18 @@ class StorageClientAsync(AbstractStorage):
             raise TypeError("condition payload must be a valid JSON")
 
         url = 'http://' + self.base_url + del_url
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url, data=condition) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("DELETE %s, with payload: %s", del_url, condition if condition else '')
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.delete(url, data=condition, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("DELETE %s, with payload: %s", del_url, condition if condition else '')
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
-    async def query_tbl(self, tbl_name, query=None):
+    async def query_tbl(self, tbl_name, query=None, timeout=None):
         """ Simple SELECT query for the specified table with optional query params
 
         :param tbl_name:
@@ -262,18 +371,18 @@ class StorageClientAsync(AbstractStorage):
             get_url += '?{}'.format(query)
 
         url = 'http://' + self.base_url + get_url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("GET %s", get_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.get(url, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("GET %s", get_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
-    async def query_tbl_with_payload(self, tbl_name, query_payload):
+    async def query_tbl_with_payload(self, tbl_name, query_payload, timeout=None):
         """ Complex SELECT query for the specified table with a payload
 
         :param tbl_name:
@@ -302,18 +411,18 @@ class StorageClientAsync(AbstractStorage):
 
         url = 'http://' + self.base_url + put_url
 
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, data=query_payload) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("PUT %s, with query payload: %s", put_url, query_payload)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.put(url, data=query_payload, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.info("PUT %s, with query payload: %s", put_url, query_payload)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
-    async def post_snapshot(self, tbl_name):
+    async def post_snapshot(self, tbl_name, timeout=None):
         """Create a table snapshot
 
         :param tbl_name:
@@ -326,17 +435,17 @@ class StorageClientAsync(AbstractStorage):
         data = {"id": str(int(time.time()))}
 
         url = 'http://' + self.base_url + post_url
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=json.dumps(data)) as resp:
-                status_code = resp.status
-                jdoc = await resp.text()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("POST %s", post_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.post(url, data=json.dumps(data), timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.text()
+            if status_code not in range(200, 209):
+                _LOGGER.info("POST %s", post_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
         return json.loads(jdoc)
 
-    async def put_snapshot(self, tbl_name, snapshot_id):
+    async def put_snapshot(self, tbl_name, snapshot_id, timeout=None):
         """Restore a table snapshot
 
         :param tbl_name:
@@ -349,17 +458,17 @@ class StorageClientAsync(AbstractStorage):
         put_url = '/storage/table/{tbl_name}/snapshot/{id}'.format(tbl_name=tbl_name, id=snapshot_id)
 
         url = 'http://' + self.base_url + put_url
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.text()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("PUT %s", put_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.put(url, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.text()
+            if status_code not in range(200, 209):
+                _LOGGER.info("PUT %s", put_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
         return json.loads(jdoc)
 
-    async def delete_snapshot(self, tbl_name, snapshot_id):
+    async def delete_snapshot(self, tbl_name, snapshot_id, timeout=None):
         """Delete a table snapshot
 
         :param tbl_name:
@@ -372,17 +481,17 @@ class StorageClientAsync(AbstractStorage):
         delete_url = '/storage/table/{tbl_name}/snapshot/{id}'.format(tbl_name=tbl_name, id=snapshot_id)
 
         url = 'http://' + self.base_url + delete_url
-        async with aiohttp.ClientSession() as session:
-            async with session.delete(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.text()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("DELETE %s", delete_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.delete(url, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.text()
+            if status_code not in range(200, 209):
+                _LOGGER.info("DELETE %s", delete_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
         return json.loads(jdoc)
 
-    async def get_snapshot(self, tbl_name):
+    async def get_snapshot(self, tbl_name, timeout=None):
         """Get a table snapshot
 
         :param tbl_name:
@@ -394,14 +503,14 @@ class StorageClientAsync(AbstractStorage):
         get_url = '/storage/table/{tbl_name}/snapshot'.format(tbl_name=tbl_name)
 
         url = 'http://' + self.base_url + get_url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.text()
-                if status_code not in range(200, 209):
-                    _LOGGER.info("GET %s", get_url)
-                    _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.get(url, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.text()
+            if status_code not in range(200, 209):
+                _LOGGER.info("GET %s", get_url)
+                _LOGGER.error("Error code: %d, reason: %s, details: %s", resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
         return json.loads(jdoc)
 
 
@@ -409,11 +518,152 @@ class ReadingsStorageClientAsync(StorageClientAsync):
     """ Readings table operations """
     _base_url = ""
 
-    def __init__(self, core_mgt_host, core_mgt_port, svc=None):
-        super().__init__(core_management_host=core_mgt_host, core_management_port=core_mgt_port, svc=svc)
+    def __init__(self, core_mgt_host, core_mgt_port, svc=None, **kwargs):
+        super().__init__(core_management_host=core_mgt_host, core_management_port=core_mgt_port, svc=svc, **kwargs)
         self.__class__._base_url = self.base_url
+        self._stream_reader = None
+        self._stream_writer = None
+        self._stream_block_number = 0
+        self._stream_lock = asyncio.Lock()
+
+    @property
+    def is_streaming(self):
+        """ True when a readings stream to the storage service is open """
+        return self._stream_writer is not None and not self._stream_writer.is_closing()
+
+    async def open_stream(self):
+        """ Open a binary readings stream to the storage service
 
-    async def append(self, readings):
+        The storage service is asked for a stream port and a single use token, a TCP connection is made to that
+        port and the token is sent as the connection header. Readings are then written with :meth:`append_stream`.
+        The caller holds the stream lock.
+
+        :Example:
+            curl -X POST http://0.0.0.0:8080/storage/reading/stream
+            { "port": 40123, "token": 1804289383 }
+        """
+        url = 'http://' + self._base_url + '/storage/reading/stream'
+        session = self._get_session()
+        async with session.post(url, timeout=self._request_timeout(None)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json(content_type=None)
+            if status_code not in range(200, 209) or 'port' not in jdoc or 'token' not in jdoc:
+                _LOGGER.error("POST url %s, Error code: %d, reason: %s, details: %s", '/storage/reading/stream',
+                              resp.status, resp.reason, jdoc)
+                raise ReadingStreamUnavailable
+
+        try:
+            reader, writer = await asyncio.open_connection(self.service._address, int(jdoc['port']))
+        except OSError as ex:
+            _LOGGER.error("Unable to connect to storage readings stream on port %s, %s", jdoc['port'], str(ex))
+            raise ReadingStreamUnavailable
+        writer.write(_RDS_CONNECT_HEADER.pack(RDS_CONNECTION_MAGIC, int(jdoc['token'])))
+        await writer.drain()
+        self._stream_reader = reader
+        self._stream_writer = writer
+        self._stream_block_number = 0
+        _LOGGER.info("Storage readings stream opened on port %s", jdoc['port'])
+
+    async def close_stream(self):
+        """ Close the readings stream, if open """
+        writer = self._stream_writer
+        self._stream_reader = None
+        self._stream_writer = None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def close(self):
+        await self.close_stream()
+        await super().close()
+
+    @staticmethod
+    def _timeval(user_ts):
+        """ Convert a reading timestamp to the (seconds, microseconds) pair of a struct timeval
+
+        Naive timestamps are taken to be UTC.
+        """
+        if not isinstance(user_ts, datetime.datetime):
+            user_ts = datetime.datetime.fromisoformat(str(user_ts))
+        if user_ts.tzinfo is None:
+            user_ts = user_ts.replace(tzinfo=datetime.timezone.utc)
+        seconds = int(user_ts.timestamp())
+        return seconds, user_ts.microsecond
+
+    def _encode_block(self, readings, count):
+        """ Encode the first count readings as one block of the readings stream protocol
+
+        Each reading is sent as a reading header, a binary timeval, the NUL terminated asset code and the NUL
+        terminated JSON of its datapoints. The asset code is elided (sent with a zero length) when it is the
+        same as that of the previous reading in the block.
+        """
+        parts = [_RDS_BLOCK_HEADER.pack(RDS_BLOCK_MAGIC, self._stream_block_number, count)]
+        last_asset = None
+        dumps = json.dumps
+        for reading_no in range(count):
+            reading = readings[reading_no]
+            asset_code = reading['asset_code']
+            payload = dumps(reading['reading']).encode() + b'\0'
+            if asset_code == last_asset:
+                asset = b''
+            else:
+                asset = asset_code.encode() + b'\0'
+                last_asset = asset_code
+            parts.append(_RDS_READING_HEADER.pack(RDS_READING_MAGIC, reading_no, len(asset), len(payload)))
+            parts.append(_RDS_TIMEVAL.pack(*self._timeval(reading['user_ts'])))
+            parts.append(asset)
+            parts.append(payload)
+        return b''.join(parts)
+
+    async def append_stream(self, readings, count=None):
+        """ Append readings over the binary readings stream, opening the stream when needed
+
+        Concurrent callers share one stream and send their blocks in turn. The storage service acknowledges each
+        block once its readings are committed; when a block is refused or not acknowledged its readings may not have
+        been stored and ReadingStreamUnavailable is raised, so that the caller can send them again with :meth:`append`.
+
+        :param readings: list of reading dicts with asset_code, reading and user_ts keys
+        :param count: number of readings, from the start of the list, to send; all readings when None
+        :return: number of readings committed
+        :raises ReadingStreamUnavailable: the stream could not be opened or the block has not been committed
+        """
+        if not readings:
+            raise ValueError("Readings payload is missing")
+
+        count = len(readings) if count is None else count
+        async with self._stream_lock:
+            if not self.is_streaming:
+                await self.open_stream()
+
+            block = self._encode_block(readings, count)
+            block_number = self._stream_block_number
+            self._stream_block_number += 1
+            try:
+                self._stream_writer.write(block)
+                await self._stream_writer.drain()
+                ack = await asyncio.wait_for(self._stream_reader.readexactly(_RDS_ACKNOWLEDGE.size),
+                                             _STREAM_ACK_TIMEOUT)
+            except (OSError, RuntimeError, asyncio.IncompleteReadError, asyncio.TimeoutError) as ex:
+                _LOGGER.error("Readings stream block %d has not been acknowledged, closing the stream. %s",
+                              block_number, str(ex))
+                await self.close_stream()
+                raise ReadingStreamUnavailable
+
+            magic, acknowledged = _RDS_ACKNOWLEDGE.unpack(ack)
+            if acknowledged != block_number:
+                _LOGGER.error("Readings stream acknowledged block %d instead of %d, closing the stream",
+                              acknowledged, block_number)
+                await self.close_stream()
+                raise ReadingStreamUnavailable
+            if magic != RDS_ACK_MAGIC:
+                _LOGGER.error("Readings stream block %d has not been committed by the storage service", block_number)
+                raise ReadingStreamUnavailable
+        return count
+
+    async def append(self, readings, timeout=None):
         """
         :param readings:
         :return:
@@ -445,18 +695,18 @@ class ReadingsStorageClientAsync(StorageClientAsync):
             raise TypeError("Readings payload must be a valid JSON")
 
         url = 'http://' + self._base_url + '/storage/reading'
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, data=readings) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.error("POST url %s with payload: %s, Error code: %d, reason: %s, details: %s",
-                                  '/storage/reading', readings, resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.post(url, data=readings, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.error("POST url %s with payload: %s, Error code: %d, reason: %s, details: %s",
+                              '/storage/reading', readings, resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
-    async def fetch(self, reading_id, count):
+    async def fetch(self, reading_id, count, timeout=None):
         """
 
         :param reading_id: the first reading ID in the block that is retrieved
@@ -480,18 +730,52 @@ class ReadingsStorageClientAsync(StorageClientAsync):
 
         get_url = '/storage/reading?id={}&count={}'.format(reading_id, count)
         url = 'http://' + self._base_url + get_url
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.error("GET url: %s, Error code: %d, reason: %s, details: %s", url, resp.status,
-                                  resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.get(url, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.error("GET url: %s, Error code: %d, reason: %s, details: %s", url, resp.status,
+                              resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
-    async def query(self, query_payload):
+    async def fetch_blocks(self, reading_id, count, timeout=None):
+        """ Asynchronous iterator over consecutive blocks of readings, starting at reading_id
+
+        Each block is fetched only when the previous one has been consumed; the iteration ends at the first
+        empty block.
+
+        :param reading_id: the first reading ID of the first block
+        :param count: the maximum number of readings in a block
+        :return: yields (rows, size) tuples, size is the number of bytes of the JSON document of the block
+        """
+        if reading_id is None:
+            raise ValueError("first reading id to retrieve the readings block is required")
+
+        if count is None:
+            raise ValueError("count is required to retrieve the readings block")
+
+        count = int(count)
+        while True:
+            get_url = '/storage/reading?id={}&count={}'.format(reading_id, count)
+            url = 'http://' + self._base_url + get_url
+            session = self._get_session()
+            async with session.get(url, timeout=self._request_timeout(timeout)) as resp:
+                body = await resp.read()
+                if resp.status not in range(200, 209):
+                    _LOGGER.error("GET url: %s, Error code: %d, reason: %s, details: %s", url, resp.status,
+                                  resp.reason, body.decode())
+                    raise StorageServerError(code=resp.status, reason=resp.reason, error=body.decode())
+
+            rows = json.loads(body.decode()).get('rows', [])
+            if not rows:
+                return
+            yield rows, len(body)
+            reading_id = rows[-1]['id'] + 1
+
+    async def query(self, query_payload, timeout=None):
         """
 
         :param query_payload:
@@ -516,18 +800,18 @@ class ReadingsStorageClientAsync(StorageClientAsync):
             raise TypeError("Query payload must be a valid JSON")
 
         url = 'http://' + self._base_url + '/storage/reading/query'
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, data=query_payload) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.error("PUT url %s with query payload: %s, Error code: %d, reason: %s, details: %s",
-                                  '/storage/reading/query', query_payload, resp.status, resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.put(url, data=query_payload, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.error("PUT url %s with query payload: %s, Error code: %d, reason: %s, details: %s",
+                              '/storage/reading/query', query_payload, resp.status, resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
 
-    async def purge(self, age=None, sent_id=0, size=None, flag=None, asset=None):
+    async def purge(self, age=None, sent_id=0, size=None, flag=None, asset=None, timeout=None):
         """ Purge readings based on the age of the readings
 
         :param age: the maximum age of data to retain, expressed in hours
@@ -584,13 +868,13 @@ class ReadingsStorageClientAsync(StorageClientAsync):
             put_url = '/storage/reading/purge?asset={}'.format(asset)
 
         url = 'http://' + self._base_url + put_url
-        async with aiohttp.ClientSession() as session:
-            async with session.put(url, data=None) as resp:
-                status_code = resp.status
-                jdoc = await resp.json()
-                if status_code not in range(200, 209):
-                    _LOGGER.error("PUT url %s, Error code: %d, reason: %s, details: %s", put_url, resp.status,
-                                  resp.reason, jdoc)
-                    raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
+        session = self._get_session()
+        async with session.put(url, data=None, timeout=self._request_timeout(timeout)) as resp:
+            status_code = resp.status
+            jdoc = await resp.json()
+            if status_code not in range(200, 209):
+                _LOGGER.error("PUT url %s, Error code: %d, reason: %s, details: %s", put_url, resp.status,
+                              resp.reason, jdoc)
+                raise StorageServerError(code=resp.status, reason=resp.reason, error=jdoc)
 
         return jdoc
@@ -12,6 +12,7 @@ import traceback
 from aiohttp import web
 import jwt
 
+from fledge.services.core import token_cache
 from fledge.services.core.user_model import User
 from fledge.common.logger import FLCoreLogger
 
@@ -71,13 +72,20 @@ async def auth_middleware(app, handler):
 
         if token:
             try:
-                # validate the token and get user id
-                uid = await User.Objects.validate_token(token)
-                # extend the token expiry, as token is valid
-                # and no bad token exception raised
-                await User.Objects.refresh_token_expiry(token)
-                # set the user to request object
-                request.user = await User.Objects.get(uid=uid)
+                cache = token_cache.get_token_cache()
+                # a token verified recently is trusted, its expiry is extended with the next refresh of the cache
+                request.user = cache.get(token) if cache is not None else None
+                if request.user is None:
+                    generation = cache.generation if cache is not None else None
+                    # validate the token and get user id
+                    uid = await User.Objects.validate_token(token)
+                    # extend the token expiry, as token is valid
+                    # and no bad token exception raised
+                    await User.Objects.refresh_token_expiry(token)
+                    # set the user to request object
+                    request.user = await User.Objects.get(uid=uid)
+                    if cache is not None:
+                        cache.put(token, request.user, generation)
                 # set the token to request
                 request.token = token
                 # set if user is admin
@@ -136,7 +144,12 @@ def has_permission(permission):
                 raise RuntimeError(msg)
 
             if request.is_auth_optional is False:  # auth is mandatory
-                roles_id = [int(r["id"]) for r in await User.Objects.get_role_id_by_name(permission)]
+                cache = token_cache.get_token_cache()
+                roles_id = cache.get_role_ids(permission) if cache is not None else None
+                if roles_id is None:
+                    roles_id = [int(r["id"]) for r in await User.Objects.get_role_id_by_name(permission)]
+                    if cache is not None:
+                        cache.put_role_ids(permission, roles_id)
                 if int(request.user["role_id"]) not in roles_id:
                     raise web.HTTPForbidden
 
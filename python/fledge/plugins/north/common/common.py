@@ -111,6 +111,183 @@ def evaluate_type(value):
     return evaluated_type
 
 
+def convert_reading_value(value):
+    """Converts a datapoint value of a reading as SendingProcess does, for example "180.2" to float 180.2
+
+    Values that are dictionaries are not converted themselves: the values of their nested dictionaries are converted
+    recursively, the other values they hold are left untouched.
+
+     Args:
+        value : datapoint value to convert, a dictionary is converted in place
+     Returns:
+         value_converted: converted value
+     Raises:
+     """
+
+    if isinstance(value, dict):
+        for nested_value in value.values():
+            if isinstance(nested_value, dict):
+                for k, v in nested_value.items():
+                    nested_value[k] = convert_reading_value(v)
+        return value
+
+    return convert_to_type(value)
+
+
+_MAX_EXACT_INTEGER = 2 ** 53
+""" Integers up to this magnitude are exactly represented as float, evaluate_type sees them as integer """
+
+_MISMATCH = object()
+""" Returned by a typed converter when the value does not have the type of the converter """
+
+
+def _convert_integer(value):
+    if type(value) is int and -_MAX_EXACT_INTEGER <= value <= _MAX_EXACT_INTEGER:
+        return value
+    return _MISMATCH
+
+
+def _convert_number(value):
+    # value - value is 0.0 only for finite values
+    if type(value) is float and value - value == 0.0:
+        return value
+    return _MISMATCH
+
+
+def _convert_integer_string(value):
+    if type(value) is str:
+        try:
+            converted = int(value)
+        except ValueError:
+            return _MISMATCH
+        # The canonical representation only, "+1", "01" or " 1" are evaluated as number
+        if -_MAX_EXACT_INTEGER <= converted <= _MAX_EXACT_INTEGER and str(converted) == value:
+            return converted
+    return _MISMATCH
+
+
+def _convert_number_string(value):
+    # A string holding a '.' or an exponent can not be the representation of an integer
+    if type(value) is str and ('.' in value or 'e' in value or 'E' in value):
+        try:
+            converted = float(value)
+        except ValueError:
+            return _MISMATCH
+        if converted - converted == 0.0:
+            return converted
+    return _MISMATCH
+
+
+def _convert_string(value):
+    if type(value) is str:
+        first = value[:1]
+        # float() accepts a leading letter only for inf, infinity and nan
+        if first.isalpha() and first not in 'iInN':
+            return value
+        try:
+            float(value)
+        except ValueError:
+            return value
+    return _MISMATCH
+
+
+def _convert_dict(value):
+    if type(value) is dict:
+        return convert_reading_value(value)
+    return _MISMATCH
+
+
+def _convert_list(value):
+    if type(value) is list:
+        return value
+    return _MISMATCH
+
+
+_TYPED_CONVERTERS = (_convert_integer, _convert_number, _convert_integer_string, _convert_number_string,
+                     _convert_string, _convert_dict, _convert_list)
+
+
+class ReadingsTypeConverter(object):
+    """Converts the datapoint values of blocks of readings to their proper type, with the same result as
+    convert_reading_value
+
+    The type of every datapoint of an asset is learned from the first reading of the asset and kept in a schema.
+    The values of the following readings are converted by the converter of the learned type, which only checks
+    the type of the value; the type is inferred again, and the schema updated, only when a value does not match it.
+    """
+
+    __slots__ = ['_schemas', '_inferences']
+
+    def __init__(self):
+        self._schemas = {}
+        self._inferences = 0
+
+    @property
+    def inferences(self):
+        """Number of datapoint values whose type had to be inferred"""
+        return self._inferences
+
+    def schema(self, asset_code):
+        """Learned schema of an asset, datapoint name to converter name"""
+        return {name: converter.__name__ if converter is not None else None
+                for name, converter in self._schemas.get(asset_code, {}).items()}
+
+    def _infer(self, schema, name, value):
+        self._inferences += 1
+        for converter in _TYPED_CONVERTERS:
+            converted = converter(value)
+            if converted is not _MISMATCH:
+                schema[name] = converter
+                return converted
+        # Values such as bool, None or non finite numbers are converted one by one
+        schema[name] = None
+        return convert_reading_value(value)
+
+    def convert_reading(self, asset_code, reading):
+        """Converts in place the datapoint values of a reading of an asset
+
+         Args:
+            asset_code : asset code of the reading
+            reading : dictionary of the datapoints of the reading
+         Returns:
+             the reading
+         Raises:
+             The exceptions raised by convert_to_type for values it can not convert
+         """
+
+        schema = self._schemas.get(asset_code)
+        if schema is None:
+            schema = self._schemas[asset_code] = {}
+        for name, value in reading.items():
+            converter = schema.get(name)
+            if converter is not None:
+                converted = converter(value)
+                if converted is _MISMATCH:
+                    converted = self._infer(schema, name, value)
+            else:
+                converted = self._infer(schema, name, value)
+            reading[name] = converted
+        return reading
+
+    def convert_block(self, rows):
+        """Converts in place the readings of a block of rows retrieved from the Storage layer
+
+         Args:
+            rows : list of rows having asset_code and reading
+         Returns:
+             failures: list of (row, exception) tuples of the rows that could not be converted
+         """
+
+        failures = []
+        convert_reading = self.convert_reading
+        for row in rows:
+            try:
+                convert_reading(row['asset_code'], row['reading'])
+            except Exception as ex:
+                failures.append((row, ex))
+        return failures
+
+
 def identify_unique_asset_codes(raw_data):
     """Identify unique asset codes in the data block
 
@@ -472,6 +472,8 @@ async def update_me(request):
                 payload = PayloadBuilder().SET(real_name=real_name.strip()).WHERE(['id', '=', user_id]).payload()
                 message = "Something went wrong."
                 result = await storage_client.update_tbl("users", payload)
+                # the users of the cached tokens are read again
+                User.Objects._invalidate_cached_tokens(user_id=user_id)
                 if result['response'] == 'updated':
                     # TODO: FOGL-1226 At the moment only real name can update
                     message = "Real name has been updated successfully!"
@@ -650,6 +652,8 @@ async def enable_user(request):
                     raise User.DoesNotExist
                 payload = PayloadBuilder().SET(enabled=user_data['enabled']).WHERE(['id', '=', user_id]).payload()
                 result = await storage_client.update_tbl("users", payload)
+                # the users of the cached tokens are read again, a disabled user is then refused
+                User.Objects._invalidate_cached_tokens(user_id=user_id)
                 # Remove ott token for this enabled/disabled user.
                 __remove_ott_for_user(user_id)
                 if result['response'] == 'updated':
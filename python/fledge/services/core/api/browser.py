@@ -36,6 +36,13 @@ Supports a number of REST API:
   Note: seconds, minutes and hours can not be combined in a URL. If they are then only seconds
   will have an effect.
   Note: if datetime units are supplied then limit will not respect i.e mutually exclusive
+
+  The series and bucket APIs are answered from the readings rollups of the core when the requested range
+  can be built from complete rollup buckets of numeric datapoints and ends before the high-water mark of the
+  readings fetched by the rollups in the background, and from the readings otherwise.
+  The asset counts, timespans and structure are answered from the asset catalogue of the core, they lag the
+  readings by the background refresh of the rollups and counts are approximate until the catalogue is
+  reconciled with the readings after a purge.
 """
 import time
 import datetime
@@ -46,6 +53,8 @@ from aiohttp import web
 from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.services.core import connect
+from fledge.services.core.asset_catalogue import get_asset_catalogue
+from fledge.services.core.readings_rollup import get_readings_rollup
 
 _logger = FLCoreLogger().get_logger(__name__)
 
@@ -61,6 +70,14 @@ __DEFAULT_OFFSET = 0
 DATAPOINT_TYPES = ['__DPIMAGE', '__DATABUFFER']
 IMAGE_PLACEHOLDER = "Data removed for brevity"
 
+# Series group formats, with their time format and size in seconds in the readings rollups
+_GROUP_FORMATS = {'YYYY-MM-DD HH24:MI:SS': ('%Y-%m-%d %H:%M:%S', 1),
+                  'YYYY-MM-DD HH24:MI': ('%Y-%m-%d %H:%M', 60),
+                  'YYYY-MM-DD HH24': ('%Y-%m-%d %H', 3600)}
+
+# Aggregate operations of the summary of all the datapoints of an asset, and their name in the response
+_SUMMARY_AGGREGATES = {"min": "min", "max": "max", "avg": "average", "count": "count"}
+
 
 def setup(app):
     """ Add the routes for the API endpoints supported by the data browser """
@@ -91,6 +108,20 @@ def prepare_limit_skip_payload(request, _dict):
     Returns:
         chain payload dict
     """
+    limit, offset = _limit_skip(request)
+    payload = PayloadBuilder(_dict).LIMIT(limit)
+    if offset:
+        payload = PayloadBuilder(_dict).SKIP(offset)
+
+    return payload.chain_payload()
+
+
+def _limit_skip(request):
+    """ limit and skip query params validation
+
+    Returns:
+        tuple of limit and skip
+    """
     limit = __DEFAULT_LIMIT
     if 'limit' in request.query and request.query['limit'] != '':
         try:
@@ -109,11 +140,47 @@ def prepare_limit_skip_payload(request, _dict):
         except ValueError:
             raise web.HTTPBadRequest(reason="Skip/Offset must be a positive integer")
 
-    payload = PayloadBuilder(_dict).LIMIT(limit)
-    if offset:
-        payload = PayloadBuilder(_dict).SKIP(offset)
+    return limit, offset
 
-    return payload.chain_payload()
+
+def _time_window(request, now):
+    """ Range of epoch seconds selected by the seconds, minutes or hours and previous query params
+
+    Returns:
+        tuple of the first second and of the second following the range, None when no time unit is given
+    """
+    for unit, unit_seconds in (('seconds', 1), ('minutes', 60), ('hours', 3600)):
+        if unit in request.query and request.query[unit] != '':
+            val = int(request.query[unit]) * unit_seconds
+            if val == 0:
+                return None
+            previous = int(request.query['previous']) * unit_seconds if 'previous' in request.query else 0
+            return int(now) - val - previous, int(now) - previous + 1
+    return None
+
+
+async def _averages_from_rollup(request, asset_code, reading, ts_restraint):
+    """ Series of averages of a datapoint built from the readings rollups, None when it has to be queried """
+    rollup = get_readings_rollup()
+    if rollup is None or not rollup.is_numeric(asset_code, reading):
+        return None
+    time_format, size = _GROUP_FORMATS[ts_restraint]
+    now = time.time()
+    offset = time.localtime(now).tm_gmtoff
+    window = _time_window(request, now)
+    if window is None:
+        limit, skip = _limit_skip(request)
+        groups = rollup.latest(asset_code, reading, size, skip + limit, now, offset)
+        if groups is None:
+            return None
+        groups = groups[skip:]
+    else:
+        groups = rollup.aggregate(asset_code, window[0], window[1], size, offset)
+        if groups is None:
+            return None
+        groups = [(start, merged[reading]) for start, merged in reversed(groups) if reading in merged]
+    return [{"min": aggregate[0], "max": aggregate[1], "average": aggregate[2] / aggregate[3],
+             "timestamp": time.strftime(time_format, time.localtime(start))} for start, aggregate in groups]
 
 
 def is_image_excluded(request: web.Request) -> bool:
@@ -142,6 +209,10 @@ async def asset_counts(request):
     :Example:
             curl -sX GET http://localhost:8081/fledge/asset
     """
+    catalogue = get_asset_catalogue()
+    if catalogue is not None:
+        return web.json_response(catalogue.counts())
+
     payload = PayloadBuilder().AGGREGATE(["count", "*"]).ALIAS("aggregate", ("*", "count", "count")) \
         .GROUP_BY("asset_code").payload()
     _readings = connect.get_readings_async()
@@ -345,7 +416,11 @@ async def asset_reading(request):
 async def asset_all_readings_summary(request):
     """ Browse all the assets for which we have recorded readings and
     return a summary for all sensors values for an asset code. The values that are
-    returned are the min, max and average values of the sensor.
+    returned are the min, max, average values and the count of readings of the sensor.
+
+    The summary of every sensor is computed by a single aggregate query. A reading lacking some of the
+    sensors is only summarised for the sensors it has, the count of a sensor is the number of readings
+    that have a value for it.
 
     Only one of hour, minutes or seconds should be supplied, if more than one time unit
     then the smallest unit will be picked
@@ -370,10 +445,8 @@ async def asset_all_readings_summary(request):
         if not results['rows']:
             raise KeyError("{} asset_code not found".format(asset_code))
 
-        # TODO: FOGL-1768 when support available from storage layer then avoid multiple calls
         # Find keys in readings
         reading_keys = list(results['rows'][-1]['reading'].keys())
-        rows = []
         _where = PayloadBuilder().WHERE(["asset_code", "=", asset_code]).chain_payload()
         if 'previous' in request.query and (
                 'seconds' in request.query or 'minutes' in request.query or 'hours' in request.query):
@@ -387,16 +460,16 @@ async def asset_all_readings_summary(request):
             # Add limit, offset clause
             _and_where = prepare_limit_skip_payload(request, _where)
 
-        for reading in reading_keys:
-            _aggregate = PayloadBuilder(_and_where).AGGREGATE(["min", ["reading", reading]],
-                                                              ["max", ["reading", reading]],
-                                                              ["avg", ["reading", reading]]) \
-                .ALIAS('aggregate', ('reading', 'min', 'min'),
-                       ('reading', 'max', 'max'),
-                       ('reading', 'avg', 'average')).chain_payload()
-            payload = PayloadBuilder(_aggregate).payload()
-            results = await _readings.query(payload)
-            rows.append({reading: results['rows'][0]})
+        # Aggregate all the datapoints in one query, aliases use the index as a datapoint name may be any string
+        aggregates = tuple([operation, ["reading", reading], "{}_{}".format(operation, index)]
+                           for index, reading in enumerate(reading_keys)
+                           for operation in _SUMMARY_AGGREGATES)
+        payload = PayloadBuilder(_and_where).AGGREGATE(aggregates).payload()
+        results = await _readings.query(payload)
+        summary = results['rows'][0]
+        rows = [{reading: {name: summary.get("{}_{}".format(operation, index))
+                           for operation, name in _SUMMARY_AGGREGATES.items()}}
+                for index, reading in enumerate(reading_keys)]
         for index, data in enumerate(rows):
             for item_name, item_val in data.items():
                 if isinstance(item_val, dict):
@@ -565,6 +638,9 @@ async def asset_averages(request):
     _group = PayloadBuilder(_and_where).GROUP_BY("user_ts").ALIAS("group", ("user_ts", "timestamp")) \
         .FORMAT("group", ("user_ts", ts_restraint)).chain_payload()
     payload = PayloadBuilder(_group).ORDER_BY(["user_ts", "desc"]).payload()
+    rows = await _averages_from_rollup(request, asset_code, reading, ts_restraint)
+    if rows is not None:
+        return web.json_response(rows)
     try:
         _readings = connect.get_readings_async()
         results = await _readings.query(payload)
@@ -703,12 +779,15 @@ async def asset_datapoints_with_bucket_size(request: web.Request) -> web.Respons
         _bucket = PayloadBuilder(_and_where).TIMEBUCKET('user_ts', bucket_size,
                                                         'YYYY-MM-DD HH24:MI:SS', 'timestamp').chain_payload()
 
-        payload = PayloadBuilder(_bucket).LIMIT(int(float(length / float(bucket_size)))).payload()
+        limit = int(float(length / float(bucket_size)))
+        payload = PayloadBuilder(_bucket).LIMIT(limit).payload()
 
-        # Sort & timebucket modifiers can not be used in same payload
-        # payload = PayloadBuilder(limit).ORDER_BY(["user_ts", "desc"]).payload()
-        results = await _readings.query(payload)
-        response = results['rows']
+        response = await _datapoints_from_rollup(asset_code_list, start, length, bucket_size, limit)
+        if response is None:
+            # Sort & timebucket modifiers can not be used in same payload
+            # payload = PayloadBuilder(limit).ORDER_BY(["user_ts", "desc"]).payload()
+            results = await _readings.query(payload)
+            response = results['rows']
     except (KeyError, IndexError) as e:
         raise web.HTTPNotFound(reason=e)
     except (TypeError, ValueError) as e:
@@ -782,12 +861,15 @@ async def asset_readings_with_bucket_size(request: web.Request) -> web.Response:
         _bucket = PayloadBuilder(_where).TIMEBUCKET('user_ts', bucket_size, 'YYYY-MM-DD HH24:MI:SS',
                                                     'timestamp').chain_payload()
 
-        payload = PayloadBuilder(_bucket).LIMIT(int(length / int(bucket_size))).payload()
+        limit = int(length / int(bucket_size))
+        payload = PayloadBuilder(_bucket).LIMIT(limit).payload()
 
-        # Sort & timebucket modifiers can not be used in same payload
-        # payload = PayloadBuilder(limit).ORDER_BY(["user_ts", "desc"]).payload()
-        results = await _readings.query(payload)
-        response = results['rows']
+        response = await _buckets_from_rollup(asset_code, reading, start, length, int(bucket_size), limit)
+        if response is None:
+            # Sort & timebucket modifiers can not be used in same payload
+            # payload = PayloadBuilder(limit).ORDER_BY(["user_ts", "desc"]).payload()
+            results = await _readings.query(payload)
+            response = results['rows']
     except (KeyError, IndexError) as e:
         raise web.HTTPNotFound(reason=e)
     except (TypeError, ValueError) as e:
@@ -801,6 +883,43 @@ async def asset_readings_with_bucket_size(request: web.Request) -> web.Response:
         return web.json_response(response)
 
 
+async def _buckets_from_rollup(asset_code, reading, start, length, bucket_size, limit):
+    """ Buckets of a datapoint built from the readings rollups, None when they have to be queried """
+    rollup = get_readings_rollup()
+    if rollup is None or not rollup.is_numeric(asset_code, reading):
+        return None
+    groups = rollup.aggregate(asset_code, int(start), int(start + length) + 1, bucket_size)
+    if groups is None:
+        return None
+    # The newest buckets first, as the readings are queried
+    rows = [{"timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(group_start)),
+             "min": merged[reading][0], "max": merged[reading][1], "average": merged[reading][2] / merged[reading][3]}
+            for group_start, merged in reversed(groups) if reading in merged]
+    return rows[:limit]
+
+
+async def _datapoints_from_rollup(asset_code_list, start, length, bucket_size, limit):
+    """ Buckets of all the datapoints of assets built from the readings rollups, None when they have to be queried """
+    rollup = get_readings_rollup()
+    if rollup is None or float(bucket_size) != int(float(bucket_size)):
+        return None
+    rows = []
+    for asset_code in asset_code_list:
+        if not rollup.is_numeric(asset_code):
+            return None
+        groups = rollup.aggregate(asset_code, int(start), int(start + length) + 1, int(float(bucket_size)))
+        if groups is None:
+            return None
+        rows.extend({"asset_code": asset_code,
+                     "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(group_start)),
+                     "reading": {datapoint: {"min": aggregate[0], "max": aggregate[1],
+                                             "average": aggregate[2] / aggregate[3], "count": aggregate[3],
+                                             "sum": aggregate[2]} for datapoint, aggregate in merged.items()}}
+                    for group_start, merged in groups)
+    rows.sort(key=lambda row: row["timestamp"], reverse=True)
+    return rows[:limit]
+
+
 async def asset_structure(request):
     """ Browse all the assets for which we have recorded readings and
     return the asset structure
@@ -833,6 +952,14 @@ async def asset_structure(request):
               }
             }
     """
+    catalogue = get_asset_catalogue()
+    if catalogue is not None:
+        try:
+            return web.json_response(await catalogue.structure())
+        except Exception as ex:
+            _logger.warning("Failed to get assets structure from the asset catalogue, querying the readings. %s",
+                            str(ex))
+
     results = {}
     try:
         payload = PayloadBuilder().ORDER_BY(["asset_code"]).payload()
@@ -894,6 +1021,10 @@ async def asset_purge_all(request):
         results = await _readings.purge(asset="")
 
         if 'purged' in results:
+            if get_readings_rollup() is not None:
+                get_readings_rollup().clear()
+            if get_asset_catalogue() is not None:
+                get_asset_catalogue().clear()
             end_time = time.strftime('%Y-%m-%d %H:%M:%S.%s', time.localtime(time.time()))
             await _audit.information('PURGE',
                                      {
@@ -934,6 +1065,10 @@ async def asset_purge(request):
         results = await _readings.purge(asset=asset_code)
 
         if 'purged' in results:
+            if get_readings_rollup() is not None:
+                get_readings_rollup().drop_asset(asset_code)
+            if get_asset_catalogue() is not None:
+                get_asset_catalogue().drop_asset(asset_code)
             end_time = time.strftime('%Y-%m-%d %H:%M:%S.%s', time.localtime(time.time()))
             await _audit.information('PURGE',
                                      {
@@ -960,6 +1095,10 @@ async def asset_timespan(request):
     :Example:
             curl -sX GET http://localhost:8081/fledge/asset/timespan
     """
+    catalogue = get_asset_catalogue()
+    if catalogue is not None:
+        return web.json_response(catalogue.timespans())
+
     try:
         payload = PayloadBuilder().AGGREGATE(["min", "user_ts"], ["max", "user_ts"]).GROUP_BY("asset_code") \
                 .ALIAS('aggregate', ('user_ts', 'min', 'oldest'), ('user_ts', 'max', 'newest')).payload()
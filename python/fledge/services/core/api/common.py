@@ -9,7 +9,6 @@ import time
 import json
 import logging
 import socket
-import subprocess
 
 from aiohttp import web
 from functools import lru_cache
@@ -18,9 +17,8 @@ from fledge.common import logger
 from fledge.services.core import server
 from fledge.services.core.api.statistics import get_statistics
 from fledge.services.core import connect
+from fledge.services.core import health_snapshot
 from fledge.common.configuration_manager import ConfigurationManager
-from fledge.services.core.service_registry.service_registry import ServiceRegistry
-from fledge.common.service_record import ServiceRecord
 from fledge.common.common import _FLEDGE_ROOT
 
 __author__ = "Amarendra K. Sinha, Ashish Jabble"
@@ -73,26 +71,32 @@ async def ping(request):
 
     since_started = time.time() - __start_time
 
+    snapshot = health_snapshot.get_health_snapshot()
+    if snapshot is not None:
+        # answered from memory, the snapshot is refreshed in the background
+        counters = snapshot.counters
+        return web.json_response({'uptime': int(since_started),
+                                  'dataRead': counters['dataRead'],
+                                  'dataSent': counters['dataSent'],
+                                  'dataPurged': counters['dataPurged'],
+                                  'authenticationOptional': request.is_auth_optional,
+                                  'serviceName': server.Server._service_name,
+                                  'hostName': snapshot.host_name,
+                                  'ipAddresses': snapshot.ip_addresses,
+                                  'health': snapshot.health,
+                                  'safeMode': True if server.Server.running_in_safe_mode else False,
+                                  'version': get_version()
+                                  })
+
     stats_request = request.clone(rel_url='fledge/statistics')
     data_read, data_sent, data_purged = await get_stats(stats_request)
 
     host_name = socket.gethostname()
     # all addresses for the host
-    all_ip_addresses_cmd_res = subprocess.run(['hostname', '-I'], stdout=subprocess.PIPE)
-    ip_addresses = all_ip_addresses_cmd_res.stdout.decode('utf-8').replace("\n", "").strip().split(" ")
+    ip_addresses = await health_snapshot.get_ip_addresses()
 
     svc_name = server.Server._service_name
-
-    def services_health_litmus_test():
-        all_svc_status = [ServiceRecord.Status(int(service_record._status)).name.upper()
-                          for service_record in ServiceRegistry.all()]
-        if 'FAILED' in all_svc_status:
-            return 'red'
-        elif 'UNRESPONSIVE' in all_svc_status:
-            return 'amber'
-        return 'green'
-
-    status_color = services_health_litmus_test()
+    status_color = health_snapshot.services_health()
     safe_mode = True if server.Server.running_in_safe_mode else False
     version = get_version()
     return web.json_response({'uptime': int(since_started),
@@ -15,6 +15,7 @@ from fledge.common.service_record import ServiceRecord
 from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.services.core import connect, server
 from fledge.services.core.scheduler.entities import Task
+from fledge.services.core.scheduler.exceptions import NotReadyError
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
 from fledge.services.core.service_registry.exceptions import DoesNotExist
 
@@ -45,6 +46,13 @@ async def _get_sent_stats(storage_client, north_schedules):
 
 
 async def _get_tasks_status():
+    # The scheduler keeps the latest task of each schedule once started
+    try:
+        return {task['schedule_name']: task for task in await server.Server.scheduler.get_latest_tasks()
+                if task['process_name'] in ("north", "north_c") and task['schedule_name'].strip()}
+    except NotReadyError:
+        pass
+
     payload = PayloadBuilder().SELECT("id", "schedule_name", "process_name", "state", "start_time",
                                       "end_time", "reason", "pid", "exit_code")\
         .WHERE(["process_name", "=", "north"])\
@@ -4,6 +4,7 @@
 # See: http://fledge-iot.readthedocs.io/
 # FLEDGE_END
 
+import asyncio
 import json
 
 from aiohttp import web
@@ -22,6 +23,7 @@ __version__ = "${VERSION}"
 _help = """
     -------------------------------------------------------------------------------
     | GET             | /fledge/plugins/installed                                |
+    | PUT             | /fledge/plugins/installed/refresh                        |
     | GET             | /fledge/plugins/available                                |
     -------------------------------------------------------------------------------
 """
@@ -60,6 +62,27 @@ async def get_plugins_installed(request):
     return web.json_response({"plugins": plugins_list})
 
 
+async def refresh_plugins_installed(request):
+    """ discover the installed plugins again, rather than using the plugins cached since they were last discovered
+
+    :Example:
+        curl -X PUT http://localhost:8081/fledge/plugins/installed/refresh
+        curl -X PUT http://localhost:8081/fledge/plugins/installed/refresh?type=north
+    """
+    plugin_type = None
+    if 'type' in request.query and request.query['type'] != '':
+        plugin_type = request.query['type'].lower()
+
+    if plugin_type is not None and plugin_type not in ['north', 'south', 'filter', 'notify', 'rule']:
+        raise web.HTTPBadRequest(reason="Invalid plugin type. Must be 'north' or 'south' or 'filter' or 'notify' "
+                                        "or 'rule'.")
+
+    loop = asyncio.get_event_loop()
+    plugins_list = await loop.run_in_executor(None, PluginDiscovery.refresh, plugin_type)
+
+    return web.json_response({"plugins": plugins_list})
+
+
 async def get_plugins_available(request: web.Request) -> web.Response:
     """ get list of a available plugins via package management i.e apt or yum
 
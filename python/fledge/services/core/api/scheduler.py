@@ -36,6 +36,7 @@ _help = """
     | PUT             | /fledge/schedule/disable                                 |
     | POST            | /fledge/schedule/start/{schedule_id}                     |
     | GET             | /fledge/schedule/type                                    |
+    | GET             | /fledge/schedule/metrics                                 |
 
     | GET             | /fledge/task                                             |
     | GET             | /fledge/task/latest                                      |
@@ -740,6 +741,25 @@ async def get_schedule_type(request):
     return web.json_response({'scheduleType': results})
 
 
+async def get_schedule_metrics(request):
+    """
+    Args:
+        request:
+
+    Returns:
+         the lag of the tasks started at a scheduled time behind that time, the start latency of the tasks by
+         process name, the counters of the writes to the tasks table and the progress of its last purge
+
+    :Example:
+             curl -X GET  http://localhost:8081/fledge/schedule/metrics
+    """
+    scheduler = server.Server.scheduler
+    return web.json_response({'scheduling': scheduler.scheduling_lag_metrics(),
+                              'taskStart': scheduler.task_start_metrics(),
+                              'taskTable': scheduler.task_table_metrics(),
+                              'purgeTasks': scheduler.purge_tasks_progress()})
+
+
 #################################
 # Tasks
 #################################
@@ -849,6 +869,27 @@ async def get_tasks(request):
         raise web.HTTPNotFound(reason=str(ex))
 
 
+async def _get_tasks_latest_from_storage(name=None):
+    payload = PayloadBuilder().SELECT("id", "schedule_name", "process_name", "state", "start_time", "end_time", "reason", "pid", "exit_code")\
+        .ALIAS("return", ("start_time", 'start_time'), ("end_time", 'end_time'))\
+        .FORMAT("return", ("start_time", "YYYY-MM-DD HH24:MI:SS.MS"), ("end_time", "YYYY-MM-DD HH24:MI:SS.MS"))\
+        .ORDER_BY(["schedule_name", "asc"], ["start_time", "desc"])
+
+    if name is not None:
+        payload.WHERE(["schedule_name", "=", name])
+
+    _storage = connect.get_storage_async()
+    results = await _storage.query_tbl_with_payload('tasks', payload.payload())
+
+    tasks = []
+    previous_schedule = None
+    for row in results['rows']:
+        if previous_schedule != row['schedule_name']:
+            tasks.append(row)
+            previous_schedule = row['schedule_name']
+    return tasks
+
+
 async def get_tasks_latest(request):
     """
     Returns:
@@ -859,31 +900,21 @@ async def get_tasks_latest(request):
 
               curl -X GET  http://localhost:8081/fledge/task/latest?name=xxx
     """
-    payload = PayloadBuilder().SELECT("id", "schedule_name", "process_name", "state", "start_time", "end_time", "reason", "pid", "exit_code")\
-        .ALIAS("return", ("start_time", 'start_time'), ("end_time", 'end_time'))\
-        .FORMAT("return", ("start_time", "YYYY-MM-DD HH24:MI:SS.MS"), ("end_time", "YYYY-MM-DD HH24:MI:SS.MS"))\
-        .ORDER_BY(["schedule_name", "asc"], ["start_time", "desc"])
-
+    name = None
     if 'name' in request.query and request.query['name'] != '':
         name = request.query['name']
-        payload.WHERE(["schedule_name", "=", name])
 
     try:
-        _storage = connect.get_storage_async()
-        results = await _storage.query_tbl_with_payload('tasks', payload.payload())
+        # The scheduler keeps the latest task of each schedule once started
+        try:
+            tasks = await server.Server.scheduler.get_latest_tasks(name)
+        except NotReadyError:
+            tasks = await _get_tasks_latest_from_storage(name)
 
-        if len(results['rows']) == 0:
+        tasks = [task for task in tasks if task['schedule_name'].strip()]
+        if len(tasks) == 0:
             raise web.HTTPNotFound(reason="No Tasks found")
 
-        tasks = []
-        previous_schedule = None
-        for row in results['rows']:
-            if not row['schedule_name'].strip():
-                continue
-            if previous_schedule != row['schedule_name']:
-                tasks.append(row)
-                previous_schedule = row['schedule_name']
-
         new_tasks = []
         for task in tasks:
             new_tasks.append(
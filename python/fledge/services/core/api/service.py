@@ -26,6 +26,7 @@ from fledge.services.core.api import utils as apiutils
 from fledge.services.core.scheduler.entities import StartUpSchedule
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
 from fledge.services.core.service_registry import exceptions as service_registry_exceptions
+from fledge.services.core.interest_registry import change_callback
 from fledge.common.common import _FLEDGE_ROOT
 from fledge.services.core.api.plugins import common
 from fledge.services.core.api.plugins import install
@@ -44,6 +45,7 @@ _help = """
     | GET POST            | /fledge/service                                      |
     | GET                 | /fledge/service/available                            |
     | GET                 | /fledge/service/installed                            |
+    | GET                 | /fledge/service/monitor                              |
     | PUT                 | /fledge/service/{type}/{name}/update                 |
     | DELETE              | /fledge/service/{service_name}                       |
     | POST                | /fledge/service/{service_name}/otp                   |
@@ -88,6 +90,22 @@ def get_service_installed() -> List:
     return services
 
 
+async def get_monitor_metrics(request):
+    """
+    Returns:
+            duration of the rounds of health checks of the service monitor, and the deliveries, failures and
+            latency of the configuration change notifications by microservice name
+
+    :Example:
+            curl -sX GET http://localhost:8081/fledge/service/monitor
+    """
+    monitor = server.Server.service_monitor
+    if monitor is None:
+        msg = "Service monitor is not running"
+        raise web.HTTPNotFound(reason=msg, body=json.dumps({"message": msg}))
+    return web.json_response(dict(monitor.metrics(), changeNotifications=change_callback.delivery_metrics()))
+
+
 async def get_health(request):
     """
     Args:
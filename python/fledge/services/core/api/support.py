@@ -5,6 +5,7 @@
 # FLEDGE_END
 
 import os
+import asyncio
 import subprocess
 import json
 import datetime
@@ -17,6 +18,7 @@ from fledge.common import utils
 from fledge.common.common import _FLEDGE_ROOT, _FLEDGE_DATA
 from fledge.common.logger import FLCoreLogger
 from fledge.services.core.support import SupportBuilder
+from fledge.services.core.syslog_index import get_syslog_index
 
 
 __author__ = "Ashish Jabble"
@@ -137,6 +139,8 @@ async def get_syslog_entries(request):
         curl -sX GET "http://localhost:8081/fledge/syslog?nontotals=true&limit=100&offset=50&keyword=fledge.services"
         curl -sX GET "http://localhost:8081/fledge/syslog?nontotals=true&source=<svc_name>|<task_name>&limit=10&offset=50"
         curl -sX GET "http://localhost:8081/fledge/syslog?nontotals=true&source=<svc_name>|<task_name>"
+
+    The entries are read from the syslog index of the core when it is available, otherwise the syslog is searched
     """
     try:
         # limit
@@ -193,10 +197,25 @@ async def get_syslog_entries(request):
             'nontotals'] != '' else "false"
         if non_totals not in ("true", "false"):
             raise ValueError('nontotals must either be in True or False.')
+        syslog_index = get_syslog_index()
+        if syslog_index is not None:
+            if source == 'fledge':
+                index_source = None
+            elif source == 'storage':
+                index_source = valid_source[source]
+            else:
+                # Each of the names of a source such as name1|name2, as grep matches them
+                index_source = ["Fledge {}".format(name) for name in source.split('|')]
+            count, response['logs'] = await syslog_index.query_async(index_source, level, keyword, offset, limit,
+                                                                     count=non_totals != "true")
+            if count is not None:
+                response['count'] = count
+            return web.json_response(response)
+        loop = asyncio.get_event_loop()
         if non_totals != "true":
             # Get total lines
             cmd = lines.format(valid_source[source], _SYSLOG_FILE)
-            t = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE).stdout.readlines()
+            t = await loop.run_in_executor(None, _run_command, cmd)
             total_lines = int(t[0].decode())
             response['count'] = total_lines
             cmd = template.format(valid_source[source], _SYSLOG_FILE, total_lines - offset, limit)
@@ -211,7 +230,7 @@ async def get_syslog_entries(request):
             _logger.debug('********* non_totals={}: new shell command: {}'.format(non_totals, cmd))
 
         t1 = datetime.datetime.now()
-        rv = subprocess.Popen([cmd], shell=True, stdout=subprocess.PIPE).stdout.readlines()
+        rv = await loop.run_in_executor(None, _run_command, [cmd])
         t2 = datetime.datetime.now()
         rv_str = [b.decode() for b in rv]  # Since "rv" contains return value in bytes, convert it to string
         _logger.debug('********* Time taken for grep/tail/head subprocess: {} msec'.format((t2 - t1).total_seconds()*1000))
@@ -227,6 +246,11 @@ async def get_syslog_entries(request):
     return web.json_response(response)
 
 
+def _run_command(cmd):
+    """ Output lines of a shell command, run in an executor as it blocks until the command exits """
+    return subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE).stdout.readlines()
+
+
 def _get_support_dir():
     if _FLEDGE_DATA:
         support_dir = os.path.expanduser(_FLEDGE_DATA + '/support')
@@ -189,7 +189,9 @@ EOF
         storage = connect.get_storage_async()
         config_mgr = ConfigurationManager(storage)
 
-        # Abort the operation if there are already executed tasks
+        # Abort the operation if there are already executed tasks, including the ones the scheduler buffers
+        if server.Server.scheduler is not None:
+            await server.Server.scheduler.flush_tasks()
         payload = PayloadBuilder() \
             .SELECT(["id", "schedule_name"]) \
             .WHERE(['schedule_name', '=', name]) \
@@ -354,6 +356,9 @@ async def delete_statistics_key(storage, key):
 
 
 async def delete_task_entry_with_schedule_id(storage, sch_id):
+    # Write the rows the scheduler buffers first, so that none of them is inserted after the delete
+    if server.Server.scheduler is not None:
+        await server.Server.scheduler.flush_tasks()
     payload = PayloadBuilder().WHERE(["schedule_id", "=", str(sch_id)]).payload()
     await storage.delete_from_tbl("tasks", payload)
 
@@ -62,6 +62,11 @@ def _find_c_lib(name, installed_dir):
 
 
 def find_c_plugin_libs(direction):
+    return [(name, _type) for name, _type, _ in find_c_plugin_files(direction)]
+
+
+def find_c_plugin_files(direction):
+    """ Same as find_c_plugin_libs, along with the directory of each plugin library """
     libraries = []
     _path = [_lib_path]
     _path = _find_plugins_from_env(_path)
@@ -72,10 +77,10 @@ def find_c_plugin_libs(direction):
                 for fname in os.listdir(p):
                     if fname.endswith('.so'):
                         # Replace lib and .so from fname
-                        libraries.append((fname.replace("lib", "").replace(".so", ""), 'binary'))
+                        libraries.append((fname.replace("lib", "").replace(".so", ""), 'binary', p))
                     # For Hybrid plugins
                     if direction == 'south' and fname.endswith('.json'):
-                        libraries.append((fname.replace(".json", ""), 'json'))
+                        libraries.append((fname.replace(".json", ""), 'json', p))
     return libraries
 
 
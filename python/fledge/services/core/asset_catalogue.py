@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Catalogue of the assets having readings, used by the asset browser instead of scanning the readings
+
+For each asset the catalogue holds the timestamps of the oldest and newest readings, an approximate count of readings
+and the type of each datapoint of its newest reading. It is loaded with a single aggregate query, then kept up to date
+with the readings fetched by the readings rollups and with the assets recorded by the asset tracker. Counts and
+timestamps drift when the purge task removes readings, they are reconciled with storage in the background.
+"""
+
+import asyncio
+
+from fledge.common.logger import FLCoreLogger
+from fledge.common.storage_client.payload_builder import PayloadBuilder
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_logger = FLCoreLogger().get_logger(__name__)
+
+_DEFAULT_RECONCILE_INTERVAL = 600
+""" Seconds between two reconciliations of the counts and timestamps with storage """
+
+_catalogue = None
+""" Catalogue of the core, started by the core server """
+
+
+def get_asset_catalogue():
+    """ Catalogue of the core, None when it has not been started """
+    return _catalogue
+
+
+async def start_asset_catalogue(readings, rollup, assets=()):
+    """ Loads the catalogue of the core
+
+    Args:
+        readings: ReadingsStorageClientAsync
+        rollup: started ReadingsRollup whose readings keep the catalogue up to date
+        assets: asset codes already known by the asset tracker
+    """
+    global _catalogue
+    catalogue = AssetCatalogue(readings)
+    for asset_code in assets:
+        catalogue.register(asset_code)
+    await catalogue.start()
+    rollup.add_observer(catalogue.observe)
+    _catalogue = catalogue
+
+
+async def stop_asset_catalogue():
+    global _catalogue
+    if _catalogue is not None:
+        await _catalogue.stop()
+        _catalogue = None
+
+
+def datapoint_type(value):
+    """ Type of a datapoint as shown by the asset structure, None for a string that is metadata """
+    if isinstance(value, str):
+        return "boolean" if value in ("True", "False") else None
+    if type(value) == int:
+        return "integer"
+    if type(value) == float:
+        return "float"
+    return None
+
+
+def _timestamp(user_ts):
+    """ Timestamp without the UTC offset some storage plugins append, so that timestamps compare as strings """
+    return user_ts.split('+')[0] if user_ts else user_ts
+
+
+class _Entry(object):
+
+    __slots__ = ['oldest', 'newest', 'count', 'datapoint', 'metadata', 'structure_known']
+
+    def __init__(self):
+        self.oldest = None
+        self.newest = None
+        self.count = 0
+        self.datapoint = {}
+        self.metadata = {}
+        self.structure_known = False
+
+
+class AssetCatalogue(object):
+    """ Oldest and newest timestamps, approximate count and datapoint types of the assets having readings """
+
+    def __init__(self, readings, reconcile_interval=_DEFAULT_RECONCILE_INTERVAL):
+        """
+        Args:
+            readings: ReadingsStorageClientAsync
+            reconcile_interval: seconds between two reconciliations with storage
+        """
+        self._readings = readings
+        self._reconcile_interval = reconcile_interval
+        self._assets = {}
+        """ _Entry by asset code """
+        self._task = None
+        self._stats = {"reconciles": 0, "structure_queries": 0}
+
+    async def start(self):
+        await self.reconcile()
+        self._task = asyncio.ensure_future(self._reconcile_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def reconcile(self):
+        """ Replaces the counts and timestamps with the ones of storage, with one aggregate query """
+        payload = PayloadBuilder().AGGREGATE(["count", "*"], ["min", "user_ts"], ["max", "user_ts"]) \
+            .ALIAS('aggregate', ('*', 'count', 'count'), ('user_ts', 'min', 'oldest'), ('user_ts', 'max', 'newest')) \
+            .GROUP_BY("asset_code").payload()
+        results = await self._readings.query(payload)
+        stored = set()
+        for row in results['rows']:
+            entry = self._entry(row['asset_code'])
+            entry.count = row['count']
+            entry.oldest = _timestamp(row['oldest'])
+            entry.newest = _timestamp(row['newest'])
+            stored.add(row['asset_code'])
+        for asset_code, entry in self._assets.items():
+            if asset_code not in stored:
+                entry.count = 0
+                entry.oldest = entry.newest = None
+        self._stats["reconciles"] += 1
+
+    def register(self, asset_code):
+        """ Records an asset reported by the asset tracker, it is listed once it has readings """
+        self._entry(asset_code)
+
+    def observe(self, rows):
+        """ Accounts for readings appended to storage, as fetched from the readings table """
+        for row in rows:
+            entry = self._entry(row['asset_code'])
+            user_ts = _timestamp(row['user_ts'])
+            if entry.oldest is None or user_ts < entry.oldest:
+                entry.oldest = user_ts
+            if entry.newest is None or user_ts >= entry.newest:
+                entry.newest = user_ts
+                self._set_structure(entry, row['reading'])
+            entry.count += 1
+
+    def drop_asset(self, asset_code):
+        """ Forgets the readings of an asset that has been purged """
+        if asset_code in self._assets:
+            self._assets[asset_code] = _Entry()
+
+    def clear(self):
+        """ Forgets the readings of all the assets, after all the readings have been purged """
+        for asset_code in self._assets:
+            self._assets[asset_code] = _Entry()
+
+    def counts(self):
+        """ List of dict of count and assetCode of the assets having readings, ordered by asset code """
+        return [{"count": self._assets[code].count, "assetCode": code} for code in sorted(self._assets)
+                if self._assets[code].count > 0]
+
+    def timespans(self):
+        """ List of dict of asset_code, oldest and newest of the assets having readings, ordered by asset code """
+        return [{"asset_code": code, "oldest": self._assets[code].oldest, "newest": self._assets[code].newest}
+                for code in sorted(self._assets) if self._assets[code].count > 0]
+
+    async def structure(self):
+        """ Datapoint types and metadata of the newest reading by asset code of the assets having readings
+
+        The structure of an asset known only from the aggregate query is read from its newest reading, once.
+        """
+        result = {}
+        for code in sorted(self._assets):
+            entry = self._assets[code]
+            if entry.count < 1:
+                continue
+            if not entry.structure_known:
+                payload = PayloadBuilder().SELECT("reading").WHERE(["asset_code", "=", code]) \
+                    .ORDER_BY(["user_ts", "desc"]).LIMIT(1).payload()
+                results = await self._readings.query(payload)
+                self._stats["structure_queries"] += 1
+                if not results['rows']:
+                    continue
+                self._set_structure(entry, results['rows'][0]['reading'])
+            result[code] = {'datapoint': dict(entry.datapoint)}
+            if entry.metadata:
+                result[code]['metadata'] = dict(entry.metadata)
+        return result
+
+    def metrics(self):
+        return dict(self._stats, assets=len(self._assets))
+
+    def _entry(self, asset_code):
+        entry = self._assets.get(asset_code)
+        if entry is None:
+            entry = self._assets[asset_code] = _Entry()
+        return entry
+
+    @staticmethod
+    def _set_structure(entry, reading):
+        entry.datapoint = {}
+        entry.metadata = {}
+        for name, value in reading.items():
+            kind = datapoint_type(value)
+            if kind is not None:
+                entry.datapoint[name] = kind
+            elif isinstance(value, str):
+                entry.metadata[name] = value
+        entry.structure_known = True
+
+    async def _reconcile_forever(self):
+        while True:
+            await asyncio.sleep(self._reconcile_interval)
+            try:
+                await self.reconcile()
+            except Exception as ex:
+                _logger.warning("Failed to reconcile the asset catalogue. %s", str(ex))
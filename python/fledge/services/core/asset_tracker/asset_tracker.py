@@ -9,6 +9,7 @@ from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.common.storage_client.exceptions import StorageServerError
+from fledge.services.core.asset_catalogue import get_asset_catalogue
 
 __author__ = "Ashish Jabble"
 __copyright__ = "Copyright (c) 2018 OSIsoft, LLC"
@@ -75,6 +76,8 @@ class AssetTracker(object):
             result = await self._storage.insert_into_tbl('asset_tracker', payload)
             response = result['response']
             self._registered_asset_records.append(d)
+            if event == 'Ingest' and get_asset_catalogue() is not None:
+                get_asset_catalogue().register(asset)
         except KeyError:
             raise ValueError(result['message'])
         except StorageServerError as ex:
@@ -4,6 +4,8 @@
 # See: http://fledge-iot.readthedocs.io/
 # FLEDGE_END
 
+import asyncio
+
 from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.storage_client import StorageClientAsync, ReadingsStorageClientAsync
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
@@ -15,14 +17,37 @@ __version__ = "${VERSION}"
 
 _logger = FLCoreLogger().get_logger(__name__)
 
+_clients = {}
+""" Dictionary of client class to the client shared by the core, each with its pooled session """
+
+
+def _shared_client(client_class, factory):
+    """ Returns the client shared by the core, created again when the storage service has moved or the event loop
+    has changed """
+    services = ServiceRegistry.get(name="Fledge Storage")
+    storage_svc = services[0]
+    address = (storage_svc._address, storage_svc._port)
+    client, client_address = _clients.get(client_class, (None, None))
+    if client is not None:
+        session = client._session
+        if session is not None and not session.closed and session._loop is not asyncio.get_event_loop():
+            # The session can not be used nor closed from another loop
+            client = None
+        elif client_address == address:
+            return client
+        elif session is not None and not session.closed:
+            asyncio.ensure_future(client.close())
+    client = factory(storage_svc)
+    _clients[client_class] = (client, address)
+    return client
+
 
 # TODO: Needs refactoring or better way to allow global discovery in core process
 def get_storage_async():
     """ Storage Object """
     try:
-        services = ServiceRegistry.get(name="Fledge Storage")
-        storage_svc = services[0]
-        _storage = StorageClientAsync(core_management_host=None, core_management_port=None, svc=storage_svc)
+        _storage = _shared_client(StorageClientAsync, lambda svc: StorageClientAsync(
+            core_management_host=None, core_management_port=None, svc=svc))
     except Exception as ex:
         _logger.error(ex)
         raise
@@ -33,10 +58,17 @@ def get_storage_async():
 def get_readings_async():
     """ Storage Object """
     try:
-        services = ServiceRegistry.get(name="Fledge Storage")
-        storage_svc = services[0]
-        _readings = ReadingsStorageClientAsync(core_mgt_host=None, core_mgt_port=None, svc=storage_svc)
+        _readings = _shared_client(ReadingsStorageClientAsync, lambda svc: ReadingsStorageClientAsync(
+            core_mgt_host=None, core_mgt_port=None, svc=svc))
     except Exception as ex:
         _logger.error(ex)
         raise
     return _readings
+
+
+async def close_storage_clients():
+    """ Closes the clients shared by the core and their pooled sessions """
+    clients = [client for client, _ in _clients.values()]
+    _clients.clear()
+    for client in clients:
+        await client.close()
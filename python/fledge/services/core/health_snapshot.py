@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Health snapshot of the core, answering the ping API from memory
+
+The host name and addresses, the readings counters and the health color of the services are refreshed in the
+background, each at its own pace: the addresses seldom change and are read with `hostname -I` once a minute, the
+counters are read every few seconds with a single query of the three statistics used and the health color is
+computed every second, and after each round of the service monitor, from the service registry.
+"""
+
+import asyncio
+import socket
+import time
+
+from fledge.common.logger import FLCoreLogger
+from fledge.common.service_record import ServiceRecord
+from fledge.common.storage_client.payload_builder import PayloadBuilder
+from fledge.services.core import connect
+from fledge.services.core.service_registry.service_registry import ServiceRegistry
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_logger = FLCoreLogger().get_logger(__name__)
+
+STATISTICS_KEYS = {'READINGS': 'dataRead', 'Readings Sent': 'dataSent', 'PURGED': 'dataPurged'}
+""" Statistics keys reported by the ping API, with the name of their field """
+
+_DEFAULT_HEALTH_INTERVAL = 1
+""" Seconds between two computations of the health color """
+
+_DEFAULT_COUNTERS_INTERVAL = 5
+""" Seconds between two reads of the statistics """
+
+_DEFAULT_ADDRESSES_INTERVAL = 60
+""" Seconds between two reads of the host addresses """
+
+_snapshot = None
+""" Snapshot of the core, started by the core server """
+
+
+def get_health_snapshot():
+    """ Health snapshot of the core, None when it has not been started """
+    return _snapshot
+
+
+async def start_health_snapshot():
+    """ Starts the health snapshot of the core, once its first refresh is done """
+    global _snapshot
+    snapshot = HealthSnapshot()
+    await snapshot.start()
+    _snapshot = snapshot
+
+
+async def stop_health_snapshot():
+    global _snapshot
+    if _snapshot is not None:
+        await _snapshot.stop()
+        _snapshot = None
+
+
+async def get_ip_addresses():
+    """ All the addresses of the host, as listed by `hostname -I`, read without blocking the event loop """
+    process = await asyncio.create_subprocess_exec('hostname', '-I', stdout=asyncio.subprocess.PIPE)
+    stdout, _ = await process.communicate()
+    return stdout.decode('utf-8').replace("\n", "").strip().split(" ")
+
+
+def services_health():
+    """ red when a service has failed, amber when one is unresponsive, green otherwise """
+    all_svc_status = {int(service_record._status) for service_record in ServiceRegistry.all()}
+    if int(ServiceRecord.Status.Failed) in all_svc_status:
+        return 'red'
+    elif int(ServiceRecord.Status.Unresponsive) in all_svc_status:
+        return 'amber'
+    return 'green'
+
+
+class HealthSnapshot(object):
+    """ Host details, readings counters and health color of the services, refreshed in the background """
+
+    def __init__(self, health_interval=_DEFAULT_HEALTH_INTERVAL, counters_interval=_DEFAULT_COUNTERS_INTERVAL,
+                 addresses_interval=_DEFAULT_ADDRESSES_INTERVAL):
+        """
+        Args:
+            health_interval: seconds between two computations of the health color
+            counters_interval: seconds between two reads of the statistics
+            addresses_interval: seconds between two reads of the host addresses
+        """
+        self._health_interval = health_interval
+        self._counters_interval = counters_interval
+        self._addresses_interval = addresses_interval
+        self.host_name = socket.gethostname()
+        self.ip_addresses = []
+        self.counters = {field: 0 for field in STATISTICS_KEYS.values()}
+        """ Value of each statistic reported, by field name """
+        self.health = 'green'
+        self._tasks = []
+        self._stats = {"health_refreshes": 0, "counters_refreshes": 0, "addresses_refreshes": 0, "failures": 0}
+        self._refreshed = {}
+        """ Monotonic time of the last refresh, by part of the snapshot """
+
+    async def start(self):
+        await self.refresh_addresses()
+        await self.refresh_counters()
+        self.refresh_health()
+        self._tasks = [asyncio.ensure_future(self._refresh_forever(self.refresh_addresses, self._addresses_interval)),
+                       asyncio.ensure_future(self._refresh_forever(self.refresh_counters, self._counters_interval)),
+                       asyncio.ensure_future(self._refresh_forever(self._refresh_health, self._health_interval))]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def refresh_health(self):
+        """ Computes the health color, called on a change of the status of the services """
+        self.health = services_health()
+        self._refreshed['health'] = time.monotonic()
+        self._stats["health_refreshes"] += 1
+
+    async def refresh_counters(self):
+        """ Reads the statistics reported, a statistic not created yet is reported as 0 """
+        payload = PayloadBuilder().SELECT("key", "value").WHERE(['key', 'in', list(STATISTICS_KEYS)]).payload()
+        result = await connect.get_storage_async().query_tbl_with_payload('statistics', payload)
+        values = {row['key']: int(row['value']) for row in result['rows']}
+        self.counters = {field: values.get(key, 0) for key, field in STATISTICS_KEYS.items()}
+        self._refreshed['counters'] = time.monotonic()
+        self._stats["counters_refreshes"] += 1
+
+    async def refresh_addresses(self):
+        self.host_name = socket.gethostname()
+        self.ip_addresses = await get_ip_addresses()
+        self._refreshed['addresses'] = time.monotonic()
+        self._stats["addresses_refreshes"] += 1
+
+    def metrics(self):
+        now = time.monotonic()
+        ages = {"{}_age".format(part): round(now - refreshed, 3) for part, refreshed in self._refreshed.items()}
+        return dict(self._stats, **ages)
+
+    async def _refresh_health(self):
+        self.refresh_health()
+
+    async def _refresh_forever(self, refresh, interval):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await refresh()
+            except Exception as ex:
+                self._stats["failures"] += 1
+                _logger.warning("Failed to refresh the health snapshot. %s", str(ex))
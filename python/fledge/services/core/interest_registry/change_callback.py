@@ -8,6 +8,8 @@
 
 import json
 import asyncio
+import functools
+import time
 import aiohttp
 from fledge.common.configuration_manager import ConfigurationManager
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
@@ -22,6 +24,161 @@ __version__ = "${VERSION}"
 
 _LOGGER = logger.setup(__name__)
 
+_NOTIFY_TIMEOUT = 10
+""" Seconds a microservice has to acknowledge a notification """
+
+_CONNECTION_LIMIT = 100
+""" Maximum number of connections open at once to the microservices """
+
+
+class _Dispatcher(object):
+    """ Notifies the interested microservices concurrently, over a shared pool of connections
+
+    Notifications about the same category are coalesced: while one is being delivered, the following changes are
+    delivered once after it, with the category as it is then.
+    """
+
+    def __init__(self):
+        self._session = None
+        self._loop = None
+        self._running = set()
+        self._next = {}
+        """ Future of the delivery following the running one, by notification key """
+        self._services = {}
+        """ Delivery counters by microservice name """
+
+    def _get_session(self):
+        loop = asyncio.get_event_loop()
+        if self._session is not None and not self._session.closed and self._loop is not loop:
+            self._close_session_of_other_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=_CONNECTION_LIMIT),
+                                                  timeout=aiohttp.ClientTimeout(total=_NOTIFY_TIMEOUT))
+            self._loop = loop
+        return self._session
+
+    def _close_session_of_other_loop(self):
+        session, self._session = self._session, None
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), self._loop)
+        else:
+            # The connections can no longer be closed on their loop, they are released with the session
+            session.detach()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def notify(self, key, deliver):
+        """ Runs deliver, or waits for a run of deliver started after the running one for the same key
+
+        Args:
+            key: notification key, the changes of a key are coalesced
+            deliver: coroutine function notifying all the microservices, it reads the category when run
+        """
+        if key in self._running:
+            following = self._next.get(key)
+            if following is None:
+                following = self._next[key] = asyncio.get_event_loop().create_future()
+            await asyncio.shield(following)
+            return
+        self._running.add(key)
+        following = None
+        try:
+            await deliver()
+            while key in self._next:
+                following = self._next.pop(key)
+                await deliver()
+                following.set_result(None)
+                following = None
+        except BaseException as ex:
+            # The callers waiting for the failed run, or for the one following it, fail alike instead of waiting
+            for waited in (following, self._next.pop(key, None)):
+                if waited is None:
+                    continue
+                if isinstance(ex, asyncio.CancelledError):
+                    waited.cancel()
+                else:
+                    waited.set_exception(ex)
+            raise
+        finally:
+            self._running.discard(key)
+
+    async def send(self, interest_records, method, path, payload):
+        """ Sends payload to all the interested microservices at once, each within its own timeout """
+        data = json.dumps(payload, sort_keys=True)
+        requests = []
+        for i in interest_records:
+            # get microservice management server info of microservice through service registry
+            try:
+                service_record = ServiceRegistry.get(idx=i._microservice_uuid)[0]
+            except service_registry_exceptions.DoesNotExist:
+                _LOGGER.exception("Unable to notify microservice with uuid %s as it is not found in the service "
+                                  "registry", i._microservice_uuid)
+                continue
+            requests.append(self._send_one(service_record, i._microservice_uuid, method, path, data))
+        if requests:
+            await asyncio.gather(*requests)
+
+    async def _send_one(self, service_record, microservice_uuid, method, path, data):
+        url = "{}://{}:{}{}".format(service_record._protocol, service_record._address,
+                                    service_record._management_port, path)
+        start = time.monotonic()
+        delivered = False
+        try:
+            delivered = await asyncio.wait_for(self._request(method, url, data), _NOTIFY_TIMEOUT)
+        except asyncio.TimeoutError:
+            _LOGGER.error("Unable to notify microservice with uuid %s within %s seconds", microservice_uuid,
+                          _NOTIFY_TIMEOUT)
+        except Exception as ex:
+            _LOGGER.exception(ex, "Unable to notify microservice with uuid {}".format(microservice_uuid))
+        self._record(service_record._name, time.monotonic() - start, delivered)
+
+    async def _request(self, method, url, data):
+        headers = {'content-type': 'application/json'}
+        session = self._get_session()
+        async with getattr(session, method)(url, data=data, headers=headers) as resp:
+            await resp.text()
+            status_code = resp.status
+            if status_code in range(400, 500):
+                _LOGGER.error("Bad request error code: %d, reason: %s", status_code, resp.reason)
+            if status_code in range(500, 600):
+                _LOGGER.error("Server error code: %d, reason: %s", status_code, resp.reason)
+            return status_code not in range(400, 600)
+
+    def _record(self, service_name, latency, delivered):
+        counters = self._services.get(service_name)
+        if counters is None:
+            counters = self._services[service_name] = {"deliveries": 0, "failures": 0, "latency_total": 0.0,
+                                                       "latency_max": 0.0}
+        counters["deliveries"] += 1
+        if not delivered:
+            counters["failures"] += 1
+        counters["latency_total"] += latency
+        if latency > counters["latency_max"]:
+            counters["latency_max"] = latency
+
+    def metrics(self):
+        return {name: {"deliveries": c["deliveries"],
+                       "failures": c["failures"],
+                       "latency_avg_ms": round(1000 * c["latency_total"] / c["deliveries"], 3),
+                       "latency_max_ms": round(1000 * c["latency_max"], 3)}
+                for name, c in self._services.items()}
+
+
+_dispatcher = _Dispatcher()
+
+
+def delivery_metrics():
+    """ Deliveries, failures and latency of the change notifications by microservice name """
+    return _dispatcher.metrics()
+
+
+async def close():
+    """ Closes the connections to the microservices """
+    await _dispatcher.close()
+
 
 async def run(category_name):
     """ Callback run by configuration category to notify changes to interested microservices
@@ -36,36 +193,20 @@ async def run(category_name):
     cfg_mgr = ConfigurationManager()
     interest_registry = InterestRegistry(cfg_mgr)
     try:
-        interest_records = interest_registry.get(category_name=category_name)
+        interest_registry.get(category_name=category_name)
     except interest_registry_exceptions.DoesNotExist:
         return
 
-    category_value = await cfg_mgr.get_category_all_items(category_name)
-    payload = {"category" : category_name, "items" : category_value}
-    headers = {'content-type': 'application/json'}
-
-    # for each microservice interested in category_name, notify change
-    for i in interest_records:
-        # get microservice management server info of microservice through service registry
-        try: 
-            service_record = ServiceRegistry.get(idx=i._microservice_uuid)[0]
-        except service_registry_exceptions.DoesNotExist:
-            _LOGGER.exception("Unable to notify microservice with uuid %s as it is not found in the service registry", i._microservice_uuid)
-            continue
-        url = "{}://{}:{}/fledge/change".format(service_record._protocol, service_record._address, service_record._management_port)
-
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, data=json.dumps(payload, sort_keys=True), headers=headers) as resp:
-                    result = await resp.text()
-                    status_code = resp.status
-                    if status_code in range(400, 500):
-                        _LOGGER.error("Bad request error code: %d, reason: %s", status_code, resp.reason)
-                    if status_code in range(500, 600):
-                        _LOGGER.error("Server error code: %d, reason: %s", status_code, resp.reason)
-            except Exception as ex:
-                _LOGGER.exception(ex, "Unable to notify microservice with uuid {}".format(i._microservice_uuid))
-                continue
+    async def deliver():
+        try:
+            interest_records = interest_registry.get(category_name=category_name)
+        except interest_registry_exceptions.DoesNotExist:
+            return
+        category_value = await cfg_mgr.get_category_all_items(category_name)
+        payload = {"category": category_name, "items": category_value}
+        await _dispatcher.send(interest_records, 'post', '/fledge/change', payload)
+
+    await _dispatcher.notify(('change', category_name), deliver)
 
 
 async def run_child_create(parent_category_name, child_category_list):
@@ -80,39 +221,22 @@ async def run_child_create(parent_category_name, child_category_list):
     cfg_mgr = ConfigurationManager()
     interest_registry = InterestRegistry(cfg_mgr)
     try:
-        interest_records = interest_registry.get(category_name=parent_category_name)
+        interest_registry.get(category_name=parent_category_name)
     except interest_registry_exceptions.DoesNotExist:
         return
 
-    for child_category in child_category_list:
-
+    async def deliver(child_category):
+        try:
+            interest_records = interest_registry.get(category_name=parent_category_name)
+        except interest_registry_exceptions.DoesNotExist:
+            return
         category_value = await cfg_mgr.get_category_all_items(child_category)
-        payload = {"parent_category" : parent_category_name, "category" : child_category, "items" : category_value}
-        headers = {'content-type': 'application/json'}
+        payload = {"parent_category": parent_category_name, "category": child_category, "items": category_value}
+        await _dispatcher.send(interest_records, 'post', '/fledge/child_create', payload)
 
-        # for each microservice interested in category_name, notify change
-        for i in interest_records:
-            # get microservice management server info of microservice through service registry
-            try:
-                service_record = ServiceRegistry.get(idx=i._microservice_uuid)[0]
-            except service_registry_exceptions.DoesNotExist:
-                _LOGGER.exception("Unable to notify microservice with uuid {} as it is not "
-                                  "found in the service registry".format(i._microservice_uuid))
-                continue
-            url = "{}://{}:{}/fledge/child_create".format(service_record._protocol, service_record._address, service_record._management_port)
-
-            async with aiohttp.ClientSession() as session:
-                try:
-                    async with session.post(url, data=json.dumps(payload, sort_keys=True), headers=headers) as resp:
-                        result = await resp.text()
-                        status_code = resp.status
-                        if status_code in range(400, 500):
-                            _LOGGER.error("Bad request error code: %d, reason: %s", status_code, resp.reason)
-                        if status_code in range(500, 600):
-                            _LOGGER.error("Server error code: %d, reason: %s", status_code, resp.reason)
-                except Exception as ex:
-                    _LOGGER.exception(ex, "Unable to notify microservice with uuid {}".format(i._microservice_uuid))
-                    continue
+    await asyncio.gather(*[_dispatcher.notify(('child_create', parent_category_name, child_category),
+                                              functools.partial(deliver, child_category))
+                           for child_category in child_category_list])
 
 
 async def run_child_delete(parent_category_name, child_category):
@@ -127,37 +251,20 @@ async def run_child_delete(parent_category_name, child_category):
     cfg_mgr = ConfigurationManager()
     interest_registry = InterestRegistry(cfg_mgr)
     try:
-        interest_records = interest_registry.get(category_name=parent_category_name)
+        interest_registry.get(category_name=parent_category_name)
     except interest_registry_exceptions.DoesNotExist:
         return
 
-    category_value = await cfg_mgr.get_category_all_items(child_category)
-    payload = {"parent_category" : parent_category_name, "category" : child_category, "items" : category_value}
-    headers = {'content-type': 'application/json'}
-
-    # for each microservice interested in category_name, notify change
-    for i in interest_records:
-        # get microservice management server info of microservice through service registry
+    async def deliver():
         try:
-            service_record = ServiceRegistry.get(idx=i._microservice_uuid)[0]
-        except service_registry_exceptions.DoesNotExist:
-            _LOGGER.exception("Unable to notify microservice with uuid %s as it is not found in the service registry", i._microservice_uuid)
-            continue
-
-        url = "{}://{}:{}/fledge/child_delete".format(service_record._protocol, service_record._address, service_record._management_port)
+            interest_records = interest_registry.get(category_name=parent_category_name)
+        except interest_registry_exceptions.DoesNotExist:
+            return
+        category_value = await cfg_mgr.get_category_all_items(child_category)
+        payload = {"parent_category": parent_category_name, "category": child_category, "items": category_value}
+        await _dispatcher.send(interest_records, 'delete', '/fledge/child_delete', payload)
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.delete(url, data=json.dumps(payload, sort_keys=True), headers=headers) as resp:
-                    result = await resp.text()
-                    status_code = resp.status
-                    if status_code in range(400, 500):
-                        _LOGGER.error("Bad request error code: %d, reason: %s", status_code, resp.reason)
-                    if status_code in range(500, 600):
-                        _LOGGER.error("Server error code: %d, reason: %s", status_code, resp.reason)
-            except Exception as ex:
-                _LOGGER.exception(ex, "Unable to notify microservice with uuid {}".format(i._microservice_uuid))
-                continue
+    await _dispatcher.notify(('child_delete', parent_category_name, child_category), deliver)
 
 
 async def run_child(parent_category_name, child_category_list, operation):
@@ -40,6 +40,9 @@ class InterestRegistry(InterestRegistrySingleton):
     _registered_interests = None
     """ maintains the list of InterestRecord objects """
 
+    _indexes = None
+    """ dict of InterestRecord objects by registration id by attribute name, then by attribute value """
+
     _configuration_manager = None
     """ ConfigurationManager used by InterestRegistry """
 
@@ -58,13 +61,20 @@ class InterestRegistry(InterestRegistrySingleton):
             self._configuration_manager = configuration_manager
         if self._registered_interests is None:
             self._registered_interests = list()
+            self._indexes = {'_registration_id': {}, '_category_name': {}, '_microservice_uuid': {}}
     
     def and_filter(self, **kwargs):
         """ Used to filter InterestRecord objects based on attribute values.
+
+        The records are looked up by the most selective indexed attribute given a value, then checked against the
+        other attributes.
         """
-        interest_records = None
-        interest_records = [s for s in self._registered_interests if all(getattr(s, k, None) == v for k, v in kwargs.items() if v is not None)]
-        return interest_records
+        criteria = {k: v for k, v in kwargs.items() if v is not None}
+        indexed = [self._indexes[k].get(v, {}) for k, v in criteria.items() if k in self._indexes]
+        if not indexed:
+            return [s for s in self._registered_interests if all(getattr(s, k, None) == v for k, v in criteria.items())]
+        candidates = min(indexed, key=len)
+        return [s for s in candidates.values() if all(getattr(s, k, None) == v for k, v in criteria.items())]
 
     def get(self, registration_id=None, category_name=None, microservice_uuid=None):
         """ Used to filter InterestRecord objects based on attribute values.
@@ -167,6 +177,8 @@ class InterestRegistry(InterestRegistrySingleton):
         registered_interest = InterestRecord(registration_id, microservice_uuid, category_name)
         # add interest record to list of registered interests
         self._registered_interests.append(registered_interest)
+        for k in self._indexes:
+            self._indexes[k].setdefault(getattr(registered_interest, k), {})[registration_id] = registered_interest
 
         return registration_id
 
@@ -185,6 +197,11 @@ class InterestRegistry(InterestRegistrySingleton):
             registered_interests = self.get(registration_id=registration_id)
             interest_record = registered_interests[0]
             self._registered_interests.remove(registered_interests[0])
+            for k in self._indexes:
+                records = self._indexes[k].get(getattr(interest_record, k))
+                records.pop(registration_id, None)
+                if not records:
+                    del self._indexes[k][getattr(interest_record, k)]
         except interest_registry_exceptions.DoesNotExist:
             raise
         # remove entry from configuration manager if no registered interests exist for this category_name
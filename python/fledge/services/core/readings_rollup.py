@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Incrementally maintained rollups of the readings, used by the asset browser
+
+The readings appended to storage are fetched by id, as the north tasks do, and added to per asset and per datapoint
+min, max, sum and count buckets of a second, a minute and an hour. Each resolution keeps its buckets for a
+configurable retention, and the buckets older than the oldest reading left by purge are dropped.
+
+A time range can be aggregated from the rollups only when every bucket needed to build it is complete, that is it
+starts after the rollups have started to follow the readings, it has not expired yet and it ends before the high-water
+mark of the readings fetched so far. Otherwise the caller is expected to query the readings.
+"""
+
+import asyncio
+import calendar
+import collections
+import functools
+import math
+import time
+
+from fledge.common.logger import FLCoreLogger
+from fledge.common.storage_client.payload_builder import PayloadBuilder
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_logger = FLCoreLogger().get_logger(__name__)
+
+RESOLUTIONS = (3600, 60, 1)
+""" Bucket sizes in seconds, the coarsest first """
+
+_DEFAULT_RETENTION = {1: 600, 60: 86400, 3600: 2592000}
+""" Seconds a bucket of each resolution is kept for """
+
+_DEFAULT_FETCH_SIZE = 5000
+""" Number of readings fetched at once """
+
+_MAX_REFRESH_BLOCKS = 20
+""" Maximum number of blocks of readings fetched by a refresh, the next refresh goes on from there """
+
+_PURGE_CHECK_INTERVAL = 60
+""" Seconds between two checks of the oldest reading left by purge """
+
+_rollup = None
+""" Rollups of the core, started by the core server """
+
+
+def get_readings_rollup():
+    """ Rollups of the core, None when they have not been started """
+    return _rollup
+
+
+async def start_readings_rollup(readings):
+    """ Starts the rollups of the core, following the readings appended from now on """
+    global _rollup
+    rollup = ReadingsRollup(readings)
+    await rollup.start()
+    _rollup = rollup
+
+
+async def stop_readings_rollup():
+    global _rollup
+    if _rollup is not None:
+        await _rollup.stop()
+        _rollup = None
+
+
+@functools.lru_cache(maxsize=4096)
+def _epoch_second(timestamp):
+    return calendar.timegm(time.strptime(timestamp, "%Y-%m-%d %H:%M:%S"))
+
+
+def epoch(user_ts):
+    """ Second of a UTC timestamp as returned by the readings fetch, for example 2026-01-01 10:00:00.123456+00 """
+    return _epoch_second(user_ts[:19])
+
+
+class ReadingsRollup(object):
+    """ Min, max, sum and count of the numeric datapoints of the readings per second, minute and hour
+
+    The aggregates of a bucket are kept as a list [min, max, sum, count] by datapoint. Datapoints that are not
+    numbers are not rolled up, they are remembered so that the callers can query the readings for them.
+    """
+
+    def __init__(self, readings, retention=None, fetch_size=_DEFAULT_FETCH_SIZE, refresh_interval=1):
+        """
+        Args:
+            readings: ReadingsStorageClientAsync
+            retention: dict of seconds a bucket is kept for, by resolution
+            fetch_size: number of readings fetched at once
+            refresh_interval: seconds between two refreshes in the background
+        """
+        self._readings = readings
+        self._retention = dict(_DEFAULT_RETENTION, **(retention or {}))
+        self._fetch_size = fetch_size
+        self._refresh_interval = refresh_interval
+        self._buckets = {}
+        """ Buckets by asset code then resolution, each an OrderedDict of aggregates by datapoint by bucket start """
+        self._non_numeric = collections.defaultdict(set)
+        """ Datapoints having values that are not numbers, by asset code """
+        self._covered = None
+        """ Start of the first complete bucket by resolution, None until started """
+        self._last_id = 0
+        self._high_water = None
+        """ Epoch time before which all the readings have been fetched, None until started """
+        self._last_purge_check = 0
+        self._lock = asyncio.Lock()
+        self._observers = []
+        self._task = None
+        self._stats = {"readings": 0, "hits": 0, "misses": 0}
+
+    @property
+    def started(self):
+        return self._covered is not None
+
+    async def start(self):
+        """ Starts to follow the readings appended after now """
+        payload = PayloadBuilder().AGGREGATE(["max", "id"]).ALIAS('aggregate', ('id', 'max', 'last_id')).payload()
+        result = await self._readings.query(payload)
+        last_id = result['rows'][0].get('last_id') if result['rows'] else None
+        self.reset(last_id or 0, time.time())
+        self._task = asyncio.ensure_future(self._refresh_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self, last_id, now):
+        """ Drops all the buckets, the rollups then hold the readings after last_id, that are newer than now """
+        self._buckets = {}
+        self._non_numeric.clear()
+        self._last_id = last_id
+        self._high_water = now
+        self._covered = {r: math.ceil(now / r) * r for r in RESOLUTIONS}
+
+    def add_observer(self, callback):
+        """ Registers a callable given each block of readings fetched, as a list of rows of the readings table """
+        self._observers.append(callback)
+
+    async def refresh(self):
+        """ Adds the readings appended since the last refresh
+
+        The high-water mark is moved to the time of the last fetch when the refresh has caught up with the readings,
+        and to the user timestamp of the last reading fetched otherwise.
+        """
+        async with self._lock:
+            for _ in range(_MAX_REFRESH_BLOCKS):
+                fetched_at = time.time()
+                result = await self._readings.fetch(self._last_id + 1, self._fetch_size)
+                rows = result['rows']
+                for row in rows:
+                    self.add(row['asset_code'], epoch(row['user_ts']), row['reading'])
+                for callback in self._observers:
+                    callback(rows)
+                if len(rows) < self._fetch_size:
+                    if rows:
+                        self._last_id = rows[-1]['id']
+                    self._high_water = fetched_at
+                    break
+                self._last_id = rows[-1]['id']
+                # Readings of the same second may still be to fetch
+                self._high_water = epoch(rows[-1]['user_ts'])
+
+    def add(self, asset_code, second, reading):
+        """ Adds a reading
+
+        Args:
+            asset_code: asset code of the reading
+            second: epoch second of the user timestamp of the reading
+            reading: dict of datapoint values
+        """
+        self._stats["readings"] += 1
+        buckets = self._buckets.get(asset_code)
+        if buckets is None:
+            buckets = self._buckets[asset_code] = {r: collections.OrderedDict() for r in RESOLUTIONS}
+        for r in RESOLUTIONS:
+            start = second - second % r
+            bucket = buckets[r].get(start)
+            if bucket is None:
+                bucket = buckets[r][start] = {}
+            for datapoint, value in reading.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    self._non_numeric[asset_code].add(datapoint)
+                    continue
+                aggregate = bucket.get(datapoint)
+                if aggregate is None:
+                    bucket[datapoint] = [value, value, value, 1]
+                else:
+                    if value < aggregate[0]:
+                        aggregate[0] = value
+                    if value > aggregate[1]:
+                        aggregate[1] = value
+                    aggregate[2] += value
+                    aggregate[3] += 1
+
+    def expire(self, now):
+        """ Drops the buckets older than the retention of their resolution """
+        for r in RESOLUTIONS:
+            self._expire_before(r, now - self._retention[r])
+
+    def expire_before(self, cutoff):
+        """ Drops the buckets holding readings older than cutoff, as purge has removed them from storage """
+        for r in RESOLUTIONS:
+            self._expire_before(r, cutoff)
+
+    def _expire_before(self, resolution, cutoff):
+        covered = math.ceil(cutoff / resolution) * resolution
+        if covered > self._covered[resolution]:
+            self._covered[resolution] = covered
+        for buckets in self._buckets.values():
+            ordered = buckets[resolution]
+            while ordered:
+                start = next(iter(ordered))
+                if start >= self._covered[resolution]:
+                    break
+                ordered.popitem(last=False)
+
+    def drop_asset(self, asset_code):
+        """ Drops the buckets of an asset whose readings have been purged """
+        self._buckets.pop(asset_code, None)
+        self._non_numeric.pop(asset_code, None)
+
+    def clear(self):
+        """ Drops the buckets of all the assets, after all the readings have been purged """
+        self._buckets = {}
+        self._non_numeric.clear()
+
+    def is_numeric(self, asset_code, datapoint=None):
+        """ False when the datapoint, or any datapoint of the asset when None, has a value that is not a number """
+        non_numeric = self._non_numeric.get(asset_code)
+        if not non_numeric:
+            return True
+        return False if datapoint is None else datapoint not in non_numeric
+
+    def aggregate(self, asset_code, start, end, size, offset=0):
+        """ Aggregates the readings of an asset in groups of size seconds
+
+        Args:
+            asset_code: asset code
+            start: first epoch second of the range
+            end: epoch second following the range
+            size: group size in seconds
+            offset: seconds added to the epoch to align the groups, the UTC offset to align them on local time
+        Returns:
+            None when the range can not be aggregated from the rollups, otherwise the list of the groups holding
+            readings in ascending order, as tuples of the group start and the dict of [min, max, sum, count] by
+            datapoint
+        """
+        if not self.started or size < 1 or size != int(size) or end > self._high_water:
+            self._stats["misses"] += 1
+            return None
+        buckets = self._buckets.get(asset_code, {})
+        groups = []
+        group_start = (start + offset) // size * size - offset
+        while group_start < end:
+            merged = self._merge(buckets, max(group_start, start), min(group_start + size, end))
+            if merged is None:
+                self._stats["misses"] += 1
+                return None
+            if merged:
+                groups.append((group_start, merged))
+            group_start += size
+        self._stats["hits"] += 1
+        return groups
+
+    def latest(self, asset_code, datapoint, size, count, now, offset=0):
+        """ Aggregates a datapoint over the count latest groups of size seconds holding readings of it
+
+        Returns:
+            None when there are less than count such groups in the rollups or the group of now ends after the
+            high-water mark, otherwise the list of the groups in descending order, as tuples of the group start and
+            [min, max, sum, count]
+        """
+        if not self.started or size < 1 or size != int(size):
+            self._stats["misses"] += 1
+            return None
+        buckets = self._buckets.get(asset_code, {})
+        covered = min(self._covered.values())
+        groups = []
+        group_start = (int(now) + offset) // size * size - offset
+        if group_start + size > self._high_water:
+            self._stats["misses"] += 1
+            return None
+        while len(groups) < count:
+            if group_start < covered:
+                self._stats["misses"] += 1
+                return None
+            merged = self._merge(buckets, group_start, group_start + size)
+            if merged is None:
+                self._stats["misses"] += 1
+                return None
+            if datapoint in merged:
+                groups.append((group_start, merged[datapoint]))
+            group_start -= size
+        self._stats["hits"] += 1
+        return groups
+
+    def _merge(self, buckets, low, high):
+        """ Merges the buckets of the range [low, high), None when a bucket needed is not complete """
+        merged = {}
+        t = low
+        while t < high:
+            for r in RESOLUTIONS:
+                if t % r == 0 and t + r <= high and t >= self._covered[r]:
+                    break
+            else:
+                return None
+            bucket = buckets[r].get(t) if buckets else None
+            if bucket:
+                for datapoint, aggregate in bucket.items():
+                    current = merged.get(datapoint)
+                    if current is None:
+                        merged[datapoint] = list(aggregate)
+                    else:
+                        if aggregate[0] < current[0]:
+                            current[0] = aggregate[0]
+                        if aggregate[1] > current[1]:
+                            current[1] = aggregate[1]
+                        current[2] += aggregate[2]
+                        current[3] += aggregate[3]
+            t += r
+        return merged
+
+    def metrics(self):
+        return dict(self._stats, assets=len(self._buckets), last_id=self._last_id, high_water=self._high_water,
+                    buckets=sum(len(ordered) for buckets in self._buckets.values() for ordered in buckets.values()))
+
+    async def _check_purge(self):
+        """ Drops the buckets older than the oldest reading left by purge """
+        result = await self._readings.fetch(1, 1)
+        if result['rows']:
+            self.expire_before(epoch(result['rows'][0]['user_ts']))
+        else:
+            self.clear()
+
+    async def _refresh_forever(self):
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self.refresh()
+                now = time.time()
+                self.expire(now)
+                if now - self._last_purge_check >= _PURGE_CHECK_INTERVAL:
+                    self._last_purge_check = now
+                    await self._check_purge()
+            except Exception as ex:
+                _logger.warning("Failed to refresh the readings rollups. %s", str(ex))
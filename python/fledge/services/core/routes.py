@@ -72,6 +72,7 @@ def setup(app):
     app.router.add_route('POST', '/fledge/category/{category_name}/{config_item}', api_configuration.add_configuration_item)
     app.router.add_route('DELETE', '/fledge/category/{category_name}/{config_item}/value', api_configuration.delete_configuration_item_value)
     app.router.add_route('POST', '/fledge/category/{category_name}/{config_item}/upload', api_configuration.upload_script)
+    app.router.add_route('GET', '/fledge/configuration/cache', api_configuration.get_cache_metrics)
     # Scheduler
     # Scheduled_processes - As per doc
     app.router.add_route('GET', '/fledge/schedule/process', api_scheduler.get_scheduled_processes)
@@ -82,6 +83,7 @@ def setup(app):
     app.router.add_route('GET', '/fledge/schedule', api_scheduler.get_schedules)
     app.router.add_route('POST', '/fledge/schedule', api_scheduler.post_schedule)
     app.router.add_route('GET', '/fledge/schedule/type', api_scheduler.get_schedule_type)
+    app.router.add_route('GET', '/fledge/schedule/metrics', api_scheduler.get_schedule_metrics)
     app.router.add_route('GET', '/fledge/schedule/{schedule_id}', api_scheduler.get_schedule)
     app.router.add_route('PUT', '/fledge/schedule/{schedule_id}/enable', api_scheduler.enable_schedule)
     app.router.add_route('PUT', '/fledge/schedule/{schedule_id}/disable', api_scheduler.disable_schedule)
@@ -106,6 +108,7 @@ def setup(app):
     app.router.add_route('DELETE', '/fledge/service/{service_name}', service.delete_service)
     app.router.add_route('GET', '/fledge/service/available', service.get_available)
     app.router.add_route('GET', '/fledge/service/installed', service.get_installed)
+    app.router.add_route('GET', '/fledge/service/monitor', service.get_monitor_metrics)
     app.router.add_route('PUT', '/fledge/service/{type}/{name}/update', service.update_service)
     app.router.add_route('POST', '/fledge/service/{service_name}/otp', service.issueOTPToken)
 
@@ -173,6 +176,7 @@ def setup(app):
 
     # Plugins (install, discovery, update, delete)
     app.router.add_route('GET', '/fledge/plugins/installed', plugins_discovery.get_plugins_installed)
+    app.router.add_route('PUT', '/fledge/plugins/installed/refresh', plugins_discovery.refresh_plugins_installed)
     app.router.add_route('GET', '/fledge/plugins/available', plugins_discovery.get_plugins_available)
     app.router.add_route('POST', '/fledge/plugins', plugins_install.add_plugin)
     if api_common.get_version() <= "2.1.0":
@@ -9,6 +9,7 @@
 import asyncio
 import collections
 import datetime
+import heapq
 import logging
 import math
 import time
@@ -27,6 +28,8 @@ from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.services.core.scheduler.entities import *
 from fledge.services.core.scheduler.exceptions import *
+from fledge.services.core.scheduler.task_table import TaskTable
+from fledge.services.core.scheduler.task_zygote import TASK_MODULES, TaskZygote
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
 from fledge.services.core.service_registry import exceptions as service_registry_exceptions
 from fledge.services.common import utils
@@ -68,7 +71,7 @@ class Scheduler(object):
 
     class _TaskProcess(object):
         """Tracks a running task with some flags"""
-        __slots__ = ['task_id', 'process', 'cancel_requested', 'schedule', 'start_time', 'future']
+        __slots__ = ['task_id', 'process', 'cancel_requested', 'schedule', 'start_time', 'future', 'start_latency']
 
         def __init__(self):
             self.task_id = None  # type: uuid.UUID
@@ -79,6 +82,8 @@ class Scheduler(object):
             self.start_time = None  # type: int
             """Epoch time when the task was started"""
             self.future = None
+            self.start_latency = None  # type: float
+            """Seconds taken to start the process"""
 
     # TODO: Methods that accept a schedule and look in _schedule_executions
     # should accept schedule_execution instead. Add reference to schedule
@@ -97,6 +102,60 @@ class Scheduler(object):
             self.start_now = False
             """True when a task is queued to start via :meth:`start_task`"""
 
+    class _TimerQueue(object):
+        """Schedules for :meth:`_check_schedules` to visit: a heap of their next start times,
+        and the schedules changed since they were last visited, whatever their start time
+
+        A schedule has at most one start time in the queue. Superseded entries stay in the heap
+        until they reach its top or the heap is rebuilt.
+        """
+
+        __slots__ = ['_heap', '_start_times', '_changed']
+
+        def __init__(self):
+            self._heap = []
+            """Heap of (start time, schedules.id), including superseded entries"""
+            self._start_times = dict()
+            """Dictionary of schedules.id to its start time in the heap"""
+            self._changed = set()
+            """schedules.id of the schedules to visit on the next check"""
+
+        def __len__(self):
+            return len(self._start_times)
+
+        def mark(self, schedule_id):
+            self._changed.add(schedule_id)
+
+        def push(self, schedule_id, start_time):
+            """Sets the start time of a schedule, None removes it from the queue"""
+            if start_time is None:
+                self._start_times.pop(schedule_id, None)
+                return
+            if self._start_times.get(schedule_id) == start_time:
+                return
+            self._start_times[schedule_id] = start_time
+            heapq.heappush(self._heap, (start_time, schedule_id))
+            if len(self._heap) > 2 * len(self._start_times) + 64:
+                self._heap = [(t, s) for s, t in self._start_times.items()]
+                heapq.heapify(self._heap)
+
+        def pop_due(self, now):
+            """Removes and returns the schedules that are due at now or have changed"""
+            due = self._changed
+            self._changed = set()
+            while self._heap and self._heap[0][0] <= now:
+                start_time, schedule_id = heapq.heappop(self._heap)
+                if self._start_times.get(schedule_id) == start_time:
+                    del self._start_times[schedule_id]
+                    due.add(schedule_id)
+            return due
+
+        def earliest(self):
+            """Returns the earliest start time in the queue or None"""
+            while self._heap and self._start_times.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
     # Constant class attributes
     _DEFAULT_MAX_RUNNING_TASKS = 50
     """Maximum number of running tasks allowed at any given time"""
@@ -180,6 +239,20 @@ class Scheduler(object):
         """asynico task for :meth:`purge_tasks`, if scheduled to run"""
         self._restore_backup_id = None # type: int
         """Restore backup id and it will be used when SCHEDULE_RESTORE_ON_DEMAND runs"""
+        self._use_task_zygote = False
+        """When True the Python tasks are forked by the task zygote"""
+        self._task_zygote = None  # type: TaskZygote
+        """Task zygote, when it is used and has started"""
+        self._task_start_latencies = dict()
+        """Dictionary of scheduled_processes.name to the number of tasks started, forked and their start latencies"""
+        self._timer_queue = self._TimerQueue()
+        """Next start times of the schedules, and the schedules changed since :meth:`_check_schedules` last ran"""
+        self._scheduling_lag = {"tasks": 0, "lag_ms_total": 0.0, "lag_ms_max": 0.0, "lag_ms_last": None}
+        """Number of tasks started at a scheduled time and their lag behind it"""
+        self._task_table = None  # type: TaskTable
+        """Buffered writes to the tasks table and latest task of each schedule, once started"""
+        self._purge_tasks_progress = {"deleted": 0, "chunks": 0, "done": None}
+        """Rows deleted by the last or running :meth:`purge_tasks`, and whether it has completed"""
 
     @property
     def max_completed_task_age(self) -> datetime.timedelta:
@@ -263,18 +336,24 @@ class Scheduler(object):
             else:
                 state = Task.State.COMPLETE
             # Update the task's status
-            update_payload = PayloadBuilder() \
-                .SET(exit_code=exit_code,
-                     state=int(state),
-                     end_time=str(common_utils.local_timestamp())) \
-                .WHERE(['id', '=', str(task_process.task_id)]) \
-                .payload()
-            try:
-                self._logger.debug('Database command: %s', update_payload)
-                res = await self._storage_async.update_tbl("tasks", update_payload)
-            except Exception:
-                self._logger.exception('Update failed: %s', update_payload)
-                # Must keep going!
+            if self._task_table is not None:
+                self._task_table.update(str(task_process.task_id), task_process.schedule.name, exit_code=exit_code,
+                                        state=int(state), end_time=str(common_utils.local_timestamp()))
+            else:
+                update_payload = PayloadBuilder() \
+                    .SET(exit_code=exit_code,
+                         state=int(state),
+                         end_time=str(common_utils.local_timestamp())) \
+                    .WHERE(['id', '=', str(task_process.task_id)]) \
+                    .payload()
+                try:
+                    self._logger.debug('Database command: %s', update_payload)
+                    res = await self._storage_async.update_tbl("tasks", update_payload)
+                except Exception:
+                    self._logger.exception('Update failed: %s', update_payload)
+                    # Must keep going!
+
+        self._check_schedule_soon(schedule.id)
 
         # Due to maximum running tasks reached, it is necessary to
         # look for schedules that are ready to run even if there
@@ -329,18 +408,31 @@ class Scheduler(object):
         
         task_process = self._TaskProcess()
         task_process.start_time = time.time()
+        start = time.perf_counter()
 
-        try:
-            process = await asyncio.create_subprocess_exec(*args_to_exec, cwd=_SCRIPTS_DIR)
-        except EnvironmentError:
-            self._logger.exception(
-                "Unable to start schedule '%s' process '%s'\n%s",
-                schedule.name, schedule.process_name, args_to_exec_printable)
-            raise
+        process = None
+        if self._task_zygote is not None and args[0] in TASK_MODULES:
+            try:
+                process = await self._task_zygote.start_task(TASK_MODULES[args[0]], args_to_exec[1:])
+            except EnvironmentError as ex:
+                self._logger.warning("Unable to fork schedule '%s' process '%s' from the task zygote, running its "
+                                     "script. %s", schedule.name, schedule.process_name, str(ex))
+        forked = process is not None
+        if process is None:
+            try:
+                process = await asyncio.create_subprocess_exec(*args_to_exec, cwd=_SCRIPTS_DIR)
+            except EnvironmentError:
+                self._logger.exception(
+                    "Unable to start schedule '%s' process '%s'\n%s",
+                    schedule.name, schedule.process_name, args_to_exec_printable)
+                raise
 
         if dryrun:
             return
 
+        task_process.start_latency = time.perf_counter() - start
+        self._record_task_start(schedule, task_process.start_latency, forked)
+
         task_id = uuid.uuid4()
         task_process.process = process
         task_process.schedule = schedule
@@ -358,24 +450,44 @@ class Scheduler(object):
         # Startup tasks are not tracked in the tasks table and do not have any future associated with them.
         if schedule.type != Schedule.Type.STARTUP:
             # The task row needs to exist before the completion handler runs
-            insert_payload = PayloadBuilder() \
-                .INSERT(id=str(task_id),
-                        pid=(self._schedule_executions[schedule.id].
-                             task_processes[task_id].process.pid),
-                        schedule_name=schedule.name,
-                        schedule_id=str(schedule.id),
-                        process_name=schedule.process_name,
-                        state=int(Task.State.RUNNING),
-                        start_time=str(common_utils.local_timestamp())) \
-                .payload()
-            try:
-                self._logger.debug('Database command: %s', insert_payload)
-                res = await self._storage_async.insert_into_tbl("tasks", insert_payload)
-            except Exception:
-                self._logger.exception('Insert failed: %s', insert_payload)
-                # The process has started. Regardless of this error it must be waited on.
+            row = dict(id=str(task_id),
+                       pid=(self._schedule_executions[schedule.id].
+                            task_processes[task_id].process.pid),
+                       schedule_name=schedule.name,
+                       schedule_id=str(schedule.id),
+                       process_name=schedule.process_name,
+                       state=int(Task.State.RUNNING),
+                       start_time=str(common_utils.local_timestamp()))
+            if self._task_table is not None:
+                self._task_table.insert(row)
+            else:
+                insert_payload = PayloadBuilder().INSERT(**row).payload()
+                try:
+                    self._logger.debug('Database command: %s', insert_payload)
+                    res = await self._storage_async.insert_into_tbl("tasks", insert_payload)
+                except Exception:
+                    self._logger.exception('Insert failed: %s', insert_payload)
+                    # The process has started. Regardless of this error it must be waited on.
             self._task_processes[task_id].future = asyncio.ensure_future(self._wait_for_task_completion(task_process))
 
+    def _record_task_start(self, schedule, start_latency, forked):
+        latencies = self._task_start_latencies.setdefault(
+            schedule.process_name, {"tasks": 0, "forked": 0, "start_ms_total": 0.0, "start_ms_max": 0.0})
+        start_ms = start_latency * 1000
+        latencies["tasks"] += 1
+        latencies["forked"] += 1 if forked else 0
+        latencies["start_ms_total"] += start_ms
+        latencies["start_ms_max"] = max(latencies["start_ms_max"], start_ms)
+        self._logger.debug("Process of schedule '%s' started in %.1f ms%s", schedule.name, start_ms,
+                           " from the task zygote" if forked else "")
+
+    def task_start_metrics(self):
+        """Returns the number of tasks started and their average and maximum start latency, by process name"""
+        return {name: {"tasks": latencies["tasks"], "forked": latencies["forked"],
+                       "start_ms_avg": round(latencies["start_ms_total"] / latencies["tasks"], 3),
+                       "start_ms_max": round(latencies["start_ms_max"], 3)}
+                for name, latencies in self._task_start_latencies.items()}
+
     async def purge_tasks(self):
         """Deletes rows from the tasks table"""
         if self._paused:
@@ -384,26 +496,83 @@ class Scheduler(object):
         if not self._ready:
             raise NotReadyError()
 
-        delete_payload = PayloadBuilder() \
+        select_payload = PayloadBuilder() \
+            .SELECT("id") \
             .WHERE(["state", "!=", int(Task.State.RUNNING)]) \
             .AND_WHERE(["start_time", "<", str(datetime.datetime.now() - self._max_completed_task_age)]) \
             .LIMIT(self._DELETE_TASKS_LIMIT) \
             .payload()
+        progress = self._purge_tasks_progress = {"deleted": 0, "chunks": 0, "done": False}
+        payload = select_payload
         try:
-            self._logger.debug('Database command: %s', delete_payload)
+            # The storage delete has no limit, the ids of at most _DELETE_TASKS_LIMIT rows are selected and deleted
+            # in each transaction, until fewer are selected
             while not self._paused:
-                res = await self._storage_async.delete_from_tbl("tasks", delete_payload)
-                # TODO: Uncomment below when delete count becomes available in storage layer
-                # if res.get("count") < self._DELETE_TASKS_LIMIT:
-                break
+                payload = select_payload
+                self._logger.debug('Database command: %s', payload)
+                res = await self._storage_async.query_tbl_with_payload("tasks", payload)
+                ids = [row['id'] for row in res['rows']]
+                if ids:
+                    payload = PayloadBuilder().WHERE(["id", "in", ids]).payload()
+                    self._logger.debug('Database command: %s', payload)
+                    res = await self._storage_async.delete_from_tbl("tasks", payload)
+                    deleted = res.get("rows_affected") if isinstance(res, dict) else None
+                    progress["chunks"] += 1
+                    progress["deleted"] += len(ids) if deleted is None else deleted
+                if len(ids) < self._DELETE_TASKS_LIMIT:
+                    progress["done"] = True
+                    break
+                self._logger.debug("Purged %s rows of the tasks table so far", progress["deleted"])
         except Exception:
-            self._logger.exception('Delete failed: %s', delete_payload)
+            self._logger.exception('Delete failed: %s', payload)
             raise
         finally:
             self._purge_tasks_task = None
 
+        if progress["deleted"]:
+            self._logger.info("Purged %s rows of the tasks table in %s chunks", progress["deleted"],
+                              progress["chunks"])
+
         self._last_task_purge_time = time.time()
 
+    def purge_tasks_progress(self):
+        """Returns the number of rows deleted by the last or running purge of the tasks table, the number of
+        deletes, and whether it has completed, None when it has not run"""
+        return dict(self._purge_tasks_progress)
+
+    def task_table_metrics(self):
+        """Returns the counters of the buffered writes to the tasks table, None before the scheduler has started"""
+        return self._task_table.metrics() if self._task_table is not None else None
+
+    async def flush_tasks(self):
+        """Writes the buffered rows of the tasks table, before it is read or deleted from without the scheduler"""
+        if self._task_table is not None:
+            await self._task_table.flush()
+
+    def forget_latest_task(self, schedule_name):
+        """Forgets the latest task of a schedule whose tasks have been deleted"""
+        if self._task_table is not None:
+            self._task_table.forget(schedule_name)
+
+    async def get_latest_tasks(self, name=None):
+        """Retrieves the latest task of each schedule, by start time
+
+        Args:
+            name: name of a schedule, to retrieve its latest task only
+
+        Returns:
+            list of dict with the fields of the tasks table, ordered by schedule name. The start and end time are
+            formatted as by :meth:`get_tasks`.
+
+        Raises:
+            NotReadyError: The scheduler has not started
+        """
+        if self._task_table is None:
+            raise NotReadyError()
+        schedule_names = [name] if name is not None else [schedule.name for schedule in self._schedules.values()]
+        await self._task_table.load_latest(schedule_names)
+        return self._task_table.latest(name)
+
     def _check_purge_tasks(self):
         """Schedules :meth:`_purge_tasks` to run if sufficient time has elapsed
         since it last ran
@@ -413,16 +582,36 @@ class Scheduler(object):
                     time.time() - self._last_task_purge_time) >= self._PURGE_TASKS_FREQUENCY_SECONDS):
             self._purge_tasks_task = asyncio.ensure_future(self.purge_tasks())
 
+    def _check_schedule_soon(self, schedule_id):
+        """Makes :meth:`_check_schedules` visit a schedule the next time it runs"""
+        self._timer_queue.mark(schedule_id)
+
     async def _check_schedules(self):
-        """Starts tasks according to schedules based on the current time"""
-        earliest_start_time = None
+        """Starts tasks according to schedules based on the current time
+
+        Visits only the schedules whose start time has come and the schedules
+        changed since the last check, see :meth:`_check_schedule_soon`.
 
-        # Can not iterate over _schedule_executions - it can change mid-iteration
-        for schedule_id in list(self._schedule_executions.keys()):
+        Returns:
+            The earliest time a task is to start, or None
+        """
+        now = self.current_time if self.current_time else time.time()
+        due = self._timer_queue.pop_due(now)
+        # Queued tasks first, then the most overdue schedules
+        schedule_ids = sorted(due, key=self._start_order)
+
+        for index, schedule_id in enumerate(schedule_ids):
             if self._paused or len(self._task_processes) >= self._max_running_tasks:
+                for pending_id in schedule_ids[index:]:
+                    self._check_schedule_soon(pending_id)
                 return None
 
-            schedule_execution = self._schedule_executions[schedule_id]
+            try:
+                schedule_execution = self._schedule_executions[schedule_id]
+            except KeyError:
+                # No task to start for the schedule
+                self._timer_queue.push(schedule_id, None)
+                continue
 
             try:
                 schedule = self._schedules[schedule_id]
@@ -432,10 +621,14 @@ class Scheduler(object):
                     del self._schedule_executions[schedule_id]
                 continue
 
+            # A disabled schedule is visited again when enabled, an exclusive
+            # schedule when its task completes
             if schedule.enabled is False:
+                self._timer_queue.push(schedule_id, None)
                 continue
 
             if schedule.exclusive and schedule_execution.task_processes:
+                self._timer_queue.push(schedule_id, None)
                 continue
 
             # next_start_time is None when repeat is None until the
@@ -444,6 +637,7 @@ class Scheduler(object):
             if not next_start_time and not schedule_execution.start_now:
                 if not schedule_execution.task_processes:
                     del self._schedule_executions[schedule_id]
+                self._timer_queue.push(schedule_id, None)
                 continue
 
             if next_start_time and not schedule_execution.start_now:
@@ -455,6 +649,9 @@ class Scheduler(object):
             if right_time or schedule_execution.start_now:
                 # Start a task
 
+                if right_time:
+                    self._record_scheduling_lag(now - next_start_time)
+
                 if not right_time:
                     # Manual start - don't change next_start_time
                     pass
@@ -478,12 +675,38 @@ class Scheduler(object):
                 # will undo that because, after all, the task started.
                 schedule_execution.start_now = False
 
-            # Keep track of the earliest next_start_time
-            if next_start_time and (earliest_start_time is None or
-                                            earliest_start_time > next_start_time):
-                earliest_start_time = next_start_time
+            # Keep track of the next start time
+            if schedule.exclusive and schedule_execution.task_processes:
+                next_start_time = None
+            self._timer_queue.push(schedule_id, next_start_time)
+
+        return self._timer_queue.earliest()
 
-        return earliest_start_time
+    def _start_order(self, schedule_id):
+        try:
+            schedule_execution = self._schedule_executions[schedule_id]
+        except KeyError:
+            return 0, 0
+        if schedule_execution.start_now or not schedule_execution.next_start_time:
+            return 0, 0
+        return 1, schedule_execution.next_start_time
+
+    def _record_scheduling_lag(self, lag):
+        lag_ms = max(lag, 0) * 1000
+        self._scheduling_lag["tasks"] += 1
+        self._scheduling_lag["lag_ms_total"] += lag_ms
+        self._scheduling_lag["lag_ms_max"] = max(self._scheduling_lag["lag_ms_max"], lag_ms)
+        self._scheduling_lag["lag_ms_last"] = lag_ms
+
+    def scheduling_lag_metrics(self):
+        """Returns the number of tasks started at a scheduled time, the average, maximum and last lag of their
+        start behind that time, and the number of schedules waiting for their start time"""
+        lag = self._scheduling_lag
+        return {"tasks": lag["tasks"],
+                "lag_ms_avg": round(lag["lag_ms_total"] / lag["tasks"], 3) if lag["tasks"] else None,
+                "lag_ms_max": round(lag["lag_ms_max"], 3),
+                "lag_ms_last": round(lag["lag_ms_last"], 3) if lag["lag_ms_last"] is not None else None,
+                "schedules_waiting": len(self._timer_queue)}
 
     async def _scheduler_loop(self):
         """Main loop for the scheduler"""
@@ -575,6 +798,7 @@ class Scheduler(object):
 
         schedule_execution = self._schedule_executions[schedule.id]
         advance_seconds = schedule.repeat_seconds
+        self._check_schedule_soon(schedule.id)
 
         if self._paused or advance_seconds is None:
             schedule_execution.next_start_time = None
@@ -638,6 +862,7 @@ class Scheduler(object):
         except KeyError:
             schedule_execution = self._ScheduleExecution()
             self._schedule_executions[schedule.id] = schedule_execution
+        self._check_schedule_soon(schedule.id)
 
         if schedule.type == Schedule.Type.INTERVAL:
             advance_seconds = schedule.repeat_seconds
@@ -758,6 +983,13 @@ class Scheduler(object):
                 "default": str(self._DEFAULT_MAX_COMPLETED_TASK_AGE_DAYS),
                 "displayName": "Max Age Of Task (In days)"
             },
+            "task_zygote": {
+                "description": "Start the Python tasks by forking a process that has already loaded them, "
+                               "applied when Fledge is restarted",
+                "type": "boolean",
+                "default": "false",
+                "displayName": "Fork Python Tasks"
+            },
         }
 
         cfg_manager = ConfigurationManager(self._storage_async)
@@ -767,6 +999,18 @@ class Scheduler(object):
         self._max_running_tasks = int(config['max_running_tasks']['value'])
         self._max_completed_task_age = datetime.timedelta(
             seconds=int(config['max_completed_task_age_days']['value']) * self._DAY_SECONDS)
+        self._use_task_zygote = config['task_zygote']['value'] == 'true'
+
+    async def _start_task_zygote(self):
+        """Starts the task zygote, the tasks are started by their scripts when it fails"""
+        task_zygote = TaskZygote()
+        try:
+            await task_zygote.start(os.path.expanduser(_FLEDGE_ROOT + '/python'))
+        except Exception as ex:
+            self._logger.warning("Unable to start the task zygote, the tasks are started by their scripts. %s",
+                                 str(ex))
+            return
+        self._task_zygote = task_zygote
 
     async def start(self):
         """Starts the scheduler
@@ -817,6 +1061,11 @@ class Scheduler(object):
         await self._read_config()
         await self._mark_tasks_interrupted()
         await self._read_storage()
+        self._task_table = TaskTable(self._storage_async)
+        await self._task_table.load_latest([schedule.name for schedule in self._schedules.values()])
+        self._task_table.start()
+        if self._use_task_zygote and not self._is_safe_mode:
+            await self._start_task_zygote()
 
         self._ready = True
         if not self._is_safe_mode:
@@ -910,7 +1159,16 @@ class Scheduler(object):
             if task_count != 0:
                 raise TimeoutError("Timeout Error: Could not stop scheduler as {} tasks are pending".format(task_count))
 
+        if self._task_zygote is not None:
+            await self._task_zygote.stop()
+            self._task_zygote = None
+
+        if self._task_table is not None:
+            await self._task_table.stop()
+            self._task_table = None
+
         self._schedule_executions = None
+        self._timer_queue = self._TimerQueue()
         self._task_processes = None
         self._schedules = None
         self._process_scripts = None
@@ -1130,6 +1388,7 @@ class Scheduler(object):
             process_name=schedule.process_name)
 
         self._schedules[schedule.schedule_id] = schedule_row
+        self._check_schedule_soon(schedule.schedule_id)
 
         # Add process to self._process_scripts if not present.
         try:
@@ -1204,6 +1463,7 @@ class Scheduler(object):
                 if schedule_type == Schedule.Type.STARTUP:  # If schedule is a service e.g. South services
                     del self._schedule_executions[schedule.id]
                     del self._task_processes[task_process.task_id]
+                    self._check_schedule_soon(schedule.id)
                     self._logger.info("Service {} records successfully removed".format(service_name))
                     return True
         except KeyError:
@@ -1238,6 +1498,7 @@ class Scheduler(object):
 
         # Disable Schedule - update the schedule in memory
         self._schedules[schedule_id] = self._schedules[schedule_id]._replace(enabled=False)
+        self._check_schedule_soon(schedule_id)
 
         # Update database
         update_payload = PayloadBuilder().SET(enabled='f').WHERE(['id', '=', str(schedule_id)]).payload()
@@ -1407,6 +1668,7 @@ class Scheduler(object):
 
         if start_now:
             schedule_execution.start_now = True
+        self._check_schedule_soon(schedule_id)
 
         self._logger.debug("Queued schedule '%s' for execution", schedule_row.name)
         self._resume_check_schedules()
@@ -1435,6 +1697,8 @@ class Scheduler(object):
             raise ScheduleNotFoundError(schedule_id)
 
         del self._schedules[schedule_id]
+        self._check_schedule_soon(schedule_id)
+        self.forget_latest_task(schedule.name)
 
         # TODO: Inspect race conditions with _set_first
         delete_payload = PayloadBuilder() \
@@ -1478,6 +1742,8 @@ class Scheduler(object):
 
     async def get_task(self, task_id: uuid.UUID) -> Task:
         """Retrieves a task given its id"""
+        if self._task_table is not None:
+            await self._task_table.flush()
         query_payload = PayloadBuilder().SELECT("id", "process_name", "schedule_name", "state", "start_time", "end_time", "reason", "exit_code")\
             .ALIAS("return", ("start_time", 'start_time'), ("end_time", 'end_time'))\
             .FORMAT("return", ("start_time", "YYYY-MM-DD HH24:MI:SS.MS"), ("end_time", "YYYY-MM-DD HH24:MI:SS.MS"))\
@@ -1517,6 +1783,8 @@ class Scheduler(object):
                 A tuple of Task attributes to sort by.
                 Defaults to ("start_time", "desc")
         """
+        if self._task_table is not None:
+            await self._task_table.flush()
         chain_payload = PayloadBuilder().SELECT("id", "process_name", "schedule_name", "state", "start_time", "end_time", "reason", "exit_code") \
             .ALIAS("return", ("start_time", 'start_time'), ("end_time", 'end_time'))\
             .FORMAT("return", ("start_time", "YYYY-MM-DD HH24:MI:SS.MS"), ("end_time", "YYYY-MM-DD HH24:MI:SS.MS"))\
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Writes of the scheduler to the tasks table, and the latest task of each schedule
+
+The row of a task is inserted when it starts and updated when it exits. The inserts and the updates are buffered
+and written every flush interval with a single multi-row insert and a single multi-row update, an update of a task
+whose row is still buffered being merged into its insert. When the multi-row insert fails, the rows are inserted one
+at a time, and a row that still fails is discarded after a few flushes. The readers of the tasks table flush the
+buffer first, so that they see every task started.
+
+The latest task of each schedule, by start time, is kept with the fields returned by the task APIs. It is read once
+per schedule from the tasks table, using its index on schedule name and start time, then kept up to date by the
+writes, so that it does not depend on the number of rows in the tasks table.
+"""
+
+import asyncio
+import collections
+import datetime
+import json
+
+from fledge.common.logger import FLCoreLogger
+from fledge.common.storage_client.payload_builder import PayloadBuilder
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_logger = FLCoreLogger().get_logger(__name__)
+
+_DEFAULT_FLUSH_INTERVAL = 1
+""" Seconds between two writes of the buffered rows """
+
+_FLUSH_SIZE = 100
+""" Number of buffered rows that wakes up the writer before the flush interval """
+
+_MAX_INSERT_ATTEMPTS = 5
+""" Number of flushes failing to insert the row of a task before it is discarded """
+
+TASK_FIELDS = ("id", "schedule_name", "process_name", "state", "start_time", "end_time", "reason", "pid",
+               "exit_code")
+""" Fields of the latest task of a schedule """
+
+_TIMESTAMP_FORMAT = "YYYY-MM-DD HH24:MI:SS.MS"
+""" Format of the start and end time of the latest tasks, as returned by the task APIs """
+
+
+def format_timestamp(timestamp):
+    """ Returns a timestamp written to the tasks table as it is read with _TIMESTAMP_FORMAT """
+    dt = datetime.datetime.fromisoformat(timestamp)
+    return "{}.{:03d}".format(dt.strftime("%Y-%m-%d %H:%M:%S"), dt.microsecond // 1000)
+
+
+class TaskTable(object):
+    """ Buffered writes to the tasks table and the latest task of each schedule """
+
+    def __init__(self, storage, flush_interval=_DEFAULT_FLUSH_INTERVAL):
+        self._storage = storage
+        self._flush_interval = flush_interval
+        self._inserts = collections.OrderedDict()
+        """ Dictionary of tasks.id to the row to insert """
+        self._updates = collections.OrderedDict()
+        """ Dictionary of tasks.id to the columns to update """
+        self._latest = dict()
+        """ Dictionary of schedules.schedule_name to its latest task, None when it has none """
+        self._attempts = dict()
+        """ Dictionary of tasks.id to the number of failed inserts of its row """
+        self._flush_lock = asyncio.Lock()
+        self._flush_wakeup = asyncio.Event()
+        self._flush_task = None
+        self._stats = {"inserted": 0, "updated": 0, "flushes": 0, "failures": 0, "discarded": 0}
+
+    def start(self):
+        """ Writes the buffered rows in the background """
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_forever())
+
+    async def stop(self):
+        """ Stops writing in the background and writes the buffered rows """
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if not await self.flush():
+            _logger.warning("Discarded %s task rows that could not be written.", self.pending)
+
+    @property
+    def pending(self):
+        return len(self._inserts) + len(self._updates)
+
+    async def load_latest(self, schedule_names):
+        """ Reads the latest task of each schedule not read yet from the tasks table """
+        for name in schedule_names:
+            if name in self._latest:
+                continue
+            payload = PayloadBuilder().SELECT(*TASK_FIELDS) \
+                .ALIAS("return", ("start_time", 'start_time'), ("end_time", 'end_time')) \
+                .FORMAT("return", ("start_time", _TIMESTAMP_FORMAT), ("end_time", _TIMESTAMP_FORMAT)) \
+                .WHERE(["schedule_name", "=", name]) \
+                .ORDER_BY(["start_time", "desc"]) \
+                .LIMIT(1) \
+                .payload()
+            try:
+                res = await self._storage.query_tbl_with_payload("tasks", payload)
+            except Exception as ex:
+                _logger.error(ex, "Failed to read the latest task of schedule '{}'.".format(name))
+                continue
+            # A task started while reading is the latest
+            if name not in self._latest:
+                self._latest[name] = dict(res['rows'][0]) if res['rows'] else None
+
+    def latest(self, name=None):
+        """ Returns the latest task of each schedule that has one, or of the schedule name only """
+        if name is not None:
+            task = self._latest.get(name)
+            return [dict(task)] if task is not None else []
+        return [dict(self._latest[name]) for name in sorted(self._latest) if self._latest[name] is not None]
+
+    def forget(self, schedule_name):
+        """ Forgets the latest task of a schedule, once the schedule or its tasks are deleted """
+        self._latest.pop(schedule_name, None)
+
+    def insert(self, row):
+        """ Buffers the row of a task started
+
+        Args:
+            row: columns of the tasks table, start_time as returned by common_utils.local_timestamp
+        """
+        self._inserts[row["id"]] = row
+        task = {field: row.get(field) for field in TASK_FIELDS}
+        task["start_time"] = format_timestamp(row["start_time"])
+        self._latest[row["schedule_name"]] = task
+        self._wake_up()
+
+    def update(self, task_id, schedule_name, **columns):
+        """ Buffers an update of the row of a task
+
+        Args:
+            task_id: id of the row, as inserted
+            schedule_name: name of the schedule of the task
+            columns: columns of the tasks table, end_time as returned by common_utils.local_timestamp
+        """
+        if task_id in self._inserts:
+            self._inserts[task_id].update(columns)
+        else:
+            self._updates.setdefault(task_id, dict()).update(columns)
+        task = self._latest.get(schedule_name)
+        if task is not None and task["id"] == task_id:
+            task.update(columns)
+            if columns.get("end_time") is not None:
+                task["end_time"] = format_timestamp(columns["end_time"])
+        self._wake_up()
+
+    async def flush(self):
+        """ Writes the buffered rows with a single insert and a single update
+
+        Returns:
+            False when storage failed, the rows are then kept for the next write
+        """
+        async with self._flush_lock:
+            self._flush_wakeup.clear()
+            written = True
+            if self._inserts:
+                inserts = self._inserts
+                self._inserts = collections.OrderedDict()
+                failed = await self._insert(inserts)
+                if failed is not None:
+                    self._stats["failures"] += 1
+                if failed:
+                    # Keep the updates of the rows merged while writing, the updates of the other rows are written
+                    for task_id, columns in self._updates_of(failed):
+                        failed[task_id].update(columns)
+                    failed.update(self._inserts)
+                    self._inserts = failed
+                    written = False
+            if self._updates:
+                updates = self._updates
+                self._updates = collections.OrderedDict()
+                payload = {"updates": [json.loads(PayloadBuilder().SET(**columns).WHERE(['id', '=', task_id]).payload())
+                                       for task_id, columns in updates.items()]}
+                try:
+                    await self._storage.update_tbl("tasks", json.dumps(payload))
+                except Exception as ex:
+                    _logger.error(ex, "Failed to update {} task rows.".format(len(updates)))
+                    for task_id, columns in self._updates.items():
+                        updates.setdefault(task_id, dict()).update(columns)
+                    self._updates = updates
+                    self._stats["failures"] += 1
+                    return False
+                self._stats["updated"] += len(updates)
+            if written:
+                self._stats["flushes"] += 1
+            return written
+
+    def metrics(self):
+        """ Counters of the buffered writes """
+        return dict(self._stats, pending=self.pending, schedules=len(self._latest))
+
+    async def _insert(self, inserts):
+        """ Inserts the rows with a single insert, or one at a time when it fails
+
+        Returns:
+            None when the single insert succeeded, else an OrderedDict of the rows to insert again
+        """
+        try:
+            await self._storage.insert_into_tbl("tasks", json.dumps({"inserts": list(inserts.values())}))
+            self._stats["inserted"] += len(inserts)
+            for task_id in inserts:
+                self._attempts.pop(task_id, None)
+            return None
+        except Exception as ex:
+            _logger.error(ex, "Failed to insert {} task rows.".format(len(inserts)))
+        failed = collections.OrderedDict()
+        for task_id, row in inserts.items():
+            if len(inserts) > 1:
+                try:
+                    await self._storage.insert_into_tbl("tasks", json.dumps({"inserts": [row]}))
+                    self._stats["inserted"] += 1
+                    self._attempts.pop(task_id, None)
+                    continue
+                except Exception:
+                    pass
+            self._attempts[task_id] = self._attempts.get(task_id, 0) + 1
+            if self._attempts[task_id] < _MAX_INSERT_ATTEMPTS:
+                failed[task_id] = row
+                continue
+            _logger.error("Discarded the row of task %s of schedule '%s' after %s failed inserts.", task_id,
+                          row.get("schedule_name"), _MAX_INSERT_ATTEMPTS)
+            del self._attempts[task_id]
+            self._updates.pop(task_id, None)
+            self._stats["discarded"] += 1
+        return failed
+
+    def _updates_of(self, inserts):
+        return [(task_id, self._updates.pop(task_id)) for task_id in list(self._updates) if task_id in inserts]
+
+    def _wake_up(self):
+        if self.pending >= _FLUSH_SIZE:
+            self._flush_wakeup.set()
+
+    async def _flush_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_wakeup.wait(), self._flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
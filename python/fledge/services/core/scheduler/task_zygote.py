@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Task zygote, starting the Python tasks by forking a process that has already imported them
+
+The scheduler starts a task by running its script, which starts a new Python interpreter that imports aiohttp and
+the Fledge packages before doing any work. When the zygote is enabled, the scheduler instead asks a process that has
+imported them once to fork, and the child runs the module of the task as __main__ with the same arguments as the
+script, that is --name, --address, --port and any argument of the scheduled process.
+
+The zygote reports the pid of each child and, when it exits, its exit code, to the scheduler over a socket. Only the
+imports are shared: a task connects to the core and the storage service as it does when started by its script.
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import os
+import runpy
+import selectors
+import signal
+import socket
+import sys
+import time
+import traceback
+
+from fledge.common import logger
+from fledge.common.logger import FLCoreLogger
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_logger = FLCoreLogger().get_logger(__name__)
+
+TASK_MODULES = {"tasks/purge": "fledge.tasks.purge",
+                "tasks/north": "fledge.tasks.north.sending_process",
+                "tasks/automation_script": "fledge.tasks.automation_script"}
+""" Module run by the script of each Python task, by script """
+
+_PRELOADED_MODULES = ("aiohttp",
+                      "fledge.common.storage_client.storage_client",
+                      "fledge.common.configuration_manager",
+                      "fledge.common.audit_logger",
+                      "fledge.common.process",
+                      "fledge.common.asset_tracker_cache",
+                      "fledge.common.jqfilter",
+                      "fledge.common.statistics",
+                      "fledge.plugins.north.common.common",
+                      "fledge.tasks.purge.purge")
+""" Modules imported by the zygote before it forks the tasks, not the modules run as __main__ """
+
+_START_TIMEOUT = 30
+""" Seconds the zygote is given to import the modules """
+
+_ORPHAN_POLL_INTERVAL = 1
+""" Seconds between two checks of a task whose zygote has exited, its exit code is then unknown """
+
+_ORPHAN_EXIT_CODE = 1
+""" Exit code reported for a task whose zygote has exited before it """
+
+
+class TaskZygoteError(OSError):
+    """ The zygote could not start a task, the scheduler then runs its script """
+    pass
+
+
+class ZygoteProcess(object):
+    """ Task forked by the zygote, with the methods of asyncio.subprocess.Process used by the scheduler """
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.returncode = None
+        self._exited = asyncio.Event()
+
+    async def wait(self):
+        await self._exited.wait()
+        return self.returncode
+
+    def send_signal(self, sig):
+        if self.returncode is not None:
+            raise ProcessLookupError()
+        os.kill(self.pid, sig)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+    def set_returncode(self, returncode):
+        self.returncode = returncode
+        self._exited.set()
+
+    async def wait_orphaned(self):
+        """ Waits for the task to exit once the zygote, its parent, has exited """
+        while True:
+            try:
+                os.kill(self.pid, 0)
+            except (ProcessLookupError, PermissionError):
+                break
+            await asyncio.sleep(_ORPHAN_POLL_INTERVAL)
+        self.set_returncode(_ORPHAN_EXIT_CODE)
+
+
+class TaskZygote(object):
+    """ Client of the zygote process, run by the scheduler """
+
+    def __init__(self):
+        self._process = None
+        self._reader = None
+        self._writer = None
+        self._read_task = None
+        self._pending = collections.deque()
+        """ Futures of the start requests not answered yet, in the order they were sent """
+        self._processes = dict()
+        """ Dictionary of pid to the ZygoteProcess of the tasks running """
+
+    @property
+    def is_running(self):
+        return self._read_task is not None and not self._read_task.done()
+
+    async def start(self, cwd):
+        """ Starts the zygote and waits until it has imported the modules of the tasks
+
+        Args:
+            cwd: directory of the Fledge Python packages, the tasks are run from it as by their scripts
+        Raises:
+            TaskZygoteError: the zygote failed to start
+        """
+        core_sock, zygote_sock = socket.socketpair()
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                sys.executable, '-m', __name__, '--fd={}'.format(zygote_sock.fileno()),
+                pass_fds=(zygote_sock.fileno(),), cwd=cwd)
+        except OSError:
+            core_sock.close()
+            raise
+        finally:
+            zygote_sock.close()
+        self._reader, self._writer = await asyncio.open_unix_connection(sock=core_sock)
+        try:
+            ready = json.loads(await asyncio.wait_for(self._reader.readline(), _START_TIMEOUT))
+        except (asyncio.TimeoutError, ValueError) as ex:
+            await self.stop()
+            raise TaskZygoteError("The task zygote did not start. {}".format(str(ex)))
+        _logger.info("Task zygote pid %s started, modules imported in %.0f ms", self._process.pid,
+                     ready['preload_ms'])
+        self._read_task = asyncio.ensure_future(self._read_forever())
+
+    async def stop(self):
+        """ Stops the zygote, the tasks it has forked keep running """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._process is not None:
+            try:
+                await asyncio.wait_for(self._process.wait(), _START_TIMEOUT)
+            except asyncio.TimeoutError:
+                self._process.kill()
+            self._process = None
+        if self._read_task is not None:
+            await self._read_task
+            self._read_task = None
+
+    async def start_task(self, module, args):
+        """ Forks a task running a module as __main__
+
+        Args:
+            module: name of the module run by the script of the task
+            args: arguments of the script
+        Returns:
+            ZygoteProcess of the task
+        Raises:
+            TaskZygoteError: the task could not be forked
+        """
+        if not self.is_running:
+            raise TaskZygoteError("The task zygote is not running")
+        future = asyncio.get_event_loop().create_future()
+        self._pending.append(future)
+        self._writer.write(json.dumps({"module": module, "args": args}).encode() + b'\n')
+        await self._writer.drain()
+        return await future
+
+    async def _read_forever(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if 'exit' in message:
+                    process = self._processes.pop(message['exit'], None)
+                    if process is not None:
+                        process.set_returncode(message['returncode'])
+                elif 'pid' in message:
+                    process = self._processes[message['pid']] = ZygoteProcess(message['pid'])
+                    self._pending.popleft().set_result(process)
+                else:
+                    self._pending.popleft().set_exception(TaskZygoteError(message['error']))
+        except Exception as ex:
+            _logger.warning("Lost the task zygote. %s", str(ex))
+        while self._pending:
+            self._pending.popleft().set_exception(TaskZygoteError("The task zygote has exited"))
+        for process in self._processes.values():
+            asyncio.ensure_future(process.wait_orphaned())
+        self._processes.clear()
+
+
+def _send(sock, message):
+    sock.sendall(json.dumps(message).encode() + b'\n')
+
+
+def _run_task(module, args):
+    """ Runs the module of a task in the forked child, as `python3 -m module args` would, and never returns """
+    code = 0
+    try:
+        sys.argv = [module] + args
+        # The command line of the child is that of the zygote, the loggers are named from the arguments of the task
+        logger.set_process_args(sys.argv)
+        runpy.run_module(module, run_name='__main__', alter_sys=True)
+    except SystemExit as ex:
+        if isinstance(ex.code, int) or ex.code is None:
+            code = ex.code or 0
+        else:
+            print(ex.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            logging.shutdown()
+            logger.stop_syslog_listener()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _serve(sock):
+    """ Forks a task for each request received on the socket until it is closed, and reports the exits """
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_read, False)
+    os.set_blocking(wakeup_write, False)
+    signal.set_wakeup_fd(wakeup_write)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    selector = selectors.DefaultSelector()
+    selector.register(sock, selectors.EVENT_READ)
+    selector.register(wakeup_read, selectors.EVENT_READ)
+    buffer = b''
+    while True:
+        for key, _ in selector.select():
+            if key.fileobj == wakeup_read:
+                while True:
+                    try:
+                        if not os.read(wakeup_read, 512):
+                            break
+                    except BlockingIOError:
+                        break
+                continue
+            data = sock.recv(65536)
+            if not data:
+                return
+            buffer += data
+            while b'\n' in buffer:
+                line, buffer = buffer.split(b'\n', 1)
+                request = json.loads(line)
+                sys.stdout.flush()
+                sys.stderr.flush()
+                try:
+                    pid = os.fork()
+                except OSError as ex:
+                    _send(sock, {"error": str(ex)})
+                    continue
+                if pid == 0:
+                    selector.close()
+                    sock.close()
+                    signal.set_wakeup_fd(-1)
+                    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                    os.close(wakeup_read)
+                    os.close(wakeup_write)
+                    _run_task(request['module'], request['args'])
+                _send(sock, {"pid": pid})
+        # Report the exits after the pids, so that the scheduler knows each task before it exits
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+            _send(sock, {"exit": pid, "returncode": returncode})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fledge task zygote")
+    parser.add_argument("--fd", required=True, type=int, help="socket connected to the scheduler")
+    namespace = parser.parse_args()
+    sock = socket.socket(fileno=namespace.fd)
+    start = time.perf_counter()
+    for module in _PRELOADED_MODULES:
+        try:
+            __import__(module)
+        except Exception as ex:
+            _logger.warning("Task zygote could not import %s, the tasks will import it. %s", module, str(ex))
+    _send(sock, {"preload_ms": (time.perf_counter() - start) * 1e3})
+    _serve(sock)
+
+
+if __name__ == '__main__':
+    main()
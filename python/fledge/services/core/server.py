@@ -24,7 +24,8 @@ import jwt
 
 from fledge.common import logger
 from fledge.common.audit_logger import AuditLogger
-from fledge.common.configuration_manager import ConfigurationManager
+from fledge.common.configuration_manager import ConfigurationCache, ConfigurationManager
+from fledge.common.plugin_discovery import PluginDiscovery
 from fledge.common.storage_client.exceptions import *
 from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.common.storage_client.storage_client import ReadingsStorageClientAsync
@@ -39,12 +40,15 @@ from fledge.services.core.service_registry.service_registry import ServiceRegist
 from fledge.services.core.service_registry import exceptions as service_registry_exceptions
 from fledge.services.core.interest_registry.interest_registry import InterestRegistry
 from fledge.services.core.interest_registry import exceptions as interest_registry_exceptions
+from fledge.services.core.interest_registry import change_callback
 from fledge.services.core.scheduler.scheduler import Scheduler
 from fledge.services.core.service_registry.monitor import Monitor
 from fledge.services.common.service_announcer import ServiceAnnouncer
-from fledge.services.core.user_model import User
+from fledge.services.core.user_model import User, JWT_EXP_DELTA_SECONDS
 from fledge.common.storage_client import payload_builder
 from fledge.services.core.asset_tracker.asset_tracker import AssetTracker
+from fledge.services.core import asset_catalogue, connect, health_snapshot, readings_rollup, syslog_index, token_cache
+from fledge.services.core.api import support as support_api
 from fledge.services.core.api import asset_tracker as asset_tracker_api
 from fledge.common.web.ssl_wrapper import SSLVerifier
 from fledge.services.core.api import exceptions as api_exception
@@ -294,6 +298,35 @@ class Server:
     _log_level = _LOGGING_DEFAULT_CONFIG['logLevel']['default']
     """ Common logging level for Core """
 
+    _CONFIGURATION_CACHE_DEFAULT_CONFIG = {
+        'maxCategories': {
+            'description': 'Maximum number of configuration categories held in the cache of the core',
+            'type': 'integer',
+            'displayName': 'Maximum Categories',
+            'default': str(ConfigurationCache.MAX_CACHE_SIZE),
+            'minimum': '1',
+            'order': '1'
+        },
+        'maxSize': {
+            'description': 'Maximum size in MB of the values of the configuration categories held in the cache',
+            'type': 'integer',
+            'displayName': 'Maximum Size (MB)',
+            'default': str(ConfigurationCache.MAX_CACHE_BYTES // (1024 * 1024)),
+            'minimum': '1',
+            'order': '2'
+        },
+        'preload': {
+            'description': 'Read the configuration categories into the cache at once when the core starts',
+            'type': 'boolean',
+            'displayName': 'Preload',
+            'default': 'true',
+            'order': '3'
+        }
+    }
+
+    _preload_configuration = True
+    """ Read the categories into the configuration cache when the core starts """
+
     _start_time = time.time()
     """ Start time of core process """
 
@@ -800,7 +833,8 @@ class Server:
         # Create the parent category for all advanced configuration categories
         try:
             await cls._configuration_manager.create_category("Advanced", {}, 'Advanced', True)
-            await cls._configuration_manager.create_child_category("Advanced", ["SMNTR", "SCHEDULER", "LOGGING"])
+            await cls._configuration_manager.create_child_category("Advanced", ["SMNTR", "SCHEDULER", "LOGGING",
+                                                                                "CONFIGURATION_CACHE"])
         except KeyError:
             _logger.error('Failed to create Advanced parent configuration category for service')
             raise
@@ -817,6 +851,94 @@ class Server:
         cls._asset_tracker = AssetTracker(cls._storage_client_async)
         await cls._asset_tracker.load_asset_records()
 
+    @classmethod
+    async def configuration_cache_config(cls):
+        """ Get the limits of the configuration cache and whether it is preloaded """
+        try:
+            await cls._configuration_manager.create_category('CONFIGURATION_CACHE',
+                                                             cls._CONFIGURATION_CACHE_DEFAULT_CONFIG,
+                                                             'Configuration cache of Core server', True,
+                                                             display_name='Configuration Cache')
+            config = await cls._configuration_manager.get_category_all_items('CONFIGURATION_CACHE')
+            cls.set_configuration_cache_limits(config)
+        except Exception as ex:
+            _logger.warning("Failed to configure the configuration cache, the default limits apply. %s", str(ex))
+
+    @classmethod
+    def set_configuration_cache_limits(cls, config):
+        """ Applies the items of the CONFIGURATION_CACHE category to the configuration cache """
+        cls._preload_configuration = config['preload']['value'].lower() == 'true'
+        cls._configuration_manager.set_cache_limits(int(config['maxCategories']['value']),
+                                                    int(config['maxSize']['value']) * 1024 * 1024)
+
+    @classmethod
+    async def _preload_configuration_cache(cls):
+        if not cls._preload_configuration:
+            _logger.info("Configuration cache preload is disabled")
+            return
+        try:
+            size = await cls._configuration_manager.preload_cache()
+            _logger.info("Configuration cache preloaded with %s categories", size)
+        except Exception as ex:
+            _logger.warning("Failed to preload the configuration cache. %s", str(ex))
+
+    @classmethod
+    async def _start_plugin_discovery_cache(cls):
+        data_dir = _FLEDGE_DATA if _FLEDGE_DATA else _FLEDGE_ROOT + '/data'
+        try:
+            PluginDiscovery.enable_cache(os.path.expanduser(data_dir + '/var/plugins.json'))
+            # Validate the plugins saved by the previous run in the background, loading the ones that have changed
+            asyncio.get_event_loop().run_in_executor(None, PluginDiscovery.get_plugins_installed)
+        except Exception as ex:
+            _logger.warning("Plugin discovery cache is not available, plugins are discovered on each request. %s",
+                            str(ex))
+
+    @classmethod
+    async def _start_token_cache(cls):
+        try:
+            await token_cache.start_token_cache(JWT_EXP_DELTA_SECONDS)
+        except Exception as ex:
+            _logger.warning("Token cache is not available, each request is authenticated against storage. %s",
+                            str(ex))
+
+    @classmethod
+    async def _start_health_snapshot(cls):
+        try:
+            await health_snapshot.start_health_snapshot()
+        except Exception as ex:
+            _logger.warning("Health snapshot is not available, each ping reads the statistics. %s", str(ex))
+
+    @classmethod
+    async def _start_syslog_index(cls):
+        data_dir = _FLEDGE_DATA if _FLEDGE_DATA else _FLEDGE_ROOT + '/data'
+        try:
+            await syslog_index.start_syslog_index(support_api._SYSLOG_FILE,
+                                                  os.path.expanduser(data_dir + '/var/syslog.idx'))
+        except Exception as ex:
+            _logger.warning("Syslog index is not available, the syslog API searches the syslog. %s", str(ex))
+
+    @classmethod
+    async def _start_readings_rollup(cls):
+        try:
+            await readings_rollup.start_readings_rollup(cls._readings_client_async)
+        except Exception as ex:
+            _logger.warning("Readings rollups are not available, the asset browser queries the readings. %s",
+                            str(ex))
+
+    @classmethod
+    async def _start_asset_catalogue(cls):
+        rollup = readings_rollup.get_readings_rollup()
+        if rollup is None:
+            # Nothing would keep the catalogue up to date with the readings appended
+            _logger.warning("Asset catalogue is not available without the readings rollups, the asset browser "
+                            "queries the readings.")
+            return
+        try:
+            assets = {r['asset'] for r in cls._asset_tracker._registered_asset_records if r['event'] == 'Ingest'}
+            await asset_catalogue.start_asset_catalogue(cls._readings_client_async, rollup, assets)
+        except Exception as ex:
+            _logger.warning("Asset catalogue is not available, the asset browser queries the readings. %s", str(ex))
+
     @classmethod
     def _start_core(cls, loop=None):
         if cls.running_in_safe_mode:
@@ -844,6 +966,9 @@ class Server:
             # obtain configuration manager and interest registry
             cls._configuration_manager = ConfigurationManager(cls._storage_client_async)
             cls._interest_registry = InterestRegistry(cls._configuration_manager)
+            # Read the categories into the configuration cache at once rather than one by one on first use
+            loop.run_until_complete(cls.configuration_cache_config())
+            loop.run_until_complete(cls._preload_configuration_cache())
 
             # Logging category
             loop.run_until_complete(cls.core_logger_setup())
@@ -924,9 +1049,24 @@ class Server:
             # Create the configuration category parents
             loop.run_until_complete(cls._config_parents())
 
+            # Index the syslog for the syslog API
+            loop.run_until_complete(cls._start_syslog_index())
+
+            # Cache the installed plugins, discovered from the plugin directories
+            loop.run_until_complete(cls._start_plugin_discovery_cache())
+
+            # Cache the tokens verified by the REST authentication
+            loop.run_until_complete(cls._start_token_cache())
+            # Start the health snapshot answering the ping API
+            loop.run_until_complete(cls._start_health_snapshot())
+
             if not cls.running_in_safe_mode:
                 # Start asset tracker
                 loop.run_until_complete(cls._start_asset_tracker())
+                # Start the readings rollups of the asset browser
+                loop.run_until_complete(cls._start_readings_rollup())
+                # Load the asset catalogue, kept up to date by the readings rollups
+                loop.run_until_complete(cls._start_asset_catalogue())
                 # If dispatcher installation:
                 # a) not found then add it as a StartUp service
                 # b) found then check the status of its schedule and take action
@@ -1013,6 +1153,19 @@ class Server:
             audit_msg = {"message": "Exited from safe mode"} if cls.running_in_safe_mode else None
             await cls._audit.information('FSTOP', audit_msg)
 
+            await asset_catalogue.stop_asset_catalogue()
+            await syslog_index.stop_syslog_index()
+            await token_cache.stop_token_cache()
+            await health_snapshot.stop_health_snapshot()
+            PluginDiscovery.disable_cache()
+            await readings_rollup.stop_readings_rollup()
+
+            # release the connections used to notify configuration changes
+            await change_callback.close()
+
+            # release pooled storage connections
+            await cls._close_storage_clients()
+
             # stop storage
             await cls.stop_storage()
 
@@ -1024,6 +1177,14 @@ class Server:
         except Exception:
             raise
 
+    @classmethod
+    async def _close_storage_clients(cls):
+        """ Close the shared storage client sessions and their connection pools """
+        for client in (cls._readings_client_async, cls._storage_client_async):
+            if client is not None:
+                await client.close()
+        await connect.close_storage_clients()
+
     @classmethod
     async def stop_rest_server(cls):
         # Delete all user tokens
@@ -9,12 +9,15 @@
 import asyncio
 import aiohttp
 import json
+import random
+import time
 from fledge.common import logger
 from fledge.common.audit_logger import AuditLogger
 from fledge.common.configuration_manager import ConfigurationManager
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
 from fledge.common.service_record import ServiceRecord
 from fledge.services.core import connect
+from fledge.services.core import health_snapshot
 from fledge.common.acl_manager import ACLManager
 
 __author__ = "Ashwin Gopalakrishnan, Amarendra K Sinha"
@@ -36,6 +39,12 @@ class Monitor(object):
     _DEFAULT_RESTART_FAILED = "auto"
     """Restart failed microservice - manual/auto"""
 
+    _MAX_CONCURRENT_PINGS = 50
+    """Maximum number of micro-services pinged at once"""
+
+    _PING_SPACING = 0.01
+    """Seconds the pings of a round are spread over per micro-service, up to half the health check interval"""
+
     _logger = None
 
     def __init__(self):
@@ -55,9 +64,26 @@ class Monitor(object):
         self.restarted_services = []
         self._acl_handler = None
 
+        self._session = None  # type: aiohttp.ClientSession
+        """Session shared by the pings"""
+        self._session_loop = None
+        self._ping_semaphore = None  # type: asyncio.Semaphore
+        self._round_stats = {"rounds": 0, "last_duration": 0, "total_duration": 0, "max_duration": 0,
+                             "services": 0, "unresponsive": 0}
+
     async def _sleep(self, sleep_time):
         await asyncio.sleep(sleep_time)
 
+    def _get_session(self):
+        """Session shared by the pings, keeping the connections to the services open between rounds"""
+        loop = asyncio.get_event_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._MAX_CONCURRENT_PINGS))
+            self._session_loop = loop
+            self._ping_semaphore = asyncio.Semaphore(self._MAX_CONCURRENT_PINGS)
+        return self._session
+
     async def _monitor_loop(self):
         """async Monitor loop to monitor registered services"""
         # check health of all micro-services every N seconds
@@ -69,7 +95,9 @@ class Monitor(object):
             round_cnt += 1
             self._logger.debug("Starting next round#{} of service monitoring, sleep/i:{} ping/t:{} max/a:{}".format(
                 round_cnt, self._sleep_interval, self._ping_timeout, self._max_attempts))
-            for service_record in ServiceRegistry.all():
+            round_start = time.monotonic()
+            pinged = []
+            for service_record in list(ServiceRegistry.all()):
                 if service_record._id not in check_count:
                     check_count.update({service_record._id: 1})
 
@@ -95,43 +123,24 @@ class Monitor(object):
                          asyncio.ensure_future(self.restart_service(service_record))
                      continue
 
-                try:
-                    url = "{}://{}:{}/fledge/service/ping".format(
-                        service_record._protocol, service_record._address, service_record._management_port)
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url, timeout=self._ping_timeout) as resp:
-                            text = await resp.text()
-                            res = json.loads(text)
-                            if res["uptime"] is None:
-                                raise ValueError('res.uptime is None')
-                except (asyncio.TimeoutError, aiohttp.client_exceptions.ServerTimeoutError) as ex:
-                    service_record._status = ServiceRecord.Status.Unresponsive
-                    check_count[service_record._id] += 1
-                    self._logger.info("ServerTimeoutError: %s, %s", str(ex), service_record.__repr__())
-                except aiohttp.client_exceptions.ClientConnectorError as ex:
-                    service_record._status = ServiceRecord.Status.Unresponsive
-                    check_count[service_record._id] += 1
-                    self._logger.info("ClientConnectorError: %s, %s", str(ex), service_record.__repr__())
-                except ValueError as ex:
-                    service_record._status = ServiceRecord.Status.Unresponsive
-                    check_count[service_record._id] += 1
-                    self._logger.info("Invalid response: %s, %s", str(ex), service_record.__repr__())
-                except Exception as ex:
-                    service_record._status = ServiceRecord.Status.Unresponsive
-                    check_count[service_record._id] += 1
-                    self._logger.info("Exception occurred: %s, %s", str(ex), service_record.__repr__())
-                else:
-                    service_record._status = ServiceRecord.Status.Running
+                pinged.append(service_record)
 
-                    self._logger.debug("Resolving pending notification for ACL change "
-                                       "for service {} ".format(service_record._name))
-                    if not self._acl_handler:
-                        self._acl_handler = ACLManager(connect.get_storage_async())
-                    await self._acl_handler.\
-                        resolve_pending_notification_for_acl_change(service_record._name)
+            # Ping the services concurrently, each after a random delay so that they are not all pinged at once
+            spread = min(len(pinged) * self._PING_SPACING, self._sleep_interval / 2)
+            responsive = await asyncio.gather(*[self._ping(service_record, check_count, random.uniform(0, spread))
+                                                for service_record in pinged])
 
-                    check_count[service_record._id] = 1
+            running = [service_record._name for service_record, ok in zip(pinged, responsive) if ok]
+            if running:
+                self._logger.debug("Resolving pending notification for ACL change for services {}".format(running))
+                if not self._acl_handler:
+                    self._acl_handler = ACLManager(connect.get_storage_async())
+                try:
+                    await self._acl_handler.resolve_pending_notifications_for_acl_change(running)
+                except Exception as ex:
+                    self._logger.info("Failed to resolve pending notifications for ACL change %s", str(ex))
 
+            for service_record in pinged:
                 if check_count[service_record._id] > self._max_attempts:
                     ServiceRegistry.mark_as_failed(service_record._id)
                     check_count[service_record._id] = 0
@@ -140,8 +149,75 @@ class Monitor(object):
                         await audit.failure('SRVFL', {'name':service_record._name})
                     except Exception as ex:
                         self._logger.info("Failed to audit service failure %s", str(ex))
+
+            # The round may have changed the status of the services, refresh the health reported by ping
+            snapshot = health_snapshot.get_health_snapshot()
+            if snapshot is not None:
+                snapshot.refresh_health()
+            self._record_round(time.monotonic() - round_start, len(pinged), len(pinged) - len(running))
             await self._sleep(self._sleep_interval)
 
+    async def _ping(self, service_record, check_count, delay=0):
+        """Pings a service and updates its status
+
+        Returns:
+            True when the service responded
+        """
+        if delay:
+            await asyncio.sleep(delay)
+        session = self._get_session()
+        async with self._ping_semaphore:
+            try:
+                url = "{}://{}:{}/fledge/service/ping".format(
+                    service_record._protocol, service_record._address, service_record._management_port)
+                async with session.get(url, timeout=self._ping_timeout) as resp:
+                    text = await resp.text()
+                    res = json.loads(text)
+                    if res["uptime"] is None:
+                        raise ValueError('res.uptime is None')
+            except (asyncio.TimeoutError, aiohttp.client_exceptions.ServerTimeoutError) as ex:
+                service_record._status = ServiceRecord.Status.Unresponsive
+                check_count[service_record._id] += 1
+                self._logger.info("ServerTimeoutError: %s, %s", str(ex), service_record.__repr__())
+            except aiohttp.client_exceptions.ClientConnectorError as ex:
+                service_record._status = ServiceRecord.Status.Unresponsive
+                check_count[service_record._id] += 1
+                self._logger.info("ClientConnectorError: %s, %s", str(ex), service_record.__repr__())
+            except ValueError as ex:
+                service_record._status = ServiceRecord.Status.Unresponsive
+                check_count[service_record._id] += 1
+                self._logger.info("Invalid response: %s, %s", str(ex), service_record.__repr__())
+            except Exception as ex:
+                service_record._status = ServiceRecord.Status.Unresponsive
+                check_count[service_record._id] += 1
+                self._logger.info("Exception occurred: %s, %s", str(ex), service_record.__repr__())
+            else:
+                service_record._status = ServiceRecord.Status.Running
+                check_count[service_record._id] = 1
+                return True
+        return False
+
+    def _record_round(self, duration, services, unresponsive):
+        stats = self._round_stats
+        stats["rounds"] += 1
+        stats["last_duration"] = duration
+        stats["total_duration"] += duration
+        stats["max_duration"] = max(stats["max_duration"], duration)
+        stats["services"] = services
+        stats["unresponsive"] = unresponsive
+        if duration > self._sleep_interval:
+            self._logger.warning("Round of service monitoring of %s services took %.3f seconds, more than the "
+                                 "health check interval of %s seconds", services, duration, self._sleep_interval)
+
+    def metrics(self):
+        """Duration of the rounds of health checks, to size the health check interval"""
+        stats = self._round_stats
+        return {"rounds": stats["rounds"], "services": stats["services"], "unresponsive": stats["unresponsive"],
+                "sleepInterval": self._sleep_interval,
+                "round_last_ms": round(stats["last_duration"] * 1000, 3),
+                "round_avg_ms": round(stats["total_duration"] / stats["rounds"] * 1000, 3) if stats["rounds"] else 0,
+                "round_max_ms": round(stats["max_duration"] * 1000, 3)}
+
     async def _read_config(self):
         """Reads configuration"""
         default_config = {
@@ -202,3 +278,6 @@ class Monitor(object):
             self._monitor_loop_task.cancel()
         except asyncio.CancelledError:
             pass
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -25,6 +25,13 @@ class ServiceRegistry:
 
     _registry = list()
 
+    _indexes = None
+    """ Records of _registry by id, then dict of records by id by name, type, address and port, address and
+    management port """
+
+    _indexed_registry = None
+    """ List the indexes were built from, they are built again when _registry is replaced """
+
     # Startup tokens to pass to service or tasks being started
     _startupTokens = dict()
 
@@ -113,6 +120,7 @@ class ServiceRegistry:
         service_id = str(uuid.uuid4()) if new_service is True else current_service_id
         registered_service = ServiceRecord(service_id, name, s_type, protocol, address, port, management_port)
         cls._registry.append(registered_service)
+        cls._add_to_indexes(registered_service)
         cls._logger.info("Registered {}".format(str(registered_service)))
 
         # Remove startup token
@@ -185,6 +193,7 @@ class ServiceRegistry:
         """
         services = cls.get(idx=service_id)
         cls._registry.remove(services[0])
+        cls._remove_from_indexes(services[0])
 
     @classmethod
     def _remove_from_scheduler_records(cls, service_name):
@@ -207,11 +216,18 @@ class ServiceRegistry:
     @classmethod
     def filter(cls, **kwargs):
         # OR based filter
-        services = cls._registry
-        for k, v in kwargs.items():
-            if v:
-                services = [s for s in cls._registry if getattr(s, k, None) == v]
-        return services
+        # The last attribute given a value decides, as the services filtered by each attribute replace the previous
+        criteria = [(k, v) for k, v in kwargs.items() if v]
+        if not criteria:
+            return cls._registry
+        k, v = criteria[-1]
+        indexes = cls._get_indexes()
+        if k == '_id':
+            service = indexes['_id'].get(v)
+            return [] if service is None else [service]
+        if k in indexes:
+            return list(indexes[k].get(v, {}).values())
+        return [s for s in cls._registry if getattr(s, k, None) == v]
 
     @classmethod
     def get(cls, idx=None, name=None, s_type=None):
@@ -223,27 +239,52 @@ class ServiceRegistry:
     @classmethod
     def check_address_and_port(cls, address, port):
         # AND based check
-        # ugly hack! <Make filter to support AND | OR>
-        services = [s for s in cls._registry if getattr(s, "_address") == address and getattr(s, "_port") == port and getattr(s, "_status") != ServiceRecord.Status.Failed]
-        if len(services) == 0:
-            return False
-        return True
+        services = cls._get_indexes()['_address_port'].get((address, port), {}).values()
+        return any(s._status != ServiceRecord.Status.Failed for s in services)
 
     @classmethod
     def check_address_and_mgt_port(cls, address, m_port):
         # AND based check
-        # ugly hack! <Make filter to support AND | OR>
-        services = [s for s in cls._registry if getattr(s, "_address") == address
-                    and getattr(s, "_management_port") == m_port and getattr(s, "_status") != ServiceRecord.Status.Failed]
-        if len(services) == 0:
-            return False
-        return True
+        services = cls._get_indexes()['_address_management_port'].get((address, m_port), {}).values()
+        return any(s._status != ServiceRecord.Status.Failed for s in services)
 
     @classmethod
     def filter_by_name_and_type(cls, name, s_type):
         # AND based check
-        # ugly hack! <Make filter to support AND | OR>
-        services = [s for s in cls._registry if getattr(s, "_name") == name and getattr(s, "_type") == s_type]
+        services = [s for s in cls._get_indexes()['_name'].get(name, {}).values() if s._type == s_type]
         if len(services) == 0:
             raise service_registry_exceptions.DoesNotExist
         return services
+
+    @classmethod
+    def _get_indexes(cls):
+        if cls._indexed_registry is not cls._registry:
+            cls._indexes = {'_id': {}, '_name': {}, '_type': {}, '_address_port': {}, '_address_management_port': {}}
+            cls._indexed_registry = cls._registry
+            for service in cls._registry:
+                cls._add_to_indexes(service)
+        return cls._indexes
+
+    @classmethod
+    def _index_keys(cls, service):
+        return (('_name', service._name), ('_type', service._type),
+                ('_address_port', (service._address, service._port)),
+                ('_address_management_port', (service._address, service._management_port)))
+
+    @classmethod
+    def _add_to_indexes(cls, service):
+        indexes = cls._get_indexes()
+        indexes['_id'][service._id] = service
+        for index, key in cls._index_keys(service):
+            indexes[index].setdefault(key, {})[service._id] = service
+
+    @classmethod
+    def _remove_from_indexes(cls, service):
+        indexes = cls._get_indexes()
+        indexes['_id'].pop(service._id, None)
+        for index, key in cls._index_keys(service):
+            services = indexes[index].get(key)
+            if services is not None:
+                services.pop(service._id, None)
+                if not services:
+                    del indexes[index][key]
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Index of the Fledge lines of the syslog, used by the syslog API instead of grep
+
+The syslog is tailed incrementally. For each line logged by a Fledge process, the index records its position in the
+file, its source, that is the syslog program name such as "Fledge" or "Fledge Storage", and its level. Lines are then
+selected by source and minimum level from in memory lists and read from the syslog by position.
+
+The records are appended to a compact file next to a small JSON file identifying the syslog they belong to, so that a
+restart of the core only indexes the lines logged since. When the syslog is rotated, or truncated, the index starts
+over with the new file.
+"""
+
+import array
+import asyncio
+import heapq
+import json
+import os
+import re
+import struct
+import threading
+import zlib
+
+from fledge.common.logger import FLCoreLogger
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_logger = FLCoreLogger().get_logger(__name__)
+
+LEVELS = {'debug': 0, 'info': 1, 'warning': 2, 'error': 3}
+""" Minimum level ranks accepted by queries """
+
+_LEVEL_RANKS = {b'DEBUG': 0, b'INFO': 1, b'WARNING': 2, b'ERROR': 3, b'FATAL': 3}
+
+_SOURCE_PATTERN = re.compile(rb'(Fledge[^\[\n]*)\[')
+_LEVEL_PATTERN = re.compile(rb' (DEBUG|INFO|WARNING|ERROR|FATAL)')
+
+_RECORD = struct.Struct('=QIHB')
+""" Position, length, source id and level rank of a line """
+
+_HEAD_SIZE = 256
+""" Bytes at the start of the syslog whose checksum identifies the file along with its inode """
+
+_MAX_READ = 64 * 1024 * 1024
+""" Maximum number of bytes of the syslog indexed by a refresh, the next refresh goes on from there """
+
+_DEFAULT_REFRESH_INTERVAL = 5
+""" Seconds between two refreshes in the background """
+
+_index = None
+""" Index of the core, started by the core server """
+
+
+def get_syslog_index():
+    """ Syslog index of the core, None when it has not been started """
+    return _index
+
+
+async def start_syslog_index(syslog_file, index_file):
+    """ Starts to index the syslog, loading the index saved by a previous run """
+    global _index
+    index = SyslogIndex(syslog_file, index_file)
+    await index.start()
+    _index = index
+
+
+async def stop_syslog_index():
+    global _index
+    if _index is not None:
+        await _index.stop()
+        _index = None
+
+
+class SyslogIndex(object):
+    """ Positions of the Fledge lines of a syslog file by source and minimum level """
+
+    def __init__(self, syslog_file, index_file, refresh_interval=_DEFAULT_REFRESH_INTERVAL):
+        """
+        Args:
+            syslog_file: path of the syslog
+            index_file: path of the index records, the identity of the syslog is saved with a .json suffix
+            refresh_interval: seconds between two refreshes in the background
+        """
+        self._syslog_file = syslog_file
+        self._index_file = index_file
+        self._meta_file = index_file + '.json'
+        self._refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._task = None
+        self._reset(None, None)
+
+    def _reset(self, inode, head):
+        self._inode = inode
+        self._head = head
+        self._indexed = 0
+        """ Bytes of the syslog indexed, always at the start of a line """
+        self._positions = array.array('Q')
+        self._lengths = array.array('I')
+        self._line_sources = array.array('H')
+        self._ranks = array.array('B')
+        self._sources = []
+        self._source_ids = {}
+        self._all = [array.array('I') for _ in range(len(LEVELS))]
+        """ Record numbers of the lines of any source by minimum level """
+        self._by_source = []
+        """ Record numbers of the lines of each source by minimum level, by source id """
+        self._saved = 0
+
+    @property
+    def lines(self):
+        return len(self._positions)
+
+    async def start(self):
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.load)
+        await loop.run_in_executor(None, self.refresh)
+        self._task = asyncio.ensure_future(self._refresh_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.get_event_loop().run_in_executor(None, self.save)
+
+    def load(self):
+        """ Loads the index saved for the current syslog, if any """
+        try:
+            with open(self._meta_file) as f:
+                meta = json.load(f)
+            with open(self._index_file, 'r+b') as f:
+                records = f.read(meta['lines'] * _RECORD.size)
+                records = records[:len(records) // _RECORD.size * _RECORD.size]
+                # Drop the records past the ones saved with the meta data, left by a save that did not complete,
+                # as the next save appends at the end of the file
+                f.truncate(len(records))
+        except (OSError, ValueError, KeyError) as ex:
+            _logger.debug("No syslog index loaded. %s", str(ex))
+            return
+        with self._lock:
+            self._reset(meta['inode'], meta['head'])
+            self._sources = list(meta['sources'])
+            self._source_ids = {name: i for i, name in enumerate(self._sources)}
+            self._by_source = [[array.array('I') for _ in range(len(LEVELS))] for _ in self._sources]
+            for position, length, source_id, rank in _RECORD.iter_unpack(records):
+                self._append(position, length, source_id, rank)
+            if self.lines == meta['lines']:
+                self._indexed = meta['indexed']
+            elif self.lines:
+                self._indexed = self._positions[-1] + self._lengths[-1]
+            self._saved = self.lines
+
+    def save(self):
+        """ Appends the records not saved yet to the index file and saves the identity of the syslog """
+        with self._lock:
+            if self._inode is None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self._index_file), exist_ok=True)
+                mode = 'ab' if self._saved else 'wb'
+                with open(self._index_file, mode) as f:
+                    f.write(b''.join(_RECORD.pack(self._positions[n], self._lengths[n], self._line_sources[n],
+                                                  self._ranks[n]) for n in range(self._saved, self.lines)))
+                meta = {"inode": self._inode, "head": self._head, "indexed": self._indexed, "lines": self.lines,
+                        "sources": self._sources}
+                with open(self._meta_file + '.tmp', 'w') as f:
+                    json.dump(meta, f)
+                os.replace(self._meta_file + '.tmp', self._meta_file)
+                self._saved = self.lines
+            except OSError as ex:
+                _logger.warning("Failed to save the syslog index. %s", str(ex))
+
+    def refresh(self):
+        """ Indexes the lines appended to the syslog since the last refresh, starting over when it was rotated
+
+        Returns:
+            number of lines indexed
+        """
+        with self._lock:
+            try:
+                f = open(self._syslog_file, 'rb')
+            except OSError:
+                return 0
+            with f:
+                stat = os.fstat(f.fileno())
+                head = zlib.crc32(f.read(_HEAD_SIZE)) if stat.st_size >= _HEAD_SIZE else None
+                if stat.st_ino != self._inode or stat.st_size < self._indexed or \
+                        (self._head is not None and head != self._head):
+                    self._reset(stat.st_ino, head)
+                elif self._head is None:
+                    self._head = head
+                f.seek(self._indexed)
+                data = f.read(_MAX_READ)
+            end = data.rfind(b'\n') + 1
+            lines = 0
+            position = self._indexed
+            for line in data[:end].splitlines(keepends=True):
+                match = _SOURCE_PATTERN.search(line)
+                if match is not None:
+                    source = match.group(1).decode('utf-8', 'replace')
+                    source_id = self._source_ids.get(source)
+                    if source_id is None:
+                        source_id = self._source_ids[source] = len(self._sources)
+                        self._sources.append(source)
+                        self._by_source.append([array.array('I') for _ in range(len(LEVELS))])
+                    level = _LEVEL_PATTERN.search(line, match.end())
+                    self._append(position, len(line), source_id, _LEVEL_RANKS[level.group(1)] if level else 0)
+                    lines += 1
+                position += len(line)
+            self._indexed = position
+            return lines
+
+    def query(self, source=None, level='debug', keyword='', offset=0, limit=20, count=True):
+        """ Selects the most recent lines matching the criteria
+
+        Args:
+            source: syslog program name of the lines, or list of names, None for the lines of all the Fledge
+                    processes
+            level: minimum level, one of LEVELS
+            keyword: text the lines contain
+            offset: number of most recent matching lines skipped
+            limit: maximum number of lines returned
+            count: when False the total number of matching lines is not computed, the search stops once the page
+                   is complete
+        Returns:
+            tuple of the total number of matching lines, or None, and the page of lines in the syslog order
+        """
+        with self._lock:
+            if source is None:
+                candidates = self._all[LEVELS[level]]
+            else:
+                names = [source] if isinstance(source, str) else source
+                by_source = [self._by_source[self._source_ids[name]][LEVELS[level]] for name in names
+                             if name in self._source_ids]
+                # The lines of each source are in the syslog order, and a line has a single source
+                candidates = by_source[0] if len(by_source) == 1 else array.array('I', heapq.merge(*by_source))
+            with open(self._syslog_file, 'rb') as f:
+                if not keyword:
+                    total = len(candidates)
+                    page = candidates[max(0, total - offset - limit):max(0, total - offset)]
+                    return (total if count else None), [self._read(f, n) for n in page]
+
+                wanted = keyword.encode('utf-8')
+                matched = 0
+                page = []
+                for n in reversed(candidates):
+                    line = self._read(f, n)
+                    if wanted not in line.encode('utf-8'):
+                        continue
+                    if offset <= matched < offset + limit:
+                        page.append(line)
+                    matched += 1
+                    if not count and matched >= offset + limit:
+                        break
+                page.reverse()
+                return (matched if count else None), page
+
+    async def query_async(self, *args, **kwargs):
+        """ Same as query, refreshing the index first, run in an executor so that the core is not blocked """
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.refresh)
+        return await loop.run_in_executor(None, lambda: self.query(*args, **kwargs))
+
+    def metrics(self):
+        return {"lines": self.lines, "indexed_bytes": self._indexed, "sources": len(self._sources)}
+
+    def _append(self, position, length, source_id, rank):
+        n = len(self._positions)
+        self._positions.append(position)
+        self._lengths.append(length)
+        self._line_sources.append(source_id)
+        self._ranks.append(rank)
+        for r in range(rank + 1):
+            self._all[r].append(n)
+            self._by_source[source_id][r].append(n)
+
+    def _read(self, f, n):
+        f.seek(self._positions[n])
+        return f.read(self._lengths[n]).decode('utf-8', 'replace')
+
+    async def _refresh_forever(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                if await loop.run_in_executor(None, self.refresh):
+                    await loop.run_in_executor(None, self.save)
+            except Exception as ex:
+                _logger.warning("Failed to refresh the syslog index. %s", str(ex))
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Cache of the tokens verified by the REST authentication middleware
+
+A token verified against storage is kept with its user, by hash of the token, for a short time. The requests carrying
+it meanwhile are not checked against storage again: the expiry of the tokens they used is extended by a single
+update every few seconds rather than by one update each. The role ids checked by permissions are cached too.
+
+The user model invalidates the tokens it deletes, on logout, password or role change and user deletion. A token
+invalidated while it was being verified is not cached.
+"""
+
+import asyncio
+import collections
+import hashlib
+import time
+from datetime import datetime, timedelta
+
+from fledge.common.logger import FLCoreLogger
+from fledge.common.storage_client.payload_builder import PayloadBuilder
+from fledge.services.core import connect
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+_logger = FLCoreLogger().get_logger(__name__)
+
+_DEFAULT_TTL = 60
+""" Seconds a verified token, or the role ids of a permission, are trusted before being read from storage again """
+
+_DEFAULT_REFRESH_INTERVAL = 10
+""" Seconds between two updates of the expiry of the tokens used """
+
+_MAX_TOKENS = 10000
+""" Maximum number of tokens cached, the least recently verified are dropped first """
+
+_cache = None
+""" Cache of the core, started by the core server """
+
+
+def get_token_cache():
+    """ Cache of the core, None when it has not been started """
+    return _cache
+
+
+async def start_token_cache(token_expiry):
+    """ Starts the cache of the core
+
+    Args:
+        token_expiry: seconds a token is extended by when it is used
+    """
+    global _cache
+    cache = TokenCache(token_expiry)
+    cache.start()
+    _cache = cache
+
+
+async def stop_token_cache():
+    global _cache
+    if _cache is not None:
+        await _cache.stop()
+        _cache = None
+
+
+def _key(token):
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+class TokenCache(object):
+    """ Users of the tokens verified recently, by hash of the token """
+
+    def __init__(self, token_expiry, ttl=_DEFAULT_TTL, refresh_interval=_DEFAULT_REFRESH_INTERVAL,
+                 max_tokens=_MAX_TOKENS):
+        """
+        Args:
+            token_expiry: seconds a token is extended by when it is used
+            ttl: seconds a verified token is trusted for
+            refresh_interval: seconds between two updates of the expiry of the tokens used
+            max_tokens: maximum number of tokens cached
+        """
+        self._token_expiry = token_expiry
+        self._ttl = ttl
+        self._refresh_interval = refresh_interval
+        self._max_tokens = max_tokens
+        self._tokens = collections.OrderedDict()
+        """ Tuple of the user and the monotonic time of the verification, by hash of the token """
+        self._used = {}
+        """ Tokens used since the last update of their expiry, by hash """
+        self._roles = {}
+        """ Tuple of the role ids and the monotonic time they were read, by permission """
+        self._generation = 0
+        self._task = None
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0, "refreshes": 0}
+
+    @property
+    def generation(self):
+        """ Changes on each invalidation, read it before verifying a token and give it to put """
+        return self._generation
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._refresh_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.refresh_expiry()
+        except Exception as ex:
+            _logger.warning("Failed to extend the expiry of the tokens used. %s", str(ex))
+
+    def get(self, token):
+        """ User of a token verified recently, None when it must be verified against storage
+
+        The token expiry is then extended with the next refresh.
+        """
+        key = _key(token)
+        entry = self._tokens.get(key)
+        if entry is None or time.monotonic() - entry[1] > self._ttl:
+            if entry is not None:
+                del self._tokens[key]
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        self._used[key] = token
+        return dict(entry[0])
+
+    def put(self, token, user, generation):
+        """ Caches the user of a token verified against storage, unless an invalidation happened meanwhile """
+        if generation != self._generation:
+            return
+        key = _key(token)
+        self._tokens[key] = (dict(user), time.monotonic())
+        self._tokens.move_to_end(key)
+        while len(self._tokens) > self._max_tokens:
+            self._tokens.popitem(last=False)
+
+    def get_role_ids(self, permission):
+        entry = self._roles.get(permission)
+        if entry is None or time.monotonic() - entry[1] > self._ttl:
+            return None
+        return entry[0]
+
+    def put_role_ids(self, permission, role_ids):
+        self._roles[permission] = (role_ids, time.monotonic())
+
+    def invalidate_token(self, token):
+        key = _key(token)
+        self._tokens.pop(key, None)
+        self._used.pop(key, None)
+        self._invalidated()
+
+    def invalidate_user(self, user_id):
+        for key in [key for key, entry in self._tokens.items() if str(entry[0]['id']) == str(user_id)]:
+            del self._tokens[key]
+            self._used.pop(key, None)
+        self._invalidated()
+
+    def clear(self):
+        self._tokens.clear()
+        self._used.clear()
+        self._roles.clear()
+        self._invalidated()
+
+    async def refresh_expiry(self):
+        """ Extends the expiry of the tokens used since the last refresh, with a single update """
+        if not self._used:
+            return
+        tokens = list(self._used.values())
+        self._used = {}
+        exp = datetime.now() + timedelta(seconds=self._token_expiry)
+        payload = PayloadBuilder().SET(token_expiration=str(exp)).WHERE(['token', 'in', tokens]
+                                                                        ).MODIFIER(["allowzero"]).payload()
+        await connect.get_storage_async().update_tbl("user_logins", payload)
+        self._stats["refreshes"] += 1
+
+    def metrics(self):
+        return dict(self._stats, tokens=len(self._tokens), pending=len(self._used))
+
+    def _invalidated(self):
+        self._generation += 1
+        self._stats["invalidations"] += 1
+
+    async def _refresh_forever(self):
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self.refresh_expiry()
+            except Exception as ex:
+                _logger.warning("Failed to extend the expiry of the tokens used. %s", str(ex))
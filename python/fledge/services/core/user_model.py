@@ -18,7 +18,7 @@ from fledge.common.logger import FLCoreLogger
 from fledge.common.storage_client.payload_builder import PayloadBuilder
 from fledge.common.storage_client.exceptions import StorageServerError
 from fledge.common.web.ssl_wrapper import SSLVerifier
-from fledge.services.core import connect
+from fledge.services.core import connect, token_cache
 
 __author__ = "Praveen Garg, Ashish Jabble, Amarendra K Sinha"
 __copyright__ = "Copyright (c) 2017 OSIsoft, LLC"
@@ -144,6 +144,7 @@ class User:
                 payload = PayloadBuilder().SET(enabled="f").WHERE(['id', '=', user_id]).AND_WHERE(
                     ['enabled', '=', 't']).payload()
                 result = await storage_client.update_tbl("users", payload)
+                cls._invalidate_cached_tokens(user_id=user_id)
                 # USRDL audit trail entry
                 audit = AuditLogger(storage_client)
                 await audit.information(
@@ -198,6 +199,8 @@ class User:
                     ['enabled', '=', 't']).payload()
                 result = await storage_client.update_tbl("users", payload)
                 if result['rows_affected']:
+                    # the users of the cached tokens are read again
+                    cls._invalidate_cached_tokens(user_id=user_id)
                     # FIXME: FOGL-1226 active session delete only in case of role_id and password updation
                     if 'password' in user_data or 'role_id' in user_data:
                         # delete all active sessions
@@ -424,12 +427,26 @@ class User:
             uid, jwt_token, is_admin = await cls._get_new_token(storage_client, found_user, host)
             return uid, jwt_token, is_admin
 
+        @classmethod
+        def _invalidate_cached_tokens(cls, user_id=None, token=None):
+            cache = token_cache.get_token_cache()
+            if cache is None:
+                return
+            if token is not None:
+                cache.invalidate_token(token)
+            elif user_id is not None:
+                cache.invalidate_user(user_id)
+            else:
+                cache.clear()
+
         @classmethod
         async def delete_user_tokens(cls, user_id):
             storage_client = connect.get_storage_async()
             payload = PayloadBuilder().WHERE(['user_id', '=', user_id]).payload()
             try:
                 res = await storage_client.delete_from_tbl("user_logins", payload)
+                # after the delete, so that a token being verified meanwhile is not cached
+                cls._invalidate_cached_tokens(user_id=user_id)
             except StorageServerError as ex:
                 if not ex.error["retryable"]:
                     pass
@@ -443,6 +460,7 @@ class User:
             payload = PayloadBuilder().WHERE(['token', '=', token]).payload()
             try:
                 res = await storage_client.delete_from_tbl("user_logins", payload)
+                cls._invalidate_cached_tokens(token=token)
             except StorageServerError as ex:
                 if not ex.error["retryable"]:
                     pass
@@ -454,6 +472,7 @@ class User:
         async def delete_all_user_tokens(cls):
             storage_client = connect.get_storage_async()
             await storage_client.delete_from_tbl("user_logins")
+            cls._invalidate_cached_tokens()
 
         @classmethod
         def hash_password(cls, password):
@@ -14,7 +14,9 @@ import json
 
 from fledge.common import logger
 from fledge.common import statistics
-from fledge.common.storage_client.exceptions import StorageServerError
+from fledge.common.asset_tracker_cache import AssetTrackerCache
+from fledge.common.storage_client.exceptions import StorageServerError, ReadingStreamUnavailable
+from fledge.services.south.readings_buffer import ReadingsRingBuffer
 
 __author__ = "Terris Linenbach, Amarendra K Sinha"
 __copyright__ = "Copyright (c) 2017 OSIsoft, LLC"
@@ -32,7 +34,8 @@ class Ingest(object):
     """Adds sensor readings to Fledge
 
     Also tracks readings-related statistics.
-    Readings are added to a configurable list. Configurable batches of inserts are sent to storage
+    Readings are added to a ring buffer of configurable size. Configurable batches of inserts are taken from
+    the front of the buffer and sent to storage
     """
 
     # Class attributes
@@ -57,35 +60,23 @@ class Ingest(object):
     _started = False
     """True when the server has been started"""
 
-    _readings_lists = None  # type: List
-    """A list of readings lists. Each list contains the inputs to :meth:`add_readings`."""
-
-    _current_readings_list_index = 0
-    """Which readings list to insert into next"""
+    _readings_buffer = None  # type: ReadingsRingBuffer
+    """Readings passed to :meth:`add_readings` that are waiting to be inserted"""
 
     _insert_readings_tasks = None  # type: List[asyncio.Task]
     """asyncio tasks for :meth:`_insert_readings`"""
 
-    _readings_list_batch_size_reached = None  # type: List[asyncio.Event]
-    """Fired when a readings list has reached _readings_insert_batch_size entries"""
-
-    _readings_list_not_empty = None  # type: List[asyncio.Event]
-    """Fired when a readings list transitions from empty to not empty"""
+    _readings_batch_ready = None  # type: asyncio.Event
+    """Fired when the readings buffer holds at least _readings_insert_batch_size entries"""
 
-    _readings_lists_not_full = None  # type: asyncio.Event
-    """Fired when items are removed from any readings list"""
-
-    _insert_readings_wait_tasks = None  # type: List[asyncio.Task]
-    """asyncio tasks blocking :meth:`_insert_readings` that can be canceled"""
+    _readings_buffer_not_full = None  # type: asyncio.Event
+    """Fired when readings are removed from a full readings buffer"""
 
     _last_insert_time = 0  # type: int
     """epoch time of last insert"""
 
-    _readings_list_size = 0  # type: int
-    """Maximum number of readings items in each buffer"""
-
     _readings_buffer_size = 4096
-    """Maximum number of readings to buffer in memory(_max_concurrent_readings_inserts x _readings_insert_batch_size)"""
+    """Maximum number of readings to buffer in memory"""
 
     _max_concurrent_readings_inserts = 4
     """Maximum number of concurrent processes that send batches of readings to storage. Preferably in multiples of 2."""
@@ -102,14 +93,27 @@ class Ingest(object):
     _max_readings_insert_batch_reconnect_wait_seconds = 10
     """The maximum number of seconds to wait before reconnecting to storage when inserting readings"""
 
+    _readings_insert_mode = "json"
+    """How batches of readings are sent to storage: "json" posts a JSON document, "stream" uses the binary
+    readings stream and falls back to JSON for a batch that can not be streamed"""
+
     # Configuration (end)
 
-    _payload_events = []
-    """The list of unique reading payload for asset tracker"""
+    _asset_tracker = None  # type: AssetTrackerCache
+    """Asset tracker events known to the service, new events are delivered to the core in the background"""
+
+    _asset_tracker_service = None
+    """Service name of the asset tracker Ingest events"""
+
+    _asset_tracker_plugin = None
+    """Plugin name of the asset tracker Ingest events"""
 
     stats = None
     """Statistics class instance"""
 
+    _statistics = None  # type: statistics.StatisticsAccumulator
+    """Accumulates the statistics increments and writes them to storage in bulk"""
+
     @classmethod
     async def _read_config(cls):
         """Creates default values for the South configuration category and then reads all
@@ -158,6 +162,14 @@ class Ingest(object):
                 "type": "integer",
                 "default": str(cls._max_readings_insert_batch_reconnect_wait_seconds)
             },
+            "readings_insert_mode": {
+                "description": "Send readings to storage as JSON documents or over the binary "
+                               "readings stream",
+                "displayName": "Readings Insert Mode",
+                "type": "enumeration",
+                "options": ["json", "stream"],
+                "default": cls._readings_insert_mode
+            },
         }
 
         # Create configuration category and any new keys within it
@@ -191,8 +203,7 @@ class Ingest(object):
             ['value'])
         cls._max_readings_insert_batch_reconnect_wait_seconds = int(
             config['max_readings_insert_batch_reconnect_wait_seconds']['value'])
-
-        cls._payload_events = []
+        cls._readings_insert_mode = config['readings_insert_mode']['value']
 
     @classmethod
     async def start(cls, parent):
@@ -212,35 +223,27 @@ class Ingest(object):
         cls._readings_insert_batch_size = 1024 if not cls._readings_insert_batch_size else cls._readings_insert_batch_size
         cls._max_concurrent_readings_inserts = 4 if not cls._max_concurrent_readings_inserts else cls._max_concurrent_readings_inserts
 
-        cls._readings_list_size = int(cls._readings_buffer_size / (
-            cls._max_concurrent_readings_inserts))
-
-        # Is the buffer size as configured big enough to support all of
-        # the buffers filled to the batch size? If not, increase
-        # the buffer size.
-        if cls._readings_list_size < cls._readings_insert_batch_size:
-            cls._readings_list_size = cls._readings_insert_batch_size
+        # Is the buffer size as configured big enough to hold a full batch? If not, increase the buffer size.
+        buffer_size = cls._readings_buffer_size
+        if buffer_size < cls._readings_insert_batch_size:
+            buffer_size = cls._readings_insert_batch_size
 
             _LOGGER.warning('Readings buffer size as configured (%s) is too small; increasing '
-                            'to %s', cls._readings_buffer_size,
-                            cls._readings_list_size * cls._max_concurrent_readings_inserts)
+                            'to %s', cls._readings_buffer_size, buffer_size)
 
         cls._last_insert_time = 0
-        cls._insert_readings_wait_tasks = []
-        cls._readings_list_batch_size_reached = []
-        cls._readings_list_not_empty = []
-        cls._readings_lists = []
-
-        for _ in range(cls._max_concurrent_readings_inserts):
-            cls._readings_lists.append([])
-            cls._insert_readings_wait_tasks.append(None)
-            cls._readings_list_batch_size_reached.append(asyncio.Event())
-            cls._readings_list_not_empty.append(asyncio.Event())
-
-        cls._insert_readings_task = asyncio.ensure_future(cls._insert_readings())
-        cls._readings_lists_not_full = asyncio.Event()
-
-        cls._payload_events = cls._parent_service._core_microservice_management_client.get_asset_tracker_events()['track']
+        cls._readings_buffer = ReadingsRingBuffer(buffer_size)
+        cls._readings_batch_ready = asyncio.Event()
+        cls._readings_buffer_not_full = asyncio.Event()
+        cls._insert_readings_tasks = [asyncio.ensure_future(cls._insert_readings())
+                                      for _ in range(cls._max_concurrent_readings_inserts)]
+
+        management_client = cls._parent_service._core_microservice_management_client
+        cls._asset_tracker = AssetTrackerCache(management_client)
+        cls._asset_tracker.load(management_client.get_asset_tracker_events()['track'])
+        cls._asset_tracker.start()
+        cls._asset_tracker_service = cls._parent_service._name
+        cls._asset_tracker_plugin = cls._parent_service._plugin_info['config']['plugin']['default']
 
         cls.stats = await statistics.create_statistics(cls.storage_async)
 
@@ -249,6 +252,8 @@ class Ingest(object):
         await cls.stats.register('DISCARDED', 'Readings discarded at the input side by Fledge, i.e. '
                                               'discarded before being placed in the buffer. This may be due to some '
                                               'error in the readings themselves.')
+        cls._statistics = await statistics.create_statistics_accumulator(cls.storage_async)
+        cls._statistics.start()
 
         cls._stop = False
         cls._started = True
@@ -263,24 +268,27 @@ class Ingest(object):
 
         cls._stop = True
 
-        for task in cls._insert_readings_wait_tasks:
-            if task is not None:
-                try:
-                    task.cancel()
-                except asyncio.CancelledError:
-                    pass
-        try:
-            await cls._insert_readings_task
-            cls._insert_readings_task = None
-        except Exception:
-            _LOGGER.exception('An exception was raised by Ingest._insert_readings')
+        # Wake the insert tasks so that they flush the buffer, and any producer waiting for space
+        cls._readings_batch_ready.set()
+        cls._readings_buffer_not_full.set()
+
+        for task in cls._insert_readings_tasks:
+            try:
+                await task
+            except Exception:
+                _LOGGER.exception('An exception was raised by Ingest._insert_readings')
+
+        _LOGGER.info('Readings buffer high water mark: %s of %s', cls._readings_buffer.high_water_mark,
+                     cls._readings_buffer.capacity)
+
+        await cls._asset_tracker.stop()
+        await cls._statistics.stop()
 
-        cls._insert_readings_wait_tasks = None
         cls._insert_readings_tasks = None
-        cls._readings_lists = None
-        cls._readings_list_batch_size_reached = None
-        cls._readings_list_not_empty = None
-        cls._readings_lists_not_full = None
+        cls._readings_buffer = None
+        cls._asset_tracker = None
+        cls._readings_batch_ready = None
+        cls._readings_buffer_not_full = None
 
         cls._started = False
 
@@ -297,57 +305,38 @@ class Ingest(object):
         """
         _LOGGER.info('Insert readings loop started')
 
-        list_index = 0
+        loop = asyncio.get_event_loop()
+        readings_buffer = cls._readings_buffer
+        batch_ready = cls._readings_batch_ready
 
-        while list_index <= cls._max_concurrent_readings_inserts-1:
+        while True:
             if cls._stop:
-                readings = 0
-                for i in range(cls._max_concurrent_readings_inserts):
-                    readings += len(cls._readings_lists[i])
-                if cls._discarded_readings_stats + readings == 0:
+                if cls._discarded_readings_stats + len(readings_buffer) == 0:
                     break  # Terminate this method as there are no pending readings available
 
-            list_index += 1
-            if list_index > cls._max_concurrent_readings_inserts-1:
-                list_index = 0
-
-            # _LOGGER.debug('Insert readings for list_index: %s', list_index)
-
-            readings_list = cls._readings_lists[list_index]
-            min_readings_reached = cls._readings_list_batch_size_reached[list_index]
-            lists_not_full = cls._readings_lists_not_full
-
-            # Wait for enough items in the list to fill a batch
+            # Wait for enough items in the buffer to fill a batch
             # for some minimum amount of time
-            while not cls._stop:
-                if len(readings_list) >= cls._readings_insert_batch_size:
+            deadline = loop.time() + cls._readings_insert_batch_timeout_seconds
+            while not cls._stop and len(readings_buffer) < cls._readings_insert_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
                     break
-
-                min_readings_reached.clear()
-                waiter = asyncio.ensure_future(min_readings_reached.wait())
-                cls._insert_readings_wait_tasks[list_index] = waiter
-
-                # _LOGGER.debug('Waiting for entire batch: Queue index: %s Size: %s', list_index, len(readings_list))
-
+                batch_ready.clear()
                 try:
-                    await asyncio.wait_for(waiter, cls._readings_insert_batch_timeout_seconds)
-                    # _LOGGER.debug('Released: Queue index: %s Size: %s', list_index, len(readings_list))
-                except asyncio.CancelledError:
-                    # _LOGGER.debug('Cancelled: Queue index: %s Size: %s', list_index, len(readings_list))
-                    break
+                    await asyncio.wait_for(batch_ready.wait(), remaining)
                 except asyncio.TimeoutError:
-                    # _LOGGER.debug('Timed out: Queue index: %s Size: %s', list_index, len(readings_list))
                     break
-                finally:
-                    cls._insert_readings_wait_tasks[list_index] = None
 
-            # If list is still empty, then proceed to next list
-            if not len(readings_list):
-                continue
+            readings_list = readings_buffer.get_batch(cls._readings_insert_batch_size)
+            if len(readings_buffer) < cls._readings_insert_batch_size:
+                batch_ready.clear()
+            if not cls._readings_buffer_not_full.is_set():
+                cls._readings_buffer_not_full.set()
 
-            # If batch size still not reached and if there is time then let this list wait and move to next list
-            if (not cls._stop) and (len(readings_list) < cls._readings_insert_batch_size) and ((
-                    time.time() - cls._last_insert_time) < cls._readings_insert_batch_timeout_seconds):
+            batch_size = len(readings_list)
+            if not batch_size:
+                if cls._stop:
+                    await cls._write_statistics()
                 continue
 
             attempt = 0
@@ -356,12 +345,12 @@ class Ingest(object):
             # Perform insert. Retry when fails.
             while True:
                 try:
-                    batch_size = len(readings_list)
-                    payload = json.dumps({"readings": readings_list[:batch_size]})
                     # insert_start_time = time.time()
-                    # _LOGGER.debug('Begin insert: Queue index: %s Batch size: %s', list_index, batch_size)
+                    # _LOGGER.debug('Begin insert: Batch size: %s', batch_size)
                     try:
-                        await cls.readings_storage_async.append(payload)
+                        if not await cls._stream_readings(readings_list, batch_size):
+                            payload = json.dumps({"readings": readings_list})
+                            await cls.readings_storage_async.append(payload)
                         # insert_end_time = time.time()
                         # _LOGGER.debug('Inserted %s records in time %s', batch_size, insert_end_time - insert_start_time)
                         cls._readings_stats += batch_size
@@ -375,89 +364,114 @@ class Ingest(object):
                         else:
                             # not retryable
                             _LOGGER.error("%s, %s", err_response["source"], err_response["message"])
-                            batch_size = len(readings_list)
                             cls._discarded_readings_stats += batch_size
-                    # _LOGGER.debug('End insert: Queue index: %s Batch size: %s', list_index, batch_size)
+                    # _LOGGER.debug('End insert: Batch size: %s', batch_size)
                     break
                 except Exception as ex:
                     attempt += 1
 
-                    _LOGGER.exception(ex, 'Insert failed on attempt #{}, list index: {}'.format(attempt, list_index))
+                    _LOGGER.exception(ex, 'Insert failed on attempt #{}'.format(attempt))
 
                     if cls._stop or attempt >= _MAX_ATTEMPTS:
-                        # Stopping. Discard the entire list upon failure.
-                        batch_size = len(readings_list)
+                        # Stopping. Discard the entire batch upon failure.
                         cls._discarded_readings_stats += batch_size
-                        _LOGGER.warning('Insert failed: Queue index: %s Batch size: %s', list_index, batch_size)
+                        _LOGGER.warning('Insert failed: Batch size: %s', batch_size)
                         break
 
             await cls._write_statistics()
 
-            del readings_list[:batch_size]
-
-            if not lists_not_full.is_set():
-                lists_not_full.set()
-
             # insert_end_time = time.time()
             # _LOGGER.debug('Inserted %s records + stat in time %s', batch_size, insert_end_time - insert_start_time)
 
         _LOGGER.info('Insert readings loop stopped')
 
+    @classmethod
+    async def _stream_readings(cls, readings_list, batch_size) -> bool:
+        """Sends a batch over the binary readings stream when the stream insert mode is configured
+
+        Returns:
+            True - The batch has been sent
+            False - The batch must be sent as JSON
+        """
+        if cls._readings_insert_mode != "stream":
+            return False
+        try:
+            await cls.readings_storage_async.append_stream(readings_list, batch_size)
+            return True
+        except ReadingStreamUnavailable:
+            _LOGGER.warning('Readings stream is unavailable, sending batch as JSON')
+        except (ValueError, TypeError, KeyError) as ex:
+            _LOGGER.warning('Unable to encode batch for the readings stream, sending batch as JSON. %s', str(ex))
+        return False
+
     @classmethod
     async def _write_statistics(cls):
-        """Periodically commits collected readings statistics"""
+        """Hands the collected readings statistics to the statistics accumulator, which writes them in bulk"""
 
-        updates = {}
+        accumulator = cls._statistics
 
         readings = cls._readings_stats
         cls._readings_stats -= readings
-        updates.update({'READINGS': readings})
+        accumulator.increment('READINGS', readings)
 
         discarded_readings = cls._discarded_readings_stats
         cls._discarded_readings_stats -= discarded_readings
-        updates.update({'DISCARDED': discarded_readings})
+        accumulator.increment('DISCARDED', discarded_readings)
 
-        """ Register the statistics keys as this may be the first time the key has come into existence """
+        """ The accumulator registers the keys that come into existence for the first time """
         sensor_readings = cls._sensor_stats.copy()
-        for key in sensor_readings:
-            description = 'Readings received by Fledge since startup for sensor {}'.format(key)
-            await cls.stats.register(key, description)
-            cls._sensor_stats[key] -= sensor_readings[key]
-            updates.update({key: sensor_readings[key]})
-
-        try:
-            await cls.stats.update_bulk(updates)
-        except Exception as ex:
-            cls._readings_stats += readings
-            cls._discarded_readings_stats += discarded_readings
-            for key in sensor_readings:
-                cls._sensor_stats[key] += sensor_readings[key]
-            _LOGGER.exception(ex, 'An error occurred while writing sensor statistics')
+        for key, value in sensor_readings.items():
+            if value:
+                cls._sensor_stats[key] -= value
+                accumulator.increment(key, value, 'Readings received by Fledge since startup for sensor {}'.format(key))
 
     @classmethod
     def is_available(cls) -> bool:
-        """Indicates whether all lists are currently full
+        """Indicates whether the readings buffer is currently full
 
         Returns:
-            False - All of the lists are full
+            False - The buffer is full or the server is stopping
             True - Otherwise
         """
         if cls._stop:
             return False
 
-        list_index = cls._current_readings_list_index
-        if len(cls._readings_lists[list_index]) < cls._readings_list_size:
+        if not cls._readings_buffer.is_full():
             return True
 
-        if cls._max_concurrent_readings_inserts > 1:
-            for list_index in range(cls._max_concurrent_readings_inserts):
-                if len(cls._readings_lists[list_index]) < cls._readings_list_size:
-                    cls._current_readings_list_index = list_index
-                    return True
-
-        _LOGGER.warning('The ingest service is unavailable %s', list_index)
+        _LOGGER.warning('The ingest service is unavailable, readings buffer is full')
         return False
 
+    @classmethod
+    async def wait_available(cls, timeout: float = None) -> bool:
+        """Waits until the readings buffer has space for another reading
+
+        Async south plugins should await this before :meth:`add_readings` so that they slow down to the rate
+        storage accepts readings, instead of having readings discarded.
+
+        Args:
+            timeout: Maximum number of seconds to wait, None to wait until space is available
+
+        Returns:
+            False - The server is stopping or the timeout expired
+            True - A reading can be added
+        """
+        while not cls._stop and cls._readings_buffer.is_full():
+            not_full = cls._readings_buffer_not_full
+            not_full.clear()
+            try:
+                await asyncio.wait_for(not_full.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return not cls._stop
+
+    @classmethod
+    def buffer_metrics(cls) -> dict:
+        """Capacity, occupancy and high water mark of the readings buffer"""
+        if cls._readings_buffer is None:
+            return {}
+        return cls._readings_buffer.metrics()
+
     @classmethod
     async def add_readings(cls, asset: str, timestamp: Union[str, datetime.datetime],
                            readings: dict = None) -> None:
@@ -515,16 +529,8 @@ class Ingest(object):
             cls.increment_discarded_readings()
             return
 
-        list_index = cls._current_readings_list_index
-        readings_list = cls._readings_lists[list_index]
-
-        read = dict()
-        read['asset_code'] = asset
-        read['reading'] = readings
-        read['user_ts'] = timestamp
-        readings_list.append(read)
-
-        list_size = len(readings_list)
+        readings_buffer = cls._readings_buffer
+        readings_buffer.put({'asset_code': asset, 'reading': readings, 'user_ts': timestamp})
 
         # Increment the count of received readings to be used for statistics update
         if asset.upper() in cls._sensor_stats:
@@ -532,29 +538,8 @@ class Ingest(object):
         else:
             cls._sensor_stats[asset.upper()] = 1
 
-        # asset tracker checking
-        payload = {"asset": asset, "event": "Ingest", "service": cls._parent_service._name,
-                   "plugin": cls._parent_service._plugin_info['config']['plugin']['default']}
-        if payload not in cls._payload_events:
-            cls._parent_service._core_microservice_management_client.create_asset_tracker_event(payload)
-            cls._payload_events.append(payload)
-
-        # _LOGGER.debug('Add readings list index: %s size: %s', cls._current_readings_list_index, list_size)
-
-        if list_size == 1:
-            cls._readings_list_not_empty[list_index].set()
-
-        if list_size == cls._readings_insert_batch_size:
-            cls._readings_list_batch_size_reached[list_index].set()
-            # _LOGGER.debug('Set event list index: %s size: %s', cls._current_readings_list_index, len(readings_list))
-
-        # When the current list is full, move on to the next list
-        if cls._max_concurrent_readings_inserts > 1 and (
-                    list_size >= cls._readings_insert_batch_size):
-            # Start at the beginning to reduce the number of connections
-            for list_index in range(cls._max_concurrent_readings_inserts):
-                if len(cls._readings_lists[list_index]) < cls._readings_insert_batch_size:
-                    cls._current_readings_list_index = list_index
-                    # _LOGGER.debug('Change Ingest Queue: from #%s (len %s) to #%s', cls._current_readings_list_index,
-                    #               len(cls._readings_lists[list_index]), list_index)
-                    break
+        # asset tracker checking, new events are delivered to the core in the background
+        cls._asset_tracker.track(asset, "Ingest", cls._asset_tracker_service, cls._asset_tracker_plugin)
+
+        if len(readings_buffer) >= cls._readings_insert_batch_size and not cls._readings_batch_ready.is_set():
+            cls._readings_batch_ready.set()
@@ -76,6 +76,8 @@ async def modify_process_name(service_name, core_management_host, core_managemen
         result = await storage.query_tbl_with_payload('schedules', payload)
     except Exception:
         raise
+    finally:
+        await storage.close()
 
     if int(result['count']):
         sch_id = result['rows'][0]['id']
@@ -128,7 +130,10 @@ async def change_to_south_c(service_name, microservice_management_host, core_man
 
     storage = StorageClientAsync(core_management_host, core_management_port)
     configuration_manager = ConfigurationManager(storage)
-    config = await configuration_manager.get_category_all_items('rest_api')
+    try:
+        config = await configuration_manager.get_category_all_items('rest_api')
+    finally:
+        await storage.close()
 
     is_rest_server_http_enabled = False if config['enableHttp']['value'] == 'false' else True
     port_from_config = config['httpPort']['value'] if is_rest_server_http_enabled \
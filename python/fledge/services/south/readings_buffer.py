@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Fixed capacity ring buffer that holds readings between the south plugin and storage """
+
+from typing import List
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+class ReadingsRingBuffer(object):
+    """ Ring buffer of readings with O(1) put and batch removal from the front
+
+    The slots are allocated once; readings are never shifted when a batch is removed. The buffer is only used
+    from the event loop thread, so it needs no locking.
+    """
+
+    __slots__ = ['_slots', '_capacity', '_head', '_count', '_high_water_mark']
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError('capacity must be a positive integer')
+        self._slots = [None] * capacity
+        self._capacity = capacity
+        self._head = 0
+        self._count = 0
+        self._high_water_mark = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def high_water_mark(self) -> int:
+        """ Largest number of readings held at once since creation or the last :meth:`reset_high_water_mark` """
+        return self._high_water_mark
+
+    def is_full(self) -> bool:
+        return self._count == self._capacity
+
+    def put(self, reading) -> bool:
+        """ Add a reading at the back of the buffer
+
+        Returns:
+            False - The buffer is full and the reading was not added
+            True - Otherwise
+        """
+        count = self._count
+        if count == self._capacity:
+            return False
+        tail = self._head + count
+        if tail >= self._capacity:
+            tail -= self._capacity
+        self._slots[tail] = reading
+        count += 1
+        self._count = count
+        if count > self._high_water_mark:
+            self._high_water_mark = count
+        return True
+
+    def get_batch(self, size: int) -> List:
+        """ Remove and return up to size readings from the front of the buffer, oldest first """
+        size = min(size, self._count)
+        if size <= 0:
+            return []
+        head = self._head
+        end = head + size
+        slots = self._slots
+        if end <= self._capacity:
+            batch = slots[head:end]
+            slots[head:end] = [None] * size
+        else:
+            end -= self._capacity
+            batch = slots[head:] + slots[:end]
+            slots[head:] = [None] * (self._capacity - head)
+            slots[:end] = [None] * end
+        self._head = end if end < self._capacity else 0
+        self._count -= size
+        return batch
+
+    def reset_high_water_mark(self):
+        self._high_water_mark = self._count
+
+    def metrics(self) -> dict:
+        """ Occupancy metrics of the buffer """
+        return {"capacity": self._capacity, "occupancy": self._count, "high_water_mark": self._high_water_mark}
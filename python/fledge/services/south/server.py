@@ -9,6 +9,7 @@
 import json
 import asyncio
 import sys
+import time
 from fledge.services.south import exceptions
 from fledge.common import logger
 from fledge.services.south.ingest import Ingest
@@ -189,13 +190,9 @@ class Server(FledgeMicroservice):
                 if len(data) > 0:
                     if isinstance(data, list):
                         for reading in data:
-                            asyncio.ensure_future(Ingest.add_readings(asset=reading['asset'],
-                                                                        timestamp=reading['timestamp'],
-                                                                        readings=reading['readings']))
+                            await self._add_reading(reading['asset'], reading['timestamp'], reading['readings'])
                     elif isinstance(data, dict):
-                        asyncio.ensure_future(Ingest.add_readings(asset=data['asset'],
-                                                                  timestamp=data['timestamp'],
-                                                                  readings=data['readings']))
+                        await self._add_reading(data['asset'], data['timestamp'], data['readings'])
                 delta = self._event_loop.time() - t1
                 # If delta somehow becomes > sleep_seconds, then ignore delta
                 sleep_for = sleep_seconds - delta if delta < sleep_seconds else sleep_seconds
@@ -216,6 +213,15 @@ class Server(FledgeMicroservice):
 
         _LOGGER.warning('Stopped all polling tasks for plugin: {}'.format(self._name))
 
+    async def _add_reading(self, asset, timestamp, readings) -> None:
+        """Adds a polled reading, waiting for space in the readings buffer rather than having it discarded
+        """
+        await Ingest.wait_available()
+        try:
+            await Ingest.add_readings(asset=asset, timestamp=timestamp, readings=readings)
+        except (ValueError, TypeError, RuntimeError) as ex:
+            _LOGGER.warning('Reading discarded for plugin {}: {}'.format(self._name, str(ex)))
+
     def run(self):
         """Starts the South Microservice
         """
@@ -245,6 +251,11 @@ class Server(FledgeMicroservice):
             _LOGGER.exception('Unable to stop the Ingest server. %s', str(ex))
             raise ex
 
+        try:
+            await self.close_storage_clients()
+        except Exception as ex:
+            _LOGGER.exception('Unable to close storage clients. %s', str(ex))
+
         try:
             if self._task_main is not None:
                 self._task_main.cancel()
@@ -264,6 +275,13 @@ class Server(FledgeMicroservice):
         _LOGGER.info('Stopping South service event loop, for plugin {}.'.format(self._name))
         loop.stop()
 
+    async def ping(self, request):
+        """ health check, with the occupancy of the ingest readings buffer
+
+        """
+        since_started = time.time() - self._start_time
+        return web.json_response({'uptime': since_started, 'readings_buffer': Ingest.buffer_metrics()})
+
     async def shutdown(self, request):
         """implementation of abstract method form fledge.common.microservice.
         """
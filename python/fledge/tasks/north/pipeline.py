@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Building blocks of the pipelined sending process: a memory budget in bytes and per stage metrics """
+
+import asyncio
+import time
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+class MemoryBudget(object):
+    """ Bounds the number of bytes of the blocks held between the first and the last stage of the pipeline
+
+    A block is admitted when it fits in the budget, or when nothing else is held so that a single block larger than
+    the budget can not stall the pipeline.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError('limit must be a positive integer')
+        self._limit = limit
+        self._used = 0
+        self._high_water_mark = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    @property
+    def high_water_mark(self) -> int:
+        return self._high_water_mark
+
+    async def acquire(self, size: int):
+        """ Wait until size bytes fit in the budget and reserve them """
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._used == 0 or self._used + size <= self._limit)
+            self._used += size
+            if self._used > self._high_water_mark:
+                self._high_water_mark = self._used
+
+    async def release(self, size: int):
+        """ Return size bytes to the budget """
+        async with self._condition:
+            self._used -= size
+            self._condition.notify_all()
+
+
+class StageMetrics(object):
+    """ Throughput and latency counters of a pipeline stage
+
+    The busy time is the time spent processing blocks, excluding the time spent waiting for input or for room in the
+    next stage. The latency of a block is the time from the start of its fetch until the stage finished with it.
+    """
+
+    __slots__ = ['name', 'blocks', 'readings', 'bytes', 'busy', 'latency_total', 'latency_max']
+
+    def __init__(self, name: str):
+        self.name = name
+        self.blocks = 0
+        self.readings = 0
+        self.bytes = 0
+        self.busy = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record(self, readings: int, size: int, started: float, fetched: float):
+        """ Account for a block
+
+        :param readings: number of readings in the block
+        :param size: size in bytes of the block
+        :param started: time.monotonic() when the stage started to process the block
+        :param fetched: time.monotonic() when the fetch of the block started
+        """
+        now = time.monotonic()
+        latency = now - fetched
+        self.blocks += 1
+        self.readings += readings
+        self.bytes += size
+        self.busy += now - started
+        self.latency_total += latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+
+    def metrics(self) -> dict:
+        return {
+            "blocks": self.blocks,
+            "readings": self.readings,
+            "bytes": self.bytes,
+            "readings_per_second": round(self.readings / self.busy, 1) if self.busy else 0.0,
+            "latency_avg_ms": round(1000 * self.latency_total / self.blocks, 3) if self.blocks else 0.0,
+            "latency_max_ms": round(1000 * self.latency_max, 3)
+        }
@@ -25,6 +25,7 @@ import logging
 import datetime
 import signal
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import fledge.plugins.north.common.common as plugin_common
 from fledge.common.parser import Parser
@@ -33,10 +34,12 @@ from fledge.common.storage_client import payload_builder
 from fledge.common import statistics
 from fledge.common.jqfilter import JQFilter
 from fledge.common.audit_logger import AuditLogger
+from fledge.common.asset_tracker_cache import AssetTrackerCache
 from fledge.common.logger import FLCoreLogger
 from fledge.common.process import FledgeProcess
 from fledge.common.common import _FLEDGE_ROOT
 from fledge.services.core.api.plugins import common
+from fledge.tasks.north.pipeline import MemoryBudget, StageMetrics
 
 __author__ = "Stefano Simonelli, Massimiliano Pinto, Mark Riddoch, Amarendra K Sinha"
 __copyright__ = "Copyright (c) 2018 OSIsoft, LLC"
@@ -253,6 +256,30 @@ class SendingProcess(FledgeProcess):
             "default": "10",
             "order": "12",
             "displayName": "Memory Buffer Size"
+        },
+        "pipelined": {
+            "description": "Fetch, convert and send readings in concurrent stages, holding at most Memory Buffer "
+                           "Bytes of readings in memory",
+            "type": "boolean",
+            "default": "false",
+            "order": "13",
+            "displayName": "Pipelined Sending"
+        },
+        "memory_buffer_bytes": {
+            "description": "Maximum size in bytes of the readings held in memory by the pipelined sending",
+            "type": "integer",
+            "default": "16777216",
+            "order": "14",
+            "displayName": "Memory Buffer Bytes"
+        },
+        "filterExecution": {
+            "description": "Where the filter rule is applied when the filter is enabled: inline, in a worker thread "
+                           "or in a worker process",
+            "type": "enumeration",
+            "options": ["inline", "thread", "process"],
+            "default": "inline",
+            "order": "15",
+            "displayName": "Filter Execution"
         }
     }
 
@@ -267,6 +294,9 @@ class SendingProcess(FledgeProcess):
             'blockSize': int(self._CONFIG_DEFAULT['blockSize']['default']),
             'sleepInterval': float(self._CONFIG_DEFAULT['sleepInterval']['default']),
             'memory_buffer_size': int(self._CONFIG_DEFAULT['memory_buffer_size']['default']),
+            'pipelined': False,
+            'memory_buffer_bytes': int(self._CONFIG_DEFAULT['memory_buffer_bytes']['default']),
+            'filterExecution': self._CONFIG_DEFAULT['filterExecution']['default'],
         }
         self._config_from_manager = ""
         self._module_template = "fledge.plugins.north." + "empty." + "empty"
@@ -302,6 +332,18 @@ class SendingProcess(FledgeProcess):
         self._memory_buffer_fetch_idx = 0
         self._memory_buffer_send_idx = 0
         """" Used to to managed the in memory buffer for the fetch/send operations """
+        self._pipeline_metrics = None
+        """" Throughput and latency of the stages of the pipelined sending, by stage name """
+        self._pipeline_send_idle = False
+        """" True while the send stage of the pipelined sending waits for a block """
+        self._type_converter = plugin_common.ReadingsTypeConverter()
+        """" Converts the values of the readings to their proper type, keeps the types learned for each asset """
+        self._jqfilter = JQFilter()
+        """" Applies the filter rule, the rule is compiled once """
+        self._filter_executor = None
+        """" Executor running the filter rule, None to run it inline """
+        self._statistics = None
+        """" Accumulates the statistics of the sent readings and writes them in bulk """
         self._event_loop = asyncio.get_event_loop() if loop is None else loop
 
     @staticmethod
@@ -321,10 +363,10 @@ class SendingProcess(FledgeProcess):
     async def _update_statistics(self, num_sent):
         """ Updates Fledge statistics"""
         try:
-            key = self.statistics_key
-            _stats = await statistics.create_statistics(self._storage_async)
-            await _stats.update(key, num_sent)
-            await _stats.update(self.master_statistics_key, num_sent)
+            if self._statistics is None:
+                self._statistics = await statistics.create_statistics_accumulator(self._storage_async)
+            self._statistics.increment(self.statistics_key, num_sent)
+            self._statistics.increment(self.master_statistics_key, num_sent)
         except Exception:
             _message = _MESSAGES_LIST["e000010"]
             SendingProcess._logger.error(_message)
@@ -381,13 +423,9 @@ class SendingProcess(FledgeProcess):
 
                         if data_sent:
                             # asset tracker checking
+                            plugin_name = self._config['plugin']
                             for _reads in self._memory_buffer[self._memory_buffer_send_idx]:
-                                payload = {"asset": _reads['asset_code'], "event": "Egress", "service": self._name,
-                                           "plugin": self._config['plugin']}
-                                if payload not in self._tracked_assets:
-                                    self._core_microservice_management_client.create_asset_tracker_event(
-                                        payload)
-                                    self._tracked_assets.append(payload)
+                                self._tracked_assets.track(_reads['asset_code'], "Egress", self._name, plugin_name)
 
                             db_update = True
                             update_last_object_id = new_last_object_id
@@ -479,25 +517,21 @@ class SendingProcess(FledgeProcess):
         return converted_data
 
     @staticmethod
-    def _transform_in_memory_data_readings(raw_data):
+    def _transform_in_memory_data_readings(raw_data, type_converter=None):
         """ Applies the transformation/validation required to have a standard data set.
         Note:
             Python is not able to automatically convert a string containing a number starting with 0
             to a dictionary (using the eval also), like for example :
                 '{"value":02}'
             so these rows will generate an exception and will be skipped.
+        Args:
+            raw_data: rows retrieved from the Storage Layer
+            type_converter: ReadingsTypeConverter holding the datapoint types learned from the previous blocks,
+                            a new one is used if not given
         """
 
-        def recurse(reading_payload):
-            for k, v in reading_payload.items():
-                if isinstance(v, dict):
-                    for k1, v1 in v.items():
-                        if isinstance(v1, dict):
-                            reading_payload[k][k1] = plugin_common.convert_to_type(v1)
-                            recurse(v1)
-                else:
-                    reading_payload[k] = plugin_common.convert_to_type(v)
-            return reading_payload
+        if type_converter is None:
+            type_converter = plugin_common.ReadingsTypeConverter()
 
         converted_data = []
         for row in raw_data:
@@ -509,7 +543,7 @@ class SendingProcess(FledgeProcess):
                 # Skips row having undefined asset_code
                 if asset_code != "":
                     # Converts values to the proper types, for example "180.2" to float 180.2
-                    payload = recurse(row['reading'])
+                    payload = type_converter.convert_reading(row['asset_code'], row['reading'])
                     timestamp = apply_date_format(row['user_ts'])  # Adds timezone UTC
                     new_row = {
                         'id': row['id'],
@@ -534,7 +568,7 @@ class SendingProcess(FledgeProcess):
             # Loads data, +1 as > is needed
             readings = await self._readings.fetch(last_object_id + 1, self._config['blockSize'])
             raw_data = readings['rows']
-            converted_data = self._transform_in_memory_data_readings(raw_data)
+            converted_data = self._transform_in_memory_data_readings(raw_data, self._type_converter)
         except aiohttp.client_exceptions.ClientPayloadError as _ex:
             SendingProcess._logger.warning(_MESSAGES_LIST["e000009"].format(str(_ex)))
         except Exception as _ex:
@@ -574,6 +608,41 @@ class SendingProcess(FledgeProcess):
             raise
         return last_object_id
 
+    async def _apply_filter(self, data_to_send):
+        """ Applies the JQFilter, when enabled, to a block of data"""
+        if 'applyFilter' in self._config_from_manager:
+            # Handles the JQFilter functionality
+            if self._config_from_manager['applyFilter']["value"].upper() == "TRUE":
+                if 'filterRule' in self._config_from_manager:
+                    result = await self._jqfilter.transform_async(data_to_send,
+                                                                  self._config_from_manager['filterRule']["value"],
+                                                                  self._filter_executor)
+                    # The filter is applied to the whole block, its first result is the block to send
+                    data_to_send = result[0] if result else []
+                    timings = self._jqfilter.timings
+                    SendingProcess._logger.debug("JQ filter - milliseconds - compile |{0:.3f}| - transform |{1:.3f}| "
+                                                 "- total |{2:.3f}|".format(1000 * timings['compile'],
+                                                                            1000 * timings['transform'],
+                                                                            1000 * timings['total']))
+                else:
+                    _LOGGER.warning("filterRule config item is missing to apply filter expression.")
+        return data_to_send
+
+    def _start_filter_executor(self):
+        """ Creates the executor running the filter rule, as configured"""
+        if self._config['filterExecution'] == 'thread':
+            # A single thread, a compiled filter can not be used by several threads at once
+            self._filter_executor = ThreadPoolExecutor(max_workers=1)
+        elif self._config['filterExecution'] == 'process':
+            self._filter_executor = ProcessPoolExecutor(max_workers=1)
+        else:
+            self._filter_executor = None
+
+    def _stop_filter_executor(self):
+        if self._filter_executor is not None:
+            self._filter_executor.shutdown(wait=True)
+            self._filter_executor = None
+
     async def _task_fetch_data(self):
         """ Read data from the Storage Layer into a memory structure"""
         try:
@@ -596,23 +665,7 @@ class SendingProcess(FledgeProcess):
                             slept = True
                             await asyncio.sleep(sleep_time)
                         if data_to_send:
-                            if 'applyFilter' in self._config_from_manager:
-                                # Handles the JQFilter functionality
-                                if self._config_from_manager['applyFilter']["value"].upper() == "TRUE":
-                                    jqfilter = JQFilter()
-                                    # Steps needed to proper format the data generated by the JQFilter
-                                    # to the one expected by the SP
-                                    if 'filterRule' in self._config_from_manager:
-                                        data_to_send_2 = jqfilter.transform(data_to_send,
-                                                                            self._config_from_manager['filterRule']["value"])
-                                        data_to_send_3 = json.dumps(data_to_send_2)
-                                        del data_to_send_2
-                                        data_to_send_4 = eval(data_to_send_3)
-                                        del data_to_send_3
-                                        data_to_send = data_to_send_4[0]
-                                        del data_to_send_4
-                                    else:
-                                        _LOGGER.warning("filterRule config item is missing to apply filter expression.")
+                            data_to_send = await self._apply_filter(data_to_send)
 
                             # Loads the block of data into the in memory buffer
                             self._memory_buffer[self._memory_buffer_fetch_idx] = data_to_send
@@ -643,18 +696,8 @@ class SendingProcess(FledgeProcess):
             await self._audit.failure(self._AUDIT_CODE, {"error - on _task_fetch_data": _message})
             raise
 
-    async def send_data(self):
-        """ Handles the sending of the data to the destination using the configured plugin for a defined amount of time"""
-
-        # Prepares the in memory buffer for the fetch/send operations
-        self._memory_buffer = [None for _ in range(self._config['memory_buffer_size'])]
-        self._task_fetch_data_sem = asyncio.Semaphore(0)
-        self._task_send_data_sem = asyncio.Semaphore(0)
-        self._task_fetch_data_task_id = asyncio.ensure_future(self._task_fetch_data())
-        self._task_send_data_task_id = asyncio.ensure_future(self._task_send_data())
-        self._task_fetch_data_run = True
-        self._task_send_data_run = True
-
+    async def _wait_for_duration(self):
+        """ Waits for the configured duration, or until a termination signal is received"""
         try:
             start_time = time.time()
             elapsed_seconds = 0
@@ -664,7 +707,7 @@ class SendingProcess(FledgeProcess):
                     SendingProcess._logger.info("{func} - signal received, stops the execution".format(
                         func="send_data"))
                     break
-                # Context switch to either the fetch or the send operation
+                # Context switch to the fetch and send operations
                 await asyncio.sleep(self._config['sleepInterval'])
                 elapsed_seconds = time.time() - start_time
                 SendingProcess._logger.debug("{0} - elapsed_seconds {1}".format("send_data", elapsed_seconds))
@@ -673,6 +716,38 @@ class SendingProcess(FledgeProcess):
             SendingProcess._logger.error(_message)
             await self._audit.failure(self._AUDIT_CODE, {"error - on send_data": _message})
 
+    async def send_data(self):
+        """ Handles the sending of the data to the destination using the configured plugin for a defined amount of time"""
+        self._tracked_assets.start()
+        self._statistics = await statistics.create_statistics_accumulator(self._storage_async)
+        self._statistics.start()
+        self._start_filter_executor()
+
+        if self._config['pipelined'] and self._config.get('source') == 'readings':
+            await self._send_data_pipelined()
+        else:
+            await self._send_data_buffered()
+
+        self._stop_filter_executor()
+
+        # Delivers the asset tracker events and writes the statistics still pending
+        await self._tracked_assets.stop()
+        await self._statistics.stop()
+
+    async def _send_data_buffered(self):
+        """ Fetches blocks of data into the in memory buffer and sends them, one block at a time"""
+
+        # Prepares the in memory buffer for the fetch/send operations
+        self._memory_buffer = [None for _ in range(self._config['memory_buffer_size'])]
+        self._task_fetch_data_sem = asyncio.Semaphore(0)
+        self._task_send_data_sem = asyncio.Semaphore(0)
+        self._task_fetch_data_task_id = asyncio.ensure_future(self._task_fetch_data())
+        self._task_send_data_task_id = asyncio.ensure_future(self._task_send_data())
+        self._task_fetch_data_run = True
+        self._task_send_data_run = True
+
+        await self._wait_for_duration()
+
         try:
             # Graceful termination of the tasks
             self._task_fetch_data_run = False
@@ -685,6 +760,167 @@ class SendingProcess(FledgeProcess):
         except Exception as ex:
             SendingProcess._logger.error(_MESSAGES_LIST["e000029"].format(ex))
 
+    async def _pipeline_fetch(self, budget, convert_queue, metrics):
+        """ First stage of the pipelined sending: streams blocks of readings from the Storage Layer
+
+        A block is passed on only when its size fits in the memory budget, so a large backlog is read no faster
+        than it is sent.
+        """
+        last_object_id = await self._last_object_id_read()
+        sleep_time = self.TASK_FETCH_SLEEP
+        sleep_num_increments = 1
+        while self._task_fetch_data_run:
+            blocks = self._readings.fetch_blocks(last_object_id + 1, self._config['blockSize'])
+            try:
+                while self._task_fetch_data_run:
+                    started = time.monotonic()
+                    try:
+                        rows, size = await blocks.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    metrics.record(len(rows), size, started, started)
+                    await budget.acquire(size)
+                    await convert_queue.put((rows, size, started))
+                    last_object_id = rows[-1]['id']
+                    sleep_time = self.TASK_FETCH_SLEEP
+                    sleep_num_increments = 1
+                    self.performance_track("task _pipeline_fetch")
+            except aiohttp.client_exceptions.ClientPayloadError as ex:
+                SendingProcess._logger.warning(_MESSAGES_LIST["e000009"].format(str(ex)))
+            except Exception as ex:
+                _message = _MESSAGES_LIST["e000028"].format(ex)
+                SendingProcess._logger.error(_message)
+                await self._audit.failure(self._AUDIT_CODE, {"error - on _pipeline_fetch": _message})
+            finally:
+                await blocks.aclose()
+
+            if not self._task_fetch_data_run:
+                break
+            # There is no more data to load, or the fetch failed; the sleep time is doubled every time up to a limit
+            await asyncio.sleep(sleep_time)
+            sleep_num_increments += 1
+            sleep_time *= 2
+            if sleep_num_increments > self.TASK_SLEEP_MAX_INCREMENTS:
+                sleep_time = self.TASK_FETCH_SLEEP
+                sleep_num_increments = 1
+
+    async def _pipeline_convert(self, convert_queue, send_queue, metrics):
+        """ Second stage of the pipelined sending: converts the values to the proper types and applies the filter"""
+        while True:
+            rows, size, fetched = await convert_queue.get()
+            started = time.monotonic()
+            # The position reached by the block, even if all of its rows are skipped
+            last_object_id = rows[-1]['id']
+            data_to_send = await self._apply_filter(self._transform_in_memory_data_readings(rows,
+                                                                                            self._type_converter))
+            del rows
+            metrics.record(len(data_to_send), size, started, fetched)
+            await send_queue.put((data_to_send, size, fetched, last_object_id))
+
+    async def _pipeline_send(self, budget, send_queue, metrics):
+        """ Last stage of the pipelined sending: sends the blocks using the plugin and updates the reached position"""
+        db_update = False
+        update_last_object_id = 0
+        tot_num_sent = 0
+        update_position_idx = 0
+        plugin_name = self._config['plugin']
+        try:
+            while self._task_send_data_run:
+                self._pipeline_send_idle = True
+                data_to_send, size, fetched, last_object_id = await send_queue.get()
+                self._pipeline_send_idle = False
+                started = time.monotonic()
+
+                sleep_time = self.TASK_SEND_SLEEP
+                sleep_num_increments = 1
+                num_sent = 0
+                new_last_object_id = last_object_id
+                # A block whose rows were all skipped only moves the position forward
+                data_sent = not data_to_send
+                while not data_sent and self._task_send_data_run:
+                    try:
+                        data_sent, new_last_object_id, num_sent = \
+                            await self._plugin.plugin_send(self._plugin_handle, data_to_send, self._stream_id)
+                    except Exception as ex:
+                        _message = _MESSAGES_LIST["e000021"].format(ex)
+                        SendingProcess._logger.error(_message)
+                        await self._audit.failure(self._AUDIT_CODE, {"error - on _pipeline_send": _message})
+                        data_sent = False
+                    if not data_sent:
+                        await asyncio.sleep(sleep_time)
+                        sleep_num_increments += 1
+                        sleep_time *= 2
+                        if sleep_num_increments > self.TASK_SLEEP_MAX_INCREMENTS:
+                            sleep_time = self.TASK_SEND_SLEEP
+                            sleep_num_increments = 1
+
+                await budget.release(size)
+                if not data_sent:
+                    # Terminating, the block is sent again by the next execution
+                    break
+
+                # asset tracker checking
+                for _reads in data_to_send:
+                    self._tracked_assets.track(_reads['asset_code'], "Egress", self._name, plugin_name)
+                metrics.record(num_sent, size, started, fetched)
+                self.performance_track("task _pipeline_send")
+
+                db_update = True
+                update_last_object_id = new_last_object_id
+                tot_num_sent = tot_num_sent + num_sent
+                # Updates the Storage layer every 'self.UPDATE_POSITION_MAX' blocks or when there is nothing to send
+                if update_position_idx >= self.TASK_SEND_UPDATE_POSITION_MAX or send_queue.empty():
+                    await self._update_position_reached(update_last_object_id, tot_num_sent)
+                    update_position_idx = 0
+                    tot_num_sent = 0
+                    db_update = False
+                else:
+                    update_position_idx += 1
+        finally:
+            self._pipeline_send_idle = False
+            if db_update:
+                await self._update_position_reached(update_last_object_id, tot_num_sent)
+
+    async def _send_data_pipelined(self):
+        """ Streams the readings through concurrent fetch, convert and send stages
+
+        The stages are connected by bounded queues, and the blocks held between the fetch and the end of the send
+        are bounded by memory_buffer_bytes.
+        """
+        budget = MemoryBudget(self._config['memory_buffer_bytes'])
+        convert_queue = asyncio.Queue(maxsize=self._config['memory_buffer_size'])
+        send_queue = asyncio.Queue(maxsize=self._config['memory_buffer_size'])
+        self._pipeline_metrics = {name: StageMetrics(name) for name in ("fetch", "convert", "send")}
+        self._task_fetch_data_run = True
+        self._task_send_data_run = True
+        fetch_task = asyncio.ensure_future(self._pipeline_fetch(budget, convert_queue,
+                                                                self._pipeline_metrics["fetch"]))
+        convert_task = asyncio.ensure_future(self._pipeline_convert(convert_queue, send_queue,
+                                                                    self._pipeline_metrics["convert"]))
+        send_task = asyncio.ensure_future(self._pipeline_send(budget, send_queue, self._pipeline_metrics["send"]))
+
+        await self._wait_for_duration()
+
+        # Graceful termination of the stages, the blocks not sent yet are fetched again by the next execution
+        self._task_fetch_data_run = False
+        self._task_send_data_run = False
+        fetch_task.cancel()
+        convert_task.cancel()
+        if self._pipeline_send_idle:
+            send_task.cancel()
+        for task in (fetch_task, convert_task, send_task):
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception as ex:
+                SendingProcess._logger.error(_MESSAGES_LIST["e000029"].format(ex))
+
+        SendingProcess._logger.info("Pipelined sending - memory buffer high water mark |{0}| of |{1}| bytes - "
+                                    "stages |{2}|".format(budget.high_water_mark, budget.limit,
+                                                          {name: stage.metrics()
+                                                           for name, stage in self._pipeline_metrics.items()}))
+
     async def _get_stream_id(self, config_stream_id):
         async def get_rows_from_stream_id(stream_id):
             payload = payload_builder.PayloadBuilder() \
@@ -875,6 +1111,13 @@ class SendingProcess(FledgeProcess):
                 self._config['plugin'] = _config_from_manager['plugin']['value']
 
             self._config['memory_buffer_size'] = int(_config_from_manager['memory_buffer_size']['value'])
+
+            if 'pipelined' in _config_from_manager:
+                self._config['pipelined'] = _config_from_manager['pipelined']['value'].upper() == 'TRUE'
+            if 'memory_buffer_bytes' in _config_from_manager:
+                self._config['memory_buffer_bytes'] = int(_config_from_manager['memory_buffer_bytes']['value'])
+            if 'filterExecution' in _config_from_manager:
+                self._config['filterExecution'] = _config_from_manager['filterExecution']['value']
             _config_from_manager['_CONFIG_CATEGORY_NAME'] = cat_name
 
             if 'stream_id' in _config_from_manager:
@@ -966,8 +1209,9 @@ class SendingProcess(FledgeProcess):
             await self._audit.failure(self._AUDIT_CODE, {"error - on start": _message})
             raise
 
-        # The list of unique reading payload for asset tracker
-        self._tracked_assets = []
+        # The asset tracker events already known, new events are delivered to the core in the background
+        self._tracked_assets = AssetTrackerCache(self._core_microservice_management_client)
+        self._tracked_assets.load(self._core_microservice_management_client.get_asset_tracker_events()['track'])
 
         return exec_sending_process
 
@@ -1002,15 +1246,21 @@ class SendingProcess(FledgeProcess):
                                                                                                            1] else logging.DEBUG)
             _LOGGER = SendingProcess._logger
 
+            # The audit trail entries, one per position update, are written in batches
+            self._audit.start_write_behind()
             try:
                 is_started = await self._start()
                 if is_started:
                     await self.send_data()
                 self.stop()
+                await self._audit.stop_write_behind()
+                await self._readings.close()
+                await self.close_storage_clients()
                 SendingProcess._logger.info("Execution completed.")
                 sys.exit(0)
             except (ValueError, Exception) as ex:
                 SendingProcess._logger.exception(_MESSAGES_LIST["e000002"].format(str(ex)))
+                await self._audit.stop_write_behind()
                 sys.exit(1)
 
     def stop(self):
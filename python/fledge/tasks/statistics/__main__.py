@@ -22,3 +22,4 @@ if __name__ == '__main__':
     statistics_history_process = StatisticsHistory()
     loop = asyncio.get_event_loop()
     loop.run_until_complete(statistics_history_process.run())
+    loop.run_until_complete(statistics_history_process.close_storage_clients())
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Startup time of the Python tasks and services
+
+Each of them configures a logger in most of the modules it imports. Imports the modules of the purge task and of the
+south service in fresh interpreters, as they are started by the scheduler, and reports the wall time. Run it from
+FLEDGE_ROOT:
+::
+    PYTHONPATH=python python3 tests/benchmark/python/bench_logger_startup.py --runs 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+MODULES = {"interpreter": "pass",
+           "logger": "from fledge.common import logger; logger.setup('bench')",
+           "purge": "import fledge.tasks.purge.purge",
+           "south": "import fledge.services.south.server"}
+""" Code run by each interpreter, by name """
+
+
+def measure(code, runs, name):
+    args = [sys.executable, "-c", code, "--port=8081", "--address=127.0.0.1", "--name={}".format(name)]
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, check=True)
+        durations.append((time.perf_counter() - start) * 1e3)
+    return statistics.mean(durations), min(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task and service startup time benchmark")
+    parser.add_argument('--runs', type=int, default=10, help="interpreters started for each module")
+    args = parser.parse_args()
+
+    print("{:<12} {:>10} {:>10}".format("import", "mean ms", "min ms"))
+    for name, code in MODULES.items():
+        print("{:<12} {:>10.1f} {:>10.1f}".format(name, *measure(code, args.runs, name)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Throughput of the conversion of the values of north readings to their proper type
+
+Compares the per value conversion, convert_reading_value, with ReadingsTypeConverter on blocks of readings shaped
+like the ones produced by fogbench. Run it from FLEDGE_ROOT:
+::
+    PYTHONPATH=python python3 tests/benchmark/python/bench_north_type_conversion.py --readings 100000
+"""
+
+import argparse
+import copy
+import random
+import time
+
+import fledge.plugins.north.common.common as plugin_common
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+def make_block(readings, assets):
+    random.seed(0)
+    block = []
+    for i in range(readings):
+        block.append({
+            "id": i + 1,
+            "asset_code": "asset{}".format(i % assets),
+            "reading": {
+                "temperature": "{:.3f}".format(random.uniform(-20, 50)),
+                "humidity": random.randint(0, 100),
+                "pressure": random.uniform(950, 1050),
+                "count": str(random.randint(0, 100000)),
+                "state": random.choice(["up", "down"]),
+                "position": {"x": str(random.randint(0, 100)), "y": "{:.1f}".format(random.uniform(0, 10))}
+            },
+            "user_ts": "2026-01-01 00:00:00.000000+00:00"
+        })
+    return block
+
+
+def per_value(block):
+    for row in block:
+        reading = row['reading']
+        for name, value in reading.items():
+            reading[name] = plugin_common.convert_reading_value(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="North readings type conversion benchmark")
+    parser.add_argument('--readings', type=int, default=100000, help="readings in a block")
+    parser.add_argument('--assets', type=int, default=10, help="distinct assets in a block")
+    parser.add_argument('--repeat', type=int, default=3, help="blocks converted by each method")
+    args = parser.parse_args()
+
+    block = make_block(args.readings, args.assets)
+    converter = plugin_common.ReadingsTypeConverter()
+    methods = (("convert_reading_value", per_value),
+               ("ReadingsTypeConverter", converter.convert_block))
+    print("{} readings of {} assets, {} datapoints each".format(args.readings, args.assets,
+                                                                len(block[0]['reading'])))
+    for name, method in methods:
+        best = None
+        for _ in range(args.repeat):
+            data = copy.deepcopy(block)
+            start = time.perf_counter()
+            method(data)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print("{:<24} {:>8.3f} s {:>12,.0f} readings/s".format(name, best, args.readings / best))
+    print("types inferred by ReadingsTypeConverter: {}".format(converter.inferences))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Throughput of the ping API under concurrent pollers
+
+Serves the ping API on a local port, with a storage answering the statistics query after a simulated round trip, and
+polls it from concurrent clients, first with each ping reading the statistics and the host addresses, then with the
+health snapshot of the core. Run it from FLEDGE_ROOT:
+::
+    FLEDGE_ROOT=. PYTHONPATH=python python3 tests/benchmark/python/bench_ping.py --pollers 50 --duration 5
+"""
+
+import argparse
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+from aiohttp import web
+
+from fledge.common.storage_client.storage_client import StorageClientAsync
+from fledge.common.web import middleware
+from fledge.services.core import connect, health_snapshot
+from fledge.services.core.api import common
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+STATISTICS = [{"key": "READINGS", "description": "Readings received", "value": 1000},
+              {"key": "Readings Sent", "description": "Readings sent north", "value": 900},
+              {"key": "PURGED", "description": "Readings purged", "value": 100}]
+
+
+def storage(latency):
+    async def query_tbl_with_payload(*args, **kwargs):
+        await asyncio.sleep(latency)
+        return {"rows": STATISTICS}
+
+    client = MagicMock(spec=StorageClientAsync)
+    client.query_tbl_with_payload.side_effect = query_tbl_with_payload
+    return client
+
+
+async def poll(url, pollers, duration):
+    latencies = []
+    deadline = time.monotonic() + duration
+
+    async def poller(session):
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            async with session.get(url) as resp:
+                await resp.read()
+                assert 200 == resp.status
+            latencies.append(time.perf_counter() - start)
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=pollers)) as session:
+        await asyncio.gather(*[poller(session) for _ in range(pollers)])
+    latencies.sort()
+    return len(latencies) / duration, latencies[len(latencies) // 2] * 1e3, latencies[int(len(latencies) * .99)] * 1e3
+
+
+async def run(args):
+    app = web.Application(middlewares=[middleware.optional_auth_middleware])
+    app.router.add_route('GET', '/fledge/ping', common.ping)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', args.port)
+    await site.start()
+    url = 'http://127.0.0.1:{}/fledge/ping'.format(args.port)
+    middleware._logger.disabled = True
+    print("{:<12} {:>10} {:>10} {:>10}".format("ping", "req/s", "p50 ms", "p99 ms"))
+    try:
+        with patch.object(connect, 'get_storage_async', return_value=storage(args.storage_latency / 1e3)):
+            print("{:<12} {:>10.0f} {:>10.2f} {:>10.2f}".format("direct", *await poll(url, args.pollers,
+                                                                                       args.duration)))
+            await health_snapshot.start_health_snapshot()
+            try:
+                print("{:<12} {:>10.0f} {:>10.2f} {:>10.2f}".format("snapshot", *await poll(url, args.pollers,
+                                                                                             args.duration)))
+            finally:
+                await health_snapshot.stop_health_snapshot()
+    finally:
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ping API throughput benchmark")
+    parser.add_argument('--pollers', type=int, default=50, help="concurrent clients polling the ping API")
+    parser.add_argument('--duration', type=float, default=5, help="seconds each method is polled for")
+    parser.add_argument('--storage-latency', type=float, default=2, help="milliseconds of a statistics query")
+    parser.add_argument('--port', type=int, default=18081, help="local port the ping API is served on")
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args))
+
+
+if __name__ == "__main__":
+    main()
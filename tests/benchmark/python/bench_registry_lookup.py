@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Cost of the lookups of the service and interest registries
+
+Fills ServiceRegistry and InterestRegistry with records, then times the indexed lookups against the linear scans they
+replace. Run it from FLEDGE_ROOT:
+::
+    PYTHONPATH=python python3 tests/benchmark/python/bench_registry_lookup.py --records 10000
+"""
+
+import argparse
+import random
+import time
+import uuid
+from unittest.mock import MagicMock
+
+from fledge.common.configuration_manager import ConfigurationManager
+from fledge.common.service_record import ServiceRecord
+from fledge.services.core.interest_registry.interest_registry import InterestRegistry
+from fledge.services.core.service_registry.service_registry import ServiceRegistry
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+def fill(records):
+    ServiceRegistry._registry = list()
+    ServiceRegistry._logger.disabled = True
+    for i in range(records):
+        ServiceRegistry.register("service{}".format(i), "Southbound", "127.0.0.1", None, 10000 + i)
+    interests = InterestRegistry(MagicMock(spec=ConfigurationManager))
+    for service in ServiceRegistry.all():
+        interests.register(service._id, "category{}".format(random.randrange(records)))
+    return interests
+
+
+def scan_get(idx=None, name=None):
+    return [s for s in ServiceRegistry._registry if getattr(s, "_id" if idx else "_name") == (idx or name)]
+
+
+def scan_address_and_mgt_port(address, m_port):
+    return [s for s in ServiceRegistry._registry if getattr(s, "_address") == address
+            and getattr(s, "_management_port") == m_port and getattr(s, "_status") != ServiceRecord.Status.Failed]
+
+
+def scan_interests(interests, category_name):
+    return [s for s in interests._registered_interests if getattr(s, "_category_name") == category_name]
+
+
+def measure(lookup, keys):
+    start = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service and interest registry lookup benchmark")
+    parser.add_argument('--records', type=int, default=10000, help="services, and interests, registered")
+    parser.add_argument('--lookups', type=int, default=1000, help="lookups timed for each method")
+    args = parser.parse_args()
+
+    random.seed(0)
+    start = time.perf_counter()
+    interests = fill(args.records)
+    print("{} services and interests registered in {:.3f} s".format(args.records, time.perf_counter() - start))
+
+    services = ServiceRegistry.all()
+    picked = [random.choice(services) for _ in range(args.lookups)]
+    categories = [random.choice(interests._registered_interests)._category_name for _ in range(args.lookups)]
+    lookups = (
+        ("get by id", lambda s: ServiceRegistry.get(idx=s._id), lambda s: scan_get(idx=s._id), picked),
+        ("get by name", lambda s: ServiceRegistry.get(name=s._name), lambda s: scan_get(name=s._name), picked),
+        ("address and mgt port", lambda s: ServiceRegistry.check_address_and_mgt_port(s._address, s._management_port),
+         lambda s: scan_address_and_mgt_port(s._address, s._management_port), picked),
+        ("interests by category", lambda c: interests.get(category_name=c), lambda c: scan_interests(interests, c),
+         categories),
+    )
+    print("{:<24} {:>12} {:>12}".format("lookup", "indexed us", "scan us"))
+    for name, indexed, scan, keys in lookups:
+        print("{:<24} {:>12.2f} {:>12.2f}".format(name, measure(indexed, keys), measure(scan, keys)))
+    # An unknown id is the worst case of a scan
+    unknown = [str(uuid.uuid4()) for _ in range(args.lookups)]
+    print("{:<24} {:>12.2f} {:>12.2f}".format("unknown id", measure(lambda k: ServiceRegistry.filter(_id=k), unknown),
+                                               measure(lambda k: scan_get(idx=k), unknown)))
+
+
+if __name__ == "__main__":
+    main()
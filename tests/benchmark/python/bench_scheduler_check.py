@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Cost of a wakeup of the scheduler with many interval schedules
+
+Each wakeup starts the tasks of the few schedules that are due. Times a wakeup when every schedule is visited, as
+before the timer queue, and when only the due schedules are. Run it from FLEDGE_ROOT:
+::
+    PYTHONPATH=python python3 tests/benchmark/python/bench_scheduler_check.py --schedules 10000
+"""
+
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+import uuid
+
+from fledge.services.core.scheduler.entities import Schedule
+from fledge.services.core.scheduler.scheduler import Scheduler
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+async def _start_task(schedule, dryrun=False):
+    pass
+
+
+def scheduler(schedules):
+    """ Returns a scheduler with interval schedules of one hour, starting in turn over that hour """
+    instance = Scheduler()
+    instance._logger.disabled = True
+    instance._max_running_tasks = schedules + 1
+    instance._start_task = _start_task
+    now = time.time()
+    for index in range(schedules):
+        row = Scheduler._ScheduleRow(id=uuid.uuid4(), name="schedule {}".format(index), type=Schedule.Type.INTERVAL,
+                                     time=None, day=None, repeat=datetime.timedelta(hours=1), repeat_seconds=3600,
+                                     exclusive=False, enabled=True, process_name="purge")
+        instance._schedules[row.id] = row
+        execution = instance._ScheduleExecution()
+        execution.next_start_time = now + 3600 * index / schedules
+        instance._schedule_executions[row.id] = execution
+        instance._timer_queue.push(row.id, execution.next_start_time)
+    return instance
+
+
+async def measure(schedules, wakeups, scan):
+    instance = scheduler(schedules)
+    durations = []
+    for _ in range(wakeups):
+        if scan:
+            for schedule_id in instance._schedule_executions:
+                instance._check_schedule_soon(schedule_id)
+        begin = time.perf_counter()
+        instance.current_time = await instance._check_schedules()
+        durations.append((time.perf_counter() - begin) * 1e3)
+    return statistics.mean(durations), max(durations)
+
+
+async def run(args):
+    print("{:<8} {:>14} {:>14}".format("check", "mean ms", "max ms"))
+    for name, scan in (("scan", True), ("queue", False)):
+        print("{:<8} {:>14.3f} {:>14.3f}".format(name, *await measure(args.schedules, args.wakeups, scan)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduler wakeup benchmark")
+    parser.add_argument('--schedules', type=int, default=10000, help="interval schedules")
+    parser.add_argument('--wakeups', type=int, default=200, help="wakeups timed, each starting the next due task")
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Start latency of the Python tasks, run as new interpreters or forked by the task zygote
+
+Times each task from the start request until it exits, for tasks that exit once their modules are imported, such as
+the automation script task with --dryrun. Run it from FLEDGE_ROOT:
+::
+    PYTHONPATH=python python3 tests/benchmark/python/bench_task_start.py --runs 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from fledge.services.core.scheduler.task_zygote import TaskZygote
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+TASKS = {"automation": ("fledge.tasks.automation_script",
+                        ["--port=8081", "--address=127.0.0.1", "--name=bench", "--dryrun"])}
+""" Module and arguments of each task timed, by name """
+
+
+async def measure(start, runs):
+    durations = []
+    for _ in range(runs):
+        begin = time.perf_counter()
+        process = await start()
+        assert 0 == await process.wait()
+        durations.append((time.perf_counter() - begin) * 1e3)
+    return statistics.mean(durations), min(durations)
+
+
+async def run(args):
+    cwd = os.path.join(os.getcwd(), 'python')
+    zygote = TaskZygote()
+    begin = time.perf_counter()
+    await zygote.start(cwd)
+    print("task zygote started in {:.0f} ms".format((time.perf_counter() - begin) * 1e3))
+    print("{:<12} {:>14} {:>14} {:>14} {:>14}".format("task", "exec mean ms", "exec min ms", "fork mean ms",
+                                                      "fork min ms"))
+    try:
+        for name, (module, task_args) in TASKS.items():
+            executed = await measure(lambda: asyncio.create_subprocess_exec(sys.executable, '-m', module, *task_args,
+                                                                            cwd=cwd), args.runs)
+            forked = await measure(lambda: zygote.start_task(module, task_args), args.runs)
+            print("{:<12} {:>14.1f} {:>14.1f} {:>14.1f} {:>14.1f}".format(name, *executed, *forked))
+    finally:
+        await zygote.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task start latency benchmark")
+    parser.add_argument('--runs', type=int, default=10, help="tasks started for each task and method")
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+/*
+ * unit tests - Storage service reading stream protocol
+ *
+ * Copyright (c) 2024 Dianomic Systems, Inc.
+ *
+ * Released under the Apache 2.0 Licence
+ */
+
+#include <gtest/gtest.h>
+#include <storage_api.h>
+#include <stream_handler.h>
+#include <reading_stream.h>
+#include <sys/socket.h>
+#include <sys/time.h>
+#include <netinet/in.h>
+#include <arpa/inet.h>
+#include <unistd.h>
+#include <string.h>
+#include <mutex>
+#include <string>
+#include <vector>
+
+using namespace std;
+
+/*
+ * The calls the stream handler makes to insert the readings, recorded
+ * as the number of readings and the commit flag of each call.
+ */
+static mutex				insertsMutex;
+static vector<pair<unsigned int, bool> >	inserts;
+static bool				insertResult = true;
+
+bool StorageApi::readingStream(ReadingStream **readings, bool commit)
+{
+	unsigned int nReadings = 0;
+	while (readings[nReadings])
+		nReadings++;
+	lock_guard<mutex> guard(insertsMutex);
+	inserts.push_back(make_pair(nReadings, commit));
+	return insertResult;
+}
+
+class StreamHandlerTest : public ::testing::Test {
+	protected:
+		void SetUp()
+		{
+			inserts.clear();
+			insertResult = true;
+			// The storage API is never dereferenced by the stream handler
+			m_handler = new StreamHandler(NULL);
+			uint32_t token;
+			uint32_t port = m_handler->createStream(&token);
+			ASSERT_NE(port, 0);
+
+			m_socket = socket(AF_INET, SOCK_STREAM, 0);
+			struct sockaddr_in addr;
+			memset(&addr, 0, sizeof(addr));
+			addr.sin_family = AF_INET;
+			addr.sin_addr.s_addr = inet_addr("127.0.0.1");
+			addr.sin_port = htons(port);
+			ASSERT_EQ(connect(m_socket, (struct sockaddr *)&addr, sizeof(addr)), 0);
+			struct timeval timeout = { 10, 0 };
+			setsockopt(m_socket, SOL_SOCKET, SO_RCVTIMEO, &timeout, sizeof(timeout));
+
+			RDSConnectHeader conhdr;
+			conhdr.magic = RDS_CONNECTION_MAGIC;
+			conhdr.token = token;
+			ASSERT_EQ(write(m_socket, &conhdr, sizeof(conhdr)), sizeof(conhdr));
+		}
+
+		void TearDown()
+		{
+			close(m_socket);
+			delete m_handler;
+		}
+
+		/**
+		 * Send a block of readings of the same asset down the stream
+		 */
+		void sendBlock(uint32_t blockNumber, uint32_t count)
+		{
+			string buffer;
+			RDSBlockHeader blkhdr;
+			blkhdr.magic = RDS_BLOCK_MAGIC;
+			blkhdr.blockNumber = blockNumber;
+			blkhdr.count = count;
+			buffer.append((const char *)&blkhdr, sizeof(blkhdr));
+
+			string asset = "sinusoid";
+			string payload = "{\"sinusoid\":0.5}";
+			struct timeval tm;
+			gettimeofday(&tm, NULL);
+			for (uint32_t i = 0; i < count; i++)
+			{
+				RDSReadingHeader rdhdr;
+				rdhdr.magic = RDS_READING_MAGIC;
+				rdhdr.readingNo = i;
+				rdhdr.assetLength = i == 0 ? asset.length() + 1 : 0;
+				rdhdr.payloadLength = payload.length() + 1;
+				buffer.append((const char *)&rdhdr, sizeof(rdhdr));
+				buffer.append((const char *)&tm, sizeof(tm));
+				if (rdhdr.assetLength)
+					buffer.append(asset.c_str(), rdhdr.assetLength);
+				buffer.append(payload.c_str(), rdhdr.payloadLength);
+			}
+
+			size_t sent = 0;
+			while (sent < buffer.length())
+			{
+				ssize_t n = write(m_socket, buffer.data() + sent, buffer.length() - sent);
+				ASSERT_GT(n, 0);
+				sent += n;
+			}
+		}
+
+		/**
+		 * Wait for the acknowledge of a block
+		 */
+		RDSAcknowledge readAck()
+		{
+			RDSAcknowledge ack;
+			memset(&ack, 0, sizeof(ack));
+			EXPECT_EQ(recv(m_socket, &ack, sizeof(ack), MSG_WAITALL), sizeof(ack));
+			return ack;
+		}
+
+		StreamHandler	*m_handler;
+		int		m_socket;
+};
+
+TEST_F(StreamHandlerTest, BlockOfMultipleOfRDSBlock)
+{
+	sendBlock(0, RDS_BLOCK);
+	RDSAcknowledge ack = readAck();
+	EXPECT_EQ(ack.magic, RDS_ACK_MAGIC);
+	EXPECT_EQ(ack.block, 0);
+
+	// The next block header is accepted after a block of exactly RDS_BLOCK readings
+	sendBlock(1, 2);
+	ack = readAck();
+	EXPECT_EQ(ack.magic, RDS_ACK_MAGIC);
+	EXPECT_EQ(ack.block, 1);
+
+	lock_guard<mutex> guard(insertsMutex);
+	ASSERT_EQ(inserts.size(), 2);
+	EXPECT_EQ(inserts[0], make_pair((unsigned int)RDS_BLOCK, true));
+	EXPECT_EQ(inserts[1], make_pair(2U, true));
+}
+
+TEST_F(StreamHandlerTest, BlockLargerThanRDSBlock)
+{
+	sendBlock(0, RDS_BLOCK + 3);
+	RDSAcknowledge ack = readAck();
+	EXPECT_EQ(ack.magic, RDS_ACK_MAGIC);
+	EXPECT_EQ(ack.block, 0);
+
+	lock_guard<mutex> guard(insertsMutex);
+	ASSERT_EQ(inserts.size(), 2);
+	EXPECT_EQ(inserts[0], make_pair((unsigned int)RDS_BLOCK, false));
+	EXPECT_EQ(inserts[1], make_pair(3U, true));
+}
+
+TEST_F(StreamHandlerTest, BlockNotCommitted)
+{
+	insertResult = false;
+	sendBlock(0, 5);
+	RDSAcknowledge ack = readAck();
+	EXPECT_EQ(ack.magic, RDS_NACK_MAGIC);
+	EXPECT_EQ(ack.block, 0);
+
+	insertResult = true;
+	sendBlock(1, 5);
+	ack = readAck();
+	EXPECT_EQ(ack.magic, RDS_ACK_MAGIC);
+	EXPECT_EQ(ack.block, 1);
+}
+
+TEST_F(StreamHandlerTest, EmptyBlock)
+{
+	sendBlock(0, 0);
+	RDSAcknowledge ack = readAck();
+	EXPECT_EQ(ack.magic, RDS_ACK_MAGIC);
+	EXPECT_EQ(ack.block, 0);
+
+	lock_guard<mutex> guard(insertsMutex);
+	EXPECT_EQ(inserts.size(), 0);
+}
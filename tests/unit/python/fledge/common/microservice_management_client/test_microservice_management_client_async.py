@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test MicroserviceManagementClientAsync against a fake management API """
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import unused_port
+
+from fledge.common.microservice_management_client import exceptions as client_exceptions
+from fledge.common.microservice_management_client.microservice_management_client import \
+    MicroserviceManagementClientAsync, _logger
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+HOST = '127.0.0.1'
+
+
+class FakeManagementSrvr:
+
+    def __init__(self, port):
+        self.port = port
+        self.calls = []
+        self.unavailable = 0
+        self.app = web.Application()
+        self.app.router.add_routes([
+            web.post('/fledge/service', self.register),
+            web.get('/fledge/service', self.services),
+            web.get('/fledge/service/category/{name}', self.category),
+            web.post('/fledge/track', self.track),
+            web.get('/fledge/service/ping', self.ping)
+        ])
+        self.runner = None
+
+    async def start(self):
+        self.runner = web.AppRunner(self.app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, HOST, self.port).start()
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def register(self, request):
+        payload = await request.json()
+        self.calls.append(('POST', request.path_qs))
+        if payload.get("bad_request"):
+            raise web.HTTPBadRequest(reason="bad data")
+        return web.json_response({"id": "c6bbf3a8-f51f-4c20-b8f9-b8b6e1b8a8c5"})
+
+    async def services(self, request):
+        self.calls.append(('GET', request.path_qs))
+        return web.json_response({"services": [{"name": request.query.get('name')}]})
+
+    async def category(self, request):
+        self.calls.append(('GET', request.path_qs))
+        # Keep the request in flight long enough for identical requests to share it
+        await asyncio.sleep(0.1)
+        return web.json_response({"info": {"value": request.match_info['name']}})
+
+    async def track(self, request):
+        self.calls.append(('POST', request.path_qs))
+        raise web.HTTPServiceUnavailable(reason="unavailable")
+
+    async def ping(self, request):
+        self.calls.append(('GET', request.path_qs))
+        if self.unavailable:
+            self.unavailable -= 1
+            raise web.HTTPServiceUnavailable(reason="unavailable")
+        return web.json_response({"uptime": 10})
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("common", "microservice-management-client")
+class TestMicroserviceManagementClientAsync:
+
+    @pytest.fixture
+    async def server(self):
+        srvr = FakeManagementSrvr(unused_port())
+        await srvr.start()
+        yield srvr
+        await srvr.stop()
+
+    async def test_register_service(self, server):
+        client = MicroserviceManagementClientAsync(HOST, server.port)
+        assert {"id": "c6bbf3a8-f51f-4c20-b8f9-b8b6e1b8a8c5"} == await client.register_service({"name": "Sine"})
+        with patch.object(_logger, "error") as log_error:
+            with pytest.raises(client_exceptions.MicroserviceManagementClientError) as excinfo:
+                await client.register_service({"bad_request": True})
+        assert 400 == excinfo.value.status
+        log_error.assert_called_once_with("Client error code: %d, Reason: %s", 400, "bad data")
+        await client.close()
+
+    async def test_get_services(self, server):
+        client = MicroserviceManagementClientAsync(HOST, server.port)
+        response = await client.get_services(service_name="Fledge Storage", service_type="Storage")
+        assert {"services": [{"name": "Fledge Storage"}]} == response
+        assert [('GET', '/fledge/service?name=Fledge%20Storage&type=Storage')] == server.calls
+        await client.close()
+
+    async def test_identical_gets_are_coalesced(self, server):
+        client = MicroserviceManagementClientAsync(HOST, server.port)
+        responses = await asyncio.gather(*[client.get_configuration_category("South") for _ in range(5)])
+        assert 5 * [{"info": {"value": "South"}}] == responses
+        # Every caller gets its own copy
+        assert responses[0] is not responses[1]
+        assert [('GET', '/fledge/service/category/South')] == server.calls
+        assert {"requests": 1, "retries": 0, "coalesced": 4} == client.stats
+        await client.get_configuration_category("South")
+        assert 2 == len(server.calls)
+        await client.close()
+
+    async def test_idempotent_request_retried(self, server):
+        client = MicroserviceManagementClientAsync(HOST, server.port, retry_backoff=0.01)
+        server.unavailable = 2
+        with patch.object(_logger, "warning") as log_warning:
+            assert {"uptime": 10} == await client.ping_service()
+        assert 2 == log_warning.call_count
+        assert {"requests": 3, "retries": 2, "coalesced": 0} == client.stats
+        await client.close()
+
+    async def test_post_not_retried_on_server_error(self, server):
+        client = MicroserviceManagementClientAsync(HOST, server.port, retry_backoff=0.01)
+        with patch.object(_logger, "error"):
+            with pytest.raises(client_exceptions.MicroserviceManagementClientError) as excinfo:
+                await client.create_asset_tracker_event({"asset": "a", "event": "Ingest", "service": "Sine",
+                                                         "plugin": "sinusoid"})
+        assert 503 == excinfo.value.status
+        assert 1 == len(server.calls)
+        await client.close()
+
+    async def test_connection_refused_retried(self):
+        client = MicroserviceManagementClientAsync(HOST, unused_port(), retries=1, retry_backoff=0.01)
+        with patch.object(_logger, "warning") as log_warning:
+            with pytest.raises(aiohttp.ClientConnectorError):
+                await client.register_service({"name": "Sine"})
+        assert 1 == log_warning.call_count
+        assert 1 == client.stats["retries"]
+        await client.close()
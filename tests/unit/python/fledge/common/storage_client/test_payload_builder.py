@@ -249,6 +249,14 @@ class TestPayloadBuilderRead:
                                                            ('values', 'avg', 'Average')).payload()
         assert expected == json.loads(res)
 
+    @pytest.mark.parametrize("test_input, expected", [
+        ((["min", ["reading", "x"], "min_0"], ["min", ["reading", "y"], "min_1"], ["count", ["reading", "y"], "count_1"]),
+         _payload("data/payload_aggregate8_alias.json"))
+    ])
+    def test_aggregate_payload_with_inline_alias(self, test_input, expected):
+        res = PayloadBuilder().AGGREGATE(test_input).payload()
+        assert expected == json.loads(res)
+
     @pytest.mark.parametrize("test_input, expected", [
         (("user_ts",), _payload("data/payload_timebucket4.json")),
         (("user_ts", "5"), _payload("data/payload_timebucket1.json")),
@@ -10,12 +10,14 @@ import aiohttp
 from unittest.mock import MagicMock, patch
 import json
 import asyncio
+import struct
 from aiohttp import web
 from aiohttp.test_utils import unused_port
 from functools import partial
 
 from fledge.common.service_record import ServiceRecord
-from fledge.common.storage_client.storage_client import _LOGGER, StorageClientAsync, ReadingsStorageClientAsync
+from fledge.common.storage_client.storage_client import _LOGGER, StorageClientAsync, ReadingsStorageClientAsync, \
+    RDS_BLOCK_MAGIC, RDS_READING_MAGIC, RDS_ACK_MAGIC, RDS_NACK_MAGIC
 
 from fledge.common.storage_client.exceptions import *
 
@@ -128,6 +130,14 @@ class FakeFledgeStorageSrvr:
         if request.query.get("id") == "internal_server_err":
             return web.HTTPInternalServerError(reason="something wrong", text='{"key": "value"}')
 
+        if request.query.get("id").isdigit() and int(request.query.get("id")) >= 100:
+            # Readings 100 to 104 are available
+            first = int(request.query.get("id"))
+            last = min(first + int(request.query.get("count")), 105)
+            return web.json_response({"count": max(last - first, 0),
+                                      "rows": [{"id": i, "asset_code": "A", "reading": {"x": i}}
+                                               for i in range(first, last)]})
+
         return web.json_response({"readings": [],
                                   "start": request.query.get('id'),
                                   "count": request.query.get('count')
@@ -266,6 +276,7 @@ class TestStorageClientAsync:
             log_e.assert_called_once_with('Error code: %d, reason: %s, details: %s', 500, 'something wrong', {'key': 'value'})
         assert excinfo.type is aiohttp.client_exceptions.ContentTypeError
 
+        await sc.close()
         await fake_storage_srvr.stop()
 
     @pytest.mark.asyncio
@@ -325,6 +336,7 @@ class TestStorageClientAsync:
             log_e.assert_called_once_with("Error code: %d, reason: %s, details: %s", 500, 'something wrong', {'key': 'value'})
         assert excinfo.type is aiohttp.client_exceptions.ContentTypeError
 
+        await sc.close()
         await fake_storage_srvr.stop()
 
     @pytest.mark.asyncio
@@ -381,6 +393,7 @@ class TestStorageClientAsync:
             log_e.assert_called_once_with("Error code: %d, reason: %s, details: %s", 500, 'something wrong', {'key': 'value'})
         assert excinfo.type is aiohttp.client_exceptions.ContentTypeError
 
+        await sc.close()
         await fake_storage_srvr.stop()
 
     @pytest.mark.asyncio
@@ -430,6 +443,49 @@ class TestStorageClientAsync:
             log_e.assert_called_once_with("Error code: %d, reason: %s, details: %s", 500, 'something wrong', {'key': 'value'})
         assert excinfo.type is aiohttp.client_exceptions.ContentTypeError
 
+        await sc.close()
+        await fake_storage_srvr.stop()
+
+    def test_pool_stats_before_first_request(self):
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        sc = StorageClientAsync(1, 2, mockServiceRecord, connection_limit=5)
+        assert {"limit": 5, "open": 0, "in_use": 0, "created": 0, "reused": 0, "waiting": 0,
+                "requests": 0} == sc.pool_stats
+
+    @pytest.mark.asyncio
+    async def test_shared_session_and_close(self, event_loop):
+        fake_storage_srvr = FakeFledgeStorageSrvr(loop=event_loop)
+        await fake_storage_srvr.start()
+
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        sc = StorageClientAsync(1, 2, mockServiceRecord)
+        for _ in range(3):
+            response = await sc.query_tbl("aTable", timeout=5)
+            assert 1 == response["called"]
+        session = sc._session
+        assert session is sc._get_session()
+        stats = sc.pool_stats
+        assert 3 == stats["requests"]
+        assert 1 == stats["created"]
+        assert 2 == stats["reused"]
+        assert 1 == stats["open"]
+
+        await sc.close()
+        assert session.closed
+        assert sc._session is None
+        assert 0 == sc.pool_stats["open"]
+        # closing twice is harmless
+        await sc.close()
         await fake_storage_srvr.stop()
 
     @pytest.mark.asyncio
@@ -490,6 +546,7 @@ class TestStorageClientAsync:
             log_e.assert_called_once_with("Error code: %d, reason: %s, details: %s", 500, 'something wrong', {'key': 'value'})
         assert excinfo.type is aiohttp.client_exceptions.ContentTypeError
 
+        await sc.close()
         await fake_storage_srvr.stop()
 
 
@@ -554,8 +611,128 @@ class TestReadingsStorageAsyncClient:
         response = await rsc.append(readings)
         assert {'readings': []} == response['appended']
 
+        await rsc.close()
         await fake_storage_srvr.stop()
 
+    def test_encode_block(self):
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        rsc = ReadingsStorageClientAsync(1, 2, mockServiceRecord)
+        readings = [{"asset_code": "A", "reading": {"x": 1}, "user_ts": "1970-01-01 00:00:01.000002+00:00"},
+                    {"asset_code": "A", "reading": {"x": 2}, "user_ts": "1970-01-01 00:00:03.000004"},
+                    {"asset_code": "B", "reading": {"y": 3}, "user_ts": "1970-01-01 00:00:05.000006+00:00"}]
+        block = rsc._encode_block(readings, 3)
+
+        offset = 0
+        magic, block_no, count = struct.unpack_from('=III', block, offset)
+        offset += 12
+        assert (RDS_BLOCK_MAGIC, 0, 3) == (magic, block_no, count)
+        decoded = []
+        last_asset = None
+        for i in range(count):
+            magic, reading_no, asset_len, payload_len = struct.unpack_from('=IIII', block, offset)
+            offset += 16
+            assert RDS_READING_MAGIC == magic
+            assert i == reading_no
+            sec, usec = struct.unpack_from('@ll', block, offset)
+            offset += struct.calcsize('@ll')
+            if asset_len:
+                last_asset = block[offset:offset + asset_len - 1].decode()
+                offset += asset_len
+            payload = json.loads(block[offset:offset + payload_len - 1].decode())
+            offset += payload_len
+            decoded.append((last_asset, payload, sec, usec))
+        assert len(block) == offset
+        assert [("A", {"x": 1}, 1, 2), ("A", {"x": 2}, 3, 4), ("B", {"y": 3}, 5, 6)] == decoded
+
+    def test_encode_block_invalid_timestamp(self):
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        rsc = ReadingsStorageClientAsync(1, 2, mockServiceRecord)
+        with pytest.raises(ValueError):
+            rsc._encode_block([{"asset_code": "A", "reading": {}, "user_ts": "now()"}], 1)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("acks, committed", [
+        ([RDS_ACK_MAGIC, RDS_ACK_MAGIC], [True, True]),
+        ([RDS_NACK_MAGIC, RDS_ACK_MAGIC], [False, True])
+    ])
+    async def test_append_stream(self, event_loop, acks, committed):
+        received = []
+
+        async def handle_stream(reader, writer):
+            # Acknowledge each block, once read, with the next of the given acks
+            for ack in acks:
+                magic, block_no, count = struct.unpack('=III', await reader.readexactly(12))
+                for i in range(count):
+                    _, _, asset_len, payload_len = struct.unpack('=IIII', await reader.readexactly(16))
+                    await reader.readexactly(struct.calcsize('@ll') + asset_len + payload_len)
+                received.append((block_no, count))
+                writer.write(struct.pack('=II', ack, block_no))
+                await writer.drain()
+            writer.close()
+
+        stream_port = unused_port()
+        server = await asyncio.start_server(handle_stream, HOST, stream_port)
+
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        rsc = ReadingsStorageClientAsync(1, 2, mockServiceRecord)
+        rsc._stream_reader, rsc._stream_writer = await asyncio.open_connection(HOST, stream_port)
+        readings = [{"asset_code": "A", "reading": {"x": 1}, "user_ts": "1970-01-01 00:00:01.000002+00:00"},
+                    {"asset_code": "A", "reading": {"x": 2}, "user_ts": "1970-01-01 00:00:03.000004"}]
+        for expected in committed:
+            if expected:
+                assert 2 == await rsc.append_stream(readings)
+            else:
+                with pytest.raises(ReadingStreamUnavailable):
+                    await rsc.append_stream(readings)
+            # A refused block leaves the stream open for the next one
+            assert rsc.is_streaming
+        assert [(0, 2), (1, 2)] == received
+
+        await rsc.close()
+        server.close()
+        await server.wait_closed()
+
+    @pytest.mark.asyncio
+    async def test_append_stream_not_acknowledged(self, event_loop):
+        async def handle_stream(reader, writer):
+            # Close the stream without acknowledging the block
+            await reader.readexactly(12)
+            writer.close()
+
+        stream_port = unused_port()
+        server = await asyncio.start_server(handle_stream, HOST, stream_port)
+
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        rsc = ReadingsStorageClientAsync(1, 2, mockServiceRecord)
+        rsc._stream_reader, rsc._stream_writer = await asyncio.open_connection(HOST, stream_port)
+        with pytest.raises(ReadingStreamUnavailable):
+            await rsc.append_stream([{"asset_code": "A", "reading": {"x": 1}, "user_ts": "1970-01-01 00:00:01"}])
+        assert rsc.is_streaming is False
+
+        await rsc.close()
+        server.close()
+        await server.wait_closed()
+
     @pytest.mark.asyncio
     async def test_fetch(self, event_loop):
         # GET, '/storage/reading?id={}&count={}'
@@ -609,6 +786,38 @@ class TestReadingsStorageAsyncClient:
         response = await rsc.fetch(*args)
         assert {'readings': [], 'start': '2', 'count': '3'} == response
 
+        await rsc.close()
+        await fake_storage_srvr.stop()
+
+    @pytest.mark.asyncio
+    async def test_fetch_blocks(self, event_loop):
+        fake_storage_srvr = FakeFledgeStorageSrvr(loop=event_loop)
+        await fake_storage_srvr.start()
+
+        mockServiceRecord = MagicMock(ServiceRecord)
+        mockServiceRecord._address = HOST
+        mockServiceRecord._type = "Storage"
+        mockServiceRecord._port = PORT
+        mockServiceRecord._management_port = 2000
+
+        rsc = ReadingsStorageClientAsync(1, 2, mockServiceRecord)
+        with pytest.raises(ValueError) as excinfo:
+            async for _ in rsc.fetch_blocks(None, 3):
+                pass
+        assert "first reading id to retrieve the readings block is required" == str(excinfo.value)
+
+        blocks = [block async for block in rsc.fetch_blocks(100, 2)]
+        assert [[100, 101], [102, 103], [104]] == [[row['id'] for row in rows] for rows, _ in blocks]
+        assert all(size > 0 for _, size in blocks)
+
+        with pytest.raises(StorageServerError) as excinfo:
+            with patch.object(_LOGGER, "error") as log_e:
+                async for _ in rsc.fetch_blocks("bad_data", 3):
+                    pass
+        assert 400 == excinfo.value.code
+        assert 1 == log_e.call_count
+
+        await rsc.close()
         await fake_storage_srvr.stop()
 
     @pytest.mark.asyncio
@@ -654,6 +863,7 @@ class TestReadingsStorageAsyncClient:
                                           '/storage/reading/query', '{"internal_server_err": "v"}', 500, 'something wrong', {"key": "value"})
         assert excinfo.type is aiohttp.client_exceptions.ContentTypeError
 
+        await rsc.close()
         await fake_storage_srvr.stop()
 
     @pytest.mark.asyncio
@@ -749,4 +959,5 @@ class TestReadingsStorageAsyncClient:
         response = await rsc.purge(**kwargs)
         assert 1 == response["called"]
 
+        await rsc.close()
         await fake_storage_srvr.stop()
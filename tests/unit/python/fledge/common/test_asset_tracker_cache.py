@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+from unittest.mock import patch, call
+import pytest
+
+from fledge.common import asset_tracker_cache
+from fledge.common.asset_tracker_cache import AssetTrackerCache
+from fledge.common.microservice_management_client.microservice_management_client import \
+    MicroserviceManagementClient, MicroserviceManagementClientAsync
+from fledge.common.microservice_management_client.exceptions import MicroserviceManagementClientError
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("common", "asset-tracker-cache")
+class TestAssetTrackerCache:
+
+    @pytest.fixture
+    def management_client(self):
+        with patch.object(MicroserviceManagementClient, "__init__", return_value=None):
+            client = MicroserviceManagementClient()
+            client.hostname = "localhost"
+            client.port = 1234
+            yield client
+
+    def test_load_and_track(self, management_client):
+        cache = AssetTrackerCache(management_client)
+        cache.load([{"asset": "sinusoid", "event": "Ingest", "service": "Sine", "plugin": "sinusoid",
+                     "fledge": "Fledge", "timestamp": "2026-01-01 00:00:00.000"},
+                    {"asset": "invalid"}])
+        assert 1 == len(cache)
+        assert ("sinusoid", "Ingest", "Sine", "sinusoid") in cache
+        assert cache.track("sinusoid", "Ingest", "Sine", "sinusoid") is False
+        assert cache.track("sinusoid", "Egress", "OMF", "OMF") is True
+        assert cache.track("sinusoid", "Egress", "OMF", "OMF") is False
+        assert 1 == cache.pending
+
+    async def test_start_delivers_and_stop(self, management_client):
+        with patch.object(MicroserviceManagementClientAsync, "create_asset_tracker_event",
+                          return_value={}) as patch_create:
+            cache = AssetTrackerCache(management_client)
+            cache.start()
+            cache.track("a", "Ingest", "Sine", "sinusoid")
+            cache.track("b", "Ingest", "Sine", "sinusoid")
+            cache.track("a", "Ingest", "Sine", "sinusoid")
+            await cache.stop()
+        assert 0 == cache.pending
+        assert {"events": 2, "pending": 0, "delivered": 2, "failed": 0} == cache.metrics()
+        patch_create.assert_has_calls([
+            call({"asset": "a", "event": "Ingest", "service": "Sine", "plugin": "sinusoid"}),
+            call({"asset": "b", "event": "Ingest", "service": "Sine", "plugin": "sinusoid"})])
+
+    async def test_flush_keeps_failed_events(self, management_client):
+        cache = AssetTrackerCache(management_client)
+        cache.track("a", "Ingest", "Sine", "sinusoid")
+        cache.track("b", "Ingest", "Sine", "sinusoid")
+        with patch.object(MicroserviceManagementClientAsync, "create_asset_tracker_event",
+                          side_effect=[{}, MicroserviceManagementClientError(status=500, reason="error")]):
+            with patch.object(asset_tracker_cache._LOGGER, "error") as patch_log:
+                assert 1 == await cache.flush()
+        assert 1 == patch_log.call_count
+        assert 1 == cache.pending
+        with patch.object(MicroserviceManagementClientAsync, "create_asset_tracker_event",
+                          return_value={}) as patch_create:
+            assert 0 == await cache.flush()
+        patch_create.assert_called_once_with({"asset": "b", "event": "Ingest", "service": "Sine", "plugin": "sinusoid"})
+        assert {"events": 2, "pending": 0, "delivered": 2, "failed": 1} == cache.metrics()
@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import asyncio
+import json
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+from fledge.common import audit_logger
 from fledge.common.audit_logger import AuditLogger
 from fledge.common.storage_client.storage_client import StorageClientAsync
 
@@ -130,3 +132,56 @@ class TestAuditLogger():
         await audit.success('AUDTCODE', None)
         assert audit._storage.insert_into_tbl.called is True
         audit._storage.insert_into_tbl.reset_mock()
+
+    @pytest.mark.asyncio
+    async def test_write_behind_batches_entries(self):
+        """ Test that buffered entries are written with a single multi-row insert """
+        audit = AuditLogger(MagicMock(spec=StorageClientAsync))
+        with patch.object(audit._storage, 'insert_into_tbl', return_value={"response": "inserted"}) as patch_insert:
+            audit.start_write_behind(flush_interval=60)
+            await audit.information('AUDTCODE', {'sentRows': 10})
+            await audit.failure('AUDTCODE', None)
+            assert 0 == patch_insert.call_count
+            assert {"written": 0, "discarded": 0, "failures": 0, "pending": 2} == audit.metrics()
+            await audit.stop_write_behind()
+        patch_insert.assert_called_once_with("log", json.dumps({"inserts": [
+            {"code": "AUDTCODE", "level": 4, "log": {"sentRows": 10}}, {"code": "AUDTCODE", "level": 1}]}))
+        assert audit.metrics() is None
+
+    @pytest.mark.asyncio
+    async def test_write_behind_keeps_entries_on_failure(self):
+        audit = AuditLogger(MagicMock(spec=StorageClientAsync))
+        audit.start_write_behind(flush_interval=60, buffer_size=2)
+        await audit.success('AUDTCODE', {'n': 1})
+        await audit.success('AUDTCODE', {'n': 2})
+        with patch.object(audit._storage, 'insert_into_tbl', side_effect=Exception):
+            with patch.object(audit_logger._logger, 'error') as log_error:
+                assert await audit.flush() is False
+        assert 1 == log_error.call_count
+        # The buffer is full, the oldest entry is discarded
+        await audit.success('AUDTCODE', {'n': 3})
+        assert {"written": 0, "discarded": 1, "failures": 1, "pending": 2} == audit.metrics()
+        with patch.object(audit._storage, 'insert_into_tbl', return_value={"response": "inserted"}) as patch_insert:
+            await audit.stop_write_behind()
+        patch_insert.assert_called_once_with("log", json.dumps({"inserts": [
+            {"code": "AUDTCODE", "level": 0, "log": {"n": 2}}, {"code": "AUDTCODE", "level": 0, "log": {"n": 3}}]}))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("overflow, expected", [
+        ('discard_newest', [{"n": 1}]),
+        ('flush', [{"n": 1}, {"n": 2}])
+    ])
+    async def test_write_behind_overflow(self, overflow, expected):
+        audit = AuditLogger(MagicMock(spec=StorageClientAsync))
+        with patch.object(audit._storage, 'insert_into_tbl', return_value={"response": "inserted"}) as patch_insert:
+            audit.start_write_behind(flush_interval=60, buffer_size=1, overflow=overflow)
+            await audit.success('AUDTCODE', {'n': 1})
+            await audit.success('AUDTCODE', {'n': 2})
+            await audit.stop_write_behind()
+        written = [e["log"] for args, kwargs in patch_insert.call_args_list for e in json.loads(args[1])["inserts"]]
+        assert expected == written
+
+    def test_write_behind_bad_overflow(self):
+        audit = AuditLogger(MagicMock(spec=StorageClientAsync))
+        with pytest.raises(ValueError):
+            audit.start_write_behind(overflow='block')
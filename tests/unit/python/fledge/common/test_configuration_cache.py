@@ -16,9 +16,12 @@ class TestConfigurationCache:
     def test_init(self):
         cached_manager = ConfigurationCache()
         assert {} == cached_manager.cache
-        assert 10 == cached_manager.max_cache_size
+        assert 1000 == cached_manager.max_cache_size
+        assert 16 * 1024 * 1024 == cached_manager.max_cache_bytes
+        assert 0 == cached_manager.bytes
         assert 0 == cached_manager.hit
         assert 0 == cached_manager.miss
+        assert 0 == cached_manager.evictions
 
     def test_size(self):
         cached_manager = ConfigurationCache()
@@ -54,7 +57,7 @@ class TestConfigurationCache:
         assert cat_display_name == cached_manager.cache[cat_name]['displayName']
 
     def test_remove_oldest(self):
-        cached_manager = ConfigurationCache()
+        cached_manager = ConfigurationCache(max_cache_size=10)
         cached_manager.update("cat1", "desc1", {'value': {}})
         cached_manager.update("cat2", "desc2", {'value': {}})
         cached_manager.update("cat3", "desc3", {'value': {}})
@@ -93,3 +96,54 @@ class TestConfigurationCache:
         assert 'cat1' in cached_manager.cache
         assert 'cat3' in cached_manager.cache
         assert 'cat4' in cached_manager.cache
+
+    def test_least_recently_used_is_removed(self):
+        cached_manager = ConfigurationCache(max_cache_size=3)
+        cached_manager.update("cat1", "desc1", {'value': {}})
+        cached_manager.update("cat2", "desc2", {'value': {}})
+        cached_manager.update("cat3", "desc3", {'value': {}})
+        assert "cat1" in cached_manager
+        cached_manager.update("cat4", "desc4", {'value': {}})
+        assert ['cat3', 'cat1', 'cat4'] == list(cached_manager.cache)
+        assert 1 == cached_manager.evictions
+
+    def test_bytes_limit(self):
+        item = {'config_item': {'default': 'woo', 'description': 'foo', 'type': 'string', 'value': 'x' * 100}}
+        cached_manager = ConfigurationCache(max_cache_bytes=400)
+        cached_manager.update("cat1", "desc1", item)
+        cached_manager.update("cat2", "desc2", item)
+        assert 2 == cached_manager.size
+        cached_manager.update("cat3", "desc3", item)
+        assert ['cat2', 'cat3'] == list(cached_manager.cache)
+        assert cached_manager.bytes <= 400
+        cached_manager.remove("cat2")
+        cached_manager.remove("cat3")
+        assert 0 == cached_manager.bytes
+
+    def test_set_limits(self):
+        cached_manager = ConfigurationCache()
+        for name in ("cat1", "cat2", "cat3"):
+            cached_manager.update(name, "desc", {'value': {}})
+        cached_manager.set_limits(max_cache_size=2)
+        assert ['cat2', 'cat3'] == list(cached_manager.cache)
+        assert 1 == cached_manager.evictions
+        assert ConfigurationCache.MAX_CACHE_BYTES == cached_manager.max_cache_bytes
+        cached_manager.set_limits(max_cache_bytes=1)
+        assert ['cat3'] == list(cached_manager.cache)
+        assert ConfigurationCache.MAX_CACHE_SIZE == cached_manager.max_cache_size
+
+    def test_resize(self):
+        cached_manager = ConfigurationCache()
+        cached_manager.update("cat1", "desc1", {'config_item': {'value': 'a'}})
+        size = cached_manager.bytes
+        cached_manager.cache["cat1"]['value']['config_item']['value'] = 'abc'
+        cached_manager.resize("cat1")
+        assert size + 2 == cached_manager.bytes
+
+    def test_metrics(self):
+        cached_manager = ConfigurationCache()
+        cached_manager.update("cat1", "desc1", {})
+        assert "cat1" in cached_manager
+        assert "cat2" not in cached_manager
+        assert {"size": 1, "maxSize": 1000, "bytes": 2, "maxBytes": 16 * 1024 * 1024, "hit": 1, "miss": 1,
+                "evictions": 0, "hitRatio": 0.5} == cached_manager.metrics()
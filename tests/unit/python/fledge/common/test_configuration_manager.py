@@ -1744,6 +1744,43 @@ class TestConfigurationManager:
             assert cat_value == ret_val
         readpatch.assert_called_once_with(category_name)
 
+    async def test_get_category_all_items_from_cache(self, reset_singleton):
+        category_name = 'catname'
+        cat_value = {"config_item": {"type": "string", "default": "blah", "description": "Des", "value": "blah"}}
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        c_mgr = ConfigurationManager(storage_client_mock)
+        c_mgr._cacheManager.update(category_name, "Test Des", cat_value)
+        with patch.object(ConfigurationManager, '_read_category') as readpatch:
+            ret_val = await c_mgr.get_category_all_items(category_name)
+            assert cat_value == ret_val
+        readpatch.assert_not_called()
+        assert 1 == c_mgr._cacheManager.hit
+
+    async def test_preload_cache(self, reset_singleton):
+
+        async def async_mock(return_value):
+            return return_value
+
+        rows = [{'key': 'cat{}'.format(i), 'description': 'Des', 'display_name': 'Cat',
+                 'value': {"config_item": {"type": "string", "default": "blah", "description": "Des", "value": "blah"}}}
+                for i in range(3)]
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        c_mgr = ConfigurationManager(storage_client_mock)
+        c_mgr.set_cache_limits(max_cache_size=2)
+
+        # Changed in version 3.8: patch() now returns an AsyncMock if the target is an async function.
+        if sys.version_info.major == 3 and sys.version_info.minor >= 8:
+            _rv = await async_mock({'rows': rows})
+        else:
+            _rv = asyncio.ensure_future(async_mock({'rows': rows}))
+
+        with patch.object(storage_client_mock, 'query_tbl_with_payload', return_value=_rv) as query_patch:
+            assert 2 == await c_mgr.preload_cache()
+        query_patch.assert_called_once_with('configuration', json.dumps(
+            {"return": ["key", "description", "value", "display_name"]}))
+        assert ['cat0', 'cat1'] == list(c_mgr._cacheManager.cache)
+        assert 'Cat' == c_mgr._cacheManager.cache['cat0']['displayName']
+
     async def test_get_category_all_items_bad(self, reset_singleton):
         category_name = 'catname'
         storage_client_mock = MagicMock(spec=StorageClientAsync)
@@ -7,7 +7,8 @@
 """ Test common/jqfilter.py
 
 """
-from unittest.mock import patch
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
 import pytest
 import pyjq
 from fledge.common.logger import FLCoreLogger
@@ -29,14 +30,25 @@ class TestJQFilter:
         log.assert_called_once_with("JQFilter")
 
     @pytest.mark.parametrize("input_filter_string, input_reading_block, expected_return", [
-        (".", '{"a": 1}', '{"a": 1}')
+        (".", {"a": 1}, [{"a": 1}]),
+        ("[.[] | select(.x > 1)]", [{"x": 1}, {"x": 2}], [[{"x": 2}]])
     ])
     def test_transform(self, input_filter_string, input_reading_block, expected_return):
         jqfilter_instance = JQFilter()
-        with patch.object(pyjq, "all", return_value=expected_return) as mock_pyjq:
-            ret = jqfilter_instance.transform(input_filter_string, input_reading_block)
-            assert ret == expected_return
-        mock_pyjq.assert_called_once_with(input_reading_block, input_filter_string)
+        ret = jqfilter_instance.transform(input_reading_block, input_filter_string)
+        assert ret == expected_return
+        assert ["compile", "transform", "total"] == list(jqfilter_instance.timings.keys())
+
+    def test_transform_compiles_once(self):
+        jqfilter_instance = JQFilter()
+        with patch.object(pyjq, "compile", wraps=pyjq.compile) as mock_compile:
+            jqfilter_instance.transform([1], ".")
+            jqfilter_instance.transform([2], ".")
+            assert 1 == mock_compile.call_count
+            # A new filter rule is compiled again
+            assert [2] == jqfilter_instance.transform([1, 2], ".[1]")
+            assert 2 == mock_compile.call_count
+        mock_compile.assert_called_with(".[1]")
 
     @pytest.mark.parametrize("input_filter_string, input_reading_block, expected_error, expected_log", [
         (".", '{"a" 1}', TypeError, 'Invalid JSON passed during jq transform.'),
@@ -44,11 +56,40 @@ class TestJQFilter:
     ])
     def test_transform_exceptions(self, input_filter_string, input_reading_block, expected_error, expected_log):
         jqfilter_instance = JQFilter()
-        with patch.object(pyjq, "all", side_effect=expected_error) as mock_pyjq:
+        program = MagicMock()
+        program.all.side_effect = expected_error
+        with patch.object(pyjq, "compile", return_value=program) as mock_compile:
             with patch.object(jqfilter_instance._logger, "error") as patch_log:
                 with pytest.raises(expected_error):
-                    jqfilter_instance.transform(input_filter_string, input_reading_block)
+                    jqfilter_instance.transform(input_reading_block, input_filter_string)
             args = patch_log.call_args
             assert expected_error == args[0][0].__class__
             assert expected_log == args[0][1]
-        mock_pyjq.assert_called_once_with(input_reading_block, input_filter_string)
+        mock_compile.assert_called_once_with(input_filter_string)
+        program.all.assert_called_once_with(input_reading_block)
+
+    def test_compile_exception(self):
+        jqfilter_instance = JQFilter()
+        with patch.object(jqfilter_instance._logger, "error") as patch_log:
+            with pytest.raises(ValueError):
+                jqfilter_instance.transform({"a": 1}, "..[")
+        assert 'Failed to transform, please check the transformation rule.' == patch_log.call_args[0][1]
+
+    @pytest.mark.parametrize("executor_class", [None, ThreadPoolExecutor, ProcessPoolExecutor])
+    async def test_transform_async(self, executor_class):
+        executor = executor_class(max_workers=1) if executor_class else None
+        jqfilter_instance = JQFilter()
+        ret = await jqfilter_instance.transform_async([{"x": 1}, {"x": 2}], "[.[] | select(.x > 1)]", executor)
+        assert [[{"x": 2}]] == ret
+        assert jqfilter_instance.timings["total"] >= jqfilter_instance.timings["transform"]
+        if executor is not None:
+            executor.shutdown()
+
+    async def test_transform_async_process_exception(self):
+        jqfilter_instance = JQFilter()
+        executor = ProcessPoolExecutor(max_workers=1)
+        with patch.object(jqfilter_instance._logger, "error") as patch_log:
+            with pytest.raises(ValueError):
+                await jqfilter_instance.transform_async({"a": 1}, "..[", executor)
+        assert 'Failed to transform, please check the transformation rule.' == patch_log.call_args[0][1]
+        executor.shutdown()
@@ -6,6 +6,8 @@
 
 import pytest
 import logging
+import sys
+from unittest.mock import MagicMock, patch
 
 from fledge.common import logger
 
@@ -95,3 +97,52 @@ class TestLogger:
                     log.setLevel(level) 
                     log.propagate = propagate
                     assert log is logger.setup(name, propagate=propagate, level=level)
+
+    @pytest.mark.parametrize("argv, process_name", [
+        (["python3", "-m", "fledge.services.core"], "Fledge"),
+        (["python3", "-m", "fledge.tasks.purge", "--port=8081", "--address=127.0.0.1", "--name=purge"],
+         "Fledge purge"),
+        (["fledge.services.south", "--token=abc", "--name=Sine Wave", "--dryrun"], "Fledge Sine Wave")
+    ])
+    def test_get_process_name(self, argv, process_name):
+        """ Test the process name is read from the command line of the process """
+        logger.get_process_name.cache_clear()
+        try:
+            with patch('builtins.open', side_effect=OSError):
+                with patch.object(sys, 'argv', argv):
+                    assert process_name == logger.get_process_name()
+                    # resolved once
+                    with patch.object(sys, 'argv', []):
+                        assert process_name == logger.get_process_name()
+        finally:
+            logger.get_process_name.cache_clear()
+
+    def test_set_process_args(self):
+        """ Test a forked task is named from its arguments, including in the handlers already set up """
+        instance = logger.setup("test_set_process_args")
+        core_logger = logger.FLCoreLogger()
+        try:
+            logger.set_process_args(["fledge.tasks.purge", "--port=8081", "--name=purge"])
+            assert "Fledge purge" == logger.get_process_name()
+            assert logger.FLCoreLogger() is not core_logger
+            assert logger.FLCoreLogger().formatter._fmt.startswith("Fledge purge[%(process)d]")
+            assert instance.handlers[-1].formatter._fmt.startswith("Fledge purge[%(process)d]")
+        finally:
+            logger.set_process_args([])
+            logger._process_args = None
+            logger.get_process_name.cache_clear()
+        assert instance.handlers[-1].formatter._fmt.startswith("Fledge[%(process)d]")
+
+    def test_syslog_handler(self):
+        """ Test the records are formatted by the caller and written to syslog by the listener thread """
+        instance = logger.setup("test_syslog_handler", level=logging.INFO)
+        handler = instance.handlers[-1]
+        assert isinstance(handler, logger.SyslogQueueHandler)
+        syslog_handler = MagicMock(level=logging.NOTSET)
+        listener = logger._syslog_listener
+        with patch.object(listener, 'handlers', (syslog_handler,)):
+            instance.info("Received %s request", "GET")
+            listener.queue.join()
+        record = syslog_handler.handle.call_args[0][0]
+        assert record.getMessage().endswith("INFO: test_logger: test_syslog_handler: Received GET request")
+        assert logging.INFO == record.levelno
@@ -10,7 +10,7 @@ import copy
 from unittest.mock import patch
 import pytest
 
-from fledge.common.plugin_discovery import PluginDiscovery, _logger
+from fledge.common.plugin_discovery import PluginDiscovery, PluginDiscoveryCache, _logger
 from fledge.services.core.api import utils
 from fledge.services.core.api.plugins import common
 from fledge.plugins.common import utils as api_utils
@@ -581,3 +581,95 @@ class TestPluginDiscovery:
         assert 1 == patch_log_exc.call_count
         args = patch_log_exc.call_args
         assert msg == args[0][1]
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("common", "plugin-discovery")
+class TestPluginDiscoveryCache:
+
+    @pytest.fixture
+    def plugin_dirs(self, tmp_path):
+        python_dir = tmp_path / "python" / "north" / "http_north"
+        python_dir.mkdir(parents=True)
+        (python_dir / "http_north.py").write_text("# plugin")
+        c_dir = tmp_path / "plugins" / "north" / "OMF"
+        c_dir.mkdir(parents=True)
+        (c_dir / "libOMF.so").write_text("ELF")
+        return str(python_dir), str(c_dir)
+
+    @staticmethod
+    def _plugin(name):
+        return {"name": name, "type": "north", "description": name, "version": "1.0",
+                "installedDirectory": "north/{}".format(name), "packageName": "",
+                "config": {"plugin": {"default": name}}}
+
+    @pytest.fixture
+    def patched(self, plugin_dirs):
+        python_dir, c_dir = plugin_dirs
+
+        def c_files(installed_dir_name):
+            return [("OMF", "binary", c_dir)] if installed_dir_name == "north" else []
+
+        with patch.object(PluginDiscovery, "get_plugin_folders",
+                          side_effect=lambda t: [python_dir] if t == "north" else []), \
+                patch.object(utils, "find_c_plugin_files", side_effect=c_files), \
+                patch.object(PluginDiscovery, "get_plugin_config",
+                             return_value=self._plugin("http_north")) as patch_python, \
+                patch.object(PluginDiscovery, "get_c_plugin_config", return_value=self._plugin("OMF")) as patch_c:
+            yield patch_python, patch_c
+
+    def test_cached_until_plugin_files_change(self, plugin_dirs, patched):
+        patch_python, patch_c = patched
+        cache = PluginDiscoveryCache(PluginDiscovery)
+        plugins = cache.get_plugins_installed("north", is_config=True)
+        assert ["http_north", "OMF"] == [p["name"] for p in plugins]
+        assert "config" in plugins[0]
+        assert "config" not in cache.get_plugins_installed("north")[0]
+        assert 2 == len(cache.get_plugins_installed())
+        patch_python.assert_called_once_with(plugin_dirs[0], "north", "north", True)
+        patch_c.assert_called_once_with("OMF", "binary", "north", "north", True)
+        assert {"hits": 2, "misses": 5, "loads": 2, "plugins": 2, "types": 5} == cache.metrics()
+
+        # A file added to the directory of the python plugin loads it again, not the C plugin
+        open(plugin_dirs[0] + "/.Package", "w").close()
+        os.utime(plugin_dirs[0], ns=(0, 0))
+        cache.get_plugins_installed("north")
+        assert 2 == patch_python.call_count
+        assert 1 == patch_c.call_count
+
+    def test_clear(self, patched):
+        patch_python, patch_c = patched
+        cache = PluginDiscoveryCache(PluginDiscovery)
+        cache.get_plugins_installed("north")
+        cache.clear("south")
+        cache.get_plugins_installed("north")
+        assert 1 == patch_python.call_count
+        cache.clear("north")
+        cache.get_plugins_installed("north")
+        assert 2 == patch_python.call_count
+        assert 2 == patch_c.call_count
+
+    def test_index_saved_and_loaded(self, tmp_path, patched):
+        patch_python, patch_c = patched
+        index_file = str(tmp_path / "var" / "plugins.json")
+        cache = PluginDiscoveryCache(PluginDiscovery, index_file)
+        expected = cache.get_plugins_installed("north")
+        loaded = PluginDiscoveryCache(PluginDiscovery, index_file)
+        loaded.load()
+        assert expected == loaded.get_plugins_installed("north")
+        assert 1 == patch_python.call_count
+        assert 1 == patch_c.call_count
+
+    def test_enable_refresh_and_disable(self, patched):
+        patch_python, patch_c = patched
+        PluginDiscovery.enable_cache()
+        try:
+            PluginDiscovery.get_plugins_installed("north")
+            PluginDiscovery.get_plugins_installed("north")
+            assert 1 == patch_python.call_count
+            assert 2 == len(PluginDiscovery.refresh("north"))
+            assert 2 == patch_python.call_count
+            assert 1 == PluginDiscovery.cache_metrics()["hits"]
+        finally:
+            PluginDiscovery.disable_cache()
+        assert PluginDiscovery.cache_metrics() is None
@@ -274,3 +274,76 @@ class TestStatistics:
                 with patch.object(statistics._logger, 'exception') as logger_exception:
                     await s.add_update(stat_dict)
                 logger_exception.assert_called_once_with(*msg)
+
+    async def test_register_bulk(self):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        s = statistics.Statistics(storage_client_mock)
+        s._registered_keys = ['READINGS']
+        with patch.object(s._storage, 'insert_into_tbl', return_value={"response": "inserted"}) as stat_insert:
+            await s.register_bulk({'READINGS': 'Readings', 'SINUSOID': 'Sinusoid', 'RANDOM': 'Random'})
+            await s.register_bulk({'SINUSOID': 'Sinusoid'})
+        assert 1 == stat_insert.call_count
+        args, kwargs = stat_insert.call_args
+        assert 'statistics' == args[0]
+        assert {"inserts": [{"key": "SINUSOID", "description": "Sinusoid", "value": 0, "previous_value": 0},
+                            {"key": "RANDOM", "description": "Random", "value": 0, "previous_value": 0}]} \
+            == json.loads(args[1])
+        assert ['READINGS', 'SINUSOID', 'RANDOM'] == s._registered_keys
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("common", "statistics")
+class TestStatisticsAccumulator:
+
+    @pytest.fixture
+    def stats(self):
+        s = statistics.Statistics(MagicMock(spec=StorageClientAsync))
+        s._registered_keys = ['READINGS']
+        return s
+
+    async def test_flush_coalesces_increments(self, stats):
+        accumulator = statistics.StatisticsAccumulator(stats)
+        accumulator.increment('READINGS', 10)
+        accumulator.increment('SINUSOID', 4, 'Sinusoid')
+        accumulator.increment('READINGS', 5)
+        accumulator.increment('SINUSOID', 1, 'Sinusoid')
+        accumulator.increment('DISCARDED', 0)
+        assert 2 == accumulator.pending
+        with patch.object(stats, 'register_bulk', return_value=None) as patch_register:
+            with patch.object(stats, 'update_bulk', return_value=None) as patch_update:
+                assert await accumulator.flush() is True
+                assert await accumulator.flush() is True
+        patch_register.assert_called_once_with({'SINUSOID': 'Sinusoid'})
+        patch_update.assert_called_once_with({'READINGS': 15, 'SINUSOID': 5})
+        assert {"pending": 0, "flushes": 1, "failures": 0} == accumulator.metrics()
+
+    async def test_flush_keeps_counts_on_failure(self, stats):
+        accumulator = statistics.StatisticsAccumulator(stats)
+        accumulator.increment('SINUSOID', 4, 'Sinusoid')
+        with patch.object(statistics._logger, 'warning') as log_warning:
+            with patch.object(stats, 'register_bulk', side_effect=Exception('down')):
+                assert await accumulator.flush() is False
+        assert 1 == log_warning.call_count
+        accumulator.increment('SINUSOID', 2)
+        with patch.object(stats, 'register_bulk', return_value=None) as patch_register:
+            with patch.object(stats, 'update_bulk', return_value=None) as patch_update:
+                assert await accumulator.flush() is True
+        patch_register.assert_called_once_with({'SINUSOID': 'Sinusoid'})
+        patch_update.assert_called_once_with({'SINUSOID': 6})
+        assert {"pending": 0, "flushes": 1, "failures": 1} == accumulator.metrics()
+
+    async def test_threshold_triggers_flush(self, stats):
+        accumulator = statistics.StatisticsAccumulator(stats, flush_interval=60, flush_threshold=3)
+        with patch.object(stats, 'update_bulk', return_value=None) as patch_update:
+            accumulator.start()
+            accumulator.increment('READINGS', 1)
+            accumulator.increment('READINGS', 1)
+            await asyncio.sleep(0.01)
+            assert 0 == patch_update.call_count
+            accumulator.increment('READINGS', 1)
+            await asyncio.sleep(0.01)
+            patch_update.assert_called_once_with({'READINGS': 3})
+            accumulator.increment('READINGS', 7)
+            await accumulator.stop()
+        assert 2 == patch_update.call_count
+        patch_update.assert_called_with({'READINGS': 7})
@@ -6,6 +6,7 @@
 
 """ Unit tests about the common code available in plugins.north.common.common """
 
+import copy
 import pytest
 import fledge.plugins.north.common.common as plugin_common
 
@@ -151,3 +152,50 @@ class TestPluginsNorthCommon(object):
         """ """
 
         assert plugin_common.identify_unique_asset_codes(value) == expected
+
+    @pytest.mark.parametrize("value", [
+        "xxx", "", " 5", "+5", "007", "1_000", "-0", "0", "-10", "180.2", "180.", ".0", "1e5", "nan", "Infinite",
+        "9007199254740993", "up", "1.2.3",
+        0, -1, 2 ** 53 + 1, 0.0, 1.5, float('nan'), True, [1, "2"],
+        {"a": "1", "b": {"c": "2", "d": {"e": "3"}}}
+    ])
+    def test_readings_type_converter_as_convert_reading_value(self, value):
+        """ the converter gives the result of convert_reading_value, with and without a learned schema """
+
+        converter = plugin_common.ReadingsTypeConverter()
+        for _ in range(2):
+            expected = plugin_common.convert_reading_value(copy.deepcopy(value))
+            converted = converter.convert_reading("asset", {"value": copy.deepcopy(value)})["value"]
+            assert type(expected) is type(converted)
+            assert repr(expected) == repr(converted)
+
+    def test_readings_type_converter_schema(self):
+        """ the types are inferred once per datapoint and again only when they change """
+
+        converter = plugin_common.ReadingsTypeConverter()
+        rows = [{"asset_code": "pump", "reading": {"speed": "10", "temperature": "20.5", "state": "up"}}
+                for _ in range(100)]
+        assert [] == converter.convert_block(rows)
+        assert {"speed": 10, "temperature": 20.5, "state": "up"} == rows[-1]["reading"]
+        assert 3 == converter.inferences
+        assert {"speed": "_convert_integer_string", "temperature": "_convert_number_string",
+                "state": "_convert_string"} == converter.schema("pump")
+
+        # The schema changes
+        reading = converter.convert_reading("pump", {"speed": "10.5", "temperature": "20.5", "state": "1"})
+        assert {"speed": 10.5, "temperature": 20.5, "state": 1} == reading
+        assert 5 == converter.inferences
+        assert "_convert_number_string" == converter.schema("pump")["speed"]
+
+    def test_readings_type_converter_failure(self):
+        """ a value that can not be converted fails only its own row """
+
+        converter = plugin_common.ReadingsTypeConverter()
+        rows = [{"asset_code": "pump", "reading": {"speed": "10"}},
+                {"asset_code": "pump", "reading": {"speed": "inf"}},
+                {"asset_code": "pump", "reading": {"speed": "12"}}]
+        failures = converter.convert_block(rows)
+        assert 1 == len(failures)
+        assert rows[1] is failures[0][0]
+        assert isinstance(failures[0][1], OverflowError)
+        assert 12 == rows[2]["reading"]["speed"]
@@ -395,6 +395,7 @@ class TestAuthMandatory:
             rv1 = asyncio.ensure_future(mock_coro(user_info))
             rv2 = asyncio.ensure_future(mock_coro(user_record))
             rv3 = asyncio.ensure_future(mock_coro(update_result))
+        patch_invalidate = mocker.patch.object(User.Objects, '_invalidate_cached_tokens')
         with patch.object(User.Objects, 'get', return_value=rv1) as patch_get_user:
             with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
                 with patch.object(storage_client_mock, 'query_tbl_with_payload', return_value=rv2) as q_tbl_patch:
@@ -409,6 +410,7 @@ class TestAuthMandatory:
                     q_tbl_patch.assert_called_once_with('user_logins', '{"return": ["user_id"], '
                                                                        '"where": {"column": "token", "condition": "=", '
                                                                        '"value": "admin_user_token"}}')
+        patch_invalidate.assert_called_once_with(user_id=2)
         patch_get_user.assert_called_once_with(uid=1)
         patch_refresh_token.assert_called_once_with(ADMIN_USER_HEADER['Authorization'])
         patch_validate_token.assert_called_once_with(ADMIN_USER_HEADER['Authorization'])
@@ -908,6 +910,7 @@ class TestAuthMandatory:
             _se1 = asyncio.ensure_future(mock_coro(user_record))
             _se2 = asyncio.ensure_future(mock_coro(update_user_record))
 
+        patch_invalidate = mocker.patch.object(User.Objects, '_invalidate_cached_tokens')
         with patch.object(User.Objects, 'get_role_id_by_name', return_value=_rv1) as patch_role_id:
             with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
                 with patch.object(storage_client_mock, 'query_tbl_with_payload',
@@ -924,6 +927,7 @@ class TestAuthMandatory:
                                         } == json.loads(r)
                             patch_audit.assert_called_once_with('USRCH', audit_details)
                     update_tbl_patch.assert_called_once_with('users', _payload)
+                    patch_invalidate.assert_called_once_with(user_id='2')
                 assert 2 == q_tbl_patch.call_count
                 args, kwargs = q_tbl_patch.call_args_list[0]
                 assert ('users', '{"return": ["id", "uname", "role_id", "enabled"], '
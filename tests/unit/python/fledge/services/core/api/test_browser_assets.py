@@ -7,6 +7,7 @@
 
 import asyncio
 import json
+import time
 from unittest.mock import MagicMock, patch
 import sys
 
@@ -16,6 +17,7 @@ import pytest
 
 from fledge.services.core.api import browser
 from fledge.services.core import connect
+from fledge.services.core.readings_rollup import ReadingsRollup
 from fledge.common.storage_client.storage_client import ReadingsStorageClientAsync
 
 __author__ = "Ashish Jabble"
@@ -57,7 +59,8 @@ FILTERING_IMAGE_PAYLOADS = [
 ]
 FILTERING_IMAGE_RESULTS = [
     {'count': 1, 'rows': [{'reading': {'testcard': '__DPIMAGE:256,256,8_AA'}}]},
-    {'count': 1, 'rows': [{'min': '__DPIMAGE:256,256,8_A', 'max': '__DPIMAGE:256,256,8_AA', 'average': 0.0}]},
+    {'count': 1, 'rows': [{'min_0': '__DPIMAGE:256,256,8_A', 'max_0': '__DPIMAGE:256,256,8_AA', 'avg_0': 0.0,
+                           'count_0': 1}]},
     {'count': 1, 'rows': [{'timestamp': '2022-02-11 16:08:59.617317', 'testcard': '__DPIMAGE:256,256,8_AA'}]},
     {'count': 1, 'rows': [{'min': '__DPIMAGE:256,256,8_AA', 'max': '__DPIMAGE:256,256,8_AA', 'average': 0.0}]},
     {'count': 1, 'rows': [{'min': '__DPIMAGE:256,256,8_AA', 'max': '__DPIMAGE:256,256,8_AA', 'average': 0.0}]}
@@ -380,17 +383,18 @@ class TestBrowserAssets:
     async def test_asset_all_readings_summary(self, client):
         async def q_result(*args):
             if payload1 == args[0]:
-                return {'rows': [{'reading': {'humidity': 20}}], 'count': 1}
+                return {'rows': [{'reading': {'humidity': 20, 'temperature': 15}}], 'count': 1}
             if payload2 == args[0]:
-                return {'count': 1, 'rows': [{'min': 13.0, 'max': 83.0, 'average': 33.5}]}
+                return {'count': 1, 'rows': [{'min_0': 13.0, 'max_0': 83.0, 'avg_0': 33.5, 'count_0': 4,
+                                              'min_1': 10.0, 'max_1': 30.0, 'avg_1': 20.0, 'count_1': 2}]}
 
         payload1 = {"return": ["reading"],
                     "where": {"column": "asset_code", "condition": "=", "value": "fogbench_humidity"}}
         payload2 = {
-            "aggregate": [{"operation": "min", "json": {"properties": "humidity", "column": "reading"}, "alias": "min"},
-                          {"operation": "max", "json": {"properties": "humidity", "column": "reading"}, "alias": "max"},
-                          {"operation": "avg", "json": {"properties": "humidity", "column": "reading"},
-                           "alias": "average"}],
+            "aggregate": [{"operation": operation, "json": {"properties": reading, "column": "reading"},
+                           "alias": "{}_{}".format(operation, index)}
+                          for index, reading in enumerate(["humidity", "temperature"])
+                          for operation in ["min", "max", "avg", "count"]],
             "where": {"column": "asset_code", "condition": "=", "value": "fogbench_humidity"}, "limit": 20}
 
         readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
@@ -409,10 +413,14 @@ class TestBrowserAssets:
                 assert 200 == resp.status
                 r = await resp.text()
                 json_response = json.loads(r)
-                assert [{'humidity': {'average': 33.5, 'max': 83.0, 'min': 13.0}}] == json_response
+                # temperature is missing from some of the readings
+                assert [{'humidity': {'average': 33.5, 'max': 83.0, 'min': 13.0, 'count': 4}},
+                        {'temperature': {'average': 20.0, 'max': 30.0, 'min': 10.0, 'count': 2}}] == json_response
+            # A single aggregate query for all the datapoints
             assert 2 == patch_query.call_count
             args0, kwargs0 = patch_query.call_args_list[0]
             args1, kwargs1 = patch_query.call_args_list[1]
+            assert payload2 == json.loads(args1[0])
             # assert '{"return": ["reading"], "where": {"column": "asset_code", "condition": "=", "value": "fogbench_humidity"}}' in args0
             # FIXME: ordering issue and add tests for datetimeunits request param
             # assert '{"aggregate": [{"operation": "min", "json": {"column": "reading", "properties": "humidity"}, "alias": "min"}, {"operation": "max", "json": {"column": "reading", "properties": "humidity"}, "alias": "max"}, {"operation": "avg", "json": {"column": "reading", "properties": "humidity"}, "alias": "average"}], "where": {"column": "asset_code", "condition": "=", "value": "fogbench_humidity"}, "limit": 20}' in args1
@@ -474,6 +482,39 @@ class TestBrowserAssets:
             # TODO: After datetime patch assert full payload
             # assert payload == json.loads(args[0])
 
+    async def test_asset_readings_with_bucket_size_from_rollup(self, client):
+        # 2026-01-01 00:00:00 UTC, a reading every 10 seconds so that each one is in a bucket of its own
+        t0 = 1767225600
+        readings = [(t0 + 10 * index, index) for index in range(30)]
+        rollup = ReadingsRollup(MagicMock(spec=ReadingsStorageClientAsync))
+        rollup.reset(0, t0)
+        for second, value in readings:
+            rollup.add("sinusoid", second, {"x": value})
+        rollup._high_water = t0 + 3600
+        start, length, size = t0 + 100, 60, 10
+        # Timebucket query of the storage layer, the newest buckets first and limited to length / size buckets
+        storage_rows = [{"timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second)),
+                         "min": value, "max": value, "average": value}
+                        for second, value in reversed(readings) if start <= second <= start + length][:length // size]
+        url = 'fledge/asset/sinusoid/x/bucket/{}?start={}&length={}'.format(size, start, length)
+        readings_storage_client_mock = MagicMock(ReadingsStorageClientAsync)
+        result = {'rows': storage_rows, 'count': len(storage_rows)}
+        _rv = await mock_coro(result) if sys.version_info.major == 3 and sys.version_info.minor >= 8 else \
+            asyncio.ensure_future(mock_coro(result))
+        with patch.object(connect, 'get_readings_async', return_value=readings_storage_client_mock):
+            with patch.object(readings_storage_client_mock, 'query', return_value=_rv) as query_patch:
+                with patch.object(browser, 'get_readings_rollup', return_value=None):
+                    resp = await client.get(url)
+                    assert 200 == resp.status
+                    from_storage = json.loads(await resp.text())
+                with patch.object(browser, 'get_readings_rollup', return_value=rollup):
+                    resp = await client.get(url)
+                    assert 200 == resp.status
+                    from_rollup = json.loads(await resp.text())
+            assert 1 == query_patch.call_count
+        assert storage_rows == from_storage
+        assert from_storage == from_rollup
+
     @pytest.mark.skip(reason='TODO: FOGL-3541 rewrite tests')
     @pytest.mark.parametrize("storage_result, message", [
         ({'rows': [], 'count': 0}, "'fogbench/humidity asset code not found'"),
@@ -604,8 +645,14 @@ class TestBrowserAssets:
                     assert 200 == resp.status
                     r = await resp.text()
                     json_response = json.loads(r)
-                    expected_result = {'testcard': result['rows'][0]} if isinstance(json_response, dict) else \
-                        [{'testcard': result['rows'][0]}]
+                    if isinstance(json_response, dict):
+                        expected_result = {'testcard': result['rows'][0]}
+                    else:
+                        # Images are excluded by default
+                        row = {name: browser.IMAGE_PLACEHOLDER if str(value).startswith('__DPIMAGE') else value
+                               for name, value in result['rows'][0].items()}
+                        expected_result = [{'testcard': {'min': row['min_0'], 'max': row['max_0'],
+                                                         'average': row['avg_0'], 'count': row['count_0']}}]
                     assert expected_result == json_response
         else:
             _rv = await mock_coro(result) if sys.version_info.major == 3 and sys.version_info.minor >= 8 else \
@@ -29,6 +29,7 @@ from aiohttp import web
 
 from fledge.services.core import routes
 from fledge.services.core import connect
+from fledge.services.core import health_snapshot
 from fledge.services.core.api.common import _logger
 from fledge.common.web import middleware
 from fledge.common.storage_client.storage_client import StorageClientAsync
@@ -572,6 +573,39 @@ async def test_ping_https_auth_required_allow_ping_false(aiohttp_server, ssl_ctx
         logger_info.assert_called_once_with('Received %s request for %s', 'GET', '/fledge/ping')
 
 
+@pytest.allure.feature("unit")
+@pytest.allure.story("api", "common")
+async def test_ping_from_health_snapshot(aiohttp_server, aiohttp_client, loop):
+    snapshot = health_snapshot.HealthSnapshot()
+    snapshot.ip_addresses = ["192.0.2.1"]
+    snapshot.counters = {"dataRead": 2, "dataSent": 100, "dataPurged": 1}
+    snapshot.health = 'amber'
+    mock_storage_client_async = MagicMock(spec=StorageClientAsync)
+    with patch.object(health_snapshot, '_snapshot', snapshot):
+        with patch.object(connect, 'get_storage_async', return_value=mock_storage_client_async):
+            app = web.Application(loop=loop, middlewares=[middleware.optional_auth_middleware])
+            # fill route table
+            routes.setup(app)
+            server = await aiohttp_server(app)
+            await server.start_server(loop=loop)
+            client = await aiohttp_client(server)
+            resp = await client.get('/fledge/ping')
+            assert 200 == resp.status
+            content_dict = json.loads(await resp.text())
+            assert 0 <= content_dict["uptime"]
+            assert 2 == content_dict["dataRead"]
+            assert 100 == content_dict["dataSent"]
+            assert 1 == content_dict["dataPurged"]
+            assert content_dict["authenticationOptional"] is True
+            assert content_dict['serviceName'] == "Fledge"
+            assert content_dict['hostName'] == socket.gethostname()
+            assert content_dict['ipAddresses'] == ["192.0.2.1"]
+            assert content_dict['health'] == "amber"
+            assert content_dict['safeMode'] is False
+    # answered from memory, without reading the statistics
+    assert 0 == mock_storage_client_async.query_tbl_with_payload.call_count
+
+
 @pytest.allure.feature("unit")
 @pytest.allure.story("api", "common")
 async def test_shutdown_http(aiohttp_server, aiohttp_client, loop):
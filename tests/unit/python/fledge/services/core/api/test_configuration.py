@@ -1098,3 +1098,16 @@ class TestConfiguration:
             assert 1 == patch_delete_cat.call_count
             args, kwargs = patch_delete_cat.call_args
             assert category_name == args[0]
+
+    async def test_get_cache_metrics(self, client, reset_singleton):
+        storage_client_mock = MagicMock(StorageClientAsync)
+        c_mgr = ConfigurationManager(storage_client_mock)
+        c_mgr._cacheManager.update('cat1', 'desc1', {})
+        assert 'cat1' in c_mgr._cacheManager
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            resp = await client.get('/fledge/configuration/cache')
+            assert 200 == resp.status
+            r = await resp.text()
+            json_response = json.loads(r)
+            assert {"size": 1, "bytes": 2, "hit": 1, "miss": 0, "evictions": 0, "hitRatio": 1.0} == {
+                k: json_response[k] for k in ("size", "bytes", "hit", "miss", "evictions", "hitRatio")}
@@ -857,6 +857,18 @@ class TestSchedules:
                                  {'name': 'INTERVAL', 'index': 3},
                                  {'name': 'MANUAL', 'index': 4}]} == json_response
 
+    async def test_get_schedule_metrics(self, client):
+        _lag = {"tasks": 2, "lag_ms_avg": 1.5, "lag_ms_max": 2.0, "lag_ms_last": 1.0, "schedules_waiting": 3}
+        _start = {"purge": {"tasks": 2, "forked": 0, "start_ms_avg": 100.0, "start_ms_max": 120.0}}
+        with patch.object(server.Server.scheduler, 'scheduling_lag_metrics', return_value=_lag):
+            with patch.object(server.Server.scheduler, 'task_start_metrics', return_value=_start):
+                resp = await client.get('/fledge/schedule/metrics')
+                assert 200 == resp.status
+                result = await resp.text()
+                json_response = json.loads(result)
+                assert {'scheduling': _lag, 'taskStart': _start, 'taskTable': None,
+                        'purgeTasks': {'deleted': 0, 'chunks': 0, 'done': None}} == json_response
+
 
 class TestTasks:
     _random_uuid = uuid.uuid4()
@@ -1042,6 +1054,22 @@ class TestTasks:
                 assert 404 == resp.status
                 assert "No Tasks found" == resp.reason
 
+    async def test_get_tasks_latest_from_scheduler(self, client):
+        _latest = [{'pid': '1', 'reason': None, 'exit_code': None, 'id': '1', 'process_name': 'north',
+                    'schedule_name': 'OMF', 'end_time': None, 'start_time': '2026-10-18 10:00:00.000',
+                    'state': 1}]
+        storage_client_mock = MagicMock(StorageClientAsync)
+        with patch.object(server.Server.scheduler, 'get_latest_tasks', return_value=_latest) as patch_latest:
+            with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+                resp = await client.get('/fledge/task/latest?name=OMF')
+                assert 200 == resp.status
+                json_response = json.loads(await resp.text())
+                assert {'tasks': [{'reason': None, 'name': 'OMF', 'processName': 'north', 'state': 'Running',
+                                   'exitCode': None, 'endTime': 'None', 'pid': '1',
+                                   'startTime': '2026-10-18 10:00:00.000', 'id': '1'}]} == json_response
+            storage_client_mock.query_tbl_with_payload.assert_not_called()
+        patch_latest.assert_called_once_with('OMF')
+
     async def test_cancel_task(self, client):
         async def mock_coro():
             return "some valid values"
@@ -16,8 +16,10 @@ from fledge.services.core import routes
 from fledge.services.core import connect
 from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
+from fledge.services.core.service_registry.monitor import Monitor
 from fledge.common.service_record import ServiceRecord
 from fledge.services.core.interest_registry.interest_registry import InterestRegistry
+from fledge.services.core.interest_registry import change_callback
 from fledge.services.core import server
 from fledge.services.core.scheduler.scheduler import Scheduler
 from fledge.services.core.scheduler.entities import StartUpSchedule
@@ -52,6 +54,21 @@ class TestService:
     async def async_mock(self, return_value):
         return return_value
 
+    async def test_get_monitor_metrics(self, client):
+        metrics = {"rounds": 2, "services": 1, "unresponsive": 0, "sleepInterval": 5, "round_last_ms": 1.5,
+                   "round_avg_ms": 2.0, "round_max_ms": 2.5}
+        deliveries = {"notify1": {"deliveries": 3, "failures": 1, "latency_avg_ms": 4.5, "latency_max_ms": 9.0}}
+        monitor = MagicMock(spec=Monitor)
+        monitor.metrics.return_value = metrics
+        with patch.object(server.Server, 'service_monitor', monitor):
+            with patch.object(change_callback._dispatcher, 'metrics', return_value=deliveries):
+                resp = await client.get('/fledge/service/monitor')
+            assert 200 == resp.status
+            assert dict(metrics, changeNotifications=deliveries) == json.loads(await resp.text())
+        with patch.object(server.Server, 'service_monitor', None):
+            resp = await client.get('/fledge/service/monitor')
+            assert 404 == resp.status
+
     async def test_get_health(self, mocker, client):
         # empty service registry
         resp = await client.get('/fledge/service')
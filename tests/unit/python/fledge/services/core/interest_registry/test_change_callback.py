@@ -265,3 +265,73 @@ class TestChangeCallback:
                 [call('http://saddress1:1/fledge/change', data='{"category": "catname1", "items": null}',
                       headers={'content-type': 'application/json'})])
         cm_get_patch.assert_called_once_with('catname1')
+
+    @pytest.mark.asyncio
+    async def test_notify_coalesces_changes(self):
+        dispatcher = cb._Dispatcher()
+        deliveries = []
+
+        async def deliver():
+            deliveries.append(len(deliveries))
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[dispatcher.notify(('change', 'catname1'), deliver) for _ in range(5)])
+        # The first change is delivered at once, the four others together after it
+        assert 2 == len(deliveries)
+        await dispatcher.notify(('change', 'catname1'), deliver)
+        assert 3 == len(deliveries)
+
+    @pytest.mark.asyncio
+    async def test_notify_failure_given_to_coalesced_changes(self):
+        dispatcher = cb._Dispatcher()
+
+        async def deliver():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("storage")
+
+        results = await asyncio.wait_for(asyncio.gather(
+            *[dispatcher.notify(('change', 'catname1'), deliver) for _ in range(3)], return_exceptions=True), 0.5)
+        assert 3 == len([result for result in results if isinstance(result, RuntimeError)])
+        assert {} == dispatcher._next
+        assert set() == dispatcher._running
+
+    @pytest.mark.asyncio
+    async def test_session_of_other_loop_closed(self):
+        dispatcher = cb._Dispatcher()
+        session = dispatcher._get_session()
+        assert session is dispatcher._get_session()
+        dispatcher._loop = MagicMock(spec=asyncio.AbstractEventLoop)
+        dispatcher._loop.is_running.return_value = False
+        assert session is not dispatcher._get_session()
+        assert session.closed
+        await dispatcher.close()
+
+    @pytest.mark.asyncio
+    async def test_send_concurrently_with_timeout(self):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        cfg_mgr = ConfigurationManager(storage_client_mock)
+        with patch.object(ServiceRegistry._logger, 'info'):
+            s_id_1 = ServiceRegistry.register('sname1', 'Southbound', 'saddress1', 1, 1, 'http')
+            s_id_2 = ServiceRegistry.register('sname2', 'Southbound', 'saddress2', 2, 2, 'http')
+        i_reg = InterestRegistry(cfg_mgr)
+        i_reg.register(s_id_1, 'catname1')
+        i_reg.register(s_id_2, 'catname1')
+
+        async def request(method, url, data):
+            if 'saddress1' in url:
+                await asyncio.sleep(1)
+            return True
+
+        dispatcher = cb._Dispatcher()
+        with patch.object(cb, '_NOTIFY_TIMEOUT', 0.05):
+            with patch.object(dispatcher, '_request', side_effect=request) as request_patch:
+                with patch.object(cb._LOGGER, 'error') as log_error:
+                    await asyncio.wait_for(dispatcher.send(i_reg.get(category_name='catname1'), 'post',
+                                                           '/fledge/change', {"category": "catname1"}), 0.5)
+                log_error.assert_called_once_with("Unable to notify microservice with uuid %s within %s seconds",
+                                                  s_id_1, 0.05)
+            assert 2 == request_patch.call_count
+        metrics = dispatcher.metrics()
+        assert {"deliveries": 1, "failures": 1} == {k: metrics['sname1'][k] for k in ("deliveries", "failures")}
+        assert {"deliveries": 1, "failures": 0} == {k: metrics['sname2'][k] for k in ("deliveries", "failures")}
+        assert metrics['sname2']['latency_max_ms'] < metrics['sname1']['latency_max_ms']
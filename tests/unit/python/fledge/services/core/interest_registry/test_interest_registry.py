@@ -4,7 +4,7 @@ import pytest
 from unittest.mock import MagicMock
 from unittest.mock import patch
 from fledge.common.configuration_manager import ConfigurationManager
-from fledge.services.core.interest_registry.interest_registry import InterestRegistry
+from fledge.services.core.interest_registry.interest_registry import InterestRegistry, NOTIFY_CHANGE_CALLBACK
 from fledge.services.core.interest_registry.interest_registry import InterestRegistrySingleton
 from fledge.services.core.interest_registry.interest_record import InterestRecord
 from fledge.services.core.interest_registry import exceptions as interest_registry_exceptions
@@ -193,3 +193,18 @@ class TestInterestRegistry:
         assert ret_val[0]._registration_id is id_2_2
         assert ret_val[0]._microservice_uuid is 'muuid2'
         assert ret_val[0]._category_name is 'catname2'
+
+    def test_indexes_after_unregister(self, reset_singleton):
+        configuration_manager_mock = MagicMock(spec=ConfigurationManager)
+        i_reg = InterestRegistry(configuration_manager_mock)
+        id_1_1 = i_reg.register('muuid1', 'catname1')
+        id_2_1 = i_reg.register('muuid2', 'catname1')
+        i_reg.unregister(id_1_1)
+        assert [id_2_1] == [i._registration_id for i in i_reg.get(category_name='catname1')]
+        with pytest.raises(interest_registry_exceptions.DoesNotExist):
+            i_reg.get(microservice_uuid='muuid1')
+        assert 'muuid1' not in i_reg._indexes['_microservice_uuid']
+        # the category is no longer of interest once its last record is unregistered
+        i_reg.unregister(id_2_1)
+        assert {} == i_reg._indexes['_category_name']
+        configuration_manager_mock.unregister_interest.assert_called_once_with('catname1', NOTIFY_CHANGE_CALLBACK)
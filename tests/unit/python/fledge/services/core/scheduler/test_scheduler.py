@@ -18,6 +18,8 @@ import pytest
 from fledge.services.core.scheduler.scheduler import Scheduler, AuditLogger, ConfigurationManager
 from fledge.services.core.scheduler.entities import *
 from fledge.services.core.scheduler.exceptions import *
+from fledge.services.core.scheduler.task_table import TaskTable
+from fledge.services.core.scheduler.task_zygote import TaskZygote, TaskZygoteError
 from fledge.common.storage_client.storage_client import StorageClientAsync
 
 __author__ = "Amarendra K Sinha"
@@ -218,6 +220,39 @@ class TestScheduler:
         assert 'OMF to PI north' in args
         assert 'North Readings to PI' in args
 
+    @pytest.mark.asyncio
+    async def test__start_task_forked(self, mocker):
+        # GIVEN
+        scheduler, schedule, log_info, log_exception, log_error, log_debug = await self.scheduler_fixture(mocker)
+        log_warning = mocker.patch.object(scheduler._logger, "warning")
+        mocker.patch.object(scheduler, '_process_scripts', {"North Readings to PI": ["tasks/north"]})
+        scheduler._schedule_executions[schedule.id] = scheduler._ScheduleExecution()
+        scheduler._task_zygote = MagicMock(spec=TaskZygote)
+        scheduler._task_zygote.start_task.return_value = await mock_process()
+
+        # WHEN
+        await scheduler._start_task(schedule)
+
+        # THEN
+        scheduler._task_zygote.start_task.assert_called_once_with(
+            "fledge.tasks.north.sending_process", ["--port=None", "--address=127.0.0.1", "--name=OMF to PI north"])
+        assert 0 == asyncio.create_subprocess_exec.call_count
+        assert 1 == len(scheduler._schedule_executions[schedule.id].task_processes)
+
+        # WHEN the zygote fails, the script is run
+        scheduler._task_zygote.start_task.side_effect = TaskZygoteError("The task zygote is not running")
+        await scheduler._start_task(schedule)
+
+        # THEN
+        asyncio.create_subprocess_exec.assert_called_once_with(
+            "tasks/north", "--port=None", "--address=127.0.0.1", "--name=OMF to PI north", cwd=mocker.ANY)
+        assert 1 == log_warning.call_count
+        assert 2 == len(scheduler._schedule_executions[schedule.id].task_processes)
+        metrics = scheduler.task_start_metrics()["North Readings to PI"]
+        assert 2 == metrics["tasks"]
+        assert 1 == metrics["forked"]
+        assert metrics["start_ms_max"] >= metrics["start_ms_avg"] >= 0
+
     @pytest.mark.asyncio
     async def test_purge_tasks(self, mocker):
         # TODO: Mandatory - Add negative tests for full code coverage
@@ -235,6 +270,77 @@ class TestScheduler:
         assert scheduler._purge_tasks_task is None
         assert scheduler._last_task_purge_time is not None
 
+    @pytest.mark.asyncio
+    async def test_purge_tasks_chunks(self, mocker):
+        # GIVEN
+        scheduler = Scheduler()
+        scheduler._storage_async = MockStorageAsync(core_management_host=None, core_management_port=None)
+        mocker.patch.multiple(scheduler, _ready=True, _paused=False)
+        mocker.patch.object(scheduler, '_max_completed_task_age', datetime.timedelta(days=30))
+        old = str(datetime.datetime.now() - datetime.timedelta(days=31))
+        purged = 2 * scheduler._DELETE_TASKS_LIMIT + 10
+        tasks = [{"id": str(uuid.uuid4()), "state": int(Task.State.COMPLETE), "start_time": old}
+                 for _ in range(purged)]
+        kept = [{"id": str(uuid.uuid4()), "state": int(Task.State.RUNNING), "start_time": old},
+                {"id": str(uuid.uuid4()), "state": int(Task.State.COMPLETE), "start_time": str(datetime.datetime.now())}]
+        tasks.extend(kept)
+        conditions = {"!=": lambda a, b: a != b, "<": lambda a, b: a < b, "in": lambda a, b: a in b}
+
+        def matches(row, where):
+            while where is not None:
+                if not conditions[where["condition"]](row[where["column"]], where["value"]):
+                    return False
+                where = where.get("and")
+            return True
+
+        async def query_tbl_with_payload(table_name, query_payload):
+            payload = json.loads(query_payload)
+            rows = [{"id": row["id"]} for row in tasks if matches(row, payload["where"])][:payload["limit"]]
+            return {"count": len(rows), "rows": rows}
+
+        async def delete_from_tbl(table_name, condition=None):
+            # The storage delete ignores a limit, all the rows matching the where clause are deleted
+            payload = json.loads(condition)
+            deleted = [row for row in tasks if matches(row, payload["where"])]
+            for row in deleted:
+                tasks.remove(row)
+            return {"response": "deleted", "rows_affected": len(deleted)}
+
+        mocker.patch.object(scheduler._storage_async, 'query_tbl_with_payload', side_effect=query_tbl_with_payload)
+        delete = mocker.patch.object(scheduler._storage_async, 'delete_from_tbl', side_effect=delete_from_tbl)
+        log_info = mocker.patch.object(scheduler._logger, "info")
+
+        # WHEN
+        await scheduler.purge_tasks()
+
+        # THEN
+        assert kept == tasks
+        assert 3 == delete.call_count
+        assert [scheduler._DELETE_TASKS_LIMIT, scheduler._DELETE_TASKS_LIMIT, 10] == [
+            len(json.loads(args[1])["where"]["value"]) for args, kwargs in delete.call_args_list]
+        assert {"deleted": purged, "chunks": 3, "done": True} == scheduler.purge_tasks_progress()
+        log_info.assert_called_once_with("Purged %s rows of the tasks table in %s chunks", purged, 3)
+
+    @pytest.mark.asyncio
+    async def test__start_task_task_table(self, mocker):
+        # GIVEN
+        scheduler, schedule, log_info, log_exception, log_error, log_debug = await self.scheduler_fixture(mocker)
+        scheduler._task_table = TaskTable(scheduler._storage_async)
+        insert = mocker.patch.object(scheduler._storage_async, 'insert_into_tbl')
+        await scheduler.queue_task(schedule.id)
+
+        # WHEN
+        await scheduler._start_task(schedule)
+
+        # THEN
+        # The row is written with the next flush
+        insert.assert_not_called()
+        latest = await scheduler.get_latest_tasks(schedule.name)
+        assert [int(Task.State.RUNNING)] == [task["state"] for task in latest]
+        await scheduler.get_tasks()
+        args, _ = insert.call_args
+        assert schedule.name == json.loads(args[1])["inserts"][0]["schedule_name"]
+
     @pytest.mark.asyncio
     async def test__check_purge_tasks(self, mocker):
         # TODO: Mandatory - Add negative tests for full code coverage
@@ -281,6 +387,88 @@ class TestScheduler:
         assert 'COAP listener south' in args1
         assert 'OMF to PI north' in args2
 
+    @pytest.mark.asyncio
+    async def test__check_schedules_visits_due_schedules(self, mocker):
+        # GIVEN
+        scheduler = Scheduler()
+        scheduler._storage = MockStorage(core_management_host=None, core_management_port=None)
+        scheduler._storage_async = MockStorageAsync(core_management_host=None, core_management_port=None)
+        mocker.patch.object(scheduler._logger, "info")
+
+        current_time = time.time()
+        mocker.patch.multiple(scheduler, _max_running_tasks=10,
+                              _start_time=current_time)
+        await scheduler._get_schedules()
+        start_task = mocker.patch.object(scheduler, '_start_task', return_value=asyncio.ensure_future(mock_task()))
+        scheduler.current_time = current_time
+        # The startup schedules start on time
+        earliest_start_time = await scheduler._check_schedules()
+        started = start_task.call_count
+        assert {"tasks": started, "lag_ms_avg": 0, "lag_ms_max": 0, "lag_ms_last": 0,
+                "schedules_waiting": len(scheduler._timer_queue)} == scheduler.scheduling_lag_metrics()
+        start_task.reset_mock()
+
+        # WHEN
+        # Nothing is due before the earliest start time
+        assert earliest_start_time == await scheduler._check_schedules()
+        assert 0 == start_task.call_count
+        scheduler.current_time = earliest_start_time + 2
+        await scheduler._check_schedules()
+
+        # THEN
+        assert 1 <= start_task.call_count
+        metrics = scheduler.scheduling_lag_metrics()
+        assert started + start_task.call_count == metrics["tasks"]
+        assert 2000 == metrics["lag_ms_last"]
+        assert 2000 == metrics["lag_ms_max"]
+
+    @pytest.mark.asyncio
+    async def test__check_schedules_changed_schedule(self, mocker):
+        # GIVEN
+        scheduler = Scheduler()
+        scheduler._storage = MockStorage(core_management_host=None, core_management_port=None)
+        scheduler._storage_async = MockStorageAsync(core_management_host=None, core_management_port=None)
+        mocker.patch.object(scheduler._logger, "info")
+        mocker.patch.object(scheduler._logger, "debug")
+
+        current_time = time.time()
+        mocker.patch.multiple(scheduler, _max_running_tasks=10, _start_time=current_time, _ready=True)
+        await scheduler._get_schedules()
+        start_task = mocker.patch.object(scheduler, '_start_task', return_value=asyncio.ensure_future(mock_task()))
+        scheduler.current_time = current_time
+        await scheduler._check_schedules()
+        start_task.reset_mock()
+        started = scheduler.scheduling_lag_metrics()["tasks"]
+        sch_id = uuid.UUID("2b614d26-760f-11e7-b5a5-be2e44b06b34")  # OMF to PI north
+
+        # WHEN
+        await scheduler.queue_task(sch_id)
+        await scheduler._check_schedules()
+
+        # THEN
+        start_task.assert_called_once_with(scheduler._schedules[sch_id])
+        assert scheduler._schedule_executions[sch_id].start_now is False
+        # A manual start is not late
+        assert started == scheduler.scheduling_lag_metrics()["tasks"]
+
+    def test__timer_queue(self):
+        queue = Scheduler._TimerQueue()
+        first, second = uuid.uuid4(), uuid.uuid4()
+        queue.push(first, 10)
+        queue.push(second, 20)
+        # The start time of the first schedule is superseded
+        queue.push(first, 30)
+        assert 20 == queue.earliest()
+        assert set() == queue.pop_due(15)
+        assert {second} == queue.pop_due(25)
+        assert 30 == queue.earliest()
+        queue.push(first, None)
+        assert queue.earliest() is None
+        assert 0 == len(queue)
+        queue.mark(second)
+        assert {second} == queue.pop_due(0)
+        assert set() == queue.pop_due(0)
+
     @pytest.mark.asyncio
     @pytest.mark.skip("_scheduler_loop() not suitable for unit testing. Will be tested during System tests.")
     async def test__scheduler_loop(self, mocker):
@@ -512,6 +700,12 @@ class TestScheduler:
                         "default": str(Scheduler._DEFAULT_MAX_COMPLETED_TASK_AGE_DAYS),
                         "value": str(Scheduler._DEFAULT_MAX_COMPLETED_TASK_AGE_DAYS)
                     },
+                    "task_zygote": {
+                        "description": "Start the Python tasks by forking a process that has already loaded them",
+                        "type": "boolean",
+                        "default": "false",
+                        "value": "false"
+                    },
             }
         
         # Changed in version 3.8: patch() now returns an AsyncMock if the target is an async function.
@@ -537,6 +731,7 @@ class TestScheduler:
         assert 1 == get_cat.call_count
         assert scheduler._max_running_tasks is not None
         assert scheduler._max_completed_task_age is not None
+        assert scheduler._use_task_zygote is False
 
     @pytest.mark.asyncio
     async def test_start(self, mocker):
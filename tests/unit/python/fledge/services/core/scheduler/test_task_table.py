@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/services/core/scheduler/task_table.py """
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from fledge.common.storage_client.storage_client import StorageClientAsync
+from fledge.services.core.scheduler.task_table import TaskTable, format_timestamp
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+START_TIME = "2026-10-18 10:00:00.123456+00:00"
+END_TIME = "2026-10-18 10:00:05.5+00:00"
+
+
+def task_row(task_id, schedule_name="OMF to PI north"):
+    return {"id": task_id, "pid": 1234, "schedule_name": schedule_name, "schedule_id": "2b614d26",
+            "process_name": "north", "state": 1, "start_time": START_TIME}
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("scheduler", "task-table")
+class TestTaskTable:
+
+    def test_format_timestamp(self):
+        assert "2026-10-18 10:00:00.123" == format_timestamp(START_TIME)
+        assert "2026-10-18 10:00:05.500" == format_timestamp(END_TIME)
+
+    async def test_update_merged_into_insert(self):
+        storage = MagicMock(spec=StorageClientAsync)
+        table = TaskTable(storage)
+        table.insert(task_row("1"))
+        table.update("1", "OMF to PI north", exit_code=0, state=2, end_time=END_TIME)
+        assert 1 == table.pending
+
+        assert await table.flush()
+
+        args, _ = storage.insert_into_tbl.call_args
+        assert "tasks" == args[0]
+        assert {"inserts": [dict(task_row("1"), exit_code=0, state=2, end_time=END_TIME)]} == json.loads(args[1])
+        storage.update_tbl.assert_not_called()
+        assert {"inserted": 1, "updated": 0, "flushes": 1, "failures": 0, "discarded": 0, "pending": 0,
+                "schedules": 1} == table.metrics()
+        assert [{"id": "1", "schedule_name": "OMF to PI north", "process_name": "north", "state": 2,
+                 "start_time": "2026-10-18 10:00:00.123", "end_time": "2026-10-18 10:00:05.500", "reason": None,
+                 "pid": 1234, "exit_code": 0}] == table.latest()
+
+    async def test_updates_batched(self):
+        storage = MagicMock(spec=StorageClientAsync)
+        table = TaskTable(storage)
+        table.insert(task_row("1"))
+        table.insert(task_row("2", "purge"))
+        assert await table.flush()
+        table.update("1", "OMF to PI north", exit_code=0, state=2, end_time=END_TIME)
+        table.update("2", "purge", exit_code=1, state=2, end_time=END_TIME)
+
+        assert await table.flush()
+
+        assert 1 == storage.insert_into_tbl.call_count
+        args, _ = storage.update_tbl.call_args
+        updates = json.loads(args[1])["updates"]
+        assert [{"column": "id", "condition": "=", "value": "1"},
+                {"column": "id", "condition": "=", "value": "2"}] == [update["where"] for update in updates]
+        assert {"exit_code": 1, "state": 2, "end_time": END_TIME} == updates[1]["values"]
+        assert ["OMF to PI north", "purge"] == [task["schedule_name"] for task in table.latest()]
+        assert [1] == [task["exit_code"] for task in table.latest("purge")]
+
+    async def test_failed_insert_kept(self):
+        storage = MagicMock(spec=StorageClientAsync)
+        storage.insert_into_tbl.side_effect = [Exception("storage"), None]
+        table = TaskTable(storage)
+        table.insert(task_row("1"))
+
+        assert not await table.flush()
+        table.update("1", "OMF to PI north", exit_code=0, state=2, end_time=END_TIME)
+        assert await table.flush()
+
+        args, _ = storage.insert_into_tbl.call_args
+        assert [dict(task_row("1"), exit_code=0, state=2, end_time=END_TIME)] == json.loads(args[1])["inserts"]
+        assert 1 == table.metrics()["failures"]
+
+    async def test_updates_written_when_insert_fails(self):
+        storage = MagicMock(spec=StorageClientAsync)
+        storage.insert_into_tbl.side_effect = [None, Exception("storage")]
+        table = TaskTable(storage)
+        table.insert(task_row("1"))
+        assert await table.flush()
+        table.insert(task_row("2", "purge"))
+        table.update("1", "OMF to PI north", exit_code=0, state=2, end_time=END_TIME)
+
+        assert not await table.flush()
+
+        args, _ = storage.update_tbl.call_args
+        assert [{"column": "id", "condition": "=", "value": "1"}] == [
+            update["where"] for update in json.loads(args[1])["updates"]]
+        assert {"updated": 1, "failures": 1, "pending": 1} == {k: v for k, v in table.metrics().items()
+                                                               if k in ("updated", "failures", "pending")}
+
+    async def test_failed_insert_split(self):
+        storage = MagicMock(spec=StorageClientAsync)
+
+        def insert(table, payload):
+            if "poison" in [row["schedule_name"] for row in json.loads(payload)["inserts"]]:
+                raise Exception("storage")
+
+        storage.insert_into_tbl.side_effect = insert
+        table = TaskTable(storage)
+        table.insert(task_row("1"))
+        table.insert(task_row("2", "poison"))
+        table.insert(task_row("3", "purge"))
+
+        assert not await table.flush()
+        # the batch, then each row
+        assert 4 == storage.insert_into_tbl.call_count
+        assert {"inserted": 2, "failures": 1, "pending": 1} == {k: v for k, v in table.metrics().items()
+                                                                if k in ("inserted", "failures", "pending")}
+        table.update("2", "poison", exit_code=0, state=2, end_time=END_TIME)
+        for _ in range(4):
+            await table.flush()
+        assert {"inserted": 2, "failures": 5, "discarded": 1, "pending": 0} == {
+            k: v for k, v in table.metrics().items() if k in ("inserted", "failures", "discarded", "pending")}
+        assert await table.flush()
+
+    async def test_forget(self):
+        table = TaskTable(MagicMock(spec=StorageClientAsync))
+        table.insert(task_row("1"))
+        table.insert(task_row("2", "purge"))
+        table.forget("OMF to PI north")
+        table.forget("unknown")
+        assert ["purge"] == [task["schedule_name"] for task in table.latest()]
+        assert [] == table.latest("OMF to PI north")
+
+    async def test_load_latest(self):
+        storage = MagicMock(spec=StorageClientAsync)
+        row = {"id": "1", "schedule_name": "purge", "process_name": "purge", "state": 2,
+               "start_time": "2026-10-17 10:00:00.000", "end_time": "2026-10-17 10:00:01.000", "reason": "",
+               "pid": 12, "exit_code": 0}
+        storage.query_tbl_with_payload.side_effect = [{"count": 1, "rows": [row]}, {"count": 0, "rows": []}]
+        table = TaskTable(storage)
+
+        await table.load_latest(["purge", "stats collection"])
+        await table.load_latest(["purge", "stats collection"])
+
+        assert 2 == storage.query_tbl_with_payload.call_count
+        args, _ = storage.query_tbl_with_payload.call_args_list[0]
+        payload = json.loads(args[1])
+        assert {"column": "schedule_name", "condition": "=", "value": "purge"} == payload["where"]
+        assert 1 == payload["limit"]
+        assert [row] == table.latest()
+        assert [] == table.latest("stats collection")
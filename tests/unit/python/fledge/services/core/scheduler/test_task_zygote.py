@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/services/core/scheduler/task_zygote.py """
+
+import asyncio
+import os
+import signal
+
+import pytest
+
+import fledge
+from fledge.services.core.scheduler.task_zygote import TaskZygote, TaskZygoteError
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(fledge.__file__))
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("scheduler", "task-zygote")
+class TestTaskZygote:
+
+    @pytest.fixture
+    async def zygote(self):
+        zygote = TaskZygote()
+        await zygote.start(PYTHON_DIR)
+        yield zygote
+        await zygote.stop()
+
+    async def test_exit_codes(self, zygote):
+        assert zygote.is_running
+        dryrun = await zygote.start_task("fledge.tasks.automation_script",
+                                         ["--port=8081", "--address=127.0.0.1", "--name=script", "--dryrun"])
+        # the arguments are required
+        missing = await zygote.start_task("fledge.tasks.automation_script", [])
+        assert dryrun.pid != missing.pid
+        assert 0 == await asyncio.wait_for(dryrun.wait(), 10)
+        assert 2 == await asyncio.wait_for(missing.wait(), 10)
+        with pytest.raises(ProcessLookupError):
+            dryrun.terminate()
+
+    async def test_terminate(self, zygote):
+        process = await zygote.start_task("timeit", ["-n", "1", "import time; time.sleep(30)"])
+        process.terminate()
+        assert -signal.SIGTERM == await asyncio.wait_for(process.wait(), 10)
+
+    async def test_stop(self, zygote):
+        process = await zygote.start_task("timeit", ["-n", "1", "import time; time.sleep(30)"])
+        await zygote.stop()
+        assert not zygote.is_running
+        with pytest.raises(TaskZygoteError):
+            await zygote.start_task("timeit", [])
+        # the task is still running once the zygote has exited, its exit code is then lost
+        os.kill(process.pid, signal.SIGTERM)
+        assert 1 == await asyncio.wait_for(process.wait(), 10)
@@ -12,6 +12,7 @@ from fledge.services.core.service_registry.service_registry import ServiceRegist
 from fledge.common.storage_client.storage_client import StorageClientAsync
 from fledge.common.service_record import ServiceRecord
 from fledge.services.core import connect
+from fledge.common.acl_manager import ACLManager
 
 
 __author__ = "Ashwin Gopalakrishnan"
@@ -143,3 +144,35 @@ class TestMonitor:
                 assert excinfo.type in [TestMonitorException, TypeError]
 
         assert ServiceRegistry.get(idx=s_id_1)[0]._status is ServiceRecord.Status.Failed
+
+    async def test__monitor_round_pings_concurrently(self):
+        class TestMonitorException(Exception):
+            pass
+
+        with patch.object(ServiceRegistry._logger, 'info'):
+            for i in range(3):
+                ServiceRegistry.register('sname{}'.format(i), 'Southbound', 'saddress', None, i + 1, 'protocol1')
+        monitor = Monitor()
+        monitor._sleep_interval = Monitor._DEFAULT_SLEEP_INTERVAL
+        monitor._max_attempts = Monitor._DEFAULT_MAX_ATTEMPTS
+        pinging = []
+
+        async def ping(service_record, check_count, delay=0):
+            pinging.append(service_record._name)
+            await asyncio.sleep(0.01)
+            # all the pings of the round are under way at once
+            assert 3 == len(pinging)
+            return service_record._name != 'sname1'
+
+        acl_handler = MagicMock(spec=ACLManager)
+        monitor._acl_handler = acl_handler
+        with patch.object(Monitor, '_sleep', side_effect=TestMonitorException()):
+            with patch.object(monitor, '_ping', side_effect=ping):
+                with pytest.raises(TestMonitorException):
+                    await monitor._monitor_loop()
+        acl_handler.resolve_pending_notifications_for_acl_change.assert_called_once_with(['sname0', 'sname2'])
+        metrics = monitor.metrics()
+        assert 1 == metrics["rounds"]
+        assert 3 == metrics["services"]
+        assert 1 == metrics["unresponsive"]
+        assert metrics["round_last_ms"] >= 10
@@ -7,6 +7,7 @@
 from unittest.mock import patch
 import pytest
 
+from fledge.common.service_record import ServiceRecord
 from fledge.services.core.service_registry.service_registry import ServiceRegistry
 from fledge.services.core.service_registry.exceptions import *
 from fledge.services.core.interest_registry.interest_registry import InterestRegistry
@@ -153,3 +154,30 @@ class TestServiceRegistry:
                 assert 0 == len(ServiceRegistry._registry)
             assert 0 == log_info.call_count
         assert excinfo.type is DoesNotExist
+
+    def test_indexes_follow_registry(self):
+        with patch.object(ServiceRegistry._logger, 'info'):
+            a_id = ServiceRegistry.register("A name", "Storage", "127.0.0.1", 1234, 4321, 'http')
+            b_id = ServiceRegistry.register("B name", "Southbound", "127.0.0.1", None, 4322, 'http')
+        assert [a_id] == [s._id for s in ServiceRegistry.get(idx=a_id)]
+        assert [b_id] == [s._id for s in ServiceRegistry.get(name="B name")]
+        assert [b_id] == [s._id for s in ServiceRegistry.get(s_type="Southbound")]
+        assert [b_id] == [s._id for s in ServiceRegistry.filter_by_name_and_type("B name", "Southbound")]
+        assert ServiceRegistry.check_address_and_port("127.0.0.1", 1234) is True
+        assert ServiceRegistry.check_address_and_mgt_port("127.0.0.1", 4322) is True
+
+        ServiceRegistry.remove_from_registry(a_id)
+        with pytest.raises(DoesNotExist):
+            ServiceRegistry.get(name="A name")
+        assert ServiceRegistry.check_address_and_port("127.0.0.1", 1234) is False
+        with pytest.raises(DoesNotExist):
+            ServiceRegistry.filter_by_name_and_type("B name", "Storage")
+
+        # A failed service does not hold its ports
+        ServiceRegistry.get(idx=b_id)[0]._status = ServiceRecord.Status.Failed
+        assert ServiceRegistry.check_address_and_mgt_port("127.0.0.1", 4322) is False
+
+        # The indexes are built again when the registry is replaced
+        ServiceRegistry._registry = list()
+        with pytest.raises(DoesNotExist):
+            ServiceRegistry.get(idx=b_id)
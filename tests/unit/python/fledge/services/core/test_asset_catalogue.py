@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/services/core/asset_catalogue.py """
+
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from fledge.common.storage_client.storage_client import ReadingsStorageClientAsync
+from fledge.services.core.asset_catalogue import AssetCatalogue, datapoint_type
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("core", "asset-catalogue")
+class TestAssetCatalogue:
+
+    @pytest.fixture
+    def catalogue(self):
+        return AssetCatalogue(MagicMock(spec=ReadingsStorageClientAsync))
+
+    def test_datapoint_type(self):
+        assert "integer" == datapoint_type(1)
+        assert "float" == datapoint_type(1.5)
+        assert "boolean" == datapoint_type("True")
+        assert datapoint_type("London") is None
+        assert datapoint_type(True) is None
+
+    async def test_reconcile(self, catalogue):
+        catalogue.register("idle")
+        catalogue.observe([{"asset_code": "gone", "user_ts": "2026-01-01 00:00:00.000000+00", "reading": {"x": 1}}])
+        rows = [{"asset_code": "sinusoid", "count": 10, "oldest": "2026-01-01 00:00:00.000000",
+                 "newest": "2026-01-01 00:00:09.000000"}]
+        catalogue._readings.query.return_value = {"rows": rows}
+        await catalogue.reconcile()
+        assert "asset_code" == json.loads(catalogue._readings.query.call_args[0][0])["group"]
+        assert [{"count": 10, "assetCode": "sinusoid"}] == catalogue.counts()
+        assert [{"asset_code": "sinusoid", "oldest": "2026-01-01 00:00:00.000000",
+                 "newest": "2026-01-01 00:00:09.000000"}] == catalogue.timespans()
+
+    def test_observe(self, catalogue):
+        catalogue.observe([
+            {"asset_code": "sinusoid", "user_ts": "2026-01-01 00:00:01.000000+00", "reading": {"x": 1}},
+            {"asset_code": "sinusoid", "user_ts": "2026-01-01 00:00:02.000000+00", "reading": {"x": 1.5}},
+            {"asset_code": "AX8", "user_ts": "2026-01-01 00:00:00.000000+00",
+             "reading": {"internal": 1.5, "factory": "London", "on": "True"}}])
+        assert [{"count": 1, "assetCode": "AX8"}, {"count": 2, "assetCode": "sinusoid"}] == catalogue.counts()
+        assert {"asset_code": "sinusoid", "oldest": "2026-01-01 00:00:01.000000",
+                "newest": "2026-01-01 00:00:02.000000"} == catalogue.timespans()[1]
+        catalogue.drop_asset("AX8")
+        assert [{"count": 2, "assetCode": "sinusoid"}] == catalogue.counts()
+        catalogue.clear()
+        assert [] == catalogue.counts()
+
+    async def test_structure(self, catalogue):
+        catalogue.observe([{"asset_code": "AX8", "user_ts": "2026-01-01 00:00:00.000000+00",
+                            "reading": {"internal": 1.5, "factory": "London", "on": "True"}}])
+        catalogue._readings.query.side_effect = [
+            {"rows": [{"asset_code": "sinusoid", "count": 10, "oldest": "2026-01-01 00:00:00.000000",
+                       "newest": "2026-01-01 00:00:09.000000"},
+                      {"asset_code": "AX8", "count": 5, "oldest": "2026-01-01 00:00:00.000000",
+                       "newest": "2026-01-01 00:00:00.000000"}]},
+            {"rows": [{"reading": {"sinusoid": 0.5}}]}]
+        await catalogue.reconcile()
+        expected = {"AX8": {"datapoint": {"internal": "float", "on": "boolean"}, "metadata": {"factory": "London"}},
+                    "sinusoid": {"datapoint": {"sinusoid": "float"}}}
+        assert expected == await catalogue.structure()
+        # The structure of an asset is queried once
+        assert expected == await catalogue.structure()
+        assert 2 == catalogue._readings.query.call_count
+        assert 1 == catalogue.metrics()["structure_queries"]
+
+    async def test_structure_of_newest_reading(self, catalogue):
+        catalogue.observe([
+            {"asset_code": "AX8", "user_ts": "2026-01-01 00:00:02.000000+00", "reading": {"internal": 1, "on": "True"}},
+            {"asset_code": "AX8", "user_ts": "2026-01-01 00:00:01.000000+00", "reading": {"spot1": 1.5}},
+            {"asset_code": "AX8", "user_ts": "2026-01-01 00:00:03.000000+00",
+             "reading": {"internal": 1.5, "factory": "London"}}])
+        assert {"AX8": {"datapoint": {"internal": "float"}, "metadata": {"factory": "London"}}} == \
+            await catalogue.structure()
+        catalogue._readings.query.assert_not_called()
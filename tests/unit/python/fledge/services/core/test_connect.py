@@ -24,9 +24,11 @@ class TestConnect:
     """ Storage connection"""
     def setup_method(self):
         ServiceRegistry._registry = []
+        connect._clients.clear()
 
     def teardown_method(self):
         ServiceRegistry._registry = []
+        connect._clients.clear()
 
     def test_get_storage(self):
         with patch.object(ServiceRegistry._logger, 'info') as log_info:
@@ -59,3 +61,26 @@ class TestConnect:
             connect.get_storage_async()
         assert str(excinfo).endswith('DoesNotExist')
         assert 1 == mock_logger.error.call_count
+
+    async def test_storage_clients_shared(self):
+        with patch.object(ServiceRegistry._logger, 'info'):
+            ServiceRegistry.register("Fledge Storage", "Storage", "127.0.0.1", 37449, 37843)
+        storage_client = connect.get_storage_async()
+        readings_client = connect.get_readings_async()
+        assert storage_client is connect.get_storage_async()
+        assert readings_client is connect.get_readings_async()
+        assert storage_client is not readings_client
+        session = storage_client._get_session()
+
+        await connect.close_storage_clients()
+
+        assert session.closed
+        assert storage_client is not connect.get_storage_async()
+
+    def test_storage_client_for_moved_storage(self):
+        with patch.object(ServiceRegistry._logger, 'info'):
+            ServiceRegistry.register("Fledge Storage", "Storage", "127.0.0.1", 37449, 37843)
+            storage_client = connect.get_storage_async()
+            ServiceRegistry._registry = []
+            ServiceRegistry.register("Fledge Storage", "Storage", "127.0.0.1", 37450, 37843)
+        assert storage_client is not connect.get_storage_async()
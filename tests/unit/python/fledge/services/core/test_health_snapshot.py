@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/services/core/health_snapshot.py """
+
+import json
+import socket
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fledge.common.service_record import ServiceRecord
+from fledge.common.storage_client.storage_client import StorageClientAsync
+from fledge.services.core import connect, health_snapshot
+from fledge.services.core.health_snapshot import HealthSnapshot
+from fledge.services.core.service_registry.service_registry import ServiceRegistry
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+ROWS = [{"key": "PURGED", "value": 1}, {"key": "READINGS", "value": 2}]
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("core", "health-snapshot")
+class TestHealthSnapshot:
+
+    @pytest.fixture
+    def storage_client_mock(self):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        storage_client_mock.query_tbl_with_payload.return_value = {"rows": ROWS}
+        return storage_client_mock
+
+    @pytest.fixture
+    def registry(self):
+        ServiceRegistry._registry = []
+        yield ServiceRegistry
+        ServiceRegistry._registry = []
+
+    async def test_refresh_counters(self, storage_client_mock):
+        snapshot = HealthSnapshot()
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            await snapshot.refresh_counters()
+        table, payload = storage_client_mock.query_tbl_with_payload.call_args[0]
+        assert "statistics" == table
+        assert {"column": "key", "condition": "in", "value": ["READINGS", "Readings Sent", "PURGED"]} == \
+            json.loads(payload)["where"]
+        # Readings Sent is not created yet
+        assert {"dataRead": 2, "dataSent": 0, "dataPurged": 1} == snapshot.counters
+
+    async def test_refresh_addresses(self):
+        snapshot = HealthSnapshot()
+        with patch.object(health_snapshot, 'get_ip_addresses', return_value=["192.0.2.1", "fd00::1"]):
+            await snapshot.refresh_addresses()
+        assert socket.gethostname() == snapshot.host_name
+        assert ["192.0.2.1", "fd00::1"] == snapshot.ip_addresses
+        assert 1 == snapshot.metrics()["addresses_refreshes"]
+
+    def test_refresh_health(self, registry):
+        snapshot = HealthSnapshot()
+        s1 = registry.register("S1", "Southbound", "127.0.0.1", 1, 1)
+        s2 = registry.register("S2", "Southbound", "127.0.0.1", 2, 2)
+        snapshot.refresh_health()
+        assert 'green' == snapshot.health
+        registry.get(idx=s1)[0]._status = ServiceRecord.Status.Unresponsive
+        # the color is only computed on a refresh
+        assert 'green' == snapshot.health
+        snapshot.refresh_health()
+        assert 'amber' == snapshot.health
+        registry.get(idx=s2)[0]._status = ServiceRecord.Status.Failed
+        snapshot.refresh_health()
+        assert 'red' == snapshot.health
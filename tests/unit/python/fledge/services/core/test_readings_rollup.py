@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/services/core/readings_rollup.py """
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fledge.common.storage_client.storage_client import ReadingsStorageClientAsync
+from fledge.services.core import readings_rollup
+from fledge.services.core.readings_rollup import ReadingsRollup, epoch
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+# 2026-01-01 00:00:00 UTC
+T0 = 1767225600
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("core", "readings-rollup")
+class TestReadingsRollup:
+
+    @pytest.fixture
+    def rollup(self):
+        rollup = ReadingsRollup(MagicMock(spec=ReadingsStorageClientAsync))
+        rollup.reset(0, T0)
+        # As if the readings of the next day had been fetched
+        rollup._high_water = T0 + 86400
+        return rollup
+
+    def test_epoch(self):
+        assert T0 + 61 == epoch("2026-01-01 00:01:01.123456+00")
+        assert T0 == epoch("2026-01-01 00:00:00")
+
+    def test_not_started(self):
+        rollup = ReadingsRollup(MagicMock(spec=ReadingsStorageClientAsync))
+        assert rollup.started is False
+        assert rollup.aggregate("sinusoid", T0, T0 + 60, 60) is None
+
+    def test_aggregate(self, rollup):
+        for second in range(0, 7200, 30):
+            rollup.add("sinusoid", T0 + second, {"x": second, "image": "__DPIMAGE:1,1,8_A"})
+        groups = rollup.aggregate("sinusoid", T0, T0 + 7200, 3600)
+        assert [(T0, {"x": [0, 3570, sum(range(0, 3600, 30)), 120]}),
+                (T0 + 3600, {"x": [3600, 7170, sum(range(3600, 7200, 30)), 120]})] == groups
+        # A range that is not aligned on the groups is built from finer buckets
+        assert [(T0 + 60, {"x": [90, 90, 90, 1]})] == rollup.aggregate("sinusoid", T0 + 61, T0 + 120, 60)
+        assert [] == rollup.aggregate("unknown", T0, T0 + 60, 60)
+        assert rollup.is_numeric("sinusoid", "x") is True
+        assert rollup.is_numeric("sinusoid", "image") is False
+        assert rollup.is_numeric("sinusoid") is False
+
+    def test_aggregate_before_coverage(self, rollup):
+        rollup.add("sinusoid", T0 + 10, {"x": 1})
+        assert rollup.aggregate("sinusoid", T0 - 60, T0 + 60, 60) is None
+        assert {"readings": 1, "hits": 0, "misses": 1} == {k: v for k, v in rollup.metrics().items()
+                                                           if k in ("readings", "hits", "misses")}
+
+    def test_latest(self, rollup):
+        for second in range(0, 600):
+            rollup.add("sinusoid", T0 + second, {"x": second})
+        groups = rollup.latest("sinusoid", "x", 60, 2, T0 + 600)
+        assert [(T0 + 540, [540, 599, sum(range(540, 600)), 60]),
+                (T0 + 480, [480, 539, sum(range(480, 540)), 60])] == groups
+        assert rollup.latest("sinusoid", "x", 60, 20, T0 + 600) is None
+
+    def test_expire(self, rollup):
+        for second in range(0, 1200):
+            rollup.add("sinusoid", T0 + second, {"x": 1})
+        rollup.expire(T0 + 1200)
+        # Seconds are kept 10 minutes, the first 10 minutes are still available as minutes
+        assert [(T0, {"x": [1, 1, 60, 60]})] == rollup.aggregate("sinusoid", T0, T0 + 60, 60)
+        assert rollup.aggregate("sinusoid", T0 + 30, T0 + 60, 60) is None
+        rollup.expire_before(T0 + 90)
+        assert rollup.aggregate("sinusoid", T0, T0 + 60, 60) is None
+        assert [(T0 + 120, {"x": [1, 1, 60, 60]})] == rollup.aggregate("sinusoid", T0 + 120, T0 + 180, 60)
+
+    def test_drop_asset_and_clear(self, rollup):
+        rollup.add("sinusoid", T0, {"x": 1})
+        rollup.add("random", T0, {"x": 1})
+        rollup.drop_asset("sinusoid")
+        assert [] == rollup.aggregate("sinusoid", T0, T0 + 60, 60)
+        assert 1 == len(rollup.aggregate("random", T0, T0 + 60, 60))
+        rollup.clear()
+        assert 0 == rollup.metrics()["assets"]
+
+    async def test_refresh(self, rollup):
+        rollup._fetch_size = 2
+        blocks = [{"rows": [{"id": 1, "asset_code": "sinusoid", "reading": {"x": 1}, "user_ts": "2026-01-01 00:00:01.5"},
+                            {"id": 2, "asset_code": "sinusoid", "reading": {"x": 3}, "user_ts": "2026-01-01 00:00:02.5"}]},
+                  {"rows": [{"id": 3, "asset_code": "sinusoid", "reading": {"x": 5}, "user_ts": "2026-01-01 00:00:03.5"}]}]
+        rollup._readings.fetch.side_effect = blocks
+        rollup._high_water = T0
+        await rollup.refresh()
+        assert [((1, 2), {}), ((3, 2), {})] == rollup._readings.fetch.call_args_list
+        assert 3 == rollup.metrics()["last_id"]
+        # Caught up with the readings, the high-water mark is the time of the last fetch
+        assert rollup.metrics()["high_water"] > T0 + 60
+        assert [(T0, {"x": [1, 5, 9, 3]})] == rollup.aggregate("sinusoid", T0, T0 + 60, 60)
+
+    async def test_refresh_behind(self, rollup):
+        rollup._fetch_size = 2
+        rollup._high_water = T0
+        rollup._readings.fetch.return_value = {"rows": [
+            {"id": 1, "asset_code": "sinusoid", "reading": {"x": 1}, "user_ts": "2026-01-01 00:00:01.5"},
+            {"id": 2, "asset_code": "sinusoid", "reading": {"x": 3}, "user_ts": "2026-01-01 00:00:02.5"}]}
+        with patch.object(readings_rollup, '_MAX_REFRESH_BLOCKS', 1):
+            await rollup.refresh()
+        assert 2 == rollup.metrics()["last_id"]
+        # More readings of 00:00:02 may be left to fetch
+        assert T0 + 2 == rollup.metrics()["high_water"]
+        assert [(T0 + 1, {"x": [1, 1, 1, 1]})] == rollup.aggregate("sinusoid", T0, T0 + 2, 1)
+        assert rollup.aggregate("sinusoid", T0, T0 + 3, 1) is None
+        assert rollup.aggregate("sinusoid", T0, T0 + 60, 60) is None
+        assert rollup.latest("sinusoid", "x", 1, 1, T0 + 2) is None
+        assert [(T0 + 1, [1, 1, 1, 1])] == rollup.latest("sinusoid", "x", 1, 1, T0 + 1)
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/services/core/syslog_index.py """
+
+import os
+
+import pytest
+
+from fledge.services.core.syslog_index import SyslogIndex
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+LINES = [
+    "Mar 19 14:00:53 host Fledge[18809] INFO: server: fledge.services.core.server: start core\n",
+    "Mar 19 14:00:53 host systemd[1]: Started Session 1 of user fledge.\n",
+    "Mar 19 14:00:54 host Fledge Storage[18810]: Registered configuration category STORAGE\n",
+    "Mar 19 14:00:58 host Fledge[18809] WARNING: scheduler: fledge.services.core.scheduler: Task late\n",
+    "Mar 19 14:00:59 host Fledge S1[18811] ERROR: sinusoid: module.name: Sinusoid plugin failed\n",
+    "Mar 19 14:01:00 host Fledge OMF[12145]: FATAL: Signal 11 (Segmentation fault) trapped:\n",
+    "Mar 19 14:01:01 host Fledge S1[18811] INFO: sinusoid: module.name: Sinusoid plugin_reconfigure called\n",
+]
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("core", "syslog-index")
+class TestSyslogIndex:
+
+    @pytest.fixture
+    def syslog(self, tmp_path):
+        path = tmp_path / "syslog"
+        path.write_text("".join(LINES))
+        return path
+
+    @pytest.fixture
+    def index(self, syslog, tmp_path):
+        index = SyslogIndex(str(syslog), str(tmp_path / "var" / "syslog.idx"))
+        assert 6 == index.refresh()
+        return index
+
+    def test_query_by_source_and_level(self, index):
+        assert (6, [LINES[n] for n in (0, 2, 3, 4, 5, 6)]) == index.query()
+        assert (1, [LINES[2]]) == index.query("Fledge Storage")
+        assert (2, [LINES[4], LINES[6]]) == index.query("Fledge S1")
+        assert (0, []) == index.query("Fledge S2")
+        assert (3, [LINES[n] for n in (4, 5, 6)]) == index.query(["Fledge S1", "Fledge OMF", "Fledge S2"])
+        assert (2, [LINES[4], LINES[6]]) == index.query(["Fledge S1"])
+        assert (5, [LINES[n] for n in (3, 4, 5, 6)]) == index.query(level="info", limit=4)
+        assert (2, [LINES[4], LINES[5]]) == index.query(level="error")
+        assert (1, [LINES[4]]) == index.query("Fledge S1", level="warning")
+
+    def test_query_pages_from_most_recent(self, index):
+        assert (6, [LINES[5], LINES[6]]) == index.query(limit=2)
+        assert (6, [LINES[3], LINES[4]]) == index.query(offset=2, limit=2)
+        assert (6, [LINES[0]]) == index.query(offset=5, limit=2)
+        assert (6, []) == index.query(offset=6, limit=2)
+
+    def test_query_keyword(self, index):
+        assert (2, [LINES[6]]) == index.query(keyword="Sinusoid", limit=1)
+        assert (2, [LINES[4]]) == index.query(keyword="Sinusoid", offset=1, limit=1)
+        assert (None, [LINES[6]]) == index.query(keyword="Sinusoid", limit=1, count=False)
+
+    def test_refresh_appended_and_partial_lines(self, index, syslog):
+        with open(str(syslog), 'a') as f:
+            f.write(LINES[2] + LINES[0][:20])
+        assert 1 == index.refresh()
+        assert (2, [LINES[2], LINES[2]]) == index.query("Fledge Storage")
+        with open(str(syslog), 'a') as f:
+            f.write(LINES[0][20:])
+        assert 1 == index.refresh()
+        assert (8, [LINES[0]]) == index.query(limit=1)
+
+    def test_rotation(self, index, syslog):
+        os.rename(str(syslog), str(syslog) + ".1")
+        syslog.write_text(LINES[2])
+        assert 1 == index.refresh()
+        assert (1, [LINES[2]]) == index.query()
+
+    def test_save_and_load(self, index, syslog, tmp_path):
+        index.save()
+        loaded = SyslogIndex(str(syslog), str(tmp_path / "var" / "syslog.idx"))
+        loaded.load()
+        assert 6 == loaded.lines
+        assert 0 == loaded.refresh()
+        assert index.query() == loaded.query()
+        assert index.query("Fledge S1", level="warning") == loaded.query("Fledge S1", level="warning")
+        with open(str(syslog), 'a') as f:
+            f.write(LINES[4])
+        assert 1 == loaded.refresh()
+        loaded.save()
+        assert 7 * 15 == os.path.getsize(str(tmp_path / "var" / "syslog.idx"))
+
+    def test_load_drops_records_not_saved(self, index, syslog, tmp_path):
+        index_file = str(tmp_path / "var" / "syslog.idx")
+        index.save()
+        # Records appended by a save that did not complete, the meta data still has 6 lines
+        with open(index_file, 'ab') as f:
+            f.write(b'\xff' * 15 * 2)
+        loaded = SyslogIndex(str(syslog), index_file)
+        loaded.load()
+        assert 6 * 15 == os.path.getsize(index_file)
+        with open(str(syslog), 'a') as f:
+            f.write(LINES[4])
+        assert 1 == loaded.refresh()
+        loaded.save()
+        reloaded = SyslogIndex(str(syslog), index_file)
+        reloaded.load()
+        assert 7 == reloaded.lines
+        assert loaded.query() == reloaded.query()
+
+    async def test_query_async(self, index, syslog):
+        with open(str(syslog), 'a') as f:
+            f.write(LINES[2])
+        assert (2, [LINES[2]]) == await index.query_async("Fledge Storage", limit=1)
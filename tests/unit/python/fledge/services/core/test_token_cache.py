@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/services/core/token_cache.py """
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from fledge.common.storage_client.storage_client import StorageClientAsync
+from fledge.services.core import connect
+from fledge.services.core.token_cache import TokenCache
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+ADMIN = {'id': 1, 'uname': 'admin', 'role_id': '1'}
+USER = {'id': 2, 'uname': 'user', 'role_id': '2'}
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("core", "token-cache")
+class TestTokenCache:
+
+    @pytest.fixture
+    def cache(self):
+        return TokenCache(1800)
+
+    def test_get_and_put(self, cache):
+        assert cache.get("admin_token") is None
+        cache.put("admin_token", ADMIN, cache.generation)
+        assert ADMIN == cache.get("admin_token")
+        # the cached user is not shared with the requests
+        cache.get("admin_token")["role_id"] = '2'
+        assert ADMIN == cache.get("admin_token")
+        assert {"hits": 3, "misses": 1, "invalidations": 0, "refreshes": 0, "tokens": 1,
+                "pending": 1} == cache.metrics()
+
+    def test_expired_entry(self):
+        cache = TokenCache(1800, ttl=-1)
+        cache.put("admin_token", ADMIN, cache.generation)
+        assert cache.get("admin_token") is None
+        assert 0 == cache.metrics()["tokens"]
+
+    def test_put_after_invalidation_is_ignored(self, cache):
+        generation = cache.generation
+        cache.invalidate_token("admin_token")
+        cache.put("admin_token", ADMIN, generation)
+        assert cache.get("admin_token") is None
+
+    def test_invalidate(self, cache):
+        cache.put("admin_token", ADMIN, cache.generation)
+        cache.put("user_token1", USER, cache.generation)
+        cache.put("user_token2", USER, cache.generation)
+        cache.invalidate_user("2")
+        assert cache.get("user_token1") is None
+        assert cache.get("user_token2") is None
+        assert ADMIN == cache.get("admin_token")
+        cache.put_role_ids("admin", [1])
+        assert [1] == cache.get_role_ids("admin")
+        cache.clear()
+        assert cache.get("admin_token") is None
+        assert cache.get_role_ids("admin") is None
+
+    def test_max_tokens(self):
+        cache = TokenCache(1800, max_tokens=2)
+        for token in ("token1", "token2", "token3"):
+            cache.put(token, USER, cache.generation)
+        assert cache.get("token1") is None
+        assert USER == cache.get("token3")
+
+    async def test_refresh_expiry(self, cache):
+        storage_client_mock = MagicMock(spec=StorageClientAsync)
+        storage_client_mock.update_tbl.return_value = {"response": "updated", "rows_affected": 2}
+        cache.put("admin_token", ADMIN, cache.generation)
+        cache.put("user_token", USER, cache.generation)
+        with patch.object(connect, 'get_storage_async', return_value=storage_client_mock):
+            # nothing to extend
+            await cache.refresh_expiry()
+            assert 0 == storage_client_mock.update_tbl.call_count
+            cache.get("admin_token")
+            cache.get("user_token")
+            cache.get("admin_token")
+            await cache.refresh_expiry()
+            await cache.refresh_expiry()
+        storage_client_mock.update_tbl.assert_called_once()
+        table, payload = storage_client_mock.update_tbl.call_args[0]
+        assert "user_logins" == table
+        where = json.loads(payload)["where"]
+        assert {"column": "token", "condition": "in", "value": ["admin_token", "user_token"]} == where
+        assert 1 == cache.metrics()["refreshes"]
@@ -14,6 +14,8 @@ import asyncio
 from unittest.mock import MagicMock, call
 from fledge.services.south.ingest import *
 from fledge.services.south import ingest
+from fledge.services.south.readings_buffer import ReadingsRingBuffer
+from fledge.common.asset_tracker_cache import AssetTrackerCache
 from fledge.common.storage_client.storage_client import StorageClientAsync, ReadingsStorageClientAsync
 from fledge.common.microservice_management_client.microservice_management_client import MicroserviceManagementClient
 
@@ -51,15 +53,14 @@ class TestIngest:
         Ingest._write_statistics_sleep_task = None  # type: asyncio.Task
         Ingest._stop = False
         Ingest._started = False
-        Ingest._readings_lists = None  # type: List
-        Ingest._current_readings_list_index = 0
+        Ingest._readings_buffer = None  # type: ReadingsRingBuffer
         Ingest._insert_readings_tasks = None  # type: List[asyncio.Task]
-        Ingest._readings_list_batch_size_reached = None  # type: List[asyncio.Event]
-        Ingest._readings_list_not_empty = None  # type: List[asyncio.Event]
-        Ingest._readings_lists_not_full = None  # type: asyncio.Event
-        Ingest._insert_readings_wait_tasks = None  # type: List[asyncio.Task]
+        Ingest._readings_batch_ready = None  # type: asyncio.Event
+        Ingest._readings_buffer_not_full = None  # type: asyncio.Event
         Ingest._last_insert_time = 0  # type: int
-        Ingest._readings_list_size = 0  # type: int
+        Ingest._asset_tracker = None  # type: AssetTrackerCache
+        Ingest._asset_tracker_service = None
+        Ingest._asset_tracker_plugin = None
         Ingest._write_statistics_frequency_seconds = 5
         Ingest._readings_buffer_size = 500
         Ingest._max_concurrent_readings_inserts = 5
@@ -67,6 +68,7 @@ class TestIngest:
         Ingest._readings_insert_batch_timeout_seconds = 1
         Ingest._max_readings_insert_batch_connection_idle_seconds = 60
         Ingest._max_readings_insert_batch_reconnect_wait_seconds = 10
+        Ingest._readings_insert_mode = "json"
         Ingest.category = 'South'
         Ingest.default_config = {
             "readings_buffer_size": {
@@ -103,6 +105,13 @@ class TestIngest:
                 "type": "integer",
                 "default": str(Ingest._max_readings_insert_batch_reconnect_wait_seconds)
             },
+            "readings_insert_mode": {
+                "description": "Send readings to storage as JSON documents or over the binary "
+                               "readings stream",
+                "type": "enumeration",
+                "options": ["json", "stream"],
+                "default": Ingest._readings_insert_mode
+            },
         }
 
     @pytest.mark.asyncio
@@ -133,6 +142,7 @@ class TestIngest:
                int(new_config['max_readings_insert_batch_connection_idle_seconds']['value'])
         assert Ingest._max_readings_insert_batch_reconnect_wait_seconds == \
                int(new_config['max_readings_insert_batch_reconnect_wait_seconds']['value'])
+        assert Ingest._readings_insert_mode == new_config['readings_insert_mode']['value']
 
     @pytest.mark.asyncio
     async def test_read_config_filter(self, mocker):
@@ -231,13 +241,10 @@ class TestIngest:
         assert 1 == get_cfg.call_count
         assert Ingest._stop is False
         assert Ingest._started is True
-        assert Ingest._readings_list_size == int(Ingest._readings_buffer_size / (
-            Ingest._max_concurrent_readings_inserts))
-        assert Ingest._last_insert_time is 0
-        assert Ingest._max_concurrent_readings_inserts == len(Ingest._insert_readings_wait_tasks)
-        assert Ingest._max_concurrent_readings_inserts == len(Ingest._readings_list_batch_size_reached)
-        assert Ingest._max_concurrent_readings_inserts == len(Ingest._readings_list_not_empty)
-        assert Ingest._max_concurrent_readings_inserts == len(Ingest._readings_lists)
+        assert Ingest._readings_buffer_size == Ingest._readings_buffer.capacity
+        assert 0 == len(Ingest._readings_buffer)
+        assert Ingest._last_insert_time == 0
+        assert Ingest._max_concurrent_readings_inserts == len(Ingest._insert_readings_tasks)
         assert 0 == log_warning.call_count
 
     @pytest.mark.asyncio
@@ -285,12 +292,11 @@ class TestIngest:
         assert 1 == get_cfg.call_count
         assert Ingest._stop is True
         assert Ingest._started is False
-        assert Ingest._insert_readings_wait_tasks is None
         assert Ingest._insert_readings_tasks is None
-        assert Ingest._readings_lists is None
-        assert Ingest._readings_list_batch_size_reached is None
-        assert Ingest._readings_list_not_empty is None
-        assert Ingest._readings_lists_not_full is None
+        assert Ingest._readings_buffer is None
+        assert Ingest._readings_batch_ready is None
+        assert Ingest._readings_buffer_not_full is None
+        assert Ingest._asset_tracker is None
         assert 0 == log_exception.call_count
 
     @pytest.mark.asyncio
@@ -307,6 +313,47 @@ class TestIngest:
     async def test__insert_readings(self, mocker):
         pass
 
+    @pytest.mark.asyncio
+    async def test_stream_readings_json_mode(self, mocker):
+        # GIVEN
+        Ingest.readings_storage_async = MagicMock(spec=ReadingsStorageClientAsync)
+
+        # WHEN
+        sent = await Ingest._stream_readings([{"asset_code": "a", "reading": {}, "user_ts": "now()"}], 1)
+
+        # THEN
+        assert sent is False
+        Ingest.readings_storage_async.append_stream.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_stream_readings(self, mocker):
+        # GIVEN
+        Ingest._readings_insert_mode = "stream"
+        Ingest.readings_storage_async = MagicMock(spec=ReadingsStorageClientAsync)
+        readings = [{"asset_code": "a", "reading": {"x": 1}, "user_ts": "2023-01-01 00:00:00.000001+00:00"}]
+
+        # WHEN
+        sent = await Ingest._stream_readings(readings, 1)
+
+        # THEN
+        assert sent is True
+        Ingest.readings_storage_async.append_stream.assert_called_once_with(readings, 1)
+
+    @pytest.mark.asyncio
+    async def test_stream_readings_fallback(self, mocker):
+        # GIVEN
+        Ingest._readings_insert_mode = "stream"
+        Ingest.readings_storage_async = MagicMock(spec=ReadingsStorageClientAsync)
+        Ingest.readings_storage_async.append_stream.side_effect = ReadingStreamUnavailable()
+        log_warning = mocker.patch.object(ingest._LOGGER, "warning")
+
+        # WHEN
+        sent = await Ingest._stream_readings([{"asset_code": "a", "reading": {}, "user_ts": "now()"}], 1)
+
+        # THEN
+        assert sent is False
+        log_warning.assert_called_once_with('Readings stream is unavailable, sending batch as JSON')
+
     @pytest.mark.skip(reason="This method uses a while True loop. Investigate as to how to write unit test for an infinite loop.")
     @pytest.mark.asyncio
     async def test_write_statistics(self, mocker):
@@ -315,16 +362,10 @@ class TestIngest:
     @pytest.mark.asyncio
     async def test_is_available_at_start(self, mocker):
         # GIVEN
-        Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        # Insert one task and leave room for more
-        Ingest._readings_lists[0].append(await mock_coro())
+        Ingest._readings_buffer = ReadingsRingBuffer(2)
+        # Insert one reading and leave room for more
+        Ingest._readings_buffer.put({})
         log_warning = mocker.patch.object(ingest._LOGGER, "warning")
-        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
-        mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
 
         # WHEN
         retval = Ingest.is_available()
@@ -336,16 +377,10 @@ class TestIngest:
     @pytest.mark.asyncio
     async def test_is_available_at_stop(self, mocker):
         # GIVEN
-        Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_lists[0].append(await mock_coro())
+        Ingest._readings_buffer = ReadingsRingBuffer(2)
+        Ingest._readings_buffer.put({})
         log_warning = mocker.patch.object(ingest._LOGGER, "warning")
         Ingest._stop = True
-        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
-        mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
 
         # WHEN
         retval = Ingest.is_available()
@@ -355,19 +390,13 @@ class TestIngest:
         assert 0 == log_warning.call_count
 
     @pytest.mark.asyncio
-    async def test_is_available_when_all_lists_full(self, mocker):
+    async def test_is_available_when_buffer_full(self, mocker):
         # GIVEN
-        Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        # Insert two tasks
-        Ingest._readings_lists[0].append(await mock_coro())
-        Ingest._readings_lists[0].append(await mock_coro())
+        Ingest._readings_buffer = ReadingsRingBuffer(2)
+        # Insert two readings
+        Ingest._readings_buffer.put({})
+        Ingest._readings_buffer.put({})
         log_warning = mocker.patch.object(ingest._LOGGER, "warning")
-        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
-        mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
 
         # WHEN
         retval = Ingest.is_available()
@@ -375,7 +404,52 @@ class TestIngest:
         # THEN
         assert retval is False
         assert 1 == log_warning.call_count
-        log_warning.assert_called_with('The ingest service is unavailable %s', 0)
+        log_warning.assert_called_with('The ingest service is unavailable, readings buffer is full')
+
+    @pytest.mark.asyncio
+    async def test_wait_available(self, mocker):
+        # GIVEN
+        Ingest._readings_buffer = ReadingsRingBuffer(1)
+        Ingest._readings_buffer.put({})
+        Ingest._readings_buffer_not_full = asyncio.Event()
+
+        # WHEN
+        waiter = asyncio.ensure_future(Ingest.wait_available())
+        await asyncio.sleep(0.01)
+        assert waiter.done() is False
+        Ingest._readings_buffer.get_batch(1)
+        Ingest._readings_buffer_not_full.set()
+
+        # THEN
+        assert await waiter is True
+
+    @pytest.mark.asyncio
+    async def test_wait_available_timeout(self, mocker):
+        # GIVEN
+        Ingest._readings_buffer = ReadingsRingBuffer(1)
+        Ingest._readings_buffer.put({})
+        Ingest._readings_buffer_not_full = asyncio.Event()
+
+        # WHEN
+        retval = await Ingest.wait_available(timeout=0.01)
+
+        # THEN
+        assert retval is False
+
+    @pytest.mark.asyncio
+    async def test_buffer_metrics(self, mocker):
+        # GIVEN
+        assert {} == Ingest.buffer_metrics()
+        Ingest._readings_buffer = ReadingsRingBuffer(4)
+        Ingest._readings_buffer.put({})
+        Ingest._readings_buffer.put({})
+        Ingest._readings_buffer.get_batch(1)
+
+        # WHEN
+        metrics = Ingest.buffer_metrics()
+
+        # THEN
+        assert {"capacity": 4, "occupancy": 1, "high_water_mark": 2} == metrics
 
     @pytest.mark.asyncio
     async def test_add_readings_all_ok(self, mocker):
@@ -391,19 +465,14 @@ class TestIngest:
                     }
                 }
         }
-        Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsRingBuffer(2)
+        Ingest._readings_batch_ready = asyncio.Event()
         Ingest._started = True
-        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
-        mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
         mocker.patch.object(MicroserviceManagementClient, "__init__", return_value=None)
-        mocker.patch.object(MicroserviceManagementClient, "create_asset_tracker_event", return_value=None)
-        assert 0 == len(Ingest._readings_lists[0])
+        Ingest._asset_tracker = AssetTrackerCache(MicroserviceManagementClient())
+        Ingest._asset_tracker_service = "test"
+        Ingest._asset_tracker_plugin = "sinusoid"
+        assert 0 == len(Ingest._readings_buffer)
         assert 'PUMP1' not in list(Ingest._sensor_stats.keys())
 
         # WHEN
@@ -412,7 +481,12 @@ class TestIngest:
                                   readings=data['readings'])
 
         # THEN
-        assert 1 == len(Ingest._readings_lists[0])
+        assert 1 == len(Ingest._readings_buffer)
+        assert Ingest._readings_batch_ready.is_set() is False
+        assert [{'asset_code': data['asset'], 'reading': data['readings'], 'user_ts': data['timestamp']}] == \
+            Ingest._readings_buffer.get_batch(2)
+        assert (data['asset'], "Ingest", "test", "sinusoid") in Ingest._asset_tracker
+        assert 1 == Ingest._asset_tracker.pending
 
     @pytest.mark.asyncio
     async def test_add_readings_if_stop(self, mocker):
@@ -428,18 +502,10 @@ class TestIngest:
                     }
                 }
         }
-        Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsRingBuffer(2)
         Ingest._stop = True
         log_warning = mocker.patch.object(ingest._LOGGER, "warning")
-        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
-        mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
         # WHEN
         await Ingest.add_readings(asset=data['asset'],
@@ -447,7 +513,7 @@ class TestIngest:
                                   readings=data['readings'])
 
         # THEN
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
         assert 1 == log_warning.call_count
         log_warning.assert_called_with('The South Service is stopping')
 
@@ -465,17 +531,9 @@ class TestIngest:
                     }
                 }
         }
-        Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsRingBuffer(2)
         Ingest._started = False
-        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
-        mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
         # WHEN
         with pytest.raises(RuntimeError):
@@ -484,7 +542,7 @@ class TestIngest:
                                       readings=data['readings'])
 
         # THEN
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
     @pytest.mark.asyncio
     async def test_add_readings_incorrect_data_values(self, mocker):
@@ -500,17 +558,9 @@ class TestIngest:
                     }
                 }
         }
-        Ingest._max_concurrent_readings_inserts = 1
-        Ingest._readings_list_size = 2
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
+        Ingest._readings_buffer = ReadingsRingBuffer(2)
         Ingest._started = True
-        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
-        mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
 
         # WHEN
         # Check for asset None
@@ -537,10 +587,11 @@ class TestIngest:
                                       timestamp=data['timestamp'],
                                       readings=123)
         # THEN
-        assert 0 == len(Ingest._readings_lists[0])
+        assert 0 == len(Ingest._readings_buffer)
+        assert 4 == Ingest._discarded_readings_stats
 
     @pytest.mark.asyncio
-    async def test_add_readings_when_one_list_becomes_full(self, mocker):
+    async def test_add_readings_when_buffer_full(self, mocker):
         # GIVEN
         data = {
                 "timestamp": "2017-01-02T01:02:03.23232Z-05:00",
@@ -553,37 +604,26 @@ class TestIngest:
                     }
                 }
         }
-        Ingest._max_concurrent_readings_inserts = 2
-        Ingest._readings_list_size = 1
+        Ingest._readings_buffer = ReadingsRingBuffer(1)
         Ingest._readings_insert_batch_size = 1
-        Ingest._current_readings_list_index = 0
-        Ingest._readings_lists = []
-        Ingest._readings_lists.append([])
-        Ingest._readings_lists.append([])
-        Ingest._readings_list_not_empty = []
-        Ingest._readings_list_not_empty.append(asyncio.Event())
-        Ingest._readings_list_not_empty.append(asyncio.Event())
-        Ingest._readings_list_batch_size_reached = []
-        Ingest._readings_list_batch_size_reached.append(asyncio.Event())
-        Ingest._readings_list_batch_size_reached.append(asyncio.Event())
+        Ingest._readings_batch_ready = asyncio.Event()
         Ingest._started = True
-        mocker.patch.object(Ingest, "_write_statistics", return_value=(await mock_coro()))
-        mocker.patch.object(Ingest, "_insert_readings", return_value=(await mock_coro()))
+        mocker.patch.object(ingest._LOGGER, "warning")
         mocker.patch.object(MicroserviceManagementClient, "__init__", return_value=None)
-        mocker.patch.object(MicroserviceManagementClient, "create_asset_tracker_event", return_value=None)
-
-        assert 0 == len(Ingest._readings_lists[0])
-        assert 'PUMP1' not in list(Ingest._sensor_stats.keys())
+        Ingest._asset_tracker = AssetTrackerCache(MicroserviceManagementClient())
+        Ingest._asset_tracker_service = "test"
+        Ingest._asset_tracker_plugin = "sinusoid"
 
         # WHEN
         await Ingest.add_readings(asset=data['asset'],
                                   timestamp=data['timestamp'],
                                   readings=data['readings'])
-        # First reading_list is full, so now add to second list
+        # Buffer is full, so the second reading is discarded
         await Ingest.add_readings(asset=data['asset'],
                                   timestamp=data['timestamp'],
                                   readings=data['readings'])
 
         # THEN
-        assert 1 == len(Ingest._readings_lists[0])
-        assert 1 == len(Ingest._readings_lists[1])
+        assert 1 == len(Ingest._readings_buffer)
+        assert Ingest._readings_batch_ready.is_set() is True
+        assert 1 == Ingest._discarded_readings_stats
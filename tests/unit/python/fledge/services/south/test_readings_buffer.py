@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test services/south/readings_buffer.py
+
+"""
+import pytest
+
+from fledge.services.south.readings_buffer import ReadingsRingBuffer
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("services", "south", "readings_buffer")
+class TestReadingsRingBuffer:
+
+    @pytest.mark.parametrize("capacity", [0, -1])
+    def test_invalid_capacity(self, capacity):
+        with pytest.raises(ValueError) as excinfo:
+            ReadingsRingBuffer(capacity)
+        assert 'capacity must be a positive integer' == str(excinfo.value)
+
+    def test_put_until_full(self):
+        buffer = ReadingsRingBuffer(3)
+        assert 0 == len(buffer)
+        for i in range(3):
+            assert buffer.put(i) is True
+        assert buffer.is_full() is True
+        assert buffer.put(3) is False
+        assert 3 == len(buffer)
+
+    def test_get_batch_in_order(self):
+        buffer = ReadingsRingBuffer(4)
+        for i in range(3):
+            buffer.put(i)
+        assert [0, 1] == buffer.get_batch(2)
+        assert [2] == buffer.get_batch(5)
+        assert [] == buffer.get_batch(1)
+        assert 0 == len(buffer)
+
+    def test_get_batch_wraps_around(self):
+        buffer = ReadingsRingBuffer(4)
+        for i in range(4):
+            buffer.put(i)
+        assert [0, 1, 2] == buffer.get_batch(3)
+        for i in range(4, 7):
+            buffer.put(i)
+        assert buffer.is_full() is True
+        assert [3, 4, 5, 6] == buffer.get_batch(4)
+        # removed slots do not keep references to the readings
+        assert [None] * 4 == buffer._slots
+
+    def test_metrics(self):
+        buffer = ReadingsRingBuffer(4)
+        for i in range(3):
+            buffer.put(i)
+        buffer.get_batch(2)
+        assert {"capacity": 4, "occupancy": 1, "high_water_mark": 3} == buffer.metrics()
+        buffer.reset_high_water_mark()
+        assert 1 == buffer.high_water_mark
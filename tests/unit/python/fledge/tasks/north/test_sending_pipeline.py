@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# FLEDGE_BEGIN
+# See: http://fledge-iot.readthedocs.io/
+# FLEDGE_END
+
+""" Test fledge/tasks/north/pipeline.py """
+
+import asyncio
+import time
+
+import pytest
+
+from fledge.tasks.north.pipeline import MemoryBudget, StageMetrics
+
+__copyright__ = "Copyright (c) 2026 Dianomic Systems Inc."
+__license__ = "Apache 2.0"
+__version__ = "${VERSION}"
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("tasks", "north", "pipeline")
+class TestMemoryBudget:
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError):
+            MemoryBudget(0)
+
+    async def test_acquire_waits_for_release(self):
+        budget = MemoryBudget(100)
+        await budget.acquire(60)
+        waiter = asyncio.ensure_future(budget.acquire(60))
+        await asyncio.sleep(0.01)
+        assert waiter.done() is False
+        await budget.release(60)
+        await asyncio.wait_for(waiter, 1)
+        assert 60 == budget.used
+        assert 60 == budget.high_water_mark
+
+    async def test_oversized_block_admitted_when_empty(self):
+        budget = MemoryBudget(100)
+        await asyncio.wait_for(budget.acquire(250), 1)
+        assert 250 == budget.used
+        assert 250 == budget.high_water_mark
+        await budget.release(250)
+        assert 0 == budget.used
+
+
+@pytest.allure.feature("unit")
+@pytest.allure.story("tasks", "north", "pipeline")
+class TestStageMetrics:
+
+    def test_metrics(self):
+        metrics = StageMetrics("send")
+        assert {"blocks": 0, "readings": 0, "bytes": 0, "readings_per_second": 0.0, "latency_avg_ms": 0.0,
+                "latency_max_ms": 0.0} == metrics.metrics()
+        now = time.monotonic()
+        metrics.record(10, 1000, now - 0.5, now - 1.0)
+        metrics.record(30, 3000, now - 0.5, now - 2.0)
+        result = metrics.metrics()
+        assert 2 == result["blocks"]
+        assert 40 == result["readings"]
+        assert 4000 == result["bytes"]
+        assert 35 < result["readings_per_second"] <= 40
+        assert 1500 <= result["latency_avg_ms"] < 1600
+        assert 2000 <= result["latency_max_ms"] < 2100
@@ -8,7 +8,7 @@ import json
 import pytest
 import asyncio
 import sys
-from unittest.mock import patch, call, MagicMock
+from unittest.mock import patch, MagicMock
 from fledge.common.audit_logger import AuditLogger
 from fledge.common.configuration_manager import ConfigurationManager
 from fledge.common.logger import FLCoreLogger
@@ -69,12 +69,12 @@ class TestPurge:
         
         with patch.object(FledgeProcess, '__init__'):
             with patch.object(Statistics, '_load_keys', return_value=_rv):
-                with patch.object(Statistics, 'update', return_value=_rv) as mock_stats_update:
+                with patch.object(Statistics, 'update_bulk', return_value=_rv) as mock_stats_update:
                     with patch.object(mock_audit_logger, "__init__", return_value=None):
                         p = Purge()
                         p._storage_async = mock_storage_client_async
                         await p.write_statistics(1, 2)
-                mock_stats_update.assert_has_calls([call('PURGED', 1), call('UNSNPURGED', 2)])
+                mock_stats_update.assert_called_once_with({'PURGED': 1, 'UNSNPURGED': 2})
 
     async def test_set_configuration(self):
         """Test that purge's set_configuration returns configuration item with key 'PURGE_READ' """